@@ -49,8 +49,16 @@ class LogWebSocketManager {
         return
       }
 
+      if (message.event === 'batch') {
+        const entries = Array.isArray(message.data.entries)
+          ? (message.data.entries as LogEntry[])
+          : []
+        this.appendLogs(entries)
+        return
+      }
+
       if (message.event === 'entry' && message.data.entry) {
-        this.appendLog(message.data.entry as LogEntry)
+        this.appendLogs([message.data.entry as LogEntry])
       }
     })
 
@@ -62,13 +70,25 @@ class LogWebSocketManager {
     this.initialized = true
   }
 
-  private appendLog(log: LogEntry): void {
-    const exists = this.logCache.some(existingLog => existingLog.id === log.id)
-    if (exists) {
+  private appendLogs(logs: LogEntry[]): void {
+    if (logs.length === 0) {
+      return
+    }
+
+    const existingIds = new Set(this.logCache.map(existingLog => existingLog.id))
+    let appended = false
+    for (const log of logs) {
+      if (existingIds.has(log.id)) {
+        continue
+      }
+      existingIds.add(log.id)
+      this.logCache.push(log)
+      appended = true
+    }
+    if (!appended) {
       return
     }
 
-    this.logCache.push(log)
     const maxCacheSize = this.getMaxCacheSize()
     if (this.logCache.length > maxCacheSize) {
       this.logCache = this.logCache.slice(-maxCacheSize)
@@ -51,6 +51,18 @@ export interface MemoryGraphPayload {
   edges: MemoryGraphEdgePayload[]
   total_nodes: number
   total_edges: number
+  strategy?: 'degree' | 'saliency' | 'focus'
+  focus?: string
+  next_cursor?: string | null
+  omitted_edges?: number
+}
+
+export interface MemoryGraphQueryOptions {
+  cursor?: string
+  focus?: string
+  strategy?: 'degree' | 'saliency'
+  depth?: number
+  maxEdgesPerNode?: number
 }
 
 export interface MemoryGraphSearchItem {
@@ -581,8 +593,17 @@ export interface MemorySourceListPayload {
   count: number
 }
 
-export async function getMemoryGraph(limit: number = 120): Promise<MemoryGraphPayload> {
-  return requestJson<MemoryGraphPayload>(`/graph?limit=${limit}`)
+export async function getMemoryGraph(
+  limit: number = 120,
+  options: MemoryGraphQueryOptions = {},
+): Promise<MemoryGraphPayload> {
+  const params = new URLSearchParams({ limit: String(limit) })
+  if (options.cursor) params.set('cursor', options.cursor)
+  if (options.focus) params.set('focus', options.focus)
+  if (options.strategy) params.set('strategy', options.strategy)
+  if (options.depth !== undefined) params.set('depth', String(options.depth))
+  if (options.maxEdgesPerNode !== undefined) params.set('max_edges_per_node', String(options.maxEdgesPerNode))
+  return requestJson<MemoryGraphPayload>(`/graph?${params.toString()}`)
 }
 
 export async function getMemoryGraphSearch(
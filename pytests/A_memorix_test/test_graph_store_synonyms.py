@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.A_memorix.core.storage.graph_store import GraphStore
+
+
+def _clustered_embeddings(count: int, dim: int = 16, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, count // 5), dim))
+    noise = rng.normal(scale=0.15, size=(count, dim))
+    return (centers[np.arange(count) % len(centers)] + noise).astype(np.float32)
+
+
+def _edge_dict(store: GraphStore) -> dict[tuple[str, str], float]:
+    adjacency = store._adjacency.tocoo()
+    nodes = store.get_nodes()
+    return {
+        (nodes[row], nodes[col]): float(value)
+        for row, col, value in zip(adjacency.row, adjacency.col, adjacency.data, strict=True)
+    }
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 4096])
+def test_embedding_path_matches_dense_similarity_path(block_size: int) -> None:
+    embeddings = _clustered_embeddings(120)
+    nodes = [f"node-{index}" for index in range(len(embeddings))]
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    dense = GraphStore()
+    dense_count = dense.connect_synonyms(normalized @ normalized.T, nodes, threshold=0.9)
+    blocked = GraphStore()
+    blocked_count = blocked.connect_synonyms_from_embeddings(embeddings, nodes, threshold=0.9, block_size=block_size)
+
+    assert dense_count > 0
+    assert blocked_count == dense_count
+    dense_edges = _edge_dict(dense)
+    blocked_edges = _edge_dict(blocked)
+    assert dense_edges.keys() == blocked_edges.keys()
+    for key, weight in dense_edges.items():
+        assert blocked_edges[key] == pytest.approx(weight, abs=1e-5)
+
+
+def test_embedding_path_skips_identical_vectors_and_keeps_existing_edges() -> None:
+    store = GraphStore()
+    store.add_edges([("a", "x")], relation_hashes=["rel-1"])
+
+    count = store.connect_synonyms_from_embeddings(
+        np.asarray([[1.0, 0.0], [1.0, 0.0], [0.96, 0.28], [0.0, 1.0]]),
+        ["a", "b", "c", "d"],
+        threshold=0.9,
+    )
+
+    # a/b 完全相同被排除，a-c、b-c 相似度为 0.96
+    assert count == 2
+    assert store.get_edge_weight("a", "c") == pytest.approx(0.96, abs=1e-5)
+    assert store.get_edge_weight("a", "x") == pytest.approx(1.0)
+    assert store.get_relation_hashes_for_edge("a", "x") == {"rel-1"}
+
+
+def test_embedding_path_rejects_mismatched_input() -> None:
+    with pytest.raises(ValueError):
+        GraphStore().connect_synonyms_from_embeddings(np.zeros((3, 4)), ["a", "b"])
@@ -40,6 +40,12 @@ class _DummyMetadataStore:
             ]
         raise AssertionError(f"unexpected query: {sql_token}")
 
+    def search_entities_by_text(self, query: str, limit: int = 50) -> list[dict[str, Any]]:
+        return self.query("SELECT * FROM entities", (f"%{query.lower()}%",))[:limit]
+
+    def search_relations_by_text(self, query: str, limit: int = 50) -> list[dict[str, Any]]:
+        return self.query("SELECT * FROM relations", (f"%{query.lower()}%",))[:limit]
+
 
 def _build_kernel(*, entities: list[dict[str, Any]], relations: list[dict[str, Any]]) -> SDKMemoryKernel:
     kernel = SDKMemoryKernel(plugin_root=Path.cwd(), config={})
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.A_memorix.core.runtime.sdk_memory_kernel import SDKMemoryKernel
+from src.A_memorix.core.storage.graph_store import GraphStore
+from src.A_memorix.core.storage.metadata_store import MetadataStore
+
+
+def _build_kernel(tmp_path: Path) -> SDKMemoryKernel:
+    """构造一个星形 + 链式的小图谱：hub 连接 a0..a5，a0 -> b0 -> c0。"""
+    kernel = SDKMemoryKernel(plugin_root=Path.cwd(), config={})
+
+    async def _fake_initialize() -> None:
+        return None
+
+    metadata_store = MetadataStore(data_dir=tmp_path)
+    metadata_store.connect()
+    graph_store = GraphStore(data_dir=tmp_path)
+
+    triples = [("hub", "连接", f"a{index}") for index in range(6)]
+    triples += [("a0", "认识", "b0"), ("b0", "认识", "c0"), ("a0", "喜欢", "b0")]
+    for index, (subject, predicate, obj) in enumerate(triples):
+        relation_hash = metadata_store.add_relation(subject, predicate, obj)
+        paragraph_hash = metadata_store.add_paragraph(f"{subject} {predicate} {obj} #{index}")
+        metadata_store.link_paragraph_relation(paragraph_hash, relation_hash)
+        graph_store.add_edges([(subject, obj)], weights=[1.0 + index], relation_hashes=[relation_hash])
+
+    kernel.initialize = _fake_initialize  # type: ignore[method-assign]
+    kernel.metadata_store = metadata_store
+    kernel.graph_store = graph_store
+    return kernel
+
+
+@pytest.mark.asyncio
+async def test_get_graph_ranks_by_degree_and_batches_edge_metadata(tmp_path: Path) -> None:
+    kernel = _build_kernel(tmp_path)
+
+    payload = await kernel.memory_graph_admin(action="get_graph", limit=3)
+
+    assert payload["success"] is True
+    assert [node["id"] for node in payload["nodes"]] == ["hub", "a0", "b0"]
+    assert payload["total_nodes"] == 9
+    assert payload["next_cursor"] == "3"
+    edges = {(edge["source"], edge["target"]): edge for edge in payload["edges"]}
+    assert set(edges) == {("hub", "a0"), ("a0", "b0")}
+    assert set(edges[("a0", "b0")]["predicates"]) == {"认识", "喜欢"}
+    assert edges[("a0", "b0")]["relation_count"] == 2
+    assert edges[("a0", "b0")]["evidence_count"] == 2
+    assert edges[("hub", "a0")]["label"] == "连接"
+
+
+@pytest.mark.asyncio
+async def test_get_graph_pages_merge_into_full_graph(tmp_path: Path) -> None:
+    kernel = _build_kernel(tmp_path)
+    full = await kernel.memory_graph_admin(action="get_graph", limit=100)
+
+    nodes, edges, cursor = [], [], None
+    while True:
+        page = await kernel.memory_graph_admin(action="get_graph", limit=2, cursor=cursor)
+        nodes.extend(node["id"] for node in page["nodes"])
+        edges.extend((edge["source"], edge["target"]) for edge in page["edges"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert nodes == [node["id"] for node in full["nodes"]]
+    assert sorted(edges) == sorted((edge["source"], edge["target"]) for edge in full["edges"])
+    assert len(edges) == len(set(edges)) == 8
+
+
+@pytest.mark.asyncio
+async def test_get_graph_focus_and_level_of_detail(tmp_path: Path) -> None:
+    kernel = _build_kernel(tmp_path)
+
+    focused = await kernel.memory_graph_admin(action="get_graph", limit=10, focus="c0", depth=2)
+    assert focused["strategy"] == "focus"
+    assert [node["id"] for node in focused["nodes"]] == ["c0", "b0", "a0"]
+
+    sampled = await kernel.memory_graph_admin(action="get_graph", limit=100, max_edges_per_node=1)
+    # hub -> a0 既不是 hub 也不是 a0 权重最高的边，会被采样省略
+    assert sampled["omitted_edges"] > 0
+    assert len(sampled["edges"]) + sampled["omitted_edges"] == 8
+
+    missing = await kernel.memory_graph_admin(action="get_graph", focus="nobody")
+    assert missing["success"] is False
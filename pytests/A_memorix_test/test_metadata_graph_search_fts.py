@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.A_memorix.core.storage.metadata_store import MetadataStore
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path: Path) -> MetadataStore:
+    store = MetadataStore(data_dir=tmp_path)
+    store.connect()
+    yield store
+    store.close()
+
+
+def test_entity_search_uses_trigram_index_and_ranks_shorter_match_first(store: MetadataStore) -> None:
+    store.add_entity(name="Alice Cooper")
+    store.add_entity(name="alice")
+    store.add_entity(name="Bob")
+
+    rows = store.search_entities_by_text("ALIC")
+
+    assert store._graph_search_fts_ready is True
+    assert [row["name"] for row in rows] == ["alice", "Alice Cooper"]
+
+
+def test_relation_search_matches_cjk_substring_and_hash_prefix(store: MetadataStore) -> None:
+    relation_hash = store.add_relation("Alice", "认识", "小明同学")
+    store.add_relation("Bob", "喜欢", "咖啡")
+
+    assert [row["hash"] for row in store.search_relations_by_text("小明同")] == [relation_hash]
+    # 不足 3 个字符时退化为 LIKE 扫描
+    assert [row["hash"] for row in store.search_relations_by_text("小明")] == [relation_hash]
+    assert [row["hash"] for row in store.search_relations_by_text(relation_hash[:8])] == [relation_hash]
+
+
+def test_index_follows_relation_deletion_and_backfills_on_reconnect(tmp_path: Path, store: MetadataStore) -> None:
+    relation_hash = store.add_relation("Alice", "认识", "小明同学")
+    store.backup_and_delete_relations([relation_hash])
+
+    assert store.search_relations_by_text("小明同") == []
+    assert store.search_deleted_relation_hashes_by_text("lice") == [relation_hash]
+
+    # 模拟旧库：索引被清空后重新连接应自动回填
+    store._conn.execute("DELETE FROM deleted_relations_spo_fts")
+    store._conn.commit()
+    store.close()
+    reopened = MetadataStore(data_dir=tmp_path)
+    reopened.connect()
+    assert reopened.search_deleted_relation_hashes_by_text("Alice") == [relation_hash]
+    reopened.close()
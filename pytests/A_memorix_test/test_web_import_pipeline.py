@@ -0,0 +1,222 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.A_memorix.core.strategies.base import BaseStrategy, ChunkContext, KnowledgeType, ProcessedChunk, SourceInfo
+from src.A_memorix.core.utils import web_import_manager as web_import_module
+from src.A_memorix.core.utils.hash import compute_hash, normalize_text
+from src.A_memorix.core.utils.web_import_manager import ImportFileRecord, ImportTaskManager, ImportTaskRecord
+
+
+class _FakeStrategy(BaseStrategy):
+    def split(self, text: str) -> List[ProcessedChunk]:
+        return [
+            ProcessedChunk(
+                type=KnowledgeType.FACTUAL,
+                source=SourceInfo(file=self.filename, offset_start=0, offset_end=len(line)),
+                chunk=ChunkContext(chunk_id=f"chunk-{index}", index=index, text=line),
+            )
+            for index, line in enumerate(text.splitlines())
+        ]
+
+    async def extract(self, chunk: ProcessedChunk, llm_func=None) -> ProcessedChunk:
+        await asyncio.sleep(0.005)
+        chunk.data = {"entities": [f"实体{chunk.chunk.index}", "共享实体"]}
+        return chunk
+
+
+class _FakeEmbeddingManager:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    async def encode(self, texts: Any) -> np.ndarray:
+        if isinstance(texts, str):
+            self.calls.append([texts])
+            return np.ones(4, dtype=np.float32)
+        self.calls.append(list(texts))
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class _FakeVectorStore:
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.save_count = 0
+
+    def __contains__(self, hash_value: str) -> bool:
+        return hash_value in self.ids
+
+    def add(self, vectors: np.ndarray, ids: List[str]) -> int:
+        new_ids = [item for item in ids if item not in self.ids]
+        self.ids.extend(new_ids)
+        return len(new_ids)
+
+    def save(self) -> None:
+        self.save_count += 1
+
+
+class _FakeGraphStore:
+    def add_nodes(self, names: List[str]) -> None:
+        del names
+
+    def save(self) -> None:
+        return None
+
+
+class _FakeMetadataStore:
+    def __init__(self) -> None:
+        self.paragraphs: List[str] = []
+
+    def add_paragraph(self, content: str, **kwargs: Any) -> str:
+        del kwargs
+        self.paragraphs.append(content)
+        return compute_hash(normalize_text(content))
+
+    def add_entity(self, name: str, source_paragraph: str = "") -> str:
+        del source_paragraph
+        return compute_hash(name.strip().lower())
+
+
+class _FakePlugin:
+    def __init__(self, data_dir: Path) -> None:
+        self.config: Dict[str, Any] = {"storage.data_dir": str(data_dir), "web.import.embedding_batch_size": 8}
+        self.embedding_manager = _FakeEmbeddingManager()
+        self.vector_store = _FakeVectorStore()
+        self.graph_store = _FakeGraphStore()
+        self.metadata_store = _FakeMetadataStore()
+
+    def get_config(self, key: str, default: Any = None) -> Any:
+        return self.config.get(key, default)
+
+
+def _build_task(manager: ImportTaskManager, content: str) -> ImportFileRecord:
+    file_record = ImportFileRecord(
+        file_id="file-1",
+        name="notes.txt",
+        source_kind="paste",
+        input_mode="text",
+        inline_content=content,
+        content_hash="content-hash",
+    )
+    manager._tasks["task-1"] = ImportTaskRecord(
+        task_id="task-1",
+        source="paste",
+        params={"strategy_override": "auto", "llm_enabled": True, "chunk_concurrency": 4},
+        status="running",
+        files=[file_record],
+    )
+    return file_record
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ImportTaskManager:
+    task_manager = ImportTaskManager(_FakePlugin(tmp_path))
+
+    async def _noop() -> None:
+        return None
+
+    async def _select_model() -> Any:
+        return object()
+
+    monkeypatch.setattr(task_manager, "_ensure_embedding_runtime_ready", _noop)
+    monkeypatch.setattr(task_manager, "_select_model", _select_model)
+    monkeypatch.setattr(task_manager, "_determine_strategy", lambda filename, *args, **kwargs: _FakeStrategy(filename))
+    return task_manager
+
+
+@pytest.mark.asyncio
+async def test_text_import_pipeline_batches_embeddings(manager: ImportTaskManager) -> None:
+    content = "\n".join(f"第{index}段内容" for index in range(20))
+    file_record = _build_task(manager, content)
+
+    await manager._process_text_file("task-1", file_record, content, asyncio.Semaphore(4))
+
+    plugin = manager.plugin
+    assert file_record.status == "completed"
+    assert file_record.done_chunks == 20
+    assert len(plugin.metadata_store.paragraphs) == 20
+    # 20 段落 + 21 个实体全部走批量编码，没有逐条回退
+    encoded_texts = [text for call in plugin.embedding_manager.calls for text in call]
+    assert len(set(encoded_texts)) == 41
+    assert all(len(call) > 1 for call in plugin.embedding_manager.calls)
+    assert len(plugin.embedding_manager.calls) < 20
+    assert not any(manager._resolve_checkpoint_root().glob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_text_import_resumes_from_chunk_checkpoint(
+    manager: ImportTaskManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    content = "\n".join(f"第{index}段内容" for index in range(6))
+    file_record = _build_task(manager, content)
+    original_persist = manager._persist_processed_chunk
+
+    async def _failing_persist(record: ImportFileRecord, processed: ProcessedChunk, **kwargs: Any) -> None:
+        if processed.chunk.index == 4:
+            raise RuntimeError("磁盘已满")
+        await original_persist(record, processed, **kwargs)
+
+    monkeypatch.setattr(manager, "_persist_processed_chunk", _failing_persist)
+    await manager._process_text_file("task-1", file_record, content, asyncio.Semaphore(4))
+    assert file_record.status == "failed"
+    assert file_record.done_chunks == 5
+
+    monkeypatch.setattr(manager, "_persist_processed_chunk", original_persist)
+    retry_record = _build_task(manager, content)
+    await manager._process_text_file("task-1", retry_record, content, asyncio.Semaphore(4))
+
+    assert retry_record.status == "completed"
+    assert retry_record.done_chunks == 6
+    # 只有失败的分块被重新写入
+    assert manager.plugin.metadata_store.paragraphs.count("第4段内容") == 1
+    assert len(manager.plugin.metadata_store.paragraphs) == 6
+    assert not any(manager._resolve_checkpoint_root().glob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_text_import_cancel_flushes_written_chunks(
+    manager: ImportTaskManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager.plugin.config["web.import.embedding_batch_size"] = 1
+    content = "\n".join(f"第{index}段内容" for index in range(6))
+    file_record = _build_task(manager, content)
+    original_persist = manager._persist_processed_chunk
+    written_indexes: List[int] = []
+
+    async def _cancelling_persist(record: ImportFileRecord, processed: ProcessedChunk, **kwargs: Any) -> None:
+        await original_persist(record, processed, **kwargs)
+        written_indexes.append(processed.chunk.index)
+        if len(written_indexes) == 2:
+            manager._tasks["task-1"].status = "cancel_requested"
+
+    monkeypatch.setattr(manager, "_persist_processed_chunk", _cancelling_persist)
+    await manager._process_text_file("task-1", file_record, content, asyncio.Semaphore(4))
+
+    assert file_record.status == "cancelled"
+    # 取消前写入的分块已随存储落盘并记录到检查点
+    assert manager.plugin.vector_store.save_count == 1
+    checkpoints = list(manager._resolve_checkpoint_root().glob("*.json"))
+    assert len(checkpoints) == 1
+    assert sorted(json.loads(checkpoints[0].read_text(encoding="utf-8"))["completed_chunk_indexes"]) == sorted(
+        written_indexes
+    )
+
+    monkeypatch.setattr(manager, "_persist_processed_chunk", original_persist)
+    retry_record = _build_task(manager, content)
+    await manager._process_text_file("task-1", retry_record, content, asyncio.Semaphore(4))
+
+    assert retry_record.status == "completed"
+    assert sorted(manager.plugin.metadata_store.paragraphs) == sorted(f"第{index}段内容" for index in range(6))
+
+
+def test_pipeline_settings_are_clamped(manager: ImportTaskManager) -> None:
+    manager.plugin.config["web.import.pipeline_queue_size"] = 0
+    assert manager._pipeline_queue_size() == 1
+    assert manager._embedding_batch_size() == 8
+    assert web_import_module.CHECKPOINT_FLUSH_INTERVAL_SECONDS > 0
@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import src.learners.expression_candidate_cache as cache_module
+from src.common.database.database_model import Expression
+from src.learners.expression_candidate_cache import ExpressionCandidateCache
+
+
+def _expression(expression_id: int, session_id: str | None, **kwargs) -> Expression:
+    values = {
+        "situation": f"情景{expression_id}",
+        "style": f"风格{expression_id}",
+        "content_list": "[]",
+        "count": 1,
+        "checked": True,
+        "rejected": False,
+    }
+    values.update(kwargs)
+    return Expression(id=expression_id, session_id=session_id, **values)
+
+
+@pytest.fixture
+def load_calls(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    rows = [
+        _expression(1, "session-a"),
+        _expression(2, "session-b"),
+        _expression(3, None),
+        _expression(4, "session-a", checked=False),
+        _expression(5, "session-a", rejected=True),
+    ]
+    load_calls: list[int] = []
+
+    @contextmanager
+    def _fake_session(auto_commit: bool = True):
+        del auto_commit
+        load_calls.append(1)
+        yield SimpleNamespace(
+            exec=lambda statement: SimpleNamespace(all=lambda: [row for row in rows if not row.rejected])
+        )
+
+    monkeypatch.setattr(cache_module, "get_db_session", _fake_session)
+    return load_calls
+
+
+def test_candidates_are_scoped_by_session_and_loaded_once(load_calls: list[int]) -> None:
+    cache = ExpressionCandidateCache()
+
+    assert [item["id"] for item in cache.get_candidates({"session-a"}, checked_only=False)] == [1, 3, 4]
+    assert [item["id"] for item in cache.get_candidates({"session-a"}, checked_only=True)] == [1, 3]
+    assert [item["id"] for item in cache.get_candidates(None, checked_only=False)] == [1, 2, 3, 4]
+    assert len(load_calls) == 1
+
+
+def test_incremental_updates_follow_learner_writes(load_calls: list[int]) -> None:
+    cache = ExpressionCandidateCache()
+    cache.get_candidates({"session-a"}, checked_only=False)
+
+    cache.upsert(_expression(6, "session-a", count=3))
+    cache.upsert(_expression(1, "session-a", situation="新情景", count=2))
+    cache.upsert(_expression(4, "session-a", rejected=True))
+
+    candidates = cache.get_candidates({"session-a"}, checked_only=False)
+    assert [item["id"] for item in candidates] == [1, 3, 6]
+    assert candidates[0] == {"id": 1, "situation": "新情景", "style": "风格1", "count": 2}
+
+    cache.remove(6)
+    assert [item["id"] for item in cache.get_candidates({"session-a"}, checked_only=False)] == [1, 3]
+    assert len(load_calls) == 1
+
+    cache.invalidate()
+    cache.get_candidates({"session-a"}, checked_only=False)
+    assert len(load_calls) == 2
@@ -0,0 +1,146 @@
+"""异步日志管线测试。"""
+
+from pathlib import Path
+from typing import List
+
+import asyncio
+import json
+import logging
+import queue
+import time
+
+import pytest
+
+from src.common.logger import LogQueueHandler, LogWriterThread, TimestampedFileHandler, WebSocketLogHandler
+
+
+def _make_record(message: str, level: int = logging.INFO, name: str = "test") -> logging.LogRecord:
+    """构造测试用日志记录。
+
+    Args:
+        message: 日志消息。
+        level: 日志级别。
+        name: logger 名称。
+
+    Returns:
+        logging.LogRecord: 日志记录。
+    """
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+
+class _CollectingHandler(logging.Handler):
+    """记录收到的消息与 flush 次数的测试 handler。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: List[str] = []
+        self.flush_count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+    def flush(self) -> None:
+        self.flush_count += 1
+
+
+def _read_lines(log_dir: Path) -> List[str]:
+    lines: List[str] = []
+    for log_file in sorted(log_dir.glob("app_*.log.jsonl")):
+        lines.extend(log_file.read_text(encoding="utf-8").splitlines())
+    return lines
+
+
+def test_file_handler_buffers_until_flush_bytes(tmp_path: Path) -> None:
+    handler = TimestampedFileHandler(tmp_path, flush_bytes=1024)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    handler.emit(_make_record("short"))
+    assert _read_lines(tmp_path) == []
+
+    handler.flush()
+    assert _read_lines(tmp_path) == ["short"]
+
+    handler.emit(_make_record("x" * 2048))
+    assert len(_read_lines(tmp_path)) == 2
+    handler.close()
+
+
+def test_file_handler_rolls_over_by_written_bytes(tmp_path: Path) -> None:
+    handler = TimestampedFileHandler(tmp_path, max_bytes=64, backup_count=30)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    first_file = handler.current_file
+
+    handler.emit(_make_record("a" * 80))
+    # 轮转文件名精确到秒，等待一秒确保生成新文件
+    time.sleep(1.1)
+    handler.emit(_make_record("b"))
+
+    assert handler.current_file != first_file
+    assert _read_lines(tmp_path) == ["a" * 80, "b"]
+    handler.close()
+
+
+def test_queue_handler_defers_formatting_to_writer_thread() -> None:
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    collector = _CollectingHandler()
+    writer = LogWriterThread(log_queue, handlers=[collector], batch_size=8, flush_interval=0.05)
+    queue_handler = LogQueueHandler(log_queue)
+    writer.start()
+
+    for index in range(50):
+        queue_handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "msg %d", (index,), None))
+    writer.stop()
+
+    assert collector.messages == [f"msg {index}" for index in range(50)]
+    assert collector.flush_count >= 1
+
+
+def test_writer_thread_respects_handler_level() -> None:
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    collector = _CollectingHandler()
+    collector.setLevel(logging.WARNING)
+    writer = LogWriterThread(log_queue, handlers=[collector])
+    writer.start()
+
+    log_queue.put(_make_record("debug", logging.DEBUG))
+    log_queue.put(_make_record("warning", logging.WARNING))
+    writer.stop()
+
+    assert collector.messages == ["warning"]
+
+
+@pytest.mark.asyncio
+async def test_ws_handler_coalesces_records_into_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches: List[dict] = []
+
+    async def fake_broadcast(entries, dropped=0):
+        batches.append({"entries": entries, "dropped": dropped})
+
+    import src.webui.logs_ws as logs_ws
+
+    monkeypatch.setattr(logs_ws, "broadcast_log_batch", fake_broadcast)
+
+    handler = WebSocketLogHandler(push_interval=0.01)
+    handler.set_loop(asyncio.get_running_loop())
+    for index in range(20):
+        handler.emit(_make_record(json.dumps({"event": f"e{index}"})))
+    await asyncio.sleep(0.1)
+
+    assert len(batches) == 1
+    assert len(batches[0]["entries"]) == 20
+    assert batches[0]["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ws_handler_drops_low_level_records_under_backpressure() -> None:
+    handler = WebSocketLogHandler(push_interval=60, max_pending=10, sample_every=5)
+    handler.set_loop(asyncio.get_running_loop())
+
+    for index in range(40):
+        handler.emit(_make_record(f"debug {index}", logging.DEBUG))
+    handler.emit(_make_record("warning", logging.WARNING))
+
+    entries, dropped = handler._take_batch()
+    assert len(entries) <= 10
+    assert entries[-1]["message"] == "warning"
+    assert dropped == 41 - len(entries)
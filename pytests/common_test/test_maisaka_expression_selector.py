@@ -89,3 +89,91 @@ def test_resolve_expression_group_scope_does_not_treat_empty_target_as_global(mo
 
     assert related_session_ids == {current_session_id}
     assert has_global_share is False
+
+
+def _build_history_message(role: str, text: str) -> SimpleNamespace:
+    return SimpleNamespace(role=role, processed_plain_text=text, timestamp=None)
+
+
+@pytest.fixture
+def advanced_selector(monkeypatch: pytest.MonkeyPatch) -> MaisakaExpressionSelector:
+    monkeypatch.setattr(
+        selector_module,
+        "global_config",
+        SimpleNamespace(expression=SimpleNamespace(advanced_chosen=True, advanced_chosen_cache_seconds=120)),
+    )
+    selector = MaisakaExpressionSelector()
+    candidates = [{"id": index, "situation": f"情景{index}", "style": f"风格{index}", "count": 1} for index in range(10)]
+    monkeypatch.setattr(selector, "_can_use_expressions", lambda session_id: True)
+    monkeypatch.setattr(selector, "_load_expression_candidates", lambda session_id: candidates)
+    monkeypatch.setattr(selector, "_update_last_active_time", lambda selected_ids: None)
+    return selector
+
+
+@pytest.mark.asyncio
+async def test_prefetched_selection_is_reused_by_reply(advanced_selector: MaisakaExpressionSelector) -> None:
+    calls: list[str] = []
+
+    async def _runner(system_prompt: str) -> str:
+        calls.append(system_prompt)
+        return '{"selected_ids": [3]}'
+
+    history = [_build_history_message("user", "今天吃什么"), _build_history_message("assistant", "想一想")]
+    target = SimpleNamespace(message_id="msg-1", processed_plain_text="今天吃什么")
+    advanced_selector.prefetch_for_reply(
+        session_id="session",
+        chat_history=history,
+        reply_message=target,
+        reply_reason="用户在问晚饭",
+        sub_agent_runner=_runner,
+    )
+    # 规划器的思考文本变化不影响复用
+    history.append(_build_history_message("assistant", "决定回复"))
+    result = await advanced_selector.select_for_reply(
+        session_id="session",
+        chat_history=history,
+        reply_message=target,
+        reply_reason="用户在问晚饭",
+        sub_agent_runner=_runner,
+    )
+
+    assert result.selected_expression_ids == [3]
+    assert len(calls) == 1
+    assert advanced_selector.stats() == {"cache_hits": 1, "cache_misses": 0, "prefetched": 1}
+
+
+@pytest.mark.asyncio
+async def test_changed_context_starts_new_selection(advanced_selector: MaisakaExpressionSelector) -> None:
+    calls: list[str] = []
+
+    async def _runner(system_prompt: str) -> str:
+        calls.append(system_prompt)
+        return '{"selected_ids": [1]}'
+
+    history = [_build_history_message("user", "今天吃什么")]
+    target = SimpleNamespace(message_id="msg-1", processed_plain_text="今天吃什么")
+    await advanced_selector.select_for_reply(
+        session_id="session",
+        chat_history=history,
+        reply_message=target,
+        reply_reason="",
+        sub_agent_runner=_runner,
+    )
+    await advanced_selector.select_for_reply(
+        session_id="session",
+        chat_history=history,
+        reply_message=SimpleNamespace(message_id="msg-2", processed_plain_text="今天吃什么"),
+        reply_reason="",
+        sub_agent_runner=_runner,
+    )
+    history.append(_build_history_message("user", "要不吃火锅"))
+    await advanced_selector.select_for_reply(
+        session_id="session",
+        chat_history=history,
+        reply_message=target,
+        reply_reason="",
+        sub_agent_runner=_runner,
+    )
+
+    assert len(calls) == 3
+    assert advanced_selector.stats()["cache_misses"] == 3
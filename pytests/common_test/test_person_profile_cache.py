@@ -0,0 +1,168 @@
+"""人物信息缓存测试。"""
+
+from __future__ import annotations
+
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any
+
+import sys
+
+import pytest
+
+from src.person_info.person_cache import PersonProfile, PersonProfileCache, person_profile_cache
+
+
+class _Anything:
+    """吞掉 SQL 语句构造调用的占位对象。"""
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args, **kwargs: self
+
+    def __eq__(self, other: Any) -> "_Anything":  # type: ignore[override]
+        return self
+
+
+class _CountingSession:
+    """记录查询次数的假数据库 Session。"""
+
+    def __init__(self, record: Any) -> None:
+        self.record = record
+        self.exec_count = 0
+
+    def __enter__(self) -> "_CountingSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        del args
+
+    def exec(self, statement: Any) -> Any:
+        del statement
+        self.exec_count += 1
+        return SimpleNamespace(first=lambda: self.record)
+
+    def add(self, record: Any) -> None:
+        self.record = record
+
+
+class _PersonInfoRecord:
+    person_id = "person_id"
+    person_name = "person_name"
+
+    def __init__(self, **kwargs: Any) -> None:
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def _load_person_module(monkeypatch: pytest.MonkeyPatch, session: _CountingSession) -> ModuleType:
+    logger_module = ModuleType("src.common.logger")
+    logger_module.get_logger = lambda name: SimpleNamespace(
+        debug=lambda *a: None, info=lambda *a: None, warning=lambda *a: None, error=lambda *a: None
+    )
+    monkeypatch.setitem(sys.modules, "src.common.logger", logger_module)
+
+    database_module = ModuleType("src.common.database.database")
+    database_module.get_db_session = lambda: session
+    monkeypatch.setitem(sys.modules, "src.common.database.database", database_module)
+
+    database_model_module = ModuleType("src.common.database.database_model")
+    database_model_module.PersonInfo = _PersonInfoRecord
+    monkeypatch.setitem(sys.modules, "src.common.database.database_model", database_model_module)
+
+    config_module = ModuleType("src.config.config")
+    config_module.global_config = SimpleNamespace(bot=SimpleNamespace(nickname="MaiBot"))
+    monkeypatch.setitem(sys.modules, "src.config.config", config_module)
+
+    chat_manager_module = ModuleType("src.chat.message_receive.chat_manager")
+    chat_manager_module.chat_manager = SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "src.chat.message_receive.chat_manager", chat_manager_module)
+
+    memory_service_module = ModuleType("src.services.memory_service")
+    memory_service_module.memory_service = SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "src.services.memory_service", memory_service_module)
+
+    llm_service_module = ModuleType("src.services.llm_service")
+    llm_service_module.LLMServiceClient = lambda *args, **kwargs: SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "src.services.llm_service", llm_service_module)
+
+    module_path = Path(__file__).resolve().parents[2] / "src" / "person_info" / "person_info.py"
+    spec = spec_from_file_location("person_info_cache_test_module", module_path)
+    assert spec is not None and spec.loader is not None
+    module = module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+
+    monkeypatch.setattr(module, "select", lambda *args: _Anything())
+    monkeypatch.setattr(module, "col", lambda field: _Anything())
+    monkeypatch.setattr(module.Person, "_is_bot_self", lambda self, platform, user_id: False)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    person_profile_cache.clear()
+    yield
+    person_profile_cache.clear()
+
+
+def test_cache_evicts_least_recently_used_and_counts_hits() -> None:
+    cache = PersonProfileCache(max_size=2)
+    cache.put("a", PersonProfile(is_known=True))
+    cache.put("b", PersonProfile(is_known=True))
+    assert cache.get("a") is not None
+    cache.put("c", PersonProfile(is_known=True))
+
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_repeated_person_construction_hits_cache_until_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    record = _PersonInfoRecord(
+        user_id="10001",
+        platform="qq",
+        is_known=True,
+        user_nickname="看番的龙",
+        person_name="龙",
+        name_reason=None,
+        know_counts=2,
+        memory_points='["喜好:番剧:0.8"]',
+        group_cardname='[{"group_id": "20001", "group_cardname": "白泽大人"}]',
+    )
+    session = _CountingSession(record)
+    module = _load_person_module(monkeypatch, session)
+
+    first = module.Person(platform="qq", user_id="10001")
+    queries_after_first = session.exec_count
+    second = module.Person(platform="qq", user_id="10001")
+
+    assert session.exec_count == queries_after_first
+    assert second.person_name == "龙"
+    assert second.group_cardname_list == [{"group_id": "20001", "group_cardname": "白泽大人"}]
+    # 每个实例持有独立的可变副本
+    second.memory_points.append("新记忆:内容:0.5")
+    assert first.memory_points == ["喜好:番剧:0.8"]
+
+    second.person_name = "新名字"
+    second.sync_to_database()
+    third = module.Person(platform="qq", user_id="10001")
+
+    assert session.exec_count > queries_after_first
+    assert third.person_name == "新名字"
+
+
+def test_unknown_person_is_cached_until_registration(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = _CountingSession(None)
+    module = _load_person_module(monkeypatch, session)
+
+    assert module.Person(platform="qq", user_id="20002").is_known is False
+    queries = session.exec_count
+    assert module.is_person_known(platform="qq", user_id="20002") is False
+    assert session.exec_count == queries
+
+    module.Person.register_person(platform="qq", user_id="20002", nickname="新朋友")
+
+    assert module.is_person_known(platform="qq", user_id="20002") is True
@@ -0,0 +1,66 @@
+import heapq
+import random
+
+import Levenshtein
+import pytest
+
+from src.emoji_system.emotion_index import EmotionTagIndex
+
+
+class _Emoji:
+    def __init__(self, name: str, tags: list[str]) -> None:
+        self.name = name
+        self.tags = tags
+
+
+def _brute_force_top(emojis: list[_Emoji], text: str, k: int) -> list[tuple[str, float]]:
+    query = text.strip().lower()
+    scored = []
+    for emoji in emojis:
+        tags = [tag.strip().lower() for tag in emoji.tags if tag.strip()]
+        if not tags:
+            continue
+        scored.append(
+            (emoji.name, max(1 - Levenshtein.distance(query, tag) / max(len(query), len(tag)) for tag in tags))
+        )
+    return heapq.nlargest(k, scored, key=lambda item: item[1])
+
+
+def _index_top(index: EmotionTagIndex, text: str, k: int) -> list[tuple[str, float]]:
+    return heapq.nlargest(k, [(emoji.name, score) for emoji, score in index.top_matches(text, k)], key=lambda x: x[1])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_top_matches_equals_brute_force(seed: int) -> None:
+    rng = random.Random(seed)
+    alphabet = "开心难过生气惊讶害怕无语可爱委屈得意abc"
+    emojis = [
+        _Emoji(f"emoji-{i}", ["".join(rng.choices(alphabet, k=rng.randint(1, 5))) for _ in range(rng.randint(0, 4))])
+        for i in range(300)
+    ]
+    index = EmotionTagIndex()
+    index.rebuild((emoji, emoji.tags) for emoji in emojis)
+
+    for query in ["开心", "难过生气", "Abc", "无", "完全不相关的词", "可爱委屈得意开心"]:
+        for k in (1, 10, 50):
+            assert _index_top(index, query, k) == _brute_force_top(emojis, query, k)
+
+
+def test_index_follows_add_remove_and_update() -> None:
+    happy = _Emoji("happy", ["开心"])
+    sad = _Emoji("sad", ["难过"])
+    index = EmotionTagIndex()
+    index.rebuild([(happy, happy.tags), (sad, sad.tags)])
+    assert [emoji.name for emoji, _ in index.top_matches("开心", 1)] == ["happy"]
+
+    index.remove(happy)
+    assert [emoji.name for emoji, _ in index.top_matches("开心", 1)] == ["sad"]
+
+    sad.tags = ["开心"]
+    index.update(sad, sad.tags)
+    angry = _Emoji("angry", ["开心", "生气"])
+    index.add(angry, angry.tags)
+    # 同分时保持加入顺序
+    assert [(emoji.name, score) for emoji, score in index.top_matches("开心", 5)] == [("sad", 1.0), ("angry", 1.0)]
+    assert index.size == 2
+    assert index.top_matches("   ", 5) == []
@@ -519,6 +519,81 @@ async def test_prompt_manager_render_only_cloned_instance():
     assert "只能渲染通过 PromptManager.get_prompt 方法获取的 Prompt 实例" in str(exc_info.value)
 
 
+@pytest.mark.asyncio
+async def test_prompt_manager_render_resolves_contexts_concurrently():
+    # Arrange
+    manager = PromptManager()
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def slow_block(prompt_name: str) -> str:
+        started.append(prompt_name)
+        if len(started) == 2:
+            release.set()
+        await release.wait()
+        return prompt_name
+
+    manager.add_prompt(Prompt(prompt_name="a", template="A{slow_a}"))
+    manager.add_prompt(Prompt(prompt_name="main", template="{a}|{slow_main}"))
+    prompt = manager.get_prompt("main")
+    prompt.add_context("slow_main", slow_block)
+    prompt.add_context("slow_a", slow_block)
+
+    # Act: 两个内容块互相等待，只有并发执行才能完成
+    rendered = await asyncio.wait_for(manager.render_prompt(prompt), timeout=1)
+
+    # Assert
+    assert rendered == "Aa|main"
+
+
+@pytest.mark.asyncio
+async def test_prompt_manager_render_reuses_compiled_template():
+    # Arrange
+    manager = PromptManager()
+    manager.add_prompt(Prompt(prompt_name="main", template="{{x}} {x!r:>6}"))
+
+    # Act
+    first = await manager.render_prompt(_with_context(manager.get_prompt("main"), "x", "v"))
+    second = await manager.render_prompt(_with_context(manager.get_prompt("main"), "x", "w"))
+
+    # Assert
+    assert first == "{x}    'v'"
+    assert second == "{x}    'w'"
+    assert len(manager._compiled_templates) == 1
+    assert manager.get_prompt("main").template == "{{x}} {x!r:>6}"
+
+
+@pytest.mark.asyncio
+async def test_prompt_manager_render_memoises_pure_context_per_render():
+    # Arrange
+    manager = PromptManager()
+    calls: list[str] = []
+
+    async def pure_block(prompt_name: str) -> str:
+        calls.append(prompt_name)
+        await asyncio.sleep(0)
+        return "P"
+
+    manager.add_context_construct_function("shared", pure_block, pure=True)
+    manager.add_prompt(Prompt(prompt_name="leaf", template="{shared}"))
+    manager.add_prompt(Prompt(prompt_name="left", template="L{leaf}"))
+    manager.add_prompt(Prompt(prompt_name="right", template="R{leaf}"))
+    manager.add_prompt(Prompt(prompt_name="main", template="{left}{right}"))
+
+    # Act
+    first = await manager.render_prompt(manager.get_prompt("main"))
+    second = await manager.render_prompt(manager.get_prompt("main"))
+
+    # Assert: 同一次渲染中只调用一次，不同渲染之间不共享
+    assert first == second == "LPRP"
+    assert calls == ["leaf", "leaf"]
+
+
+def _with_context(prompt: Prompt, name: str, value: str) -> Prompt:
+    prompt.add_context(name, value)
+    return prompt
+
+
 @pytest.mark.parametrize(
     "is_prompt_context, use_coroutine, case_id",
     [
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+import time
+
+import pytest
+
+from src.chat.heart_flow import heartflow_manager as heartflow_manager_module
+from src.chat.heart_flow.heartflow_manager import HeartflowManager
+from src.maisaka.runtime import MaisakaHibernationState
+
+
+class _FakeRuntime:
+    instances: list["_FakeRuntime"] = []
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.log_prefix = f"[{session_id}]"
+        self.last_activity_at = time.time()
+        self.busy = False
+        self.running = False
+        self.restored_state: MaisakaHibernationState | None = None
+        self._talk_frequency_adjust = 1.0
+        self.history = [f"{session_id}-history"]
+        _FakeRuntime.instances.append(self)
+
+    async def start(self) -> None:
+        self.running = True
+
+    async def stop(self) -> None:
+        self.running = False
+
+    def can_hibernate(self) -> bool:
+        return self.running and not self.busy
+
+    def adjust_talk_frequency(self, frequency: float) -> None:
+        self._talk_frequency_adjust = frequency
+
+    def export_hibernation_state(self) -> MaisakaHibernationState:
+        return MaisakaHibernationState(
+            chat_history=list(self.history),  # type: ignore[arg-type]
+            talk_frequency_adjust=self._talk_frequency_adjust,
+            last_activity_at=self.last_activity_at,
+        )
+
+    def restore_hibernation_state(self, state: MaisakaHibernationState) -> None:
+        self.restored_state = state
+        self.history = list(state.chat_history)  # type: ignore[arg-type]
+        self._talk_frequency_adjust = state.talk_frequency_adjust
+
+    def append_sent_message_to_chat_history(self, message: SimpleNamespace, *, source_kind: str) -> bool:
+        self.history.append(f"{source_kind}:{message.message_id}")
+        return True
+
+    @staticmethod
+    def build_sent_history_message(message: SimpleNamespace, *, source_kind: str) -> str:
+        return f"{source_kind}:{message.message_id}"
+
+
+@pytest.fixture
+def manager(monkeypatch: pytest.MonkeyPatch) -> HeartflowManager:
+    _FakeRuntime.instances = []
+    monkeypatch.setattr(heartflow_manager_module, "MaisakaHeartFlowChatting", _FakeRuntime)
+    monkeypatch.setattr(
+        heartflow_manager_module,
+        "chat_manager",
+        SimpleNamespace(get_session_by_session_id=lambda session_id: SimpleNamespace(session_id=session_id)),
+    )
+    return HeartflowManager()
+
+
+@pytest.mark.asyncio
+async def test_idle_runtime_hibernates_and_restores_on_next_message(manager: HeartflowManager) -> None:
+    idle_chat = await manager.get_or_create_heartflow_chat("idle-session")
+    await manager.get_or_create_heartflow_chat("active-session")
+    busy_chat = await manager.get_or_create_heartflow_chat("busy-session")
+    idle_chat.adjust_talk_frequency(0.5)
+    idle_chat.last_activity_at -= 600
+    busy_chat.last_activity_at -= 600
+    busy_chat.busy = True
+
+    assert await manager.hibernate_idle_chats(300) == 1
+    assert not idle_chat.running
+    assert set(manager.heartflow_chat_list) == {"active-session", "busy-session"}
+    assert manager.get_runtime_stats()["hibernated"] == 1
+
+    # 休眠期间调整频率，恢复后仍然生效
+    manager.adjust_talk_frequency("idle-session", 0.25)
+    assert manager.get_talk_frequency_adjust("idle-session") == 0.25
+
+    restored_chat = await manager.get_or_create_heartflow_chat("idle-session")
+    assert restored_chat is not idle_chat
+    assert restored_chat.running
+    assert restored_chat.history == ["idle-session-history"]
+    assert restored_chat._talk_frequency_adjust == 0.25
+    assert manager.get_runtime_stats() == {
+        "active": 3,
+        "hibernated": 0,
+        "hibernated_total": 1,
+        "restored_total": 1,
+    }
+    for chat in list(manager.heartflow_chat_list.values()):
+        await chat.stop()
+    if manager._hibernate_task is not None:
+        manager._hibernate_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_hibernation_disabled_when_threshold_is_zero(manager: HeartflowManager) -> None:
+    chat = await manager.get_or_create_heartflow_chat("session")
+    chat.last_activity_at -= 10_000
+
+    assert await manager.hibernate_idle_chats(0) == 0
+    assert manager.heartflow_chat_list == {"session": chat}
+    assert chat.running
+    if manager._hibernate_task is not None:
+        manager._hibernate_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_sent_message_reaches_hibernated_session_history(manager: HeartflowManager) -> None:
+    chat = await manager.get_or_create_heartflow_chat("idle-session")
+    chat.last_activity_at -= 600
+    assert await manager.hibernate_idle_chats(300) == 1
+
+    sent_message = SimpleNamespace(message_id="sent-1")
+    assert manager.append_sent_message_to_chat_history("idle-session", sent_message, source_kind="proactive")
+    assert not manager.append_sent_message_to_chat_history("unknown-session", sent_message, source_kind="proactive")
+
+    restored_chat = await manager.get_or_create_heartflow_chat("idle-session")
+    assert restored_chat.history == ["idle-session-history", "proactive:sent-1"]
+    for chat in list(manager.heartflow_chat_list.values()):
+        await chat.stop()
+    if manager._hibernate_task is not None:
+        manager._hibernate_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_hibernated_states_are_capped_and_locks_pruned(
+    manager: HeartflowManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(heartflow_manager_module.global_config.chat, "session_hibernate_max_sessions", 2)
+    for index in range(3):
+        chat = await manager.get_or_create_heartflow_chat(f"session-{index}")
+        chat.last_activity_at -= 600 - index
+        assert await manager.hibernate_idle_chats(300) == 1
+
+    # 最早休眠的会话状态被丢弃，恢复时重新开始上下文
+    assert list(manager._hibernated_states) == ["session-1", "session-2"]
+    assert manager._chat_create_locks == {}
+    fresh_chat = await manager.get_or_create_heartflow_chat("session-0")
+    assert fresh_chat.restored_state is None
+    assert list(manager._chat_create_locks) == ["session-0"]
+    await fresh_chat.stop()
+    if manager._hibernate_task is not None:
+        manager._hibernate_task.cancel()
@@ -1,13 +1,18 @@
 """HTML 浏览器渲染服务测试。"""
 
+from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List
 
+import asyncio
+
+from PIL import Image
+
 import pytest
 
 from src.config.official_configs import PluginRuntimeRenderConfig
 from src.services import html_render_service as html_render_service_module
-from src.services.html_render_service import HTMLRenderService, ManagedBrowserRecord
+from src.services.html_render_service import HTMLRenderService, HtmlRenderRequest, ManagedBrowserRecord
 
 
 class _FakeChromium:
@@ -192,3 +197,216 @@ def test_managed_browser_record_roundtrip() -> None:
     restored_record = ManagedBrowserRecord.from_dict(record.to_dict())
 
     assert restored_record == record
+
+
+def _build_png_bytes() -> bytes:
+    """构造一张 1x1 的 PNG 图片。"""
+
+    buffer = BytesIO()
+    Image.new("RGB", (1, 1)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _FakeLocator:
+    """模拟 Playwright 定位器，截图前可被事件阻塞。"""
+
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.first = self
+        self._browser = browser
+
+    async def wait_for(self, **kwargs: Any) -> None:
+        del kwargs
+
+    async def screenshot(self, **kwargs: Any) -> bytes:
+        del kwargs
+        self._browser.screenshot_count += 1
+        await self._browser.screenshot_gate.wait()
+        return _build_png_bytes()
+
+
+class _FakePage:
+    """模拟 Playwright 页面。"""
+
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self._browser = browser
+        self.closed = False
+        self.viewports: List[Dict[str, int]] = []
+        self.reset_count = 0
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def set_default_timeout(self, timeout: int) -> None:
+        del timeout
+
+    async def route(self, pattern: str, handler: Any) -> None:
+        del pattern, handler
+
+    async def unroute_all(self, behavior: str = "default") -> None:
+        del behavior
+
+    async def goto(self, url: str) -> None:
+        assert url == "about:blank"
+        self.reset_count += 1
+
+    async def set_content(self, html: str, **kwargs: Any) -> None:
+        del html, kwargs
+
+    async def set_viewport_size(self, viewport: Dict[str, int]) -> None:
+        self.viewports.append(viewport)
+
+    def locator(self, selector: str) -> _FakeLocator:
+        del selector
+        return _FakeLocator(self._browser)
+
+
+class _FakeContext:
+    """模拟 Playwright 浏览器上下文。"""
+
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self._browser = browser
+        self.page = _FakePage(browser)
+
+    async def new_page(self) -> _FakePage:
+        return self.page
+
+    async def close(self) -> None:
+        self.page.closed = True
+        self._browser.closed_contexts += 1
+
+
+class _FakeBrowser:
+    """模拟 Playwright 浏览器，记录上下文创建与截图次数。"""
+
+    def __init__(self) -> None:
+        self.context_kwargs: List[Dict[str, Any]] = []
+        self.closed_contexts = 0
+        self.screenshot_count = 0
+        self.screenshot_gate = asyncio.Event()
+        self.screenshot_gate.set()
+
+    async def new_context(self, **kwargs: Any) -> _FakeContext:
+        self.context_kwargs.append(dict(kwargs))
+        return _FakeContext(self)
+
+    async def close(self) -> None:
+        return None
+
+
+def _build_service_with_fake_browser(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    **config_kwargs: Any,
+) -> tuple[HTMLRenderService, _FakeBrowser]:
+    """构造一个使用假浏览器的渲染服务。"""
+
+    monkeypatch.setattr(html_render_service_module, "PROJECT_ROOT", tmp_path)
+    config = _build_render_config(**config_kwargs)
+    service = HTMLRenderService()
+    browser = _FakeBrowser()
+    service._browser = browser
+
+    async def fake_ensure_browser(_config: PluginRuntimeRenderConfig) -> Any:
+        return browser
+
+    monkeypatch.setattr(service, "_get_render_config", lambda: config)
+    monkeypatch.setattr(service, "_ensure_browser", fake_ensure_browser)
+    return service, browser
+
+
+@pytest.mark.asyncio
+async def test_render_reuses_pooled_page_and_resizes_viewport(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """页面池应复用同一像素比的页面，只调整视口而不重建上下文。"""
+
+    service, browser = _build_service_with_fake_browser(monkeypatch, tmp_path, cache_enabled=False, page_pool_size=1)
+
+    await service.render_html_to_png(HtmlRenderRequest(html="<p>1</p>"))
+    await service.render_html_to_png(HtmlRenderRequest(html="<p>2</p>", viewport_width=640))
+    await service.render_html_to_png(HtmlRenderRequest(html="<p>3</p>", device_scale_factor=1.0))
+
+    assert [kwargs["device_scale_factor"] for kwargs in browser.context_kwargs] == [2.0, 1.0]
+    pooled_pages = [pooled.page for pooled in service._idle_pages]
+    assert len(pooled_pages) == 1
+    assert browser.closed_contexts == 1
+    stats = service.get_render_stats()
+    assert stats["samples"] == 3 and stats["cache"] is None
+
+
+@pytest.mark.asyncio
+async def test_render_cache_serves_repeated_cards_and_dedupes_concurrent_renders(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """相同卡片的并发请求只渲染一次，之后的请求直接命中磁盘缓存。"""
+
+    service, browser = _build_service_with_fake_browser(monkeypatch, tmp_path)
+    browser.screenshot_gate.clear()
+    request = HtmlRenderRequest(html="<div>card</div>")
+
+    pending_renders = [asyncio.create_task(service.render_html_to_png(request)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    browser.screenshot_gate.set()
+    results = await asyncio.gather(*pending_renders)
+
+    cached_result = await service.render_html_to_png(request)
+    network_result = await service.render_html_to_png(HtmlRenderRequest(html="<div>card</div>", allow_network=True))
+
+    assert browser.screenshot_count == 2
+    assert {result.image_base64 for result in [*results, cached_result, network_result]} == {results[0].image_base64}
+    assert list((tmp_path / "data" / "plugin_runtime" / "html_render_cache").glob("*.png"))
+    cache_stats = service.get_render_stats()["cache"]
+    assert cache_stats["hits"] == 1 and cache_stats["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_render_failure_discards_page_instead_of_pooling(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """渲染失败的页面不应回到页面池。"""
+
+    service, browser = _build_service_with_fake_browser(monkeypatch, tmp_path, cache_enabled=False)
+
+    async def fail_capture(_page: Any, _request: HtmlRenderRequest) -> bytes:
+        raise RuntimeError("截图失败")
+
+    monkeypatch.setattr(service, "_capture_image", fail_capture)
+    with pytest.raises(RuntimeError, match="截图失败"):
+        await service.render_html_to_png(HtmlRenderRequest(html="<p>x</p>"))
+
+    assert service._idle_pages == []
+    assert browser.closed_contexts == 1
+
+
+@pytest.mark.asyncio
+async def test_render_waiter_takes_over_when_owner_is_cancelled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """负责渲染的请求被取消时，合并等待的相同请求应接替渲染而不是一起被取消。"""
+
+    service, browser = _build_service_with_fake_browser(monkeypatch, tmp_path)
+    browser.screenshot_gate.clear()
+    request = HtmlRenderRequest(html="<div>card</div>")
+
+    owner = asyncio.create_task(service.render_html_to_png(request))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(service.render_html_to_png(request)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    owner.cancel()
+    await asyncio.sleep(0.01)
+    browser.screenshot_gate.set()
+    results = await asyncio.gather(*waiters)
+
+    assert owner.cancelled()
+    assert len({result.image_base64 for result in results}) == 1
+    assert browser.screenshot_count == 2
+    assert service.get_render_stats()["inflight_renders"] == 0
+
+
+@pytest.mark.asyncio
+async def test_render_cache_bypassed_for_local_file_resources(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """引用 file: 本地资源的 HTML 可能在内容不变时结果变化，不应命中缓存。"""
+
+    service, browser = _build_service_with_fake_browser(monkeypatch, tmp_path)
+    request = HtmlRenderRequest(html=f'<img src="FILE:///{tmp_path.as_posix()}/avatar.png">')
+
+    await service.render_html_to_png(request)
+    await service.render_html_to_png(request)
+
+    assert browser.screenshot_count == 2
+    assert service.get_render_stats()["cache"] is None
@@ -0,0 +1,124 @@
+"""LPMM 同义词连接批量 kNN 查询测试。"""
+
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import random
+
+import pytest
+
+from src.chat.knowledge import embedding_store
+from src.chat.knowledge.embedding_store import EmbeddingStore, EmbeddingStoreItem
+from src.chat.knowledge.utils.hash import get_sha256
+from src.config.official_configs import LPMMKnowledgeConfig
+
+EMBEDDING_DIMENSION = 8
+
+
+def _entity_hash(name: str) -> str:
+    return "entity" + "-" + get_sha256(name)
+
+
+def _build_fixture(tmp_path) -> Tuple[EmbeddingStore, Dict[str, List[List[str]]]]:
+    """构造若干簇相近实体：同簇实体的向量只差少量噪声，不同簇之间几乎正交。"""
+    rng = random.Random(31)
+    store = EmbeddingStore("entity", str(tmp_path))
+    entity_names: List[str] = []
+    for cluster_index in range(6):
+        center = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIMENSION)]
+        for member_index in range(cluster_index % 3 + 2):
+            name = f"实体{cluster_index}-{member_index}"
+            embedding = [value + rng.gauss(0, 0.05) for value in center]
+            store.store[_entity_hash(name)] = EmbeddingStoreItem(_entity_hash(name), embedding, name)
+            entity_names.append(name)
+    store.build_faiss_index()
+
+    # 三元组中额外混入一个不在嵌入库中的实体，两种实现都应跳过它
+    triple_list_data = {
+        str(index): [[name, "相关", entity_names[(index + 5) % len(entity_names)]]]
+        for index, name in enumerate(entity_names)
+    }
+    triple_list_data["missing"] = [["未嵌入的实体", "相关", entity_names[0]]]
+    return store, triple_list_data
+
+
+@pytest.fixture
+def lpmm_config(monkeypatch: pytest.MonkeyPatch) -> LPMMKnowledgeConfig:
+    lpmm_config = LPMMKnowledgeConfig(
+        embedding_dimension=EMBEDDING_DIMENSION,
+        rag_synonym_search_top_k=4,
+        rag_synonym_threshold=0.9,
+    )
+    monkeypatch.setattr(embedding_store, "global_config", SimpleNamespace(lpmm_knowledge=lpmm_config))
+    return lpmm_config
+
+
+def test_search_top_k_batch_matches_single_queries(tmp_path, lpmm_config) -> None:
+    """批量 kNN 的邻居与逐条查询一致，相似度仅允许浮点误差。"""
+    store, _ = _build_fixture(tmp_path)
+    queries = [item.embedding for item in store.store.values()]
+
+    batched = store.search_top_k_batch(queries, 4, batch_size=3)
+
+    assert len(batched) == len(queries)
+    for query, batch_result in zip(queries, batched, strict=True):
+        single_result = store.search_top_k(query, 4)
+        assert [item_hash for item_hash, _ in batch_result] == [item_hash for item_hash, _ in single_result]
+        assert [similarity for _, similarity in batch_result] == pytest.approx(
+            [similarity for _, similarity in single_result], abs=1e-5
+        )
+
+
+def _per_entity_synonym_connect(
+    triple_list_data: Dict[str, List[List[str]]],
+    store: EmbeddingStore,
+    lpmm_config: LPMMKnowledgeConfig,
+) -> Dict[Tuple[str, str], float]:
+    """批量化之前逐个实体查询的实现，用作结果基准。"""
+    # 与实现相同的方式收集实体，同一进程内集合的遍历顺序一致，两种实现按相同顺序处理实体
+    ent_hash_list = set()
+    for triple_list in triple_list_data.values():
+        for triple in triple_list:
+            ent_hash_list.add(_entity_hash(triple[0]))
+            ent_hash_list.add(_entity_hash(triple[2]))
+    ent_hash_list = list(ent_hash_list)
+
+    node_to_node: Dict[Tuple[str, str], float] = {}
+    synonym_hash_set = set()
+    for ent_hash in ent_hash_list:
+        if ent_hash in synonym_hash_set:
+            continue
+        ent = store.store.get(ent_hash)
+        if ent is None:
+            continue
+        for res_ent_hash, similarity in store.search_top_k(ent.embedding, lpmm_config.rag_synonym_search_top_k):
+            if res_ent_hash == ent_hash:
+                continue
+            if similarity < lpmm_config.rag_synonym_threshold:
+                continue
+            node_to_node[(res_ent_hash, ent_hash)] = similarity
+            node_to_node[(ent_hash, res_ent_hash)] = similarity
+            synonym_hash_set.add(res_ent_hash)
+    return node_to_node
+
+
+def test_batched_synonym_connect_matches_per_entity_path(tmp_path, lpmm_config, monkeypatch) -> None:
+    """分块批量查询后按原顺序回放，建立的同义边与逐个查询完全一致。"""
+    pytest.importorskip("quick_algo")
+    from src.chat.knowledge import kg_manager
+
+    store, triple_list_data = _build_fixture(tmp_path)
+    # 分块小于实体数，覆盖跨块回放时“已连接实体不再发起查询”的逻辑
+    monkeypatch.setattr(kg_manager, "SYNONYM_SEARCH_CHUNK_SIZE", 4)
+    monkeypatch.setattr(kg_manager, "global_config", SimpleNamespace(lpmm_knowledge=lpmm_config))
+
+    node_to_node: Dict[Tuple[str, str], float] = {}
+    new_edge_cnt = kg_manager.KGManager._synonym_connect(
+        node_to_node, triple_list_data, SimpleNamespace(entities_embedding_store=store)
+    )
+
+    expected = _per_entity_synonym_connect(triple_list_data, store, lpmm_config)
+    assert new_edge_cnt > 0
+    assert node_to_node.keys() == expected.keys()
+    for edge, similarity in expected.items():
+        assert node_to_node[edge] == pytest.approx(similarity, abs=1e-5)
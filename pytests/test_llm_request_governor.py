@@ -0,0 +1,220 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import List
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.config.config import config_manager
+from src.config.model_configs import APIProvider, ModelInfo, TaskConfig
+from src.llm_models import utils_model
+from src.llm_models.model_client.base_client import APIResponse, BaseClient, UsageRecord, client_registry
+from src.llm_models.payload_content.message import MessageBuilder
+from src.llm_models.request_governor import (
+    LLMBudgetLimits,
+    LLMRequestGovernor,
+    LLMRequestPriority,
+    resolve_request_priority,
+)
+from src.llm_models.utils_model import LLMOrchestrator, RequestType
+
+_UNLIMITED = LLMBudgetLimits()
+
+
+def test_resolve_request_priority_by_request_type() -> None:
+    assert resolve_request_priority("maisaka_planner") == LLMRequestPriority.INTERACTIVE
+    assert resolve_request_priority("maisaka_replyer") == LLMRequestPriority.INTERACTIVE
+    assert resolve_request_priority("expression.learner") == LLMRequestPriority.BACKGROUND
+    assert resolve_request_priority("A_Memorix.EpisodeSegmentation") == LLMRequestPriority.BACKGROUND
+    assert resolve_request_priority("image") == LLMRequestPriority.NORMAL
+
+
+@pytest.mark.asyncio
+async def test_governor_reserves_slot_for_interactive_requests() -> None:
+    governor = LLMRequestGovernor()
+    model_limits = LLMBudgetLimits(max_concurrency=2)
+    release = asyncio.Event()
+    entered: List[str] = []
+
+    async def _request(name: str, priority: LLMRequestPriority) -> None:
+        async with governor.acquire(
+            provider_name="fake",
+            provider_limits=_UNLIMITED,
+            model_name="fake-model",
+            model_limits=model_limits,
+            priority=priority,
+        ):
+            entered.append(name)
+            await release.wait()
+
+    background_tasks = [
+        asyncio.create_task(_request(f"background-{index}", LLMRequestPriority.BACKGROUND)) for index in range(2)
+    ]
+    await asyncio.sleep(0)
+    interactive_task = asyncio.create_task(_request("interactive", LLMRequestPriority.INTERACTIVE))
+    await asyncio.sleep(0.01)
+
+    # 后台请求最多占用并发上限减一，剩下的空位立即留给交互请求
+    assert entered == ["background-0", "interactive"]
+    stats = governor.stats()
+    assert stats["priorities"]["background"]["queue_depth"] == 1
+    assert stats["budgets"]["model:fake-model"]["in_flight"] == 2
+
+    release.set()
+    await asyncio.gather(*background_tasks, interactive_task)
+    assert entered[-1] == "background-1"
+    assert governor.stats()["priorities"]["background"]["max_wait_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_governor_waits_for_token_budget_refill() -> None:
+    governor = LLMRequestGovernor()
+    # 每秒恢复 100 token
+    provider_limits = LLMBudgetLimits(tpm_limit=6000)
+
+    async def _request(estimated_tokens: int, used_tokens: int) -> float:
+        started = time.monotonic()
+        async with governor.acquire(
+            provider_name="fake",
+            provider_limits=provider_limits,
+            model_name="fake-model",
+            model_limits=_UNLIMITED,
+            estimated_tokens=estimated_tokens,
+        ) as lease:
+            lease.record_usage(used_tokens)
+        return time.monotonic() - started
+
+    assert await _request(estimated_tokens=5000, used_tokens=6000) < 0.05
+    # 第一次请求的实际用量超出预估，额度已耗尽，需要等待约 0.1 秒
+    waited = await _request(estimated_tokens=10, used_tokens=10)
+    assert 0.05 <= waited < 1.0
+
+
+def test_governor_hands_off_across_thread_event_loops() -> None:
+    """线程池中的同步调用各自持有临时事件循环，共享同一预算时也要能依次被唤醒。"""
+    governor = LLMRequestGovernor()
+    model_limits = LLMBudgetLimits(max_concurrency=1, rpm_limit=6000)
+    in_flight: List[int] = []
+    active = 0
+    active_lock = threading.Lock()
+
+    async def _request() -> None:
+        nonlocal active
+        async with governor.acquire(
+            provider_name="fake",
+            provider_limits=_UNLIMITED,
+            model_name="fake-model",
+            model_limits=model_limits,
+        ):
+            with active_lock:
+                active += 1
+                in_flight.append(active)
+            await asyncio.sleep(0.02)
+            with active_lock:
+                active -= 1
+
+    def _run_in_thread() -> None:
+        asyncio.run(asyncio.wait_for(_request(), timeout=5))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(_run_in_thread) for _ in range(4)]
+        for future in futures:
+            future.result(timeout=10)
+
+    assert len(in_flight) == 4
+    assert max(in_flight) == 1
+    stats = governor.stats()
+    assert stats["priorities"]["normal"]["granted"] == 4
+    assert stats["budgets"]["model:fake-model"]["in_flight"] == 0
+
+
+class _FakeClient(BaseClient):
+    started: List[str] = []
+    release: asyncio.Event
+
+    async def get_response(self, request):  # type: ignore[override]
+        label = request.message_list[0].parts[0].text
+        _FakeClient.started.append(label)
+        await _FakeClient.release.wait()
+        return APIResponse(
+            content=f"reply to {label}",
+            usage=UsageRecord(
+                model_name=request.model_info.name,
+                provider_name=self.api_provider.name,
+                prompt_tokens=10,
+                completion_tokens=5,
+                total_tokens=15,
+            ),
+        )
+
+    async def get_embedding(self, request):  # type: ignore[override]
+        raise NotImplementedError
+
+    async def get_audio_transcriptions(self, request):  # type: ignore[override]
+        raise NotImplementedError
+
+    def get_support_image_formats(self) -> List[str]:
+        return []
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_requests_are_governed_by_priority(monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = APIProvider(
+        name="fake-provider",
+        base_url="http://127.0.0.1:1",
+        api_key="fake-key",
+        client_type="fake",
+        max_concurrency=1,
+    )
+    model = ModelInfo(model_identifier="fake-model", name="fake-model", api_provider="fake-provider")
+    task_config = TaskConfig(model_list=["fake-model"])
+    model_config = SimpleNamespace(
+        model_task_config=SimpleNamespace(replyer=task_config, planner=task_config),
+        models=[model],
+        api_providers=[provider],
+    )
+    monkeypatch.setattr(config_manager, "get_model_config", lambda: model_config)
+    monkeypatch.setitem(client_registry.client_registry, "fake", _FakeClient)
+    monkeypatch.setattr(client_registry, "client_instance_cache", {})
+    governor = LLMRequestGovernor()
+    monkeypatch.setattr(utils_model, "llm_request_governor", governor)
+    _FakeClient.started = []
+    _FakeClient.release = asyncio.Event()
+
+    async def _request(task_name: str, request_type: str, label: str) -> str:
+        orchestrator = LLMOrchestrator(task_name=task_name, request_type=request_type)
+        result = await orchestrator._execute_request(
+            RequestType.RESPONSE,
+            message_factory=lambda _client: [MessageBuilder().add_text_content(label).build()],
+        )
+        return result.api_response.content or ""
+
+    tasks = [asyncio.create_task(_request("replyer", "expression.learner", "learn-1"))]
+    await asyncio.sleep(0.01)
+    tasks.append(asyncio.create_task(_request("replyer", "jargon.extract", "jargon")))
+    await asyncio.sleep(0.01)
+    tasks.append(asyncio.create_task(_request("planner", "maisaka_planner", "planner")))
+    await asyncio.sleep(0.01)
+
+    assert _FakeClient.started == ["learn-1"]
+    assert governor.stats()["priorities"]["interactive"]["queue_depth"] == 1
+
+    _FakeClient.release.set()
+    results = await asyncio.gather(*tasks)
+
+    # 规划请求虽然最后到达，但先于排队中的后台请求获得并发
+    assert _FakeClient.started == ["learn-1", "planner", "jargon"]
+    assert results == ["reply to learn-1", "reply to jargon", "reply to planner"]
+    assert governor.stats()["budgets"]["provider:fake-provider"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_governor_stats_exposed_by_webui_route() -> None:
+    from src.webui.routers import system
+
+    stats = await system.get_llm_governor_stats()
+    assert set(stats) == {"priorities", "budgets"}
+    assert "queue_depth" in stats["priorities"]["interactive"]
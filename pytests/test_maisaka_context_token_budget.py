@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from src.common.data_models.message_component_data_model import MessageSequence, TextComponent
+from src.llm_models.utils import estimate_text_tokens
+from src.maisaka import chat_loop_service
+from src.maisaka.chat_loop_service import MaisakaChatLoopService
+from src.maisaka.context_messages import SessionBackedMessage
+
+
+def _build_history(texts: list[str]) -> list[SessionBackedMessage]:
+    return [
+        SessionBackedMessage(
+            raw_message=MessageSequence([TextComponent(text)]),
+            visible_text=text,
+            timestamp=datetime.now(),
+            message_id=f"msg-{index}",
+        )
+        for index, text in enumerate(texts)
+    ]
+
+
+def test_estimate_text_tokens_counts_cjk_per_character() -> None:
+    assert estimate_text_tokens("") == 0
+    assert estimate_text_tokens("你好世界") == 4
+    assert estimate_text_tokens("hello world") == 3
+
+
+def test_token_budget_trims_oldest_context_messages() -> None:
+    history = _build_history(["很长的转发聊天记录" * 200, "第二条消息", "第三条消息", "最新消息"])
+
+    selected, reason = MaisakaChatLoopService.select_llm_context_messages(
+        history,
+        enable_visual_message=False,
+        request_kind="replyer",
+        max_context_size=10,
+        max_context_tokens=200,
+    )
+
+    assert [message.message_id for message in selected] == ["msg-1", "msg-2", "msg-3"]
+    assert "已按 token 预算裁剪" in reason
+
+    unbounded, unbounded_reason = MaisakaChatLoopService.select_llm_context_messages(
+        history,
+        enable_visual_message=False,
+        request_kind="replyer",
+        max_context_size=10,
+        max_context_tokens=0,
+    )
+    assert len(unbounded) == 4
+    assert "tokens" not in unbounded_reason
+
+
+def test_token_budget_keeps_latest_message_and_caches_estimates(monkeypatch) -> None:
+    history = _build_history(["较早的消息", "超长的最新消息" * 100])
+
+    selected, _ = MaisakaChatLoopService.select_llm_context_messages(
+        history,
+        enable_visual_message=False,
+        request_kind="replyer",
+        max_context_size=10,
+        max_context_tokens=50,
+    )
+
+    assert [message.message_id for message in selected] == ["msg-1"]
+    assert history[1].get_cached_token_estimate(False) is not None
+    assert history[1].get_cached_token_estimate(True) is None
+
+    # 两条消息在第一次选择时都已估算过，再次选择时全部命中缓存，不应重新构建 LLM 消息
+    build_calls: list[str] = []
+    original_build = chat_loop_service.build_llm_message_from_context
+
+    def _counting_build(message, **kwargs):
+        build_calls.append(message.message_id)
+        return original_build(message, **kwargs)
+
+    monkeypatch.setattr(chat_loop_service, "build_llm_message_from_context", _counting_build)
+    reselected, _ = MaisakaChatLoopService.select_llm_context_messages(
+        history,
+        enable_visual_message=False,
+        request_kind="replyer",
+        max_context_size=10,
+        max_context_tokens=50,
+    )
+
+    assert [message.message_id for message in reselected] == ["msg-1"]
+    assert build_calls == []
@@ -0,0 +1,96 @@
+from src.core.tooling import ToolSpec
+from src.maisaka.deferred_tool_index import DeferredToolSearchIndex
+
+import random
+
+
+def _linear_search(tool_specs_by_name: dict[str, ToolSpec], query: str, limit: int) -> list[str]:
+    """索引引入前的逐个扫描实现，用作排序基准。"""
+
+    normalized_query = " ".join(query.lower().split()).strip()
+    if not normalized_query:
+        return []
+
+    scored_matches: list[tuple[int, str]] = []
+    query_terms = [term for term in normalized_query.replace("_", " ").replace("-", " ").split() if term]
+    for tool_name, tool_spec in tool_specs_by_name.items():
+        lower_name = tool_name.lower()
+        lower_description = tool_spec.brief_description.lower()
+        score = 0
+        if normalized_query == lower_name:
+            score += 1000
+        if lower_name.startswith(normalized_query):
+            score += 300
+        if normalized_query in lower_name:
+            score += 200
+        if normalized_query in lower_description:
+            score += 100
+        for query_term in query_terms:
+            if query_term in lower_name:
+                score += 25
+            if query_term in lower_description:
+                score += 10
+        if score > 0:
+            scored_matches.append((score, tool_name))
+
+    scored_matches.sort(key=lambda item: (-item[0], item[1]))
+    return [tool_name for _, tool_name in scored_matches[: max(1, limit)]]
+
+
+def _build_specs() -> dict[str, ToolSpec]:
+    specs = [
+        ToolSpec(name="mcp_github_create_issue", brief_description="在 GitHub 仓库中创建 Issue"),
+        ToolSpec(name="mcp_github_search_code", brief_description="Search code across GitHub repositories"),
+        ToolSpec(name="weather_query", brief_description="查询指定城市的天气预报"),
+        ToolSpec(name="Weather-Alert", brief_description="订阅恶劣天气提醒"),
+        ToolSpec(name="music_play", brief_description="播放一首歌曲"),
+        ToolSpec(name="send_email", brief_description=""),
+    ]
+    return {tool_spec.name: tool_spec for tool_spec in specs}
+
+
+def test_index_ranks_identically_to_linear_scan() -> None:
+    tool_specs_by_name = _build_specs()
+    index = DeferredToolSearchIndex()
+    index.sync(tool_specs_by_name)
+
+    queries = [
+        "weather",
+        "天气",
+        "github issue",
+        "mcp_github",
+        "WEATHER-alert",
+        "  send   email ",
+        "歌",
+        "code search repositories",
+        "不存在的工具",
+        "e",
+    ]
+    rng = random.Random(7)
+    corpus = "".join(f"{name} {spec.brief_description} " for name, spec in tool_specs_by_name.items()).lower()
+    for _ in range(200):
+        start = rng.randrange(len(corpus) - 6)
+        queries.append(corpus[start : start + rng.randint(1, 6)])
+
+    for query in queries:
+        for limit in (1, 3, 10):
+            expected = _linear_search(tool_specs_by_name, query, limit)
+            actual = [tool_spec.name for tool_spec in index.search(query, limit=limit)]
+            assert actual == expected, query
+
+
+def test_index_sync_applies_incremental_changes() -> None:
+    tool_specs_by_name = _build_specs()
+    index = DeferredToolSearchIndex()
+    index.sync(tool_specs_by_name)
+
+    del tool_specs_by_name["music_play"]
+    tool_specs_by_name["weather_query"] = ToolSpec(name="weather_query", brief_description="获取空气质量")
+    tool_specs_by_name["calendar_add"] = ToolSpec(name="calendar_add", brief_description="添加日程")
+    index.sync(tool_specs_by_name)
+
+    assert len(index) == 6
+    assert index.search("歌曲", limit=5) == []
+    assert [tool_spec.name for tool_spec in index.search("天气", limit=5)] == ["Weather-Alert"]
+    assert [tool_spec.name for tool_spec in index.search("空气", limit=5)] == ["weather_query"]
+    assert [tool_spec.name for tool_spec in index.search("日程", limit=5)] == ["calendar_add"]
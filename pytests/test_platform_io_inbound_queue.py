@@ -0,0 +1,212 @@
+"""Platform IO 入站有界队列测试。"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import asyncio
+
+import pytest
+
+from src.platform_io.drivers.base import PlatformIODriver
+from src.platform_io.inbound_queue import InboundOverflowPolicy, InboundQueue
+from src.platform_io.manager import PlatformIOManager
+from src.platform_io.types import DeliveryReceipt, DriverDescriptor, DriverKind, InboundMessageEnvelope, RouteBinding, RouteKey
+
+ROUTE_KEY = RouteKey(platform="qq", account_id="10001")
+
+
+def _envelope(message_id: str, group_id: str, *, is_notify: bool = False) -> InboundMessageEnvelope:
+    session_message = SimpleNamespace(
+        message_id=message_id,
+        is_mentioned=False,
+        is_at=False,
+        is_notify=is_notify,
+        message_info=SimpleNamespace(group_info=SimpleNamespace(group_id=group_id), user_info=None),
+    )
+    return InboundMessageEnvelope(
+        route_key=ROUTE_KEY,
+        driver_id="plugin.napcat",
+        driver_kind=DriverKind.PLUGIN,
+        external_message_id=message_id,
+        session_message=session_message,
+    )
+
+
+class _GatedDispatcher:
+    """记录分发顺序，并可通过事件阻塞分发以制造积压。"""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.dispatched: List[str] = []
+        self.active_groups: set[str] = set()
+        self.overlapped = False
+
+    async def __call__(self, envelope: InboundMessageEnvelope) -> None:
+        group_id = envelope.session_message.message_info.group_info.group_id
+        if group_id in self.active_groups:
+            self.overlapped = True
+        self.active_groups.add(group_id)
+        try:
+            await self.gate.wait()
+            await asyncio.sleep(0)
+            self.dispatched.append(envelope.external_message_id)
+        finally:
+            self.active_groups.discard(group_id)
+
+
+@pytest.mark.asyncio
+async def test_queue_keeps_per_session_order_across_workers() -> None:
+    """多工作协程并行时，同一会话内的消息仍按入队顺序逐条分发。"""
+    dispatcher = _GatedDispatcher()
+    queue = InboundQueue(dispatcher, max_size=100, worker_count=4)
+    queue.start()
+
+    for index in range(20):
+        assert await queue.put(_envelope(f"{'ab'[index % 2]}{index}", group_id="ab"[index % 2]))
+    dispatcher.gate.set()
+    await queue.join()
+    await queue.stop()
+
+    assert not dispatcher.overlapped
+    assert [item for item in dispatcher.dispatched if item.startswith("a")] == [f"a{i}" for i in range(0, 20, 2)]
+    assert [item for item in dispatcher.dispatched if item.startswith("b")] == [f"b{i}" for i in range(1, 20, 2)]
+    assert queue.stats()["dispatched"] == 20
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_discards_earliest_pending_message() -> None:
+    """队列满时丢弃最旧的待分发消息，并记录丢弃指标。"""
+    dispatcher = _GatedDispatcher()
+    queue = InboundQueue(dispatcher, max_size=2, worker_count=1, overflow_policy=InboundOverflowPolicy.DROP_OLDEST)
+    queue.start()
+
+    await queue.put(_envelope("m0", "g0"))
+    await asyncio.sleep(0)  # m0 被工作协程取走，阻塞在分发中
+    for message_id in ("m1", "m2", "m3"):
+        assert await queue.put(_envelope(message_id, message_id))
+
+    stats = queue.stats()
+    assert stats["depth"] == 2 and stats["dropped_oldest"] == 1
+    dispatcher.gate.set()
+    await queue.stop()
+    assert dispatcher.dispatched == ["m0", "m2", "m3"]
+
+
+@pytest.mark.asyncio
+async def test_shed_low_priority_policy_keeps_normal_traffic() -> None:
+    """丢弃低优先级策略优先牺牲通知类消息。"""
+    dispatcher = _GatedDispatcher()
+    queue = InboundQueue(
+        dispatcher, max_size=2, worker_count=1, overflow_policy=InboundOverflowPolicy.SHED_LOW_PRIORITY
+    )
+    queue.start()
+
+    await queue.put(_envelope("m0", "g0"))
+    await asyncio.sleep(0)
+    assert await queue.put(_envelope("notify1", "g1", is_notify=True))
+    assert await queue.put(_envelope("m2", "g2"))
+    assert await queue.put(_envelope("m3", "g3"))
+    assert not await queue.put(_envelope("notify4", "g4", is_notify=True))
+
+    assert queue.stats()["dropped_low_priority"] == 2
+    dispatcher.gate.set()
+    await queue.stop()
+    assert dispatcher.dispatched == ["m0", "m2", "m3"]
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure_until_space_frees() -> None:
+    """阻塞策略下，队列满时调用方等待直到工作协程腾出空位。"""
+    dispatcher = _GatedDispatcher()
+    queue = InboundQueue(dispatcher, max_size=1, worker_count=1)
+    queue.start()
+
+    await queue.put(_envelope("m0", "g0"))
+    await asyncio.sleep(0)
+    await queue.put(_envelope("m1", "g1"))
+    blocked_put = asyncio.create_task(queue.put(_envelope("m2", "g2")))
+    await asyncio.sleep(0.01)
+    assert not blocked_put.done()
+
+    dispatcher.gate.set()
+    assert await asyncio.wait_for(blocked_put, timeout=1.0)
+    await queue.stop()
+    assert dispatcher.dispatched == ["m0", "m1", "m2"]
+    assert queue.stats()["blocked_puts"] == 1
+
+
+class _InboundOnlyDriver(PlatformIODriver):
+    """只用于入站的测试驱动。"""
+
+    async def send_message(
+        self,
+        message: Any,
+        route_key: RouteKey,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> DeliveryReceipt:
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_started_manager_does_not_block_driver_on_slow_dispatcher() -> None:
+    """Broker 运行期间，驱动上报入站消息后立即返回，由队列异步分发。"""
+    manager = PlatformIOManager()
+    driver = _InboundOnlyDriver(DriverDescriptor(driver_id="plugin.napcat", kind=DriverKind.PLUGIN, platform="qq"))
+    manager.register_driver(driver)
+    manager.bind_receive_route(RouteBinding(route_key=ROUTE_KEY, driver_id=driver.driver_id, driver_kind=DriverKind.PLUGIN))
+    dispatcher = _GatedDispatcher()
+    manager.set_inbound_dispatcher(dispatcher)
+    await manager.start()
+
+    assert await asyncio.wait_for(driver.emit_inbound(_envelope("m0", "g0")), timeout=1.0)
+    assert manager.inbound_queue_stats()["enqueued"] == 1
+
+    dispatcher.gate.set()
+    await manager.stop()
+    assert dispatcher.dispatched == ["m0"]
+
+
+def test_platform_io_manager_reads_inbound_queue_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """全局 Broker 管理器按 message_receive 配置构造入站队列。"""
+    from src.config.config import global_config
+    from src.platform_io import manager as manager_module
+
+    receive_config = global_config.message_receive
+    monkeypatch.setattr(receive_config, "inbound_queue_size", 16)
+    monkeypatch.setattr(receive_config, "inbound_worker_count", 3)
+    monkeypatch.setattr(receive_config, "inbound_overflow_policy", "drop_oldest")
+
+    stats = manager_module._build_platform_io_manager().inbound_queue_stats()
+
+    assert stats["max_size"] == 16
+    assert stats["worker_count"] == 3
+    assert stats["overflow_policy"] == "drop_oldest"
+
+
+@pytest.mark.asyncio
+async def test_platform_io_stats_exposed_by_webui_route() -> None:
+    """WebUI 系统路由返回入站队列指标。"""
+    from src.webui.routers import system
+
+    stats = await system.get_platform_io_stats()
+
+    assert set(stats) == {"started", "inbound_queue"}
+    assert "depth" in stats["inbound_queue"]
+
+
+@pytest.mark.asyncio
+async def test_overflow_warning_is_throttled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """队列持续溢出时告警按时间窗口节流，只输出一次。"""
+    from src.platform_io import inbound_queue as inbound_queue_module
+
+    warnings: List[str] = []
+    monkeypatch.setattr(inbound_queue_module.logger, "warning", lambda message: warnings.append(message))
+    dispatcher = _GatedDispatcher()
+    queue = InboundQueue(dispatcher, max_size=1, worker_count=1, overflow_policy=InboundOverflowPolicy.DROP_OLDEST)
+
+    for index in range(5):
+        await queue.put(_envelope(f"m{index}", "g1"))
+
+    assert queue.stats()["dropped_oldest"] == 4
+    assert len(warnings) == 1
+    assert "累计丢弃 1 条" in warnings[0]
@@ -0,0 +1,123 @@
+"""Platform IO 出站并发广播测试。"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import asyncio
+
+import pytest
+
+from src.platform_io.drivers.base import PlatformIODriver
+from src.platform_io.manager import PlatformIOManager
+from src.platform_io.types import DeliveryReceipt, DeliveryStatus, DriverDescriptor, DriverKind, RouteBinding, RouteKey
+
+ROUTE_KEY = RouteKey(platform="qq", account_id="10001")
+
+
+class _ScriptedPlatformIODriver(PlatformIODriver):
+    """按预设延迟发送、可选择抛错的测试驱动。"""
+
+    def __init__(
+        self,
+        driver_id: str,
+        delay: float = 0.0,
+        error: Optional[Exception] = None,
+        delays: Optional[List[float]] = None,
+    ) -> None:
+        super().__init__(DriverDescriptor(driver_id=driver_id, kind=DriverKind.PLUGIN, platform="qq"))
+        self.delay = delay
+        self.delays = list(delays or [])
+        self.error = error
+        self.sent_message_ids: List[str] = []
+
+    async def send_message(
+        self,
+        message: Any,
+        route_key: RouteKey,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> DeliveryReceipt:
+        await asyncio.sleep(self.delays.pop(0) if self.delays else self.delay)
+        if self.error is not None:
+            raise self.error
+        self.sent_message_ids.append(message.message_id)
+        return DeliveryReceipt(
+            internal_message_id=message.message_id,
+            route_key=route_key,
+            status=DeliveryStatus.SENT,
+            driver_id=self.driver_id,
+            driver_kind=self.descriptor.kind,
+        )
+
+
+def _build_manager(*drivers: PlatformIODriver, send_timeout_seconds: Optional[float] = 1.0) -> PlatformIOManager:
+    manager = PlatformIOManager(send_timeout_seconds=send_timeout_seconds)
+    for driver in drivers:
+        manager.register_driver(driver)
+        manager.bind_send_route(
+            RouteBinding(route_key=ROUTE_KEY, driver_id=driver.driver_id, driver_kind=driver.descriptor.kind)
+        )
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_send_message_fans_out_concurrently_and_keeps_driver_order() -> None:
+    """多个驱动应并发发送，回执顺序与路由解析顺序一致。"""
+    drivers = [_ScriptedPlatformIODriver(f"plugin.d{index}", delay=0.2) for index in range(3)]
+    manager = _build_manager(*drivers)
+
+    started_at = asyncio.get_running_loop().time()
+    batch = await manager.send_message(SimpleNamespace(message_id="m1"), ROUTE_KEY)
+    elapsed = asyncio.get_running_loop().time() - started_at
+
+    assert elapsed < 0.5
+    assert [receipt.driver_id for receipt in batch.receipts] == ["plugin.d0", "plugin.d1", "plugin.d2"]
+    assert batch.all_succeeded
+
+
+@pytest.mark.asyncio
+async def test_send_message_isolates_driver_failures_and_timeouts() -> None:
+    """单个驱动异常或超时不应影响其他驱动的投递。"""
+    healthy = _ScriptedPlatformIODriver("plugin.ok")
+    broken = _ScriptedPlatformIODriver("plugin.broken", error=RuntimeError("boom"))
+    stuck = _ScriptedPlatformIODriver("plugin.stuck", delay=5.0)
+    manager = _build_manager(healthy, broken, stuck, send_timeout_seconds=0.1)
+
+    batch = await manager.send_message(SimpleNamespace(message_id="m1"), ROUTE_KEY)
+
+    assert batch.has_success and not batch.all_succeeded
+    assert batch.receipt_for("plugin.ok").status == DeliveryStatus.SENT
+    assert batch.receipt_for("plugin.broken").error == "boom"
+    stuck_receipt = batch.receipt_for("plugin.stuck")
+    assert stuck_receipt.status == DeliveryStatus.FAILED
+    assert "超时" in stuck_receipt.error
+    assert manager.outbound_tracker.get_pending("m1", "plugin.stuck") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_keep_per_driver_order() -> None:
+    """并发调用 send_message 时，同一驱动内的发送顺序应与调用顺序一致。"""
+    fast = _ScriptedPlatformIODriver("plugin.fast")
+    # 越早的消息发送越慢，没有驱动级串行时后发的消息会先完成
+    slow = _ScriptedPlatformIODriver("plugin.slow", delays=[0.01 * (10 - index) for index in range(10)])
+    manager = _build_manager(fast, slow)
+
+    message_ids = [f"m{index}" for index in range(10)]
+    await asyncio.gather(
+        *(manager.send_message(SimpleNamespace(message_id=message_id), ROUTE_KEY) for message_id in message_ids)
+    )
+
+    assert fast.sent_message_ids == message_ids
+    assert slow.sent_message_ids == message_ids
+
+
+@pytest.mark.parametrize(("configured", "expected"), [(12.5, 12.5), (0, None)])
+def test_send_timeout_reads_config(monkeypatch: pytest.MonkeyPatch, configured: float, expected: Optional[float]) -> None:
+    """全局 Broker 管理器按 maim_message 配置设置发送超时，0 表示不限时。"""
+    from src.config.config import global_config
+    from src.platform_io import manager as manager_module
+
+    monkeypatch.setattr(global_config.maim_message, "platform_send_timeout_seconds", configured)
+
+    manager = manager_module._build_platform_io_manager()
+
+    assert manager._send_timeout_seconds == expected
@@ -187,6 +187,31 @@ class TestProtocol:
         assert decoded.payload["key"] == "value"
         assert decoded.payload["number"] == 42
 
+    def test_msgpack_codec_header_mode_matches_full_mode(self):
+        """仅处理信封头的快速编码与完整序列化产出一致"""
+        from src.plugin_runtime.protocol.codec import EnvelopeValidationMode, MsgPackCodec
+        from src.plugin_runtime.protocol.envelope import Envelope, HelloPayload, MessageType
+
+        full_codec = MsgPackCodec()
+        header_codec = MsgPackCodec(validation_mode=EnvelopeValidationMode.HEADER)
+        env = Envelope(
+            request_id=7,
+            message_type=MessageType.BROADCAST,
+            method="event.dispatch",
+            payload={"message": {"segments": [{"type": "text", "data": "你好"}], "raw": b"\x00\x01"}},
+        )
+        assert header_codec.encode_envelope(env) == full_codec.encode_envelope(env)
+        assert header_codec.decode_envelope(full_codec.encode_envelope(env)) == env
+
+        # payload 中含 Pydantic 模型时回退到 model_dump()
+        model_env = Envelope.model_construct(
+            request_id=8,
+            message_type=MessageType.REQUEST,
+            payload={"hello": HelloPayload(runner_id="r", sdk_version="1.0.0", session_token="t")},
+        )
+        decoded = full_codec.decode_envelope(header_codec.encode_envelope(model_env))
+        assert decoded.payload["hello"]["runner_id"] == "r"
+
     def test_json_codec(self):
         """JSON 编解码已移除，仅保留 MsgPack"""
         pass
@@ -219,6 +244,32 @@ class TestProtocol:
 class TestTransport:
     """传输层测试"""
 
+    @pytest.mark.asyncio
+    async def test_concurrent_frames_are_coalesced_in_order(self):
+        """并发发送的多帧合并写入后仍按顺序完整分帧"""
+        from src.plugin_runtime.transport.base import Connection
+
+        class RecordingWriter:
+            def __init__(self):
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(bytes(data))
+
+            async def drain(self):
+                await asyncio.sleep(0)
+
+        reader = asyncio.StreamReader()
+        writer = RecordingWriter()
+        conn = Connection(reader, writer)
+
+        frames = [f"frame-{index}".encode() for index in range(20)]
+        await asyncio.gather(*(conn.send_frame(frame) for frame in frames))
+
+        assert len(writer.writes) < len(frames)
+        reader.feed_data(b"".join(writer.writes))
+        assert [await conn.recv_frame() for _ in frames] == frames
+
     @pytest.mark.asyncio
     async def test_uds_connection_framing(self):
         """UDS 分帧协议测试"""
@@ -569,6 +620,179 @@ class TestSDK:
         assert plugin.configs == [{"enabled": True}]
         assert plugin.updates == [("self", {"enabled": True}, "v2", [{"enabled": True}])]
 
+    @pytest.mark.asyncio
+    async def test_runner_runs_sync_hook_handler_off_event_loop(self):
+        """同步 Hook 处理器阻塞时，健康检查与其他插件的调用仍应及时响应。"""
+        import threading
+
+        from src.plugin_runtime.protocol.envelope import Envelope, MessageType
+        from src.plugin_runtime.runner.runner_main import PluginRunner
+
+        release = threading.Event()
+
+        class SlowPlugin:
+            def on_message(self, **kwargs):
+                release.wait(timeout=5)
+                return {"action": "continue", "custom_result": threading.current_thread().name}
+
+        class FastPlugin:
+            def on_message(self, **kwargs):
+                return {"action": "continue", "custom_result": "fast"}
+
+        runner = PluginRunner(host_address="dummy", session_token="token", plugin_dirs=[])
+        for plugin_id, plugin in (("slow_plugin", SlowPlugin()), ("fast_plugin", FastPlugin())):
+            runner._loader._loaded_plugins[plugin_id] = SimpleNamespace(instance=plugin, component_handlers={})
+
+        def _hook_envelope(plugin_id: str) -> Envelope:
+            return Envelope(
+                request_id=1,
+                message_type=MessageType.REQUEST,
+                method="plugin.invoke_hook",
+                plugin_id=plugin_id,
+                payload={"component_name": "on_message", "args": {}},
+            )
+
+        slow_task = asyncio.create_task(runner._handle_hook_invoke(_hook_envelope("slow_plugin")))
+        await asyncio.sleep(0.05)
+
+        health = await asyncio.wait_for(
+            runner._handle_health(
+                Envelope(request_id=2, message_type=MessageType.REQUEST, method="plugin.health", plugin_id="")
+            ),
+            timeout=0.5,
+        )
+        fast_response = await asyncio.wait_for(runner._handle_hook_invoke(_hook_envelope("fast_plugin")), timeout=1)
+        assert health.payload["healthy"] is True
+        assert fast_response.payload["custom_result"] == "fast"
+        assert not slow_task.done()
+
+        release.set()
+        slow_response = await asyncio.wait_for(slow_task, timeout=5)
+        assert slow_response.payload["custom_result"].startswith("plugin-sync-handler")
+        runner._sync_executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runner_sync_handler_timeout_only_consumes_own_plugin_slots(self):
+        """同步处理器超时后应返回错误，且未结束的线程只占用所属插件的并发配额。"""
+        import threading
+
+        from src.plugin_runtime.protocol.envelope import Envelope, MessageType
+        from src.plugin_runtime.runner.runner_main import PluginRunner
+
+        release = threading.Event()
+
+        class StuckPlugin:
+            def handle_query(self, **kwargs):
+                release.wait(timeout=5)
+                return "late"
+
+        class HealthyPlugin:
+            def handle_query(self, **kwargs):
+                return "ok"
+
+        runner = PluginRunner(
+            host_address="dummy",
+            session_token="token",
+            plugin_dirs=[],
+            sync_handler_max_workers=4,
+            sync_handler_per_plugin_limit=1,
+            sync_handler_timeout_sec=0.1,
+        )
+        for plugin_id, plugin in (("stuck_plugin", StuckPlugin()), ("healthy_plugin", HealthyPlugin())):
+            runner._loader._loaded_plugins[plugin_id] = SimpleNamespace(instance=plugin, component_handlers={})
+
+        def _invoke_envelope(plugin_id: str) -> Envelope:
+            return Envelope(
+                request_id=1,
+                message_type=MessageType.REQUEST,
+                method="plugin.invoke_command",
+                plugin_id=plugin_id,
+                payload={"component_name": "query", "args": {}},
+            )
+
+        first = await runner._handle_invoke(_invoke_envelope("stuck_plugin"))
+        second = await runner._handle_invoke(_invoke_envelope("stuck_plugin"))
+        healthy = await runner._handle_invoke(_invoke_envelope("healthy_plugin"))
+
+        assert first.payload["success"] is False and "超过" in first.payload["result"]
+        assert second.payload["success"] is False and "等待超时" in second.payload["result"]
+        assert healthy.payload == {"success": True, "result": "ok"}
+        assert runner._sync_executor.stats()["running"] == {"stuck_plugin": 1}
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert runner._sync_executor.stats()["running"] == {}
+        runner._sync_executor.shutdown()
+
+    def test_promoted_standby_runner_applies_latest_sync_handler_options(self, monkeypatch):
+        """热备 Runner 接管后应按接管指令携带的最新配置重建同步处理器执行器。"""
+        from src.plugin_runtime import ENV_GLOBAL_CONFIG_SNAPSHOT
+        from src.plugin_runtime.runner.runner_main import PluginRunner
+
+        runner = PluginRunner(
+            host_address="dummy",
+            session_token="token",
+            plugin_dirs=[],
+            sync_handler_max_workers=4,
+            sync_handler_per_plugin_limit=1,
+            sync_handler_timeout_sec=30,
+            standby=True,
+        )
+        snapshot = {
+            "plugin_runtime": {
+                "sync_handler_max_workers": 2,
+                "sync_handler_per_plugin_limit": 3,
+                "sync_handler_timeout_sec": 5,
+            }
+        }
+        monkeypatch.setenv(ENV_GLOBAL_CONFIG_SNAPSHOT, json.dumps(snapshot))
+
+        runner._refresh_sync_executor()
+
+        stats = runner._sync_executor.stats()
+        assert (stats["max_workers"], stats["per_plugin_limit"]) == (2, 3)
+        assert runner._sync_executor.resolve_timeout(0) == 5
+        runner._sync_executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runner_activates_independent_plugins_concurrently_by_dependency_wave(self):
+        """无相互依赖的插件应并发激活，依赖者等待被依赖插件完成，失败只影响其依赖者。"""
+        from src.plugin_runtime.runner.runner_main import PluginActivationStatus, PluginRunner
+
+        def _meta(plugin_id: str, *dependency_ids: str) -> SimpleNamespace:
+            dependencies = [SimpleNamespace(id=dep_id, version_spec=">=1.0.0") for dep_id in dependency_ids]
+            return SimpleNamespace(
+                plugin_id=plugin_id,
+                version="1.0.0",
+                manifest=SimpleNamespace(plugin_dependencies=dependencies),
+            )
+
+        runner = PluginRunner(host_address="dummy", session_token="token", plugin_dirs=[])
+        active: set[str] = set()
+        started_with: Dict[str, set[str]] = {}
+        finished: List[str] = []
+
+        async def fake_activate(meta):
+            started_with[meta.plugin_id] = set(active)
+            active.add(meta.plugin_id)
+            await asyncio.sleep(0.02)
+            active.discard(meta.plugin_id)
+            finished.append(meta.plugin_id)
+            return PluginActivationStatus.FAILED if meta.plugin_id == "broken" else PluginActivationStatus.LOADED
+
+        runner._activate_plugin = fake_activate
+        plugins = [_meta("base"), _meta("broken"), _meta("other"), _meta("child", "base"), _meta("orphan", "broken")]
+        failed_plugins: set[str] = set()
+        inactive_plugins: set[str] = set()
+
+        activation_ms = await runner._activate_plugins_in_waves(plugins, failed_plugins, inactive_plugins)
+
+        assert started_with["other"] >= {"base", "broken"}
+        assert finished.index("base") < finished.index("child") and "orphan" not in finished
+        assert failed_plugins == {"broken", "orphan"} and inactive_plugins == set()
+        assert set(activation_ms) == {"base", "broken", "other", "child"}
+        assert all(elapsed >= 15 for elapsed in activation_ms.values())
+
     @pytest.mark.asyncio
     async def test_runner_global_config_update_does_not_override_plugin_config(self):
         """bot/model 广播不应覆盖插件自身配置缓存。"""
@@ -2731,6 +2955,126 @@ class TestSupervisor:
 
         assert supervisor._stderr_drain_task is None or supervisor._stderr_drain_task.done()
 
+    @pytest.mark.asyncio
+    async def test_hot_standby_failover_shrinks_outage_window(self, tmp_path):
+        """活跃 Runner 崩溃后，热备 Runner 接管的停机窗口应远小于冷启动。"""
+        import time
+
+        from src.plugin_runtime.host.supervisor import PluginSupervisor
+
+        plugin_root = tmp_path / "plugins"
+        plugin_dir = plugin_root / "slow_import_plugin"
+        plugin_dir.mkdir(parents=True)
+        (plugin_dir / "_manifest.json").write_text(
+            json.dumps(build_test_manifest("test.slow-import-plugin", name="slow_import_plugin")),
+            encoding="utf-8",
+        )
+        # 模拟导入耗时较长的插件（大型依赖、模型加载等）
+        (plugin_dir / "plugin.py").write_text(
+            "import time\n"
+            "from maibot_sdk import MaiBotPlugin\n\n"
+            "time.sleep(1.0)\n\n\n"
+            "class SlowImportPlugin(MaiBotPlugin):\n"
+            "    async def on_load(self):\n"
+            "        pass\n\n"
+            "    async def on_unload(self):\n"
+            "        pass\n\n"
+            "    async def on_config_update(self, scope, config_data, version):\n"
+            "        pass\n\n\n"
+            "def create_plugin():\n"
+            "    return SlowImportPlugin()\n",
+            encoding="utf-8",
+        )
+
+        async def measure_outage_ms(hot_standby_enabled: bool) -> float:
+            supervisor = PluginSupervisor(
+                plugin_dirs=[plugin_root],
+                health_check_interval_sec=3600,
+                hot_standby_enabled=hot_standby_enabled,
+            )
+            await supervisor.start()
+            try:
+                assert supervisor.get_loaded_plugin_ids() == ["test.slow-import-plugin"]
+                if hot_standby_enabled:
+                    await asyncio.wait_for(supervisor._standby_warm.wait(), timeout=20)
+
+                crashed_process = supervisor._runner_process
+                crashed_process.kill()
+                await crashed_process.wait()
+
+                started_at = time.perf_counter()
+                assert await supervisor._restart_runner(reason="runner_process_exited")
+                outage_ms = (time.perf_counter() - started_at) * 1000
+
+                assert supervisor.get_loaded_plugin_ids() == ["test.slow-import-plugin"]
+                if hot_standby_enabled:
+                    # 热备被提升后应立即补充新的热备进程
+                    assert supervisor._standby_process is not None
+                    assert supervisor._standby_process.pid != supervisor._runner_process.pid
+                return outage_ms
+            finally:
+                await supervisor.stop()
+
+        cold_outage_ms = await measure_outage_ms(hot_standby_enabled=False)
+        standby_outage_ms = await measure_outage_ms(hot_standby_enabled=True)
+
+        # 只比较相对改善：冷启动必须重新导入耗时 1 秒的插件，热备接管至少应快一半，
+        # 不对绝对耗时设阈值，避免在负载较高的 CI 机器上偶发失败
+        assert standby_outage_ms < cold_outage_ms * 0.5, (cold_outage_ms, standby_outage_ms)
+
+
+    @pytest.mark.asyncio
+    async def test_promoted_standby_keeps_draining_stdout(self, tmp_path):
+        """热备 Runner 被提升后 stdout 仍需持续排空，插件大量 print 不应写满管道而卡死 Runner。"""
+        from src.plugin_runtime.host.supervisor import PluginSupervisor
+
+        plugin_root = tmp_path / "plugins"
+        plugin_dir = plugin_root / "noisy_plugin"
+        plugin_dir.mkdir(parents=True)
+        (plugin_dir / "_manifest.json").write_text(
+            json.dumps(build_test_manifest("test.noisy-plugin", name="noisy_plugin")),
+            encoding="utf-8",
+        )
+        (plugin_dir / "plugin.py").write_text(
+            "import sys\n"
+            "from maibot_sdk import MaiBotPlugin, Tool\n\n\n"
+            "class NoisyPlugin(MaiBotPlugin):\n"
+            "    async def on_load(self):\n"
+            "        pass\n\n"
+            "    async def on_unload(self):\n"
+            "        pass\n\n"
+            "    async def on_config_update(self, scope, config_data, version):\n"
+            "        pass\n\n"
+            "    @Tool(\"spam\", parameters={})\n"
+            "    async def handle_spam(self, **kwargs):\n"
+            "        sys.stdout.write(\"x\" * 256 * 1024)\n"
+            "        sys.stdout.flush()\n"
+            "        return {\"ok\": True}\n\n\n"
+            "def create_plugin():\n"
+            "    return NoisyPlugin()\n",
+            encoding="utf-8",
+        )
+
+        supervisor = PluginSupervisor(plugin_dirs=[plugin_root], health_check_interval_sec=3600, hot_standby_enabled=True)
+        await supervisor.start()
+        try:
+            await asyncio.wait_for(supervisor._standby_warm.wait(), timeout=20)
+            crashed_process = supervisor._runner_process
+            crashed_process.kill()
+            await crashed_process.wait()
+            assert await supervisor._restart_runner(reason="runner_process_exited")
+            assert supervisor._runner_process.stdout is not None
+
+            # 累计输出远超管道缓冲区，stdout 未被排空时 Runner 会阻塞在写入上，调用随之超时
+            for _ in range(2):
+                response = await supervisor.invoke_plugin(
+                    "plugin.invoke_tool", "test.noisy-plugin", "spam", timeout_ms=5000
+                )
+                assert response.error is None
+        finally:
+            await supervisor.stop()
+        assert supervisor._stdout_drain_task is None
+
 
 class TestIntegration:
     """运行时集成层启动/清理测试"""
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import json
+
+import pytest
+
+from src.maisaka.reply_effect.models import (
+    ReplyEffectRecord,
+    ReplyEffectStatus,
+    ReplySnapshot,
+    SessionSnapshot,
+    UserSnapshot,
+    now_iso,
+)
+from src.maisaka.reply_effect.storage import ReplyEffectStorage
+
+
+def _build_record(effect_id: str, chat_id: str = "qq_group_10001") -> ReplyEffectRecord:
+    return ReplyEffectRecord(
+        effect_id=effect_id,
+        status=ReplyEffectStatus.PENDING,
+        created_at=now_iso(),
+        updated_at=now_iso(),
+        session=SessionSnapshot(
+            session_id=f"session-{chat_id}",
+            platform_type_id=chat_id,
+            platform="qq",
+            chat_type="group",
+            group_id="10001",
+            user_id="",
+            session_name="测试群",
+        ),
+        reply=ReplySnapshot(
+            tool_call_id="call-1",
+            target_message_id="msg-1",
+            set_quote=False,
+            reply_text=f"回复 {effect_id}",
+            reply_segments=[f"回复 {effect_id}"],
+            planner_reasoning="",
+            reference_info="",
+        ),
+        target_user=UserSnapshot(user_id="u1", nickname="用户", cardname=""),
+    )
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    reply_effect_storage = ReplyEffectStorage(tmp_path)
+    yield reply_effect_storage
+    reply_effect_storage.close()
+
+
+def test_save_and_query_records_by_chat_and_time(storage: ReplyEffectStorage) -> None:
+    first = _build_record("effect-1")
+    storage.create_record(first)
+    storage.create_record(_build_record("effect-2", chat_id="qq_group_20002"))
+
+    first.status = ReplyEffectStatus.FINALIZED
+    first.finalize_reason = "window_timeout"
+    storage.save_record(first)
+
+    saved = storage.get_record("effect-1")
+    assert saved is not None
+    assert saved["status"] == "finalized"
+    assert saved["finalize_reason"] == "window_timeout"
+    assert saved["_chat_id"] == "qq_group_10001"
+
+    assert [record["effect_id"] for record in storage.query_records(chat_id="qq_group_10001")] == ["effect-1"]
+    assert [record["effect_id"] for record in storage.query_records(status=ReplyEffectStatus.PENDING)] == ["effect-2"]
+    assert storage.query_records(start_time=saved["_created_at"] + 3600) == []
+    assert storage.list_chats() == [
+        {"chat_id": "qq_group_10001", "record_count": 1, "finalized_count": 1, "pending_count": 0},
+        {"chat_id": "qq_group_20002", "record_count": 1, "finalized_count": 0, "pending_count": 1},
+    ]
+
+
+def test_trim_overflow_removes_oldest_batch(storage: ReplyEffectStorage, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ReplyEffectStorage, "_MAX_RECORDS_PER_CHAT", 5)
+    monkeypatch.setattr(ReplyEffectStorage, "_TRIM_COUNT", 3)
+    for index in range(6):
+        storage.create_record(_build_record(f"effect-{index}"))
+    storage.create_record(_build_record("other-chat", chat_id="qq_group_20002"))
+
+    remaining = storage.query_records(chat_id="qq_group_10001")
+    assert [record["effect_id"] for record in remaining] == ["effect-3", "effect-4", "effect-5"]
+    assert storage.get_record("other-chat") is not None
+
+
+def test_legacy_json_records_are_migrated(tmp_path: Path) -> None:
+    chat_dir = tmp_path / "qq_group_10001"
+    chat_dir.mkdir()
+    for timestamp_ms, effect_id in ((1700000000000, "legacy-1"), (1700000001000, "legacy-2")):
+        payload = _build_record(effect_id).to_json_dict()
+        payload["status"] = "finalized"
+        (chat_dir / f"{timestamp_ms}_{effect_id.replace('-', '')}.json").write_text(
+            json.dumps(payload, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    storage = ReplyEffectStorage(tmp_path)
+    try:
+        records = storage.query_records(newest_first=True)
+        assert [record["effect_id"] for record in records] == ["legacy-2", "legacy-1"]
+        assert records[0]["_created_at"] == 1700000001.0
+        assert not chat_dir.exists()
+    finally:
+        storage.close()
@@ -209,9 +209,11 @@ async def test_text_to_stream_with_message_triggers_memory_and_syncs_maisaka_his
         async def on_message_sent(self, message: Any) -> None:
             memory_events.append(str(message.message_id))
 
-    class FakeRuntime:
-        def append_sent_message_to_chat_history(self, message: Any, *, source_kind: str = "guided_reply") -> None:
+    class FakeHeartflowManager:
+        def append_sent_message_to_chat_history(self, session_id: str, message: Any, *, source_kind: str) -> bool:
+            assert session_id == "test-session"
             history_events.append((str(message.message_id), source_kind))
+            return True
 
     monkeypatch.setattr(send_service, "get_platform_io_manager", lambda: fake_manager)
     monkeypatch.setattr(send_service, "get_bot_account", lambda platform: "bot-qq")
@@ -233,7 +235,7 @@ async def test_text_to_stream_with_message_triggers_memory_and_syncs_maisaka_his
     monkeypatch.setitem(
         sys.modules,
         "src.chat.heart_flow.heartflow_manager",
-        SimpleNamespace(heartflow_manager=SimpleNamespace(heartflow_chat_list={"test-session": FakeRuntime()})),
+        SimpleNamespace(heartflow_manager=FakeHeartflowManager()),
     )
 
     sent_message = await send_service.text_to_stream_with_message(
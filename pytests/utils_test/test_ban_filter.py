@@ -0,0 +1,78 @@
+import random
+import re
+
+import pytest
+
+from src.common.utils.utils_ban_filter import BanRegexMatcher, BanWordMatcher, CompiledMatcherCache
+
+ALPHABET = "abc的了是"
+
+
+def _random_text(rng: random.Random, low: int, high: int) -> str:
+    return "".join(rng.choices(ALPHABET, k=rng.randint(low, high)))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_word_matcher_agrees_with_substring_scan(seed: int) -> None:
+    rng = random.Random(seed)
+    words = {_random_text(rng, 1, 4) for _ in range(200)}
+    matcher = BanWordMatcher(words)
+
+    for _ in range(500):
+        text = _random_text(rng, 0, 12)
+        found = matcher.find(text)
+        assert (found is not None) == any(word in text for word in words)
+        if found is not None:
+            assert found in words and found in text
+
+
+def test_word_matcher_reports_overlapping_suffix_words() -> None:
+    matcher = BanWordMatcher({"abcd", "bc"})
+    assert matcher.find("xabcx") == "bc"
+    assert BanWordMatcher({""}).find("任意文本") == ""
+    assert BanWordMatcher({""}).find("") is None
+
+
+def test_regex_matcher_agrees_with_per_pattern_search() -> None:
+    patterns = [
+        r"ab\d+c",  # 含字面量，走预筛
+        r"\d{3,}",  # 可合并
+        r"(x)\1y",  # 含反向引用，逐条匹配
+        r"(?i)HELLO",  # 全局标志，逐条匹配
+        r"foo|bar",  # 顶层分支，没有必然出现的字面量
+        r"^开头",
+        r"结尾$",
+    ]
+    matcher = BanRegexMatcher(patterns)
+    samples = [
+        "ab12c",
+        "abc",
+        "号码1234",
+        "号码12",
+        "xxy",
+        "xy",
+        "say hello",
+        "a bar here",
+        "开头是这样",
+        "不是开头",
+        "这是结尾",
+        "结尾不是",
+        "",
+    ]
+    for text in samples:
+        expected = next((pattern for pattern in patterns if re.search(pattern, text)), None)
+        assert matcher.find(text) == expected, text
+
+
+def test_matcher_cache_rebuilds_when_config_is_replaced_or_resized() -> None:
+    cache = CompiledMatcherCache(BanWordMatcher)
+    words = {"坏词"}
+    first = cache.get(words)
+    assert cache.get(words) is first
+
+    words.add("另一个")
+    assert cache.get(words) is not first
+    assert cache.get(words).find("另一个词") == "另一个"
+
+    reloaded = {"新词"}
+    assert cache.get(reloaded).find("坏词") is None
@@ -0,0 +1,186 @@
+"""日志查询服务测试"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+from src.webui.services.log_store import LogQuery, LogStore
+
+
+@pytest.fixture(name="logger_module", autouse=True)
+def fixture_logger_module(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """返回真实的 ``src.common.logger``
+
+    config_test 会在收集阶段把 ``src.common.logger`` 替换为 pytests/logger.py 替身，
+    整体运行时需临时换回真实模块。
+    """
+    module = sys.modules.get("src.common.logger")
+    if module is None or not hasattr(module, "TimestampedFileHandler"):
+        monkeypatch.delitem(sys.modules, "src.common.logger", raising=False)
+        module = importlib.import_module("src.common.logger")
+    return module
+
+
+class _JsonFormatter(logging.Formatter):
+    """输出与文件日志格式一致的 JSON 行"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "logger_name": record.name,
+                "event": record.getMessage(),
+                "level": record.levelname.lower(),
+                "timestamp": str(record.created),
+            },
+            ensure_ascii=False,
+        )
+
+
+def _emit(handler: logging.Handler, name: str, level: int, message: str, created: float) -> None:
+    record = logging.LogRecord(name, level, __file__, 1, message, None, None)
+    record.created = created
+    handler.emit(record)
+
+
+@pytest.fixture(name="log_dir")
+def fixture_log_dir(tmp_path: Path, logger_module: ModuleType) -> Path:
+    """写入 5 个时间桶、每桶 20 条日志，最后一个桶保持未写入索引"""
+    handler = logger_module.TimestampedFileHandler(tmp_path, index_bucket_seconds=60)
+    handler.setFormatter(_JsonFormatter())
+    base = 1_700_000_000.0
+    for bucket in range(5):
+        for index in range(20):
+            level = logging.WARNING if index == 0 else logging.DEBUG
+            name = "chat" if bucket % 2 == 0 else "memory"
+            _emit(handler, name, level, f"b{bucket} m{index} 你好", base + bucket * 60 + index)
+    handler.flush()
+    return tmp_path
+
+
+def _messages(entries: List[dict]) -> List[str]:
+    return [entry["message"] for entry in entries]
+
+
+def test_index_written_per_bucket(log_dir: Path, logger_module: ModuleType) -> None:
+    log_file = next(log_dir.glob("app_*.log.jsonl"))
+    index_lines = logger_module.get_log_index_path(log_file).read_text(encoding="utf-8").splitlines()
+
+    assert len(index_lines) == 4
+    first_bucket = json.loads(index_lines[0])
+    assert first_bucket["start"] == 0
+    assert first_bucket["count"] == 20
+    assert first_bucket["levels"] == ["DEBUG", "WARNING"]
+    assert first_bucket["modules"] == ["chat"]
+
+
+def test_recent_returns_tail_in_chronological_order(log_dir: Path) -> None:
+    entries = LogStore(log_dir, block_size=128).recent(limit=5)
+
+    assert _messages(entries) == [f"b4 m{index} 你好" for index in range(15, 20)]
+
+
+def test_cursor_pagination_covers_all_entries(log_dir: Path) -> None:
+    store = LogStore(log_dir, block_size=256)
+    seen: List[str] = []
+    cursor = None
+    while True:
+        result = store.query(LogQuery(limit=7, cursor=cursor))
+        seen = _messages(result.entries) + seen
+        if result.next_cursor is None:
+            break
+        cursor = result.next_cursor
+
+    assert seen == [f"b{bucket} m{index} 你好" for bucket in range(5) for index in range(20)]
+
+
+def test_filters_by_level_module_and_keyword(log_dir: Path) -> None:
+    store = LogStore(log_dir)
+
+    warnings = store.query(LogQuery(levels={"WARNING"}, limit=100)).entries
+    assert _messages(warnings) == [f"b{bucket} m0 你好" for bucket in range(5)]
+
+    memory = store.query(LogQuery(modules={"memory"}, keyword="M19", limit=100)).entries
+    assert _messages(memory) == ["b1 m19 你好", "b3 m19 你好"]
+
+    chinese = store.query(LogQuery(keyword="b2 m1 你", limit=100)).entries
+    assert _messages(chinese) == ["b2 m1 你好"]
+
+
+def test_index_prunes_segments(log_dir: Path) -> None:
+    store = LogStore(log_dir)
+    full = store.query(LogQuery(limit=1000))
+    pruned = store.query(LogQuery(modules={"memory"}, limit=1000))
+
+    assert len(pruned.entries) == 40
+    assert pruned.scanned_bytes < full.scanned_bytes
+
+
+def test_filters_by_time_range(log_dir: Path) -> None:
+    base = 1_700_000_000.0
+    entries = LogStore(log_dir).query(LogQuery(since=base + 60, until=base + 130, limit=1000)).entries
+
+    assert {entry["message"].split(" ")[0] for entry in entries} == {"b1", "b2"}
+
+
+def test_time_range_applies_to_each_entry(log_dir: Path) -> None:
+    base = 1_700_000_000.0
+    store = LogStore(log_dir)
+
+    entries = store.query(LogQuery(since=base + 65, until=base + 125, limit=1000)).entries
+    assert _messages(entries) == [f"b1 m{index} 你好" for index in range(5, 20)] + [
+        f"b2 m{index} 你好" for index in range(6)
+    ]
+
+    # 最后一个桶尚未写入索引，同样按单条记录的时间过滤
+    tail = store.query(LogQuery(since=base + 250, limit=1000)).entries
+    assert _messages(tail) == [f"b4 m{index} 你好" for index in range(10, 20)]
+
+
+def test_legacy_file_without_index_filters_by_entry_time(tmp_path: Path) -> None:
+    created_at = (datetime.now() - timedelta(days=1)).replace(microsecond=0)
+    log_file = tmp_path / f"app_{created_at.strftime('%Y%m%d_%H%M%S')}.log.jsonl"
+    lines = [
+        json.dumps(
+            {
+                "logger_name": "legacy",
+                "event": f"line {index}",
+                "level": "info",
+                "timestamp": (created_at + timedelta(seconds=index)).strftime("%m-%d %H:%M:%S"),
+            }
+        )
+        for index in range(3)
+    ]
+    log_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # 文件最近仍被追加过，区段时间范围一直延伸到现在
+    os.utime(log_file, (time.time(), time.time()))
+    store = LogStore(tmp_path)
+
+    assert store.query(LogQuery(since=time.time() - 60, limit=10)).entries == []
+    since_created = store.query(LogQuery(since=created_at.timestamp() + 0.5, limit=10)).entries
+    assert _messages(since_created) == ["line 1", "line 2"]
+
+
+def test_files_without_index_are_still_readable(tmp_path: Path) -> None:
+    lines = [json.dumps({"logger_name": "legacy", "event": f"line {index}", "level": "info"}) for index in range(3)]
+    (tmp_path / "app_20240101_000000.log.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    entries = LogStore(tmp_path).recent(limit=10)
+
+    assert _messages(entries) == ["line 0", "line 1", "line 2"]
+    assert entries[0]["module"] == "legacy"
+    assert entries[0]["level"] == "INFO"
+
+
+def test_invalid_cursor_is_rejected(log_dir: Path) -> None:
+    with pytest.raises(ValueError):
+        LogStore(log_dir).query(LogQuery(cursor="../secret:0"))
@@ -52,6 +52,32 @@ def test_webui_memory_graph_route(client: TestClient, monkeypatch):
     assert response.json()["edges"][0]["evidence_count"] == 2
 
 
+def test_webui_memory_graph_route_forwards_view_params(client: TestClient, monkeypatch):
+    captured = {}
+
+    async def fake_graph_admin(*, action: str, **kwargs):
+        captured.update(kwargs)
+        if kwargs.get("focus") == "missing":
+            return {"success": False, "error": "未找到节点: missing"}
+        return {"success": True, "nodes": [], "edges": [], "next_cursor": "40"}
+
+    monkeypatch.setattr(memory_router_module.memory_service, "graph_admin", fake_graph_admin)
+
+    response = client.get(
+        "/api/webui/memory/graph",
+        params={"limit": 20, "cursor": "20", "strategy": "saliency", "max_edges_per_node": 5},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] == "40"
+    assert captured["cursor"] == "20"
+    assert captured["strategy"] == "saliency"
+    assert captured["max_edges_per_node"] == 5
+
+    response = client.get("/api/webui/memory/graph", params={"focus": "missing"})
+    assert response.status_code == 400
+
+
 def test_webui_memory_graph_search_route(client: TestClient, monkeypatch):
     async def fake_graph_admin(*, action: str, **kwargs):
         assert action == "search"
@@ -7,9 +7,11 @@ import argparse
 import csv
 import json
 import math
+import sqlite3
 
 
 DEFAULT_LOG_DIR = Path("logs") / "maisaka_reply_effect"
+REPLY_EFFECT_DB_NAME = "reply_effect.db"
 DEFAULT_MANUAL_DIR = Path("logs") / "maisaka_reply_effect_manual"
 
 
@@ -82,47 +84,63 @@ def iter_records(
     include_pending: bool,
 ) -> list[dict[str, Any]]:
     records: list[dict[str, Any]] = []
-    if not log_dir.exists():
+    db_path = log_dir / REPLY_EFFECT_DB_NAME
+    if not db_path.exists():
         return records
 
-    chat_dirs = [log_dir / normalize_name(chat_id)] if chat_id else [path for path in log_dir.iterdir() if path.is_dir()]
-    for chat_dir in sorted(chat_dirs):
-        if not chat_dir.exists() or not chat_dir.is_dir():
+    conditions: list[str] = []
+    parameters: list[Any] = []
+    if chat_id:
+        conditions.append("chat_id = ?")
+        parameters.append(normalize_name(chat_id))
+    if not include_pending:
+        conditions.append("status = 'finalized'")
+    sql = "SELECT chat_id, payload FROM reply_effect_records"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY chat_id, created_at, id"
+
+    connection = sqlite3.connect(str(db_path))
+    try:
+        rows = connection.execute(sql, parameters).fetchall()
+    finally:
+        connection.close()
+
+    for record_chat_id, raw_payload in rows:
+        try:
+            effect_record = json.loads(raw_payload)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(effect_record, dict):
+            continue
+
+        effect_id = str(effect_record.get("effect_id") or "")
+        manual_record = load_json_file(annotation_path(manual_dir, record_chat_id, effect_id))
+        manual_score = to_float(manual_record.get("manual_score"))
+        if manual_score is None:
+            manual_score_5 = to_float(manual_record.get("manual_score_5"))
+            if manual_score_5 is not None:
+                manual_score = (manual_score_5 - 1) / 4 * 100
+        if manual_score is None:
             continue
-        for record_file in sorted(chat_dir.glob("*.json")):
-            effect_record = load_json_file(record_file)
-            if not effect_record:
-                continue
-            if not include_pending and effect_record.get("status") != "finalized":
-                continue
-
-            effect_id = str(effect_record.get("effect_id") or record_file.stem)
-            manual_record = load_json_file(annotation_path(manual_dir, chat_dir.name, effect_id))
-            manual_score = to_float(manual_record.get("manual_score"))
-            if manual_score is None:
-                manual_score_5 = to_float(manual_record.get("manual_score_5"))
-                if manual_score_5 is not None:
-                    manual_score = (manual_score_5 - 1) / 4 * 100
-            if manual_score is None:
-                continue
-
-            raw_scores = effect_record.get("scores") if isinstance(effect_record.get("scores"), dict) else {}
-            scores = dict(raw_scores)
-            friction_score = to_float(scores.get("friction_score"))
-            if friction_score is not None:
-                scores["friction_quality_score"] = 1 - friction_score
-            records.append(
-                {
-                    "chat_id": chat_dir.name,
-                    "effect_id": effect_id,
-                    "manual_score": manual_score,
-                    "manual_score_5": manual_record.get("manual_score_5"),
-                    "scores": scores,
-                    "status": effect_record.get("status"),
-                    "created_at": effect_record.get("created_at"),
-                    "record_file": str(record_file),
-                }
-            )
+
+        raw_scores = effect_record.get("scores") if isinstance(effect_record.get("scores"), dict) else {}
+        scores = dict(raw_scores)
+        friction_score = to_float(scores.get("friction_score"))
+        if friction_score is not None:
+            scores["friction_quality_score"] = 1 - friction_score
+        records.append(
+            {
+                "chat_id": record_chat_id,
+                "effect_id": effect_id,
+                "manual_score": manual_score,
+                "manual_score_5": manual_record.get("manual_score_5"),
+                "scores": scores,
+                "status": effect_record.get("status"),
+                "created_at": effect_record.get("created_at"),
+                "record_file": str(db_path),
+            }
+        )
     return records
 
 
@@ -306,7 +324,7 @@ def write_json(file_path: Path, records: list[dict[str, Any]], report: list[dict
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="分析 Maisaka 回复效果自动评分与人工评分的相关性和显著性。")
-    parser.add_argument("--log-dir", type=Path, default=DEFAULT_LOG_DIR, help="自动评分 JSON 目录")
+    parser.add_argument("--log-dir", type=Path, default=DEFAULT_LOG_DIR, help="自动评分数据库所在目录")
     parser.add_argument("--manual-dir", type=Path, default=DEFAULT_MANUAL_DIR, help="人工评分 JSON 目录")
     parser.add_argument("--chat-id", default="", help="只分析某个 platform_type_id，例如 qq_group_1028699246")
     parser.add_argument("--include-pending", action="store_true", help="包含尚未 finalized 的记录")
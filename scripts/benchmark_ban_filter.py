@@ -0,0 +1,81 @@
+"""
+过滤词 / 过滤正则匹配基准脚本
+
+对比逐条匹配（旧实现）与预编译匹配器在不同规模过滤列表下的单条消息耗时，
+并校验两者的拦截判断一致。
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.common.utils.utils_ban_filter import BanRegexMatcher, BanWordMatcher  # noqa: E402
+
+ALPHABET = string.ascii_lowercase + "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动"
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(ALPHABET, k=length))
+
+
+def _legacy_word(words: set[str], text: str) -> bool:
+    return next((True for word in words if word in text), False)
+
+
+def _legacy_regex(patterns: set[str], text: str) -> bool:
+    return next((True for pattern in patterns if re.search(pattern, text)), False)
+
+
+def _measure(func, messages: list[str]) -> tuple[float, int]:
+    started = time.perf_counter()
+    hits = sum(1 for message in messages if func(message))
+    return (time.perf_counter() - started) / len(messages) * 1e6, hits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="过滤词 / 过滤正则匹配基准")
+    parser.add_argument("--sizes", default="100,1000,5000,20000", help="过滤列表规模，逗号分隔")
+    parser.add_argument("--messages", type=int, default=200, help="测试消息数量")
+    parser.add_argument("--length", type=int, default=80, help="单条消息长度")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    messages = [_random_text(rng, args.length) for _ in range(args.messages)]
+
+    print(f"{'kind':<7}{'entries':>9}{'legacy_us':>12}{'compiled_us':>13}{'build_ms':>10}{'hits':>7}")
+    for size in [int(item) for item in args.sizes.split(",") if item.strip()]:
+        words = {_random_text(rng, rng.randint(4, 8)) for _ in range(size)}
+        affixes = [(_random_text(rng, 3), _random_text(rng, 2)) for _ in range(size)]
+        patterns = {f"{prefix}\\d+{suffix}" for prefix, suffix in affixes}
+        # 保证部分消息会被拦截
+        for index in range(0, len(messages), 50):
+            prefix, suffix = affixes[index % len(affixes)]
+            injected = rng.choice([next(iter(words)), f"{prefix}42{suffix}"])
+            messages[index] = messages[index][:10] + injected + messages[index][10:]
+
+        for kind, entries, factory, legacy in (
+            ("word", words, BanWordMatcher, _legacy_word),
+            ("regex", patterns, BanRegexMatcher, _legacy_regex),
+        ):
+            started = time.perf_counter()
+            matcher = factory(entries)
+            build_ms = (time.perf_counter() - started) * 1000
+            legacy_us, legacy_hits = _measure(lambda text, e=entries, f=legacy: f(e, text), messages)
+            compiled_us, compiled_hits = _measure(lambda text, m=matcher: m.find(text) is not None, messages)
+            if legacy_hits != compiled_hits:
+                print(f"结果不一致: {kind} {size} legacy={legacy_hits} compiled={compiled_hits}")
+                return 1
+            print(f"{kind:<7}{size:>9}{legacy_us:>12.1f}{compiled_us:>13.1f}{build_ms:>10.1f}{compiled_hits:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+HTML 渲染服务延迟基准脚本
+
+使用本机 Playwright Chromium，按固定并发反复渲染一组卡片 HTML，对比以下三种配置下
+的 p50 / p99 延迟与吞吐量：
+
+- baseline：每次渲染新建浏览器上下文，不使用缓存；
+- pool：启用页面池复用上下文与页面；
+- pool+cache：在页面池基础上启用渲染结果磁盘缓存。
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.services.html_render_cache import HtmlRenderCache  # noqa: E402
+from src.services.html_render_service import HTMLRenderService, HtmlRenderRequest  # noqa: E402
+
+_CASES: Dict[str, Dict[str, object]] = {
+    "baseline": {"page_pool_size": 0, "cache_enabled": False},
+    "pool": {"page_pool_size": 4, "cache_enabled": False},
+    "pool+cache": {"page_pool_size": 4, "cache_enabled": True},
+}
+
+
+def _build_card_html(index: int) -> str:
+    """构造一张近似插件状态卡片的 HTML。"""
+    rows = "".join(f"<li>第 {row} 项：数值 {index * 7 + row}</li>" for row in range(12))
+    return (
+        "<html><body style='font-family:sans-serif;background:#f5f5f5'>"
+        f"<div class='card' style='width:480px;padding:16px;background:#fff'><h2>卡片 {index}</h2><ul>{rows}</ul></div>"
+        "</body></html>"
+    )
+
+
+async def _run_case(
+    name: str,
+    requests: int,
+    concurrency: int,
+    distinct_cards: int,
+    cache_dir: Path,
+) -> Dict[str, float]:
+    service = HTMLRenderService()
+    config = service._get_render_config().model_copy(update=_CASES[name])
+    service._get_render_config = lambda: config  # type: ignore[method-assign]
+    # 缓存写入临时目录，避免污染项目数据目录
+    service._render_cache = HtmlRenderCache(
+        cache_dir,
+        max_entries=config.cache_max_entries,
+        max_bytes=config.cache_max_size_mb * 1024 * 1024,
+    )
+
+    cards = [_build_card_html(index) for index in range(distinct_cards)]
+    latencies: List[float] = []
+
+    async def _worker(worker_index: int) -> None:
+        for request_index in range(worker_index, requests, concurrency):
+            request = HtmlRenderRequest(html=cards[request_index % distinct_cards], selector=".card")
+            started = time.perf_counter()
+            await service.render_html_to_png(request)
+            latencies.append(time.perf_counter() - started)
+
+    # 预热：启动浏览器并填充页面池，不计入统计
+    await service.render_html_to_png(HtmlRenderRequest(html="<p>warmup</p>"))
+    await asyncio.sleep(0.5)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await service.reset_browser(restart_playwright=True)
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000,
+    }
+
+
+async def _main(args: argparse.Namespace) -> int:
+    print(f"{'case':<12}{'req/s':>10}{'p50_ms':>10}{'p99_ms':>10}")
+    for name in _CASES:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = await _run_case(name, args.requests, args.concurrency, args.distinct_cards, Path(temp_dir))
+        print(f"{name:<12}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTML 渲染服务延迟基准")
+    parser.add_argument("--requests", type=int, default=200, help="每组渲染请求总数")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发中的渲染请求数")
+    parser.add_argument("--distinct-cards", type=int, default=20, help="不同卡片的数量，用于控制缓存命中率")
+    return asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
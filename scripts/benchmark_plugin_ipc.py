@@ -0,0 +1,179 @@
+"""
+插件运行时 IPC 吞吐与延迟基准脚本
+
+在同一进程内分别通过 UDS 与 TCP 建立 Host / Runner 连接，模拟高频 Hook 调用：
+客户端保持固定数量的并发请求，服务端解码后回显 payload。对比完整校验（full）
+与仅校验信封头（header）两种编解码模式下的吞吐量和延迟分位数。
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.plugin_runtime.protocol.codec import EnvelopeValidationMode, MsgPackCodec  # noqa: E402
+from src.plugin_runtime.protocol.envelope import Envelope, MessageType  # noqa: E402
+from src.plugin_runtime.transport.base import Connection, TransportClient, TransportServer  # noqa: E402
+from src.plugin_runtime.transport.tcp import TCPTransportClient, TCPTransportServer  # noqa: E402
+
+
+def _build_payload(segments: int) -> Dict[str, Any]:
+    """构造近似真实 Hook 调用的消息载荷。"""
+    return {
+        "hook_name": "chat.receive.before_process",
+        "kwargs": {
+            "message": {
+                "message_id": "bench-message",
+                "platform": "qq",
+                "message_info": {
+                    "user_info": {"user_id": "10001", "user_nickname": "bench"},
+                    "group_info": {"group_id": "20002", "group_name": "bench-group"},
+                    "additional_config": {"platform_io_account_id": "30003"},
+                },
+                "raw_message": [{"type": "text", "data": f"第 {index} 段消息内容" * 4} for index in range(segments)],
+                "processed_plain_text": "基准测试消息" * segments,
+            }
+        },
+    }
+
+
+def _make_server(kind: str) -> TransportServer:
+    if kind == "uds":
+        from src.plugin_runtime.transport.uds import UDSTransportServer
+
+        return UDSTransportServer()
+    return TCPTransportServer()
+
+
+def _make_client(kind: str, address: str) -> TransportClient:
+    if kind == "uds":
+        from src.plugin_runtime.transport.uds import UDSTransportClient
+
+        return UDSTransportClient(Path(address))
+    host, port = address.rsplit(":", 1)
+    return TCPTransportClient(host, int(port))
+
+
+async def _serve(conn: Connection, codec: MsgPackCodec) -> None:
+    while True:
+        try:
+            data = await conn.recv_frame()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        request = codec.decode_envelope(data)
+        await conn.send_frame(codec.encode_envelope(request.make_response(payload=request.payload)))
+
+
+async def _run_case(
+    kind: str,
+    mode: EnvelopeValidationMode,
+    requests: int,
+    concurrency: int,
+    segments: int,
+) -> Dict[str, float]:
+    codec = MsgPackCodec(validation_mode=mode)
+    server = _make_server(kind)
+    await server.start(lambda conn: _serve(conn, codec))
+    conn = await _make_client(kind, server.get_address()).connect()
+
+    payload = _build_payload(segments)
+    pending: Dict[int, asyncio.Future[Envelope]] = {}
+    latencies: List[float] = []
+
+    async def _recv_loop() -> None:
+        while pending or not done.is_set():
+            envelope = codec.decode_envelope(await conn.recv_frame())
+            future = pending.pop(envelope.request_id, None)
+            if future is not None and not future.done():
+                future.set_result(envelope)
+
+    async def _worker(worker_index: int) -> None:
+        loop = asyncio.get_running_loop()
+        for request_id in range(worker_index, requests, concurrency):
+            envelope = Envelope(
+                request_id=request_id,
+                message_type=MessageType.REQUEST,
+                method="plugin.invoke_hook",
+                plugin_id="bench",
+                payload=payload,
+            )
+            future: asyncio.Future[Envelope] = loop.create_future()
+            pending[request_id] = future
+            started = time.perf_counter()
+            await conn.send_frame(codec.encode_envelope(envelope))
+            await future
+            latencies.append(time.perf_counter() - started)
+
+    done = asyncio.Event()
+    receiver = asyncio.create_task(_recv_loop())
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    receiver.cancel()
+    await asyncio.gather(receiver, return_exceptions=True)
+    await conn.close()
+    await asyncio.sleep(0.05)  # 等待服务端处理完连接关闭
+    await server.stop()
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def _measure_codec(mode: EnvelopeValidationMode, segments: int, rounds: int) -> float:
+    """测量单个请求信封一次编码加一次解码的平均耗时（微秒）。"""
+    codec = MsgPackCodec(validation_mode=mode)
+    envelope = Envelope(
+        request_id=1,
+        message_type=MessageType.REQUEST,
+        method="plugin.invoke_hook",
+        plugin_id="bench",
+        payload=_build_payload(segments),
+    )
+    started = time.perf_counter()
+    for _ in range(rounds):
+        codec.decode_envelope(codec.encode_envelope(envelope))
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+async def _main(args: argparse.Namespace) -> int:
+    kinds = [kind for kind in args.transports.split(",") if kind.strip()]
+    if sys.platform == "win32" and "uds" in kinds:
+        kinds.remove("uds")
+        print("Windows 不支持 UDS，已跳过")
+
+    for mode in (EnvelopeValidationMode.FULL, EnvelopeValidationMode.HEADER):
+        print(f"codec {mode.value:<7} encode+decode {_measure_codec(mode, args.segments, 5000):.1f} us")
+
+    print(f"{'transport':<10}{'mode':<8}{'req/s':>10}{'p50_ms':>9}{'p99_ms':>9}")
+    for kind in kinds:
+        for mode in (EnvelopeValidationMode.FULL, EnvelopeValidationMode.HEADER):
+            result = await _run_case(kind, mode, args.requests, args.concurrency, args.segments)
+            print(f"{kind:<10}{mode.value:<8}{result['rps']:>10.0f}{result['p50_ms']:>9.3f}{result['p99_ms']:>9.3f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="插件运行时 IPC 吞吐与延迟基准")
+    parser.add_argument("--transports", default="uds,tcp", help="要测试的传输方式，逗号分隔")
+    parser.add_argument("--requests", type=int, default=20000, help="每组请求总数")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发中的请求数")
+    parser.add_argument("--segments", type=int, default=20, help="消息载荷中的消息段数量，用于控制载荷大小")
+    return asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
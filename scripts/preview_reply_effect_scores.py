@@ -1,16 +1,19 @@
+from contextlib import contextmanager
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from urllib.parse import parse_qs, urlparse
 
 import argparse
 import json
 import mimetypes
+import sqlite3
 import time
 import webbrowser
 
 
 DEFAULT_LOG_DIR = Path("logs") / "maisaka_reply_effect"
+REPLY_EFFECT_DB_NAME = "reply_effect.db"
 DEFAULT_MANUAL_DIR = Path("logs") / "maisaka_reply_effect_manual"
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8765
@@ -25,8 +28,15 @@ def normalize_name(value: str) -> str:
 
 def load_json_file(file_path: Path) -> dict[str, Any]:
     try:
-        payload = json.loads(file_path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        return load_json_text(file_path.read_text(encoding="utf-8"))
+    except OSError:
+        return {}
+
+
+def load_json_text(raw_text: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(raw_text)
+    except json.JSONDecodeError:
         return {}
     return payload if isinstance(payload, dict) else {}
 
@@ -42,26 +52,35 @@ class ReplyEffectRepository:
     def __init__(self, log_dir: Path, manual_dir: Path) -> None:
         self.log_dir = log_dir
         self.manual_dir = manual_dir
+        self.db_path = log_dir / REPLY_EFFECT_DB_NAME
 
     def list_chats(self) -> list[dict[str, Any]]:
-        chats: list[dict[str, Any]] = []
-        if not self.log_dir.exists():
-            return chats
-
-        for chat_dir in sorted(path for path in self.log_dir.iterdir() if path.is_dir()):
-            records = list(chat_dir.glob("*.json"))
-            annotation_dir = self.manual_dir / normalize_name(chat_dir.name)
-            annotated_count = len(list(annotation_dir.glob("*.json"))) if annotation_dir.exists() else 0
-            chats.append(
-                {
-                    "chat_id": chat_dir.name,
-                    "record_count": len(records),
-                    "finalized_count": None,
-                    "pending_count": None,
+        chats: dict[str, dict[str, Any]] = {}
+        with self._connect() as connection:
+            if connection is None:
+                return []
+            rows = connection.execute(
+                "SELECT chat_id, status, COUNT(*) FROM reply_effect_records GROUP BY chat_id, status ORDER BY chat_id"
+            ).fetchall()
+
+        for chat_id, status, count in rows:
+            chat = chats.get(chat_id)
+            if chat is None:
+                annotation_dir = self.manual_dir / normalize_name(chat_id)
+                annotated_count = len(list(annotation_dir.glob("*.json"))) if annotation_dir.exists() else 0
+                chat = chats[chat_id] = {
+                    "chat_id": chat_id,
+                    "record_count": 0,
+                    "finalized_count": 0,
+                    "pending_count": 0,
                     "annotated_count": annotated_count,
                 }
-            )
-        return chats
+            chat["record_count"] += count
+            if status == "finalized":
+                chat["finalized_count"] += count
+            elif status == "pending":
+                chat["pending_count"] += count
+        return list(chats.values())
 
     def list_records(
         self,
@@ -77,24 +96,37 @@ class ReplyEffectRepository:
         normalized_offset = max(0, int(offset or 0))
         matched_count = 0
         has_more = False
-        for record_file in self._iter_record_files(chat_id, newest_first=True):
-            payload = load_json_file(record_file)
-            if not payload:
-                continue
-            summary = self._build_record_summary(record_file, payload)
-            if status and summary["status"] != status:
-                continue
-            if annotated == "yes" and summary["manual"] is None:
-                continue
-            if annotated == "no" and summary["manual"] is not None:
-                continue
-            matched_count += 1
-            if matched_count <= normalized_offset:
-                continue
-            if len(records) >= normalized_limit:
-                has_more = True
-                break
-            records.append(summary)
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        if chat_id:
+            conditions.append("chat_id = ?")
+            parameters.append(normalize_name(chat_id))
+        if status:
+            conditions.append("status = ?")
+            parameters.append(status)
+        sql = "SELECT chat_id, payload FROM reply_effect_records"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at DESC, id DESC"
+
+        with self._connect() as connection:
+            rows = connection.execute(sql, parameters) if connection is not None else []
+            for record_chat_id, raw_payload in rows:
+                payload = load_json_text(raw_payload)
+                if not payload:
+                    continue
+                summary = self._build_record_summary(record_chat_id, payload)
+                if annotated == "yes" and summary["manual"] is None:
+                    continue
+                if annotated == "no" and summary["manual"] is not None:
+                    continue
+                matched_count += 1
+                if matched_count <= normalized_offset:
+                    continue
+                if len(records) >= normalized_limit:
+                    has_more = True
+                    break
+                records.append(summary)
         return {
             "records": records,
             "has_more": has_more,
@@ -103,17 +135,14 @@ class ReplyEffectRepository:
         }
 
     def get_record(self, chat_id: str, effect_id: str, *, compact: bool = False) -> dict[str, Any]:
-        record_file = self._find_record_file(chat_id, effect_id)
-        if record_file is None:
-            return {}
-        payload = load_json_file(record_file)
+        payload = self._load_record(chat_id, effect_id)
         if not payload:
             return {}
         self._strip_heavy_reply_metadata(payload)
         if compact:
             payload["context_snapshot"] = []
         payload["_manual"] = self.get_annotation(chat_id, effect_id)
-        payload["_record_path"] = str(record_file)
+        payload["_record_path"] = str(self.db_path)
         return payload
 
     def get_annotation(self, chat_id: str, effect_id: str) -> dict[str, Any] | None:
@@ -128,7 +157,7 @@ class ReplyEffectRepository:
         effect_id = normalize_name(str(payload.get("effect_id") or ""))
         if not chat_id or chat_id == "unknown" or not effect_id or effect_id == "unknown":
             raise ValueError("缺少 chat_id 或 effect_id")
-        if not self._record_exists(chat_id, effect_id):
+        if not self._load_record(chat_id, effect_id):
             raise ValueError("找不到对应的回复效果记录")
 
         manual_score = payload.get("manual_score")
@@ -165,67 +194,32 @@ class ReplyEffectRepository:
         write_json_file(self._annotation_path(chat_id, effect_id), annotation)
         return annotation
 
-    def _iter_record_files(self, chat_id: str | None = None, *, newest_first: bool = False) -> list[Path]:
-        if not self.log_dir.exists():
-            return []
-        if chat_id:
-            chat_dir = self.log_dir / normalize_name(chat_id)
-            if not chat_dir.exists() or not chat_dir.is_dir():
-                return []
-            return self._sort_record_files(chat_dir.glob("*.json"), newest_first=newest_first)
-
-        record_files: list[Path] = []
-        for chat_dir in self.log_dir.iterdir():
-            if chat_dir.is_dir():
-                record_files.extend(chat_dir.glob("*.json"))
-        return self._sort_record_files(record_files, newest_first=newest_first)
-
-    @staticmethod
-    def _sort_record_files(record_files: Any, *, newest_first: bool) -> list[Path]:
-        return sorted(
-            record_files,
-            key=lambda path: (path.stat().st_mtime, path.name),
-            reverse=newest_first,
-        )
-
-    def _find_record_file(self, chat_id: str, effect_id: str) -> Path | None:
-        normalized_effect_id = normalize_name(effect_id)
-        direct_match = self._direct_record_file(chat_id, effect_id)
-        if direct_match is not None:
-            return direct_match
-        for record_file in self._iter_record_files(chat_id):
-            payload = load_json_file(record_file)
-            if normalize_name(str(payload.get("effect_id") or "")) == normalized_effect_id:
-                return record_file
-        return None
-
-    def _record_exists(self, chat_id: str, effect_id: str) -> bool:
-        if self._direct_record_file(chat_id, effect_id) is not None:
-            return True
-        return self._find_record_file(chat_id, effect_id) is not None
-
-    def _direct_record_file(self, chat_id: str, effect_id: str) -> Path | None:
-        chat_dir = self.log_dir / normalize_name(chat_id)
-        if not chat_dir.exists() or not chat_dir.is_dir():
-            return None
-        normalized_effect_id = normalize_name(effect_id)
-        matches = sorted(chat_dir.glob(f"*_{normalized_effect_id}.json"))
-        if not matches:
-            exact_path = chat_dir / f"{normalized_effect_id}.json"
-            return exact_path if exact_path.exists() else None
-        return matches[-1]
-
-    def _annotation_path(self, chat_id: str, record_file_or_effect_id: Path | str) -> Path:
-        if isinstance(record_file_or_effect_id, Path):
-            payload = load_json_file(record_file_or_effect_id)
-            effect_id = str(payload.get("effect_id") or record_file_or_effect_id.stem).strip()
-        else:
-            effect_id = str(record_file_or_effect_id or "").strip()
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection | None]:
+        if not self.db_path.exists():
+            yield None
+            return
+        connection = sqlite3.connect(str(self.db_path))
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _load_record(self, chat_id: str, effect_id: str) -> dict[str, Any]:
+        with self._connect() as connection:
+            if connection is None:
+                return {}
+            row = connection.execute(
+                "SELECT payload FROM reply_effect_records WHERE chat_id = ? AND effect_id = ?",
+                (normalize_name(chat_id), str(effect_id or "").strip()),
+            ).fetchone()
+        return load_json_text(row[0]) if row is not None else {}
+
+    def _annotation_path(self, chat_id: str, effect_id: str) -> Path:
         return self.manual_dir / normalize_name(chat_id) / f"{normalize_name(effect_id)}.json"
 
-    def _build_record_summary(self, record_file: Path, payload: dict[str, Any]) -> dict[str, Any]:
-        chat_id = record_file.parent.name
-        effect_id = str(payload.get("effect_id") or record_file.stem)
+    def _build_record_summary(self, chat_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        effect_id = str(payload.get("effect_id") or "")
         scores = payload.get("scores") if isinstance(payload.get("scores"), dict) else {}
         reply = payload.get("reply") if isinstance(payload.get("reply"), dict) else {}
         target_user = payload.get("target_user") if isinstance(payload.get("target_user"), dict) else {}
@@ -245,7 +239,7 @@ class ReplyEffectRepository:
             "target_message_id": str(reply.get("target_message_id") or ""),
             "target_user": target_user,
             "followup_count": len(payload.get("followup_messages") or []),
-            "file_name": record_file.name,
+            "file_name": effect_id,
         }
 
     @staticmethod
@@ -2506,7 +2500,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="预览 Maisaka 回复效果评分，并记录人工评分。")
     parser.add_argument("--host", default=DEFAULT_HOST, help=f"监听地址，默认 {DEFAULT_HOST}")
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口，默认 {DEFAULT_PORT}")
-    parser.add_argument("--log-dir", type=Path, default=DEFAULT_LOG_DIR, help="回复效果 JSON 日志目录")
+    parser.add_argument("--log-dir", type=Path, default=DEFAULT_LOG_DIR, help="回复效果数据库所在目录")
     parser.add_argument("--manual-dir", type=Path, default=DEFAULT_MANUAL_DIR, help="人工评分 JSON 保存目录")
     parser.add_argument("--no-browser", action="store_true", help="不自动打开浏览器")
     args = parser.parse_args()
@@ -38,6 +38,9 @@ from .search_runtime_initializer import SearchRuntimeBundle, build_search_runtim
 
 logger = get_logger("A_Memorix.SDKMemoryKernel")
 
+# 批量 IN 查询的单批参数上限，低于 SQLite 默认的 999 个绑定变量
+_SQL_IN_BATCH_SIZE = 500
+
 
 @dataclass
 class KernelSearchRequest:
@@ -1415,7 +1418,17 @@ class SDKMemoryKernel:
 
         act = str(action or "").strip().lower()
         if act == "get_graph":
-            return {"success": True, **self._serialize_graph(limit=max(1, int(kwargs.get("limit", 200) or 200)))}
+            payload = self._serialize_graph(
+                limit=max(1, int(kwargs.get("limit", 200) or 200)),
+                cursor=kwargs.get("cursor"),
+                focus=str(kwargs.get("focus", "") or "").strip(),
+                strategy=str(kwargs.get("strategy", "degree") or "degree"),
+                depth=int(kwargs["depth"]) if kwargs.get("depth") is not None else None,
+                max_edges_per_node=max(0, int(kwargs.get("max_edges_per_node", 0) or 0)),
+            )
+            if payload.get("success") is False:
+                return payload
+            return {"success": True, **payload}
         if act == "search":
             return self._search_graph(
                 query=str(kwargs.get("query", "") or "").strip(),
@@ -4021,31 +4034,79 @@ class SDKMemoryKernel:
             return
         self._active_person_timestamps[token] = time.time()
 
-    def _serialize_graph(self, *, limit: int = 200) -> Dict[str, Any]:
+    def _serialize_graph(
+        self,
+        *,
+        limit: int = 200,
+        cursor: Optional[str] = None,
+        focus: str = "",
+        strategy: str = "degree",
+        depth: Optional[int] = None,
+        max_edges_per_node: int = 0,
+    ) -> Dict[str, Any]:
+        """按页序列化图谱视图。
+
+        节点按 ``strategy``（degree/saliency）排序取 top-k，或以 ``focus`` 为中心做广度优先扩展；
+        边通过稀疏邻接矩阵切片获得，谓词与证据数各用一次批量 SQL 查询解析。
+        ``cursor`` 为上一页返回的 ``next_cursor``，每页只返回新增节点以及新增节点与已加载节点之间的边，
+        客户端可逐页合并渲染。``max_edges_per_node`` 大于 0 时按权重为每个节点保留最重要的若干条边
+        （细节层次采样），被省略的边数记录在 ``omitted_edges`` 中。
+        """
         assert self.graph_store is not None
         assert self.metadata_store is not None
-        nodes = self.graph_store.get_nodes()
-        if limit > 0:
-            nodes = nodes[:limit]
-        node_set = set(nodes)
-        node_payload = []
-        for name in nodes:
-            attrs = self.graph_store.get_node_attributes(name) or {}
-            node_payload.append({"id": name, "name": name, "attributes": attrs})
+        safe_limit = max(1, int(limit or 200))
+        try:
+            offset = max(0, int(cursor or 0))
+        except (TypeError, ValueError):
+            return {"success": False, "error": f"无效的分页游标: {cursor}"}
+        end = offset + safe_limit
+
+        focus_token = str(focus or "").strip()
+        if focus_token:
+            if not self.graph_store.has_node(focus_token):
+                return {"success": False, "error": f"未找到节点: {focus_token}"}
+            # 多取一个节点用于判断是否还有下一页
+            ranked = self.graph_store.expand_neighborhood(focus_token, end + 1, max_depth=depth)
+            strategy_token = "focus"
+        else:
+            strategy_token = str(strategy or "degree").strip().lower()
+            if strategy_token not in {"degree", "saliency"}:
+                return {"success": False, "error": f"不支持的图谱视图策略: {strategy}"}
+            ranked = self.graph_store.rank_nodes(by=strategy_token, limit=end + 1)
+
+        has_more = len(ranked) > end
+        loaded = ranked[:end]
+        page_nodes = loaded[offset:]
+        node_payload = [
+            {"id": name, "name": name, "attributes": self.graph_store.get_node_attributes(name) or {}}
+            for name in page_nodes
+        ]
+
+        edges = self.graph_store.get_subgraph_edges(loaded, new_from=offset) if page_nodes else []
+        omitted_edges = 0
+        if max_edges_per_node > 0 and edges:
+            kept = self._sample_graph_edges(edges, max_edges_per_node)
+            omitted_edges = len(edges) - len(kept)
+            edges = kept
+
+        edge_hash_tokens = [
+            sorted(str(item) for item in relation_hashes if str(item).strip()) for _, _, _, relation_hashes in edges
+        ]
+        all_hashes = self._dedupe_strings(token for tokens in edge_hash_tokens for token in tokens)
+        predicate_map = self._query_relation_predicates_by_hashes(all_hashes)
+        evidence_map = self._query_paragraph_hashes_by_relation(all_hashes)
 
         edge_payload = []
-        for source, target, relation_hashes in self.graph_store.iter_edge_hash_entries():
-            if source not in node_set or target not in node_set:
-                continue
-            relation_hash_tokens = sorted(str(item) for item in relation_hashes if str(item).strip())
-            relation_rows = self._query_relation_rows_by_hashes(relation_hash_tokens)
-            predicates = self._dedupe_strings(row.get("predicate", "") for row in relation_rows)
-            evidence_hashes = self._query_distinct_paragraph_hashes_for_relations(relation_hash_tokens)
+        for (source, target, weight, _), relation_hash_tokens in zip(edges, edge_hash_tokens, strict=True):
+            predicates = self._dedupe_strings(predicate_map.get(token, "") for token in relation_hash_tokens)
+            evidence_hashes: set[str] = set()
+            for token in relation_hash_tokens:
+                evidence_hashes.update(evidence_map.get(token, ()))
             edge_payload.append(
                 {
                     "source": source,
                     "target": target,
-                    "weight": float(self.graph_store.get_edge_weight(source, target)),
+                    "weight": float(weight),
                     "relation_hashes": relation_hash_tokens,
                     "predicates": predicates,
                     "relation_count": len(relation_hash_tokens),
@@ -4058,8 +4119,29 @@ class SDKMemoryKernel:
             "edges": edge_payload,
             "total_nodes": int(self.graph_store.num_nodes),
             "total_edges": int(self.graph_store.num_edges),
+            "strategy": strategy_token,
+            "focus": focus_token,
+            "next_cursor": str(end) if has_more else None,
+            "omitted_edges": omitted_edges,
         }
 
+    @staticmethod
+    def _sample_graph_edges(
+        edges: Sequence[tuple[str, str, float, Any]],
+        max_edges_per_node: int,
+    ) -> List[tuple[str, str, float, Any]]:
+        """细节层次采样：边只要位于任一端点按权重排序的前 ``max_edges_per_node`` 条内即保留。"""
+        ranked = sorted(range(len(edges)), key=lambda index: -float(edges[index][2]))
+        counts: Dict[str, int] = {}
+        keep: set[int] = set()
+        for index in ranked:
+            source, target = edges[index][0], edges[index][1]
+            if counts.get(source, 0) < max_edges_per_node or counts.get(target, 0) < max_edges_per_node:
+                keep.add(index)
+                counts[source] = counts.get(source, 0) + 1
+                counts[target] = counts.get(target, 0) + 1
+        return [edge for index, edge in enumerate(edges) if index in keep]
+
     @staticmethod
     def _graph_search_match_rank(value: str, keyword: str) -> Optional[int]:
         token = str(value or "").strip().lower()
@@ -4106,34 +4188,10 @@ class SDKMemoryKernel:
                 "error": "query 不能为空",
             }
 
-        like_keyword = f"%{normalized_query}%"
-        entity_rows = self.metadata_store.query(
-            """
-            SELECT hash, name, appearance_count, created_at
-            FROM entities
-            WHERE (is_deleted IS NULL OR is_deleted = 0)
-              AND (
-                LOWER(COALESCE(name, '')) LIKE ?
-                OR LOWER(COALESCE(hash, '')) LIKE ?
-              )
-            """,
-            (like_keyword, like_keyword),
-        )
-
-        relation_rows = self.metadata_store.query(
-            """
-            SELECT hash, subject, predicate, object, confidence, created_at
-            FROM relations
-            WHERE (is_inactive IS NULL OR is_inactive = 0)
-              AND (
-                LOWER(COALESCE(subject, '')) LIKE ?
-                OR LOWER(COALESCE(object, '')) LIKE ?
-                OR LOWER(COALESCE(predicate, '')) LIKE ?
-                OR LOWER(COALESCE(hash, '')) LIKE ?
-              )
-            """,
-            (like_keyword, like_keyword, like_keyword, like_keyword),
-        )
+        # 候选集由 trigram 索引按相关度截取，再按精确/前缀/包含的匹配等级精排
+        candidate_limit = max(safe_limit * 4, 100)
+        entity_rows = self.metadata_store.search_entities_by_text(token, limit=candidate_limit)
+        relation_rows = self.metadata_store.search_relations_by_text(token, limit=candidate_limit)
 
         entity_items: List[Dict[str, Any]] = []
         seen_entity_keys: set[str] = set()
@@ -4319,6 +4377,51 @@ class SDKMemoryKernel:
         rows = self.metadata_store.query(sql, tuple(params))
         return [str(row.get("hash", "") or "").strip() for row in rows if str(row.get("hash", "") or "").strip()]
 
+    def _query_relation_predicates_by_hashes(self, relation_hashes: Sequence[str]) -> Dict[str, str]:
+        """批量查询活跃关系的谓词，返回 relation_hash -> predicate。"""
+        assert self.metadata_store is not None
+        hashes = [str(item or "").strip() for item in relation_hashes if str(item or "").strip()]
+        predicates: Dict[str, str] = {}
+        for start in range(0, len(hashes), _SQL_IN_BATCH_SIZE):
+            batch = hashes[start : start + _SQL_IN_BATCH_SIZE]
+            placeholders = ",".join(["?"] * len(batch))
+            rows = self.metadata_store.query(
+                f"""
+                SELECT hash, predicate
+                FROM relations
+                WHERE hash IN ({placeholders})
+                  AND (is_inactive IS NULL OR is_inactive = 0)
+                """,
+                tuple(batch),
+            )
+            for row in rows:
+                predicates[str(row.get("hash", "") or "")] = str(row.get("predicate", "") or "")
+        return predicates
+
+    def _query_paragraph_hashes_by_relation(self, relation_hashes: Sequence[str]) -> Dict[str, set[str]]:
+        """批量查询关系对应的未删除证据段落，返回 relation_hash -> {paragraph_hash}。"""
+        assert self.metadata_store is not None
+        hashes = [str(item or "").strip() for item in relation_hashes if str(item or "").strip()]
+        evidence: Dict[str, set[str]] = {}
+        for start in range(0, len(hashes), _SQL_IN_BATCH_SIZE):
+            batch = hashes[start : start + _SQL_IN_BATCH_SIZE]
+            placeholders = ",".join(["?"] * len(batch))
+            rows = self.metadata_store.query(
+                f"""
+                SELECT DISTINCT pr.relation_hash, pr.paragraph_hash
+                FROM paragraph_relations pr
+                JOIN paragraphs p ON p.hash = pr.paragraph_hash
+                WHERE pr.relation_hash IN ({placeholders})
+                  AND (p.is_deleted IS NULL OR p.is_deleted = 0)
+                """,
+                tuple(batch),
+            )
+            for row in rows:
+                paragraph_hash = str(row.get("paragraph_hash", "") or "").strip()
+                if paragraph_hash:
+                    evidence.setdefault(str(row.get("relation_hash", "") or ""), set()).add(paragraph_hash)
+        return evidence
+
     def _load_paragraph_rows(self, paragraph_hashes: Sequence[str]) -> List[Dict[str, Any]]:
         assert self.metadata_store is not None
         hashes = [str(item or "").strip() for item in paragraph_hashes if str(item or "").strip()]
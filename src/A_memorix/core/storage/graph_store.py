@@ -721,6 +721,152 @@ class GraphStore:
             out.append((idx_to_node[s_idx], idx_to_node[t_idx], set(hashes)))
         return out
 
+    def get_node_degrees(self) -> np.ndarray:
+        """
+        获取所有节点的度数（出边 + 入边），按节点索引排列
+
+        直接基于稀疏矩阵的 indptr/indices 向量化统计，不逐节点遍历。
+        """
+        n = len(self._nodes)
+        if self._adjacency is None or n == 0:
+            return np.zeros(n, dtype=np.int64)
+
+        adj = self._adjacency.tocsr()
+        degrees = np.zeros(n, dtype=np.int64)
+        out_degrees = np.diff(adj.indptr)[:n]
+        degrees[: len(out_degrees)] += out_degrees
+        degrees += np.bincount(adj.indices, minlength=n)[:n]
+        return degrees
+
+    def rank_nodes(self, by: str = "degree", limit: Optional[int] = None) -> List[str]:
+        """
+        按重要性对节点排序
+
+        Args:
+            by: 排序依据，degree（度数）或 saliency（PageRank 显著性）
+            limit: 返回的最大节点数，None 表示全部
+
+        Returns:
+            按重要性降序排列的节点列表，分数相同时保持插入顺序
+        """
+        n = len(self._nodes)
+        if n == 0:
+            return []
+
+        if by == "saliency":
+            saliency = self.get_saliency_scores()
+            scores = np.asarray([saliency.get(node, 0.0) for node in self._nodes], dtype=np.float64)
+        elif by == "degree":
+            scores = self.get_node_degrees().astype(np.float64)
+        else:
+            raise ValueError(f"不支持的节点排序方式: {by}")
+
+        order = np.argsort(-scores, kind="stable")
+        if limit is not None:
+            order = order[: max(0, int(limit))]
+        return [self._nodes[int(idx)] for idx in order]
+
+    def expand_neighborhood(
+        self,
+        focus: str,
+        limit: int,
+        max_depth: Optional[int] = None,
+    ) -> List[str]:
+        """
+        以焦点节点为中心做广度优先扩展（忽略边方向）
+
+        同一层内的邻居按度数降序加入，保证截断时优先保留枢纽节点。
+
+        Args:
+            focus: 焦点节点名称
+            limit: 返回的最大节点数
+            max_depth: 最大扩展深度，None 表示不限制
+
+        Returns:
+            节点列表，第一个元素为焦点节点；焦点不存在时返回空列表
+        """
+        canon = self._canonicalize(focus)
+        if canon not in self._node_to_idx or limit <= 0:
+            return []
+
+        start = self._node_to_idx[canon]
+        order: List[int] = [start]
+        if self._adjacency is None:
+            return [self._nodes[start]]
+
+        adj = self._adjacency.tocsr()
+        self._ensure_adjacency_T()
+        adj_t = self._adjacency_T
+        degrees = self.get_node_degrees()
+        visited = np.zeros(len(self._nodes), dtype=bool)
+        visited[start] = True
+        frontier = np.asarray([start], dtype=np.int64)
+        depth = 0
+
+        while len(order) < limit and frontier.size > 0:
+            if max_depth is not None and depth >= max_depth:
+                break
+            neighbor_chunks = [self._row_neighbor_indices(adj, int(idx)) for idx in frontier]
+            if adj_t is not None:
+                neighbor_chunks.extend(self._row_neighbor_indices(adj_t, int(idx)) for idx in frontier)
+            if not neighbor_chunks:
+                break
+            candidates = np.unique(np.concatenate(neighbor_chunks).astype(np.int64))
+            candidates = candidates[(candidates < len(visited))]
+            candidates = candidates[~visited[candidates]]
+            if candidates.size == 0:
+                break
+            candidates = candidates[np.argsort(-degrees[candidates], kind="stable")]
+            candidates = candidates[: limit - len(order)]
+            visited[candidates] = True
+            order.extend(int(idx) for idx in candidates)
+            frontier = candidates
+            depth += 1
+
+        return [self._nodes[idx] for idx in order]
+
+    def get_subgraph_edges(
+        self,
+        nodes: List[str],
+        new_from: int = 0,
+    ) -> List[Tuple[str, str, float, Set[str]]]:
+        """
+        提取节点集合诱导子图中带关系哈希的边
+
+        通过稀疏矩阵行列切片一次取出子矩阵，复杂度只与子图规模相关，
+        不需要遍历整张图的 edge-hash-map。
+
+        Args:
+            nodes: 节点列表
+            new_from: 只返回至少一个端点位于 ``nodes[new_from:]`` 的边，
+                用于分页时只补充新节点带来的边
+
+        Returns:
+            [(source, target, weight, relation_hashes), ...]，按 (source, target) 在 ``nodes`` 中的位置排序
+        """
+        if self._adjacency is None or not nodes or not self._edge_hash_map:
+            return []
+
+        indices = np.asarray([self._node_to_idx[self._canonicalize(node)] for node in nodes], dtype=np.int64)
+        sub = self._adjacency.tocsr()[indices][:, indices].tocoo()
+        rows = sub.row.astype(np.int64)
+        cols = sub.col.astype(np.int64)
+        weights = sub.data
+        if new_from > 0:
+            mask = (rows >= new_from) | (cols >= new_from)
+            rows, cols, weights = rows[mask], cols[mask], weights[mask]
+        order = np.lexsort((cols, rows))
+
+        out: List[Tuple[str, str, float, Set[str]]] = []
+        for pos in order:
+            src_idx = int(indices[rows[pos]])
+            tgt_idx = int(indices[cols[pos]])
+            hashes = self._edge_hash_map.get((src_idx, tgt_idx))
+            if not hashes:
+                continue
+            out.append((self._nodes[src_idx], self._nodes[tgt_idx], float(weights[pos]), set(hashes)))
+        return out
+
     def deactivate_edges(self, edges: List[Tuple[str, str]]) -> int:
         """
         冻结边 (将权重设为0.0，使其在计算意义上消失，但保留在Map中)
@@ -976,6 +1122,9 @@ class GraphStore:
         """
         连接相似节点（同义词）
 
+        需要完整的 N x N 相似度矩阵，仅适用于小规模节点集合；
+        大规模场景请使用 connect_synonyms_from_embeddings。
+
         Args:
             similarity_matrix: 相似度矩阵 (N x N)
             node_list: 对应的节点列表（长度为N）
@@ -991,28 +1140,119 @@ class GraphStore:
             )
 
         # 找到相似的节点对（上三角，排除对角线）
+        upper = np.triu(np.asarray(similarity_matrix), k=1)
         similar_pairs = np.argwhere(
-            (triu(similarity_matrix, k=1) >= threshold) &
-            (triu(similarity_matrix, k=1) < 1.0)  # 排除完全相同的
+            (upper >= threshold) &
+            (upper < 1.0)  # 排除完全相同的
         )
-
-        # 添加边
-        edges = []
-        for i, j in similar_pairs:
-            if i < len(node_list) and j < len(node_list):
-                src = node_list[i]
-                tgt = node_list[j]
-                # 使用相似度作为权重
-                weight = float(similarity_matrix[i, j])
-                edges.append((src, tgt, weight))
-
-        if edges:
-            edge_pairs = [(src, tgt) for src, tgt, _ in edges]
-            weights = [w for _, _, w in edges]
-            count = self.add_edges(edge_pairs, weights)
+        rows = similar_pairs[:, 0]
+        cols = similar_pairs[:, 1]
+        count = self._add_synonym_edges(node_list, rows, cols, upper[rows, cols])
+        if count:
             logger.info(f"连接 {count} 对相似节点（阈值={threshold}）")
-            return count
-        return 0
+        return count
+
+    def connect_synonyms_from_embeddings(
+        self,
+        embeddings: np.ndarray,
+        node_list: List[str],
+        threshold: float = 0.85,
+        block_size: int = 2048,
+    ) -> int:
+        """
+        基于节点向量连接相似节点（同义词）
+
+        以余弦相似度为度量，按 ``block_size x block_size`` 分块计算上三角相似度，
+        峰值内存只与分块大小和命中的边数相关，不需要构造 N x N 矩阵。
+        结果与对归一化向量的相似度矩阵调用 connect_synonyms 一致。
+
+        Args:
+            embeddings: 节点向量 (N x D)
+            node_list: 对应的节点列表（长度为N）
+            threshold: 相似度阈值，必须大于 0
+            block_size: 分块大小
+
+        Returns:
+            添加的边数量
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(node_list) != vectors.shape[0]:
+            raise ValueError(
+                f"节点列表长度与向量数量不匹配: "
+                f"{len(node_list)} vs {vectors.shape[0] if vectors.ndim else 0}"
+            )
+        if threshold <= 0:
+            raise ValueError(f"相似度阈值必须大于 0: {threshold}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        n = vectors.shape[0]
+        block = max(1, int(block_size))
+        row_chunks: List[np.ndarray] = []
+        col_chunks: List[np.ndarray] = []
+        weight_chunks: List[np.ndarray] = []
+        for row_start in range(0, n, block):
+            row_block = vectors[row_start:row_start + block]
+            for col_start in range(row_start, n, block):
+                sims = row_block @ vectors[col_start:col_start + block].T
+                if col_start == row_start:
+                    sims = np.triu(sims, k=1)
+                block_rows, block_cols = np.nonzero((sims >= threshold) & (sims < 1.0))
+                if block_rows.size == 0:
+                    continue
+                row_chunks.append(block_rows + row_start)
+                col_chunks.append(block_cols + col_start)
+                weight_chunks.append(sims[block_rows, block_cols])
+
+        if not row_chunks:
+            return 0
+        count = self._add_synonym_edges(
+            node_list,
+            np.concatenate(row_chunks),
+            np.concatenate(col_chunks),
+            np.concatenate(weight_chunks),
+        )
+        logger.info(f"连接 {count} 对相似节点（阈值={threshold}，分块={block}）")
+        return count
+
+    def _add_synonym_edges(
+        self,
+        node_list: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray,
+    ) -> int:
+        """按 node_list 下标批量添加同义边 (node_list[row] -> node_list[col])，语义与 add_edges 一致。"""
+        if len(rows) == 0:
+            return 0
+
+        self.add_nodes([node for node in node_list if self._canonicalize(node) not in self._node_to_idx])
+        node_indices = np.asarray(
+            [self._node_to_idx[self._canonicalize(node)] for node in node_list],
+            dtype=np.int64,
+        )
+        src_indices = node_indices[np.asarray(rows, dtype=np.int64)]
+        tgt_indices = node_indices[np.asarray(cols, dtype=np.int64)]
+        values = np.asarray(weights, dtype=np.float64)
+
+        if self._modification_mode == GraphModificationMode.INCREMENTAL and self._adjacency is not None:
+            # 与 add_edges 的 LIL 增量路径一致：直接覆盖赋值
+            self._adjacency[src_indices, tgt_indices] = values
+        else:
+            n = len(self._nodes)
+            new_edges = csr_matrix((values, (src_indices, tgt_indices)), shape=(n, n))
+            self._adjacency = new_edges if self._adjacency is None else self._adjacency + new_edges
+            if self.matrix_format == "csc" and isinstance(self._adjacency, csr_matrix):
+                self._adjacency = self._adjacency.tocsc()
+            elif self.matrix_format == "csr" and isinstance(self._adjacency, csc_matrix):
+                self._adjacency = self._adjacency.tocsr()
+
+        self._total_edges_added += len(src_indices)
+        self._adjacency_dirty = True
+        self._saliency_cache = None
+        return int(len(src_indices))
 
 
     # =========================================================================
@@ -11,7 +11,7 @@ import uuid
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union, List, Dict, Any, Tuple, Sequence
+from typing import Optional, Union, List, Dict, Any, Set, Tuple, Sequence
 
 from src.common.logger import get_logger
 from ..utils.hash import compute_hash, normalize_text
@@ -37,6 +37,13 @@ logger = get_logger("A_Memorix.MetadataStore")
 SCHEMA_VERSION = 12
 RUNTIME_AUTO_MIGRATION_MIN_SCHEMA_VERSION = 9
 
+# 图谱检索 trigram 索引：(源表, FTS 表, 索引列)
+GRAPH_SEARCH_FTS_TABLES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("entities", "entities_name_fts", ("name",)),
+    ("relations", "relations_spo_fts", ("subject", "predicate", "object")),
+    ("deleted_relations", "deleted_relations_spo_fts", ("subject", "object")),
+)
+
 
 class MetadataStore:
     """
@@ -71,6 +78,7 @@ class MetadataStore:
         self._conn: Optional[sqlite3.Connection] = None
         self._is_initialized = False
         self._db_path: Optional[Path] = None
+        self._graph_search_fts_ready = False
 
         logger.info(f"MetadataStore 初始化: db={db_name}")
 
@@ -130,6 +138,13 @@ class MetadataStore:
         except Exception as e:
             logger.warning(f"初始化 FTS schema 失败，将跳过 BM25 检索: {e}")
 
+        # 初始化图谱检索 trigram 索引（幂等，首次创建时回填）
+        try:
+            self._graph_search_fts_ready = self.ensure_graph_search_fts()
+        except Exception as e:
+            self._graph_search_fts_ready = False
+            logger.warning(f"初始化图谱检索 FTS 失败，将回退为 LIKE 扫描: {e}")
+
     def _assert_schema_compatible(self, db_existed: bool) -> None:
         """运行时执行 post-1.0 自动迁移；legacy/vNext 仍要求离线迁移。"""
         cursor = self._conn.cursor()
@@ -1500,6 +1515,203 @@ class MetadataStore:
             c.rollback()
             return False
 
+    def ensure_graph_search_fts(self, conn: Optional[sqlite3.Connection] = None) -> bool:
+        """
+        确保图谱检索用的 trigram FTS5 索引存在并与源表同步（幂等）。
+
+        覆盖实体名称、关系与回收站关系的 subject/predicate/object。
+        FTS 表的 rowid 与源表 rowid 一致并通过触发器同步；
+        写入使用 INSERT OR REPLACE，因此源表 ``INSERT OR REPLACE`` 不触发删除触发器时也不会产生重复行。
+        索引行数与源表不一致（首次创建或历史数据）时整体回填。
+        """
+        c = self._resolve_conn(conn)
+        cur = c.cursor()
+        try:
+            for table, fts_table, columns in GRAPH_SEARCH_FTS_TABLES:
+                cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+                if cur.fetchone() is None:
+                    continue
+                column_list = ", ".join(columns)
+                new_values = ", ".join(f"new.{column}" for column in columns)
+                cur.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+                    USING fts5({column_list}, tokenize='trigram')
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ai
+                    AFTER INSERT ON {table}
+                    BEGIN
+                        INSERT OR REPLACE INTO {fts_table}(rowid, {column_list})
+                        VALUES (new.rowid, {new_values});
+                    END
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ad
+                    AFTER DELETE ON {table}
+                    BEGIN
+                        DELETE FROM {fts_table} WHERE rowid = old.rowid;
+                    END
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_au
+                    AFTER UPDATE OF {column_list} ON {table}
+                    BEGIN
+                        INSERT OR REPLACE INTO {fts_table}(rowid, {column_list})
+                        VALUES (new.rowid, {new_values});
+                    END
+                """)
+
+                cur.execute(f"SELECT COUNT(1) FROM {table}")
+                source_count = int(cur.fetchone()[0])
+                cur.execute(f"SELECT COUNT(1) FROM {fts_table}")
+                fts_count = int(cur.fetchone()[0])
+                if source_count != fts_count:
+                    cur.execute(f"DELETE FROM {fts_table}")
+                    cur.execute(f"""
+                        INSERT INTO {fts_table}(rowid, {column_list})
+                        SELECT rowid, {column_list} FROM {table}
+                    """)
+                    logger.info(f"{fts_table} 回填完成: rows={source_count}")
+            c.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"图谱检索 FTS5 schema 创建失败（可能不支持 trigram）: {e}")
+            c.rollback()
+            return False
+
+    @staticmethod
+    def _trigram_match_query(text: str, columns: Sequence[str]) -> str:
+        """构造限定列的 trigram 子串匹配表达式。"""
+        phrase = '"' + str(text).replace('"', '""') + '"'
+        return "{" + " ".join(columns) + "} : " + phrase
+
+    def _search_graph_text(
+        self,
+        *,
+        table: str,
+        fts_table: str,
+        select_columns: str,
+        match_columns: Sequence[str],
+        query: str,
+        limit: int,
+        extra_where: str = "",
+    ) -> List[Dict[str, Any]]:
+        """
+        在图谱检索 trigram 索引上按 bm25 排序检索源表行。
+
+        关键词不足 3 个字符（trigram 无法索引）或索引不可用时退化为带 LIMIT 的 LIKE 扫描。
+        另外按 hash 前缀走主键范围查询，保证粘贴 hash 时仍可命中。
+        """
+        q = str(query or "").strip()
+        if not q:
+            return []
+        safe_limit = max(1, int(limit))
+        where_clause = f" AND {extra_where}" if extra_where else ""
+        cursor = self._conn.cursor()
+
+        rows: List[sqlite3.Row] = []
+        if self._graph_search_fts_ready and len(q) >= 3:
+            try:
+                cursor.execute(
+                    f"""
+                    SELECT {select_columns}
+                    FROM {fts_table}
+                    JOIN {table} t ON t.rowid = {fts_table}.rowid
+                    WHERE {fts_table} MATCH ?{where_clause}
+                    ORDER BY bm25({fts_table}) ASC
+                    LIMIT ?
+                    """,
+                    (self._trigram_match_query(q, match_columns), safe_limit),
+                )
+                rows = cursor.fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"{fts_table} 查询失败，回退为 LIKE 扫描: {e}")
+                rows = self._like_search_graph_text(
+                    cursor, table, select_columns, match_columns, q, safe_limit, where_clause
+                )
+        else:
+            rows = self._like_search_graph_text(cursor, table, select_columns, match_columns, q, safe_limit, where_clause)
+
+        lowered = q.lower()
+        cursor.execute(
+            f"""
+            SELECT {select_columns}
+            FROM {table} t
+            WHERE t.hash >= ? AND t.hash < ?{where_clause}
+            LIMIT ?
+            """,
+            (lowered, lowered + "\uffff", safe_limit),
+        )
+        hash_rows = cursor.fetchall()
+
+        out: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        for row in list(hash_rows) + list(rows):
+            item = dict(row)
+            key = str(item.get("hash", "") or "")
+            if key in seen:
+                continue
+            seen.add(key)
+            out.append(item)
+        return out
+
+    @staticmethod
+    def _like_search_graph_text(
+        cursor: sqlite3.Cursor,
+        table: str,
+        select_columns: str,
+        match_columns: Sequence[str],
+        query: str,
+        limit: int,
+        where_clause: str,
+    ) -> List[sqlite3.Row]:
+        like_keyword = f"%{query.lower()}%"
+        like_clause = " OR ".join(f"LOWER(COALESCE(t.{column}, '')) LIKE ?" for column in match_columns)
+        cursor.execute(
+            f"""
+            SELECT {select_columns}
+            FROM {table} t
+            WHERE ({like_clause}){where_clause}
+            LIMIT ?
+            """,
+            (*([like_keyword] * len(match_columns)), limit),
+        )
+        return cursor.fetchall()
+
+    def search_entities_by_text(
+        self,
+        query: str,
+        limit: int = 50,
+        include_deleted: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """按名称子串（或 hash 前缀）检索实体，按相关度排序。"""
+        return self._search_graph_text(
+            table="entities",
+            fts_table="entities_name_fts",
+            select_columns="t.hash, t.name, t.appearance_count, t.created_at",
+            match_columns=("name",),
+            query=query,
+            limit=limit,
+            extra_where="" if include_deleted else "(t.is_deleted IS NULL OR t.is_deleted = 0)",
+        )
+
+    def search_relations_by_text(
+        self,
+        query: str,
+        limit: int = 50,
+        include_inactive: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """按 subject/predicate/object 子串（或 hash 前缀）检索关系，按相关度排序。"""
+        return self._search_graph_text(
+            table="relations",
+            fts_table="relations_spo_fts",
+            select_columns="t.hash, t.subject, t.predicate, t.object, t.confidence, t.created_at",
+            match_columns=("subject", "predicate", "object"),
+            query=query,
+            limit=limit,
+            extra_where="" if include_inactive else "(t.is_inactive IS NULL OR t.is_inactive = 0)",
+        )
+
     def ensure_paragraph_ngram_schema(self, conn: Optional[sqlite3.Connection] = None) -> bool:
         """确保段落 ngram 倒排表存在。"""
         c = self._resolve_conn(conn)
@@ -3741,16 +3953,23 @@ class MetadataStore:
         return [str(row[0]) for row in cursor.fetchall()]
 
     def search_deleted_relation_hashes_by_text(self, query: str, limit: int = 5) -> List[str]:
-        """按 deleted_relations 内容模糊查询 hash。"""
+        """按 deleted_relations 的 subject/object 子串查询 hash，按相关度排序。"""
         q = str(query or "").strip()
         if not q:
             return []
         cursor = self._conn.cursor()
-        cursor.execute(
-            "SELECT hash FROM deleted_relations WHERE subject LIKE ? OR object LIKE ? LIMIT ?",
-            (f"%{q}%", f"%{q}%", int(max(1, limit))),
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='deleted_relations'")
+        if cursor.fetchone() is None:
+            return []
+        rows = self._search_graph_text(
+            table="deleted_relations",
+            fts_table="deleted_relations_spo_fts",
+            select_columns="t.hash",
+            match_columns=("subject", "object"),
+            query=q,
+            limit=limit,
         )
-        return [str(row[0]) for row in cursor.fetchall()]
+        return [str(row["hash"]) for row in rows[: max(1, int(limit))]]
 
     def restore_entity_by_hash(self, entity_hash: str) -> bool:
         """恢复软删除实体。"""
@@ -2,6 +2,7 @@
 Web Import Task Manager
 
 为 A_Memorix WebUI 提供导入任务队列、状态管理、并发调度与取消/重试能力。
+文本导入按“抽取 -> 批量向量化 -> 批量写入”的流水线执行，并按分块记录可恢复的检查点。
 """
 
 from __future__ import annotations
@@ -19,7 +20,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from src.common.logger import get_logger
 from src.services import llm_service as llm_api
@@ -40,6 +41,7 @@ from ..utils.import_payloads import (
     normalize_paragraph_import_item,
     normalize_relation_import_item,
 )
+from ..utils.hash import compute_hash, normalize_text
 from ..utils.runtime_self_check import ensure_runtime_self_check
 from ..utils.time_parser import normalize_time_meta
 from ..storage.knowledge_types import ImportStrategy
@@ -84,6 +86,7 @@ CHUNK_STATUS = {
 }
 
 FILE_WARNING_KEEP_LIMIT = 50
+CHECKPOINT_FLUSH_INTERVAL_SECONDS = 30.0
 
 
 def _now() -> float:
@@ -315,6 +318,17 @@ class ImportTaskRecord:
         return payload
 
 
+@dataclass
+class _ExtractedChunk:
+    """导入流水线中已完成抽取、等待向量化与写入的分块。"""
+
+    chunk_id: str
+    index: int
+    processed: ProcessedChunk
+    time_meta: Optional[Dict[str, Any]] = None
+    vectors: Dict[str, Any] = field(default_factory=dict)
+
+
 class ImportTaskManager:
     def __init__(self, plugin: Any):
         self.plugin = plugin
@@ -486,6 +500,12 @@ class ImportTaskManager:
     def _max_chunk_concurrency(self) -> int:
         return max(1, self._cfg_int("web.import.max_chunk_concurrency", 12))
 
+    def _embedding_batch_size(self) -> int:
+        return _clamp(self._cfg_int("web.import.embedding_batch_size", 32), 1, 512)
+
+    def _pipeline_queue_size(self) -> int:
+        return _clamp(self._cfg_int("web.import.pipeline_queue_size", 64), 1, 4096)
+
     def _llm_retry_config(self) -> Dict[str, float]:
         retries = max(0, self._cfg_int("web.import.llm_retry.max_attempts", 4))
         min_wait = max(0.1, float(self._cfg("web.import.llm_retry.min_wait_seconds", 3) or 3))
@@ -740,6 +760,43 @@ class ImportTaskManager:
         }
         self._save_manifest(manifest)
 
+    def _resolve_checkpoint_root(self) -> Path:
+        return self._resolve_data_dir() / "import_checkpoints"
+
+    def _chunk_checkpoint_key(self, file_record: ImportFileRecord, strategy: Any, llm_enabled: bool) -> str:
+        raw_key = f"{file_record.content_hash}|{type(strategy).__name__}|{int(llm_enabled)}"
+        return hashlib.md5(raw_key.encode("utf-8")).hexdigest()
+
+    def _load_chunk_checkpoint(self, checkpoint_key: str) -> Set[int]:
+        path = self._resolve_checkpoint_root() / f"{checkpoint_key}.json"
+        if not path.exists():
+            return set()
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            return {int(index) for index in payload.get("completed_chunk_indexes", [])}
+        except Exception as e:
+            logger.warning(f"读取导入检查点失败，忽略: {path} err={e}")
+            return set()
+
+    def _save_chunk_checkpoint(self, checkpoint_key: str, completed_indexes: Set[int]) -> None:
+        root = self._resolve_checkpoint_root()
+        root.mkdir(parents=True, exist_ok=True)
+        path = root / f"{checkpoint_key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        payload = {"completed_chunk_indexes": sorted(completed_indexes), "updated_at": _now()}
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        tmp_path.replace(path)
+
+    async def _flush_chunk_checkpoint(self, checkpoint_key: str, completed_indexes: Set[int]) -> None:
+        """先落盘向量与图存储，再写检查点，保证检查点中的分块在恢复后数据完整。"""
+        async with self._storage_lock:
+            self.plugin.vector_store.save()
+            self.plugin.graph_store.save()
+        self._save_chunk_checkpoint(checkpoint_key, completed_indexes)
+
+    def _clear_chunk_checkpoint(self, checkpoint_key: str) -> None:
+        (self._resolve_checkpoint_root() / f"{checkpoint_key}.json").unlink(missing_ok=True)
+
     def _normalize_common_import_params(self, payload: Dict[str, Any], *, default_dedupe: str) -> Dict[str, Any]:
         input_mode = str(payload.get("input_mode", "text") or "text").strip().lower()
         if input_mode not in {"text", "json"}:
@@ -2653,31 +2710,49 @@ class ImportTaskManager:
 
         await self._register_chunks(task_id, file_record.file_id, selected_chunks)
 
+        checkpoint_key = self._chunk_checkpoint_key(file_record, strategy, bool(task.params["llm_enabled"]))
+        checkpointed_indexes = set() if task.params.get("force") else self._load_chunk_checkpoint(checkpoint_key)
+        pending_chunks: List[ProcessedChunk] = []
+        for chunk in selected_chunks:
+            if int(chunk.chunk.index) in checkpointed_indexes:
+                await self._set_chunk_completed(task_id, file_record.file_id, chunk.chunk.chunk_id)
+            else:
+                pending_chunks.append(chunk)
+        if len(pending_chunks) < len(selected_chunks):
+            logger.info(
+                "从导入检查点恢复: "
+                f"file={file_record.name} "
+                f"skipped={len(selected_chunks) - len(pending_chunks)} "
+                f"remaining={len(pending_chunks)}"
+            )
+
         await self._set_file_state(task_id, file_record.file_id, "extracting", "extracting")
         model_cfg = None
-        if task.params["llm_enabled"]:
+        if task.params["llm_enabled"] and pending_chunks:
             model_cfg = await self._select_model()
 
-        jobs = []
-        for chunk in selected_chunks:
-            jobs.append(
-                asyncio.create_task(
-                    self._process_text_chunk(
-                        task_id=task_id,
-                        file_record=file_record,
-                        chunk=chunk,
-                        strategy=strategy,
-                        llm_enabled=task.params["llm_enabled"],
-                        model_cfg=model_cfg,
-                        chunk_semaphore=chunk_semaphore,
-                        chat_log=bool(task.params.get("chat_log")),
-                        chat_reference_time=str(task.params.get("chat_reference_time") or "").strip() or None,
-                    )
-                )
+        restored_chunk_count = len(checkpointed_indexes)
+        try:
+            await self._run_text_chunk_pipeline(
+                task_id=task_id,
+                file_record=file_record,
+                chunks=pending_chunks,
+                strategy=strategy,
+                model_cfg=model_cfg,
+                chunk_semaphore=chunk_semaphore,
+                checkpoint_key=checkpoint_key,
+                checkpointed_indexes=checkpointed_indexes,
             )
-        await asyncio.gather(*jobs, return_exceptions=True)
+        except BaseException:
+            # 服务关闭或流水线异常中断时，同样保留已写入的分块
+            if len(checkpointed_indexes) > restored_chunk_count:
+                await self._flush_chunk_checkpoint(checkpoint_key, checkpointed_indexes)
+            raise
 
         if await self._is_cancel_requested(task_id):
+            # 取消前已写入的分块先落盘并记录检查点，重新导入时从断点继续
+            if len(checkpointed_indexes) > restored_chunk_count:
+                await self._flush_chunk_checkpoint(checkpoint_key, checkpointed_indexes)
             await self._set_file_cancelled(task_id, file_record.file_id, "任务已取消")
             return
 
@@ -2707,8 +2782,84 @@ class ImportTaskManager:
                 f.progress = 1.0
             f.updated_at = _now()
             self._recompute_task_progress(task)
-    async def _process_text_chunk(
+            file_completed = f.status == "completed"
+        if file_completed:
+            self._clear_chunk_checkpoint(checkpoint_key)
+        elif checkpointed_indexes:
+            # 向量与图存储刚刚落盘，此时记录的检查点与持久化数据一致
+            self._save_chunk_checkpoint(checkpoint_key, checkpointed_indexes)
+
+    async def _run_text_chunk_pipeline(
+        self,
+        *,
+        task_id: str,
+        file_record: ImportFileRecord,
+        chunks: List[ProcessedChunk],
+        strategy: Any,
+        model_cfg: Any,
+        chunk_semaphore: asyncio.Semaphore,
+        checkpoint_key: str,
+        checkpointed_indexes: Set[int],
+    ) -> None:
+        """以流水线方式处理文本分块：抽取 -> 批量向量化 -> 批量写入。
+
+        各阶段之间使用有界队列衔接，抽取并发受 chunk_semaphore 约束；向量化阶段把队列中已就绪的
+        分块合并为一批统一编码，写入阶段每批只获取一次存储锁。整体吞吐由最慢的
+        阶段决定，而不是各阶段耗时之和。已写入的分块序号定期随存储落盘写入检查点，中断后重新
+        导入同一内容时会跳过这些分块。
+        """
+        if not chunks:
+            return
+
+        task = self._tasks[task_id]
+        llm_enabled = bool(task.params["llm_enabled"])
+        chat_log = bool(task.params.get("chat_log"))
+        chat_reference_time = str(task.params.get("chat_reference_time") or "").strip() or None
+        batch_size = self._embedding_batch_size()
+        embed_queue: asyncio.Queue[Optional[_ExtractedChunk]] = asyncio.Queue(maxsize=self._pipeline_queue_size())
+        write_queue: asyncio.Queue[Optional[List[_ExtractedChunk]]] = asyncio.Queue(maxsize=2)
+        pending_chunks = deque(chunks)
+
+        async def _extract_worker() -> None:
+            while pending_chunks:
+                chunk = pending_chunks.popleft()
+                extracted = await self._extract_text_chunk(
+                    task_id=task_id,
+                    file_record=file_record,
+                    chunk=chunk,
+                    strategy=strategy,
+                    llm_enabled=llm_enabled,
+                    model_cfg=model_cfg,
+                    chunk_semaphore=chunk_semaphore,
+                    chat_log=chat_log,
+                    chat_reference_time=chat_reference_time,
+                )
+                if extracted is not None:
+                    await embed_queue.put(extracted)
+
+        async def _extract_stage() -> None:
+            worker_count = max(1, min(len(chunks), int(task.params["chunk_concurrency"])))
+            await asyncio.gather(*(_extract_worker() for _ in range(worker_count)))
+            await embed_queue.put(None)
+
+        stages = [
+            asyncio.create_task(_extract_stage()),
+            asyncio.create_task(self._embed_stage(embed_queue, write_queue, batch_size)),
+            asyncio.create_task(
+                self._write_stage(task_id, file_record, write_queue, checkpoint_key, checkpointed_indexes)
+            ),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            raise
+
+    async def _extract_text_chunk(
         self,
+        *,
         task_id: str,
         file_record: ImportFileRecord,
         chunk: ProcessedChunk,
@@ -2718,12 +2869,12 @@ class ImportTaskManager:
         chunk_semaphore: asyncio.Semaphore,
         chat_log: bool = False,
         chat_reference_time: Optional[str] = None,
-    ) -> None:
+    ) -> Optional[_ExtractedChunk]:
         async with chunk_semaphore:
             chunk_id = chunk.chunk.chunk_id
             if await self._is_cancel_requested(task_id):
                 await self._set_chunk_cancelled(task_id, file_record.file_id, chunk_id, "任务已取消")
-                return
+                return None
 
             await self._set_chunk_state(task_id, file_record.file_id, chunk_id, "extracting", "extracting", 0.25)
 
@@ -2745,13 +2896,8 @@ class ImportTaskManager:
                     processed = await current_strategy.extract(chunk)
             except Exception as e:
                 await self._set_chunk_failed(task_id, file_record.file_id, chunk_id, f"抽取失败: {e}")
-                return
-
-            if await self._is_cancel_requested(task_id):
-                await self._set_chunk_cancelled(task_id, file_record.file_id, chunk_id, "任务已取消")
-                return
+                return None
 
-            await self._set_chunk_state(task_id, file_record.file_id, chunk_id, "writing", "writing", 0.7)
             try:
                 time_meta = None
                 if chat_log and llm_enabled and model_cfg is not None:
@@ -2760,11 +2906,121 @@ class ImportTaskManager:
                         model_cfg,
                         reference_time=chat_reference_time,
                     )
-                async with self._storage_lock:
-                    await self._persist_processed_chunk(file_record, processed, time_meta=time_meta)
-                await self._set_chunk_completed(task_id, file_record.file_id, chunk_id)
             except Exception as e:
                 await self._set_chunk_failed(task_id, file_record.file_id, chunk_id, f"写入失败: {e}")
+                return None
+
+            await self._set_chunk_state(task_id, file_record.file_id, chunk_id, "writing", "embedding", 0.5)
+            return _ExtractedChunk(
+                chunk_id=chunk_id,
+                index=int(chunk.chunk.index),
+                processed=processed,
+                time_meta=time_meta,
+            )
+
+    async def _embed_stage(
+        self,
+        embed_queue: asyncio.Queue[Optional[_ExtractedChunk]],
+        write_queue: asyncio.Queue[Optional[List[_ExtractedChunk]]],
+        batch_size: int,
+    ) -> None:
+        """把已就绪的分块合并为一批统一编码；上游越快，批次越大。"""
+        finished = False
+        while not finished:
+            item = await embed_queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    next_item = embed_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if next_item is None:
+                    finished = True
+                    break
+                batch.append(next_item)
+            await self._embed_chunk_batch(batch)
+            await write_queue.put(batch)
+        await write_queue.put(None)
+
+    async def _embed_chunk_batch(self, batch: List[_ExtractedChunk]) -> None:
+        embedding_manager = getattr(self.plugin, "embedding_manager", None)
+        vector_store = getattr(self.plugin, "vector_store", None)
+        if embedding_manager is None or vector_store is None or self._is_embedding_degraded():
+            return
+
+        texts: List[str] = []
+        seen: Set[str] = set()
+        for item in batch:
+            content = str(item.processed.chunk.text or "")
+            candidates: List[Tuple[str, str]] = []
+            if content and not is_probable_hash_token(content):
+                candidates.append((content, compute_hash(normalize_text(content))))
+            entities, _ = self._collect_chunk_graph_items(item.processed)
+            candidates.extend((name, compute_hash(name.strip().lower())) for name in entities)
+            for text, hash_value in candidates:
+                if text in seen or hash_value in vector_store:
+                    continue
+                seen.add(text)
+                texts.append(text)
+        if not texts:
+            return
+
+        try:
+            embeddings = await embedding_manager.encode(texts)
+        except Exception as exc:
+            # 批量编码失败时不标记向量，写入阶段会回退到逐条编码/回填入队
+            logger.warning(f"web_import 批量向量化失败，回退逐条写入: count={len(texts)} error={exc}")
+            return
+        vectors = {text: embeddings[index] for index, text in enumerate(texts)}
+        for item in batch:
+            item.vectors = vectors
+
+    async def _write_stage(
+        self,
+        task_id: str,
+        file_record: ImportFileRecord,
+        write_queue: asyncio.Queue[Optional[List[_ExtractedChunk]]],
+        checkpoint_key: str,
+        checkpointed_indexes: Set[int],
+    ) -> None:
+        last_flush_at = time.monotonic()
+        while True:
+            batch = await write_queue.get()
+            if batch is None:
+                return
+            if await self._is_cancel_requested(task_id):
+                for item in batch:
+                    await self._set_chunk_cancelled(task_id, file_record.file_id, item.chunk_id, "任务已取消")
+                continue
+
+            for item in batch:
+                await self._set_chunk_state(task_id, file_record.file_id, item.chunk_id, "writing", "writing", 0.7)
+            written: List[_ExtractedChunk] = []
+            failures: List[Tuple[_ExtractedChunk, str]] = []
+            async with self._storage_lock:
+                for item in batch:
+                    try:
+                        await self._persist_processed_chunk(
+                            file_record,
+                            item.processed,
+                            time_meta=item.time_meta,
+                            vectors=item.vectors,
+                        )
+                    except Exception as e:
+                        failures.append((item, str(e)))
+                    else:
+                        written.append(item)
+
+            checkpointed_indexes.update(item.index for item in written)
+            if written and time.monotonic() - last_flush_at >= CHECKPOINT_FLUSH_INTERVAL_SECONDS:
+                await self._flush_chunk_checkpoint(checkpoint_key, checkpointed_indexes)
+                last_flush_at = time.monotonic()
+            for item in written:
+                await self._set_chunk_completed(task_id, file_record.file_id, item.chunk_id)
+            for item, error in failures:
+                await self._set_chunk_failed(task_id, file_record.file_id, item.chunk_id, f"写入失败: {error}")
 
     async def _process_json_file(
         self,
@@ -3123,6 +3379,7 @@ class ImportTaskManager:
         processed: ProcessedChunk,
         *,
         time_meta: Optional[Dict[str, Any]] = None,
+        vectors: Optional[Dict[str, Any]] = None,
     ) -> None:
         content = str(processed.chunk.text or "")
         if is_probable_hash_token(content):
@@ -3135,16 +3392,30 @@ class ImportTaskManager:
             time_meta=time_meta,
         )
 
-        vector_result = await self._write_paragraph_vector_or_enqueue(
-            paragraph_hash=para_hash,
-            content=content,
-            context="web_import_text",
-        )
-        if str(vector_result.get("warning", "") or "").strip():
-            logger.warning(
-                f"web_import text paragraph 向量写入降级: hash={para_hash[:8]} detail={vector_result.get('detail')}"
+        paragraph_vector = (vectors or {}).get(content)
+        if paragraph_vector is not None and not self._is_embedding_degraded():
+            self.plugin.vector_store.add(paragraph_vector.reshape(1, -1), [para_hash])
+        else:
+            vector_result = await self._write_paragraph_vector_or_enqueue(
+                paragraph_hash=para_hash,
+                content=content,
+                context="web_import_text",
             )
+            if str(vector_result.get("warning", "") or "").strip():
+                logger.warning(
+                    f"web_import text paragraph 向量写入降级: hash={para_hash[:8]} detail={vector_result.get('detail')}"
+                )
+
+        uniq_entities, relations = self._collect_chunk_graph_items(processed)
+        for name in uniq_entities:
+            await self._add_entity_with_vector(name, source_paragraph=para_hash, vectors=vectors)
 
+        for s, p, o in relations:
+            await self._add_relation(s, p, o, source_paragraph=para_hash, vectors=vectors)
+
+    @staticmethod
+    def _collect_chunk_graph_items(processed: ProcessedChunk) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """从抽取结果中收集去重后的实体与关系三元组。"""
         data = processed.data or {}
         entities: List[str] = []
         relations: List[Tuple[str, str, str]] = []
@@ -3172,13 +3443,14 @@ class ImportTaskManager:
                     entities.append(name)
 
         uniq_entities = list({x.strip().lower(): x.strip() for x in entities if str(x).strip()}.values())
-        for name in uniq_entities:
-            await self._add_entity_with_vector(name, source_paragraph=para_hash)
+        return uniq_entities, relations
 
-        for s, p, o in relations:
-            await self._add_relation(s, p, o, source_paragraph=para_hash)
-
-    async def _add_entity_with_vector(self, name: str, source_paragraph: str = "") -> str:
+    async def _add_entity_with_vector(
+        self,
+        name: str,
+        source_paragraph: str = "",
+        vectors: Optional[Dict[str, Any]] = None,
+    ) -> str:
         name_token = str(name or "").strip()
         if not name_token:
             return ""
@@ -3192,7 +3464,9 @@ class ImportTaskManager:
             try:
                 if self._is_embedding_degraded():
                     raise RuntimeError("embedding_degraded")
-                emb = await self.plugin.embedding_manager.encode(name_token)
+                emb = (vectors or {}).get(name_token)
+                if emb is None:
+                    emb = await self.plugin.embedding_manager.encode(name_token)
                 self.plugin.vector_store.add(emb.reshape(1, -1), [hash_value])
             except Exception as exc:
                 if not self._allow_metadata_only_write():
@@ -3200,7 +3474,14 @@ class ImportTaskManager:
                 logger.warning(f"实体向量写入降级，保留 metadata/graph: entity={name_token} error={exc}")
         return hash_value
 
-    async def _add_relation(self, subject: str, predicate: str, obj: str, source_paragraph: str = "") -> str:
+    async def _add_relation(
+        self,
+        subject: str,
+        predicate: str,
+        obj: str,
+        source_paragraph: str = "",
+        vectors: Optional[Dict[str, Any]] = None,
+    ) -> str:
         subject_token = str(subject or "").strip()
         predicate_token = str(predicate or "").strip()
         object_token = str(obj or "").strip()
@@ -3215,8 +3496,8 @@ class ImportTaskManager:
             )
             return ""
 
-        await self._add_entity_with_vector(subject_token, source_paragraph=source_paragraph)
-        await self._add_entity_with_vector(object_token, source_paragraph=source_paragraph)
+        await self._add_entity_with_vector(subject_token, source_paragraph=source_paragraph, vectors=vectors)
+        await self._add_entity_with_vector(object_token, source_paragraph=source_paragraph, vectors=vectors)
         rv_cfg = self.plugin.get_config("retrieval.relation_vectorization", {}) or {}
         if not isinstance(rv_cfg, dict):
             rv_cfg = {}
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+同义词连接基准脚本。
+
+对比 GraphStore 的两条同义词连接路径：
+1. connect_synonyms：传入完整 N x N 相似度矩阵（仅在 --dense-max 以内执行）
+2. connect_synonyms_from_embeddings：分块近邻搜索
+
+每个规模在独立子进程中运行，输出耗时、峰值 RSS 与生成的边数。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from _bootstrap import PROJECT_ROOT
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="GraphStore 同义词连接基准")
+    parser.add_argument("--sizes", default="10000,50000,100000", help="节点规模，逗号分隔")
+    parser.add_argument("--dim", type=int, default=256, help="向量维度")
+    parser.add_argument("--threshold", type=float, default=0.85, help="相似度阈值")
+    parser.add_argument("--block-size", type=int, default=2048, help="分块大小")
+    parser.add_argument("--dense-max", type=int, default=10000, help="执行稠密路径的最大规模")
+    parser.add_argument("--single", default="", help=argparse.SUPPRESS)
+    return parser
+
+
+def _peak_rss_mb() -> float:
+    # Linux 下 ru_maxrss 单位为 KB，macOS 下为字节
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_single(mode: str, size: int, args: argparse.Namespace) -> dict:
+    import numpy as np
+
+    from src.A_memorix.core.storage.graph_store import GraphStore
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(max(1, size // 4), args.dim)).astype(np.float32)
+    embeddings = centers[np.arange(size) % len(centers)] + rng.normal(scale=0.2, size=(size, args.dim)).astype(
+        np.float32
+    )
+    nodes = [f"node-{index}" for index in range(size)]
+    baseline_rss = _peak_rss_mb()
+
+    store = GraphStore()
+    started = time.perf_counter()
+    if mode == "dense":
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        edges = store.connect_synonyms(normalized @ normalized.T, nodes, threshold=args.threshold)
+    else:
+        edges = store.connect_synonyms_from_embeddings(
+            embeddings, nodes, threshold=args.threshold, block_size=args.block_size
+        )
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "nodes": size,
+        "edges": edges,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "input_rss_mb": round(baseline_rss, 1),
+    }
+
+
+def main() -> int:
+    args = _build_arg_parser().parse_args()
+    if args.single:
+        mode, size = args.single.split(":")
+        print(json.dumps(_run_single(mode, int(size), args)))
+        return 0
+
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    print(f"{'mode':<8}{'nodes':>10}{'edges':>12}{'seconds':>10}{'input_rss_mb':>14}{'peak_rss_mb':>13}")
+    for size in sizes:
+        modes = ["dense", "blocked"] if size <= args.dense_max else ["blocked"]
+        for mode in modes:
+            command = [sys.executable, __file__, *sys.argv[1:], "--single", f"{mode}:{size}"]
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+            if completed.returncode != 0:
+                print(f"{mode:<8}{size:>10}  失败: {completed.stderr.strip().splitlines()[-1:]}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{result['mode']:<8}{result['nodes']:>10}{result['edges']:>12}{result['seconds']:>10}"
+                f"{result['input_rss_mb']:>14}{result['peak_rss_mb']:>13}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
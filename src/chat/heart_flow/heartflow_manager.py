@@ -1,21 +1,36 @@
 import asyncio
+import time
 import traceback
 
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Optional
 
 from src.chat.message_receive.chat_manager import chat_manager
+from src.chat.message_receive.message import SessionMessage
 from src.common.logger import get_logger
-from src.maisaka.runtime import MaisakaHeartFlowChatting
+from src.config.config import global_config
+from src.maisaka.runtime import MaisakaHeartFlowChatting, MaisakaHibernationState
 
 logger = get_logger("heartflow")
 
+_HIBERNATE_SWEEP_MAX_INTERVAL_SECONDS = 60.0
+
 
 class HeartflowManager:
-    """管理 session 级别的 Maisaka 心流实例。"""
+    """管理 session 级别的 Maisaka 心流实例。
+
+    空闲超过 ``chat.session_hibernate_idle_seconds`` 的运行时会被休眠：导出精简状态后停止，
+    并从 ``heartflow_chat_list`` 中移除；该会话收到下一条消息时重新创建运行时并恢复状态。
+    休眠状态按休眠先后排列，超过 ``chat.session_hibernate_max_sessions`` 时丢弃最早的状态。
+    """
 
     def __init__(self) -> None:
         self.heartflow_chat_list: Dict[str, MaisakaHeartFlowChatting] = {}
         self._chat_create_locks: Dict[str, asyncio.Lock] = {}
+        self._hibernated_states: OrderedDict[str, MaisakaHibernationState] = OrderedDict()
+        self._hibernate_task: Optional[asyncio.Task[None]] = None
+        self._hibernated_total = 0
+        self._restored_total = 0
 
     async def get_or_create_heartflow_chat(self, session_id: str) -> MaisakaHeartFlowChatting:
         """获取或创建指定会话对应的 Maisaka runtime。"""
@@ -23,32 +38,172 @@ class HeartflowManager:
             if chat := self.heartflow_chat_list.get(session_id):
                 return chat
 
-            create_lock = self._chat_create_locks.setdefault(session_id, asyncio.Lock())
-            async with create_lock:
-                if chat := self.heartflow_chat_list.get(session_id):
-                    return chat
-
-                chat_session = chat_manager.get_session_by_session_id(session_id)
-                if not chat_session:
-                    raise ValueError(f"未找到 session_id={session_id} 对应的聊天流")
-
-                new_chat = MaisakaHeartFlowChatting(session_id=session_id)
-                await new_chat.start()
-                self.heartflow_chat_list[session_id] = new_chat
-                return new_chat
+            while True:
+                create_lock = self._chat_create_locks.setdefault(session_id, asyncio.Lock())
+                async with create_lock:
+                    # 休眠时会移除该会话的锁，等锁期间锁被替换则改用新锁重试
+                    if self._chat_create_locks.get(session_id) is not create_lock:
+                        continue
+                    return await self._create_heartflow_chat(session_id)
         except Exception as exc:
             logger.error(f"创建心流聊天 {session_id} 失败: {exc}", exc_info=True)
             traceback.print_exc()
             raise
 
+    async def _create_heartflow_chat(self, session_id: str) -> MaisakaHeartFlowChatting:
+        """在持有会话创建锁的前提下创建运行时，存在休眠状态时先恢复。"""
+        if chat := self.heartflow_chat_list.get(session_id):
+            return chat
+
+        chat_session = chat_manager.get_session_by_session_id(session_id)
+        if not chat_session:
+            raise ValueError(f"未找到 session_id={session_id} 对应的聊天流")
+
+        new_chat = MaisakaHeartFlowChatting(session_id=session_id)
+        hibernated_state = self._hibernated_states.pop(session_id, None)
+        if hibernated_state is not None:
+            new_chat.restore_hibernation_state(hibernated_state)
+        try:
+            await new_chat.start()
+        except Exception:
+            if hibernated_state is not None:
+                self._hibernated_states[session_id] = hibernated_state
+            raise
+        if hibernated_state is not None:
+            self._restored_total += 1
+            logger.info(f"{new_chat.log_prefix} 已从休眠中恢复 Maisaka 运行时")
+        self.heartflow_chat_list[session_id] = new_chat
+        self._ensure_hibernate_task()
+        return new_chat
+
     def adjust_talk_frequency(self, session_id: str, frequency: float) -> None:
         """调整指定聊天流的说话频率。"""
         chat = self.heartflow_chat_list.get(session_id)
         if chat:
             chat.adjust_talk_frequency(frequency)
             logger.info(f"已调整聊天 {session_id} 的说话频率为 {frequency}")
+        elif hibernated_state := self._hibernated_states.get(session_id):
+            hibernated_state.talk_frequency_adjust = max(0.01, float(frequency))
+            logger.info(f"已调整休眠聊天 {session_id} 的说话频率为 {frequency}")
         else:
             logger.warning(f"无法调整频率，未找到 session_id={session_id} 的聊天流")
 
+    def get_talk_frequency_adjust(self, session_id: str) -> float:
+        """获取指定聊天流当前的说话频率倍率，包括已休眠的会话。"""
+        if chat := self.heartflow_chat_list.get(session_id):
+            return chat._talk_frequency_adjust
+        if hibernated_state := self._hibernated_states.get(session_id):
+            return hibernated_state.talk_frequency_adjust
+        return 1.0
+
+    def get_runtime_stats(self) -> Dict[str, int]:
+        """返回活跃与休眠运行时的数量统计。"""
+        return {
+            "active": len(self.heartflow_chat_list),
+            "hibernated": len(self._hibernated_states),
+            "hibernated_total": self._hibernated_total,
+            "restored_total": self._restored_total,
+        }
+
+    async def hibernate_idle_chats(self, idle_seconds: Optional[float] = None) -> int:
+        """休眠空闲时间超过阈值的运行时。
+
+        Args:
+            idle_seconds: 空闲阈值（秒），为空时读取配置；小于等于 0 表示不休眠。
+
+        Returns:
+            int: 本次休眠的运行时数量。
+        """
+        if idle_seconds is None:
+            idle_seconds = float(global_config.chat.session_hibernate_idle_seconds)
+        if idle_seconds <= 0:
+            return 0
+
+        hibernated_count = 0
+        for session_id, chat in list(self.heartflow_chat_list.items()):
+            if not self._is_hibernatable(chat, idle_seconds):
+                continue
+
+            create_lock = self._chat_create_locks.setdefault(session_id, asyncio.Lock())
+            async with create_lock:
+                # 等锁期间可能收到了新消息或运行时已被替换，需重新确认
+                if self.heartflow_chat_list.get(session_id) is not chat or not self._is_hibernatable(
+                    chat, idle_seconds
+                ):
+                    continue
+
+                self._hibernated_states[session_id] = chat.export_hibernation_state()
+                self._hibernated_states.move_to_end(session_id)
+                del self.heartflow_chat_list[session_id]
+                # 休眠会话不再需要创建锁，仍在等锁的创建方会发现锁已被替换并改用新锁
+                self._chat_create_locks.pop(session_id, None)
+                try:
+                    await chat.stop()
+                except Exception as exc:
+                    logger.warning(f"{chat.log_prefix} 休眠时停止 Maisaka 运行时失败: {exc}")
+                hibernated_count += 1
+                self._hibernated_total += 1
+                logger.info(f"{chat.log_prefix} 会话空闲超过 {idle_seconds:.0f} 秒，已休眠 Maisaka 运行时")
+
+        self._evict_hibernated_states()
+        return hibernated_count
+
+    def append_sent_message_to_chat_history(
+        self,
+        session_id: str,
+        message: SessionMessage,
+        *,
+        source_kind: str,
+    ) -> bool:
+        """将已发送成功的消息写入会话的 Maisaka 历史，会话休眠时写入其休眠状态。
+
+        Returns:
+            bool: 找到活跃或休眠的会话并写入成功时返回 ``True``。
+        """
+        if runtime := self.heartflow_chat_list.get(session_id):
+            return runtime.append_sent_message_to_chat_history(message, source_kind=source_kind)
+        if hibernated_state := self._hibernated_states.get(session_id):
+            history_message = MaisakaHeartFlowChatting.build_sent_history_message(message, source_kind=source_kind)
+            if history_message is None:
+                return False
+            hibernated_state.chat_history.append(history_message)
+            return True
+        return False
+
+    def _evict_hibernated_states(self) -> None:
+        """休眠状态超过上限时，丢弃最早休眠的会话状态。"""
+        max_sessions = int(global_config.chat.session_hibernate_max_sessions)
+        if max_sessions <= 0:
+            return
+        evicted_count = 0
+        while len(self._hibernated_states) > max_sessions:
+            self._hibernated_states.popitem(last=False)
+            evicted_count += 1
+        if evicted_count:
+            logger.info(f"休眠会话状态超过上限 {max_sessions}，已丢弃最早休眠的 {evicted_count} 个会话状态")
+
+    @staticmethod
+    def _is_hibernatable(chat: MaisakaHeartFlowChatting, idle_seconds: float) -> bool:
+        return time.time() - chat.last_activity_at >= idle_seconds and chat.can_hibernate()
+
+    def _ensure_hibernate_task(self) -> None:
+        if self._hibernate_task is not None and not self._hibernate_task.done():
+            return
+        self._hibernate_task = asyncio.create_task(self._hibernate_loop())
+
+    async def _hibernate_loop(self) -> None:
+        """周期性扫描并休眠空闲运行时。"""
+        while self.heartflow_chat_list:
+            idle_seconds = float(global_config.chat.session_hibernate_idle_seconds)
+            interval = _HIBERNATE_SWEEP_MAX_INTERVAL_SECONDS
+            if idle_seconds > 0:
+                interval = max(1.0, min(interval, idle_seconds / 4))
+            await asyncio.sleep(interval)
+            try:
+                await self.hibernate_idle_chats(idle_seconds)
+            except Exception as exc:
+                logger.error(f"休眠空闲心流聊天失败: {exc}", exc_info=True)
+        self._hibernate_task = None
+
 
 heartflow_manager = HeartflowManager()
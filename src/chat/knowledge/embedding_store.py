@@ -38,6 +38,7 @@ MIN_CHUNK_SIZE = 1  # 最小分块大小
 MAX_CHUNK_SIZE = 50  # 最大分块大小
 MIN_WORKERS = 1  # 最小线程数
 MAX_WORKERS = 20  # 最大线程数
+SEARCH_BATCH_SIZE = 1024  # 批量检索时每次提交给 Faiss 的查询数
 
 ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 EMBEDDING_DATA_DIR = os.path.join(ROOT_PATH, "data", "embedding")
@@ -572,6 +573,43 @@ class EmbeddingStore:
 
         return result
 
+    def search_top_k_batch(
+        self,
+        queries: List[List[float]],
+        k: int,
+        batch_size: int = SEARCH_BATCH_SIZE,
+    ) -> List[List[Tuple[str, float]]]:
+        """批量搜索最相似的k个项，结果与逐条调用 search_top_k 一致
+        Args:
+            queries: 查询的embedding列表
+            k: 每个查询返回的最相似的k个项
+            batch_size: 每批提交给 Faiss 的查询数
+        Returns:
+            result: 与 queries 一一对应的 (hash, 余弦相似度) 列表
+        """
+        if self.faiss_index is None:
+            logger.debug("FaissIndex尚未构建,返回None")
+            return [[] for _ in queries]
+        if self.idx2hash is None:
+            logger.warning("idx2hash尚未构建,返回None")
+            return [[] for _ in queries]
+
+        results: List[List[Tuple[str, float]]] = []
+        item_count = len(self.idx2hash)
+        for start in range(0, len(queries), max(1, batch_size)):
+            # 与 search_top_k 相同，查询向量本身不做归一化
+            query_batch = np.asarray(queries[start : start + batch_size], dtype=np.float32)
+            distances, indices = self.faiss_index.search(query_batch, k)
+            for row_indices, row_distances in zip(indices, distances, strict=True):
+                results.append(
+                    [
+                        (self.idx2hash[str(int(idx))], float(sim))
+                        for idx, sim in zip(row_indices, row_distances, strict=True)
+                        if 0 <= idx < item_count
+                    ]
+                )
+        return results
+
 
 class EmbeddingManager:
     def __init__(self, max_workers: int | None = None, chunk_size: int | None = None):
@@ -25,6 +25,8 @@ from src.config.config import global_config
 
 from .global_logger import logger
 
+SYNONYM_SEARCH_CHUNK_SIZE = 1024  # 同义词连接时每批发起 kNN 查询的实体数
+
 
 def _get_kg_dir():
     """
@@ -182,6 +184,9 @@ class KGManager:
 
         synonym_hash_set = set()
         synonym_result = {}
+        entities_store = embedding_manager.entities_embedding_store
+        top_k = global_config.lpmm_knowledge.rag_synonym_search_top_k
+        threshold = global_config.lpmm_knowledge.rag_synonym_threshold
 
         # rich 进度条
         total = len(ent_hash_list)
@@ -198,39 +203,44 @@ class KGManager:
             transient=False,
         ) as progress:
             task = progress.add_task("同义词连接", total=total)
-            for ent_hash in ent_hash_list:
-                if ent_hash in synonym_hash_set:
-                    progress.update(task, advance=1)
-                    continue
-                ent = embedding_manager.entities_embedding_store.store.get(ent_hash)
-                if ent is None:
-                    progress.update(task, advance=1)
-                    continue
-                assert isinstance(ent, EmbeddingStoreItem)
-                # 查询相似实体
-                similar_ents = embedding_manager.entities_embedding_store.search_top_k(
-                    ent.embedding, global_config.lpmm_knowledge.rag_synonym_search_top_k
+            # 按块批量做 kNN 查询，再按原顺序回放连接逻辑：
+            # 已被前面实体连接为同义词的实体不再作为查询发起方，因此结果与逐个查询完全一致
+            for chunk_start in range(0, total, SYNONYM_SEARCH_CHUNK_SIZE):
+                chunk = ent_hash_list[chunk_start : chunk_start + SYNONYM_SEARCH_CHUNK_SIZE]
+                query_hashes = [
+                    ent_hash
+                    for ent_hash in chunk
+                    if ent_hash not in synonym_hash_set and ent_hash in entities_store.store
+                ]
+                neighbor_map = dict(
+                    zip(
+                        query_hashes,
+                        entities_store.search_top_k_batch(
+                            [entities_store.store[ent_hash].embedding for ent_hash in query_hashes], top_k
+                        ),
+                        strict=True,
+                    )
                 )
-                res_ent = []  # Debug
-                for res_ent_hash, similarity in similar_ents:
-                    if res_ent_hash == ent_hash:
-                        # 避免自连接
+                for ent_hash in chunk:
+                    if ent_hash in synonym_hash_set or ent_hash not in neighbor_map:
                         continue
-                    if similarity < global_config.lpmm_knowledge.rag_synonym_threshold:
-                        # 相似度阈值
-                        continue
-                    node_to_node[(res_ent_hash, ent_hash)] = similarity
-                    node_to_node[(ent_hash, res_ent_hash)] = similarity
-                    synonym_hash_set.add(res_ent_hash)
-                    new_edge_cnt += 1
-                    res_ent.append(
-                        (
-                            embedding_manager.entities_embedding_store.store[res_ent_hash].str,
-                            similarity,
-                        )
-                    )  # Debug
-                    synonym_result[ent.str] = res_ent
-                progress.update(task, advance=1)
+                    ent = entities_store.store[ent_hash]
+                    assert isinstance(ent, EmbeddingStoreItem)
+                    res_ent = []  # Debug
+                    for res_ent_hash, similarity in neighbor_map[ent_hash]:
+                        if res_ent_hash == ent_hash:
+                            # 避免自连接
+                            continue
+                        if similarity < threshold:
+                            # 相似度阈值
+                            continue
+                        node_to_node[(res_ent_hash, ent_hash)] = similarity
+                        node_to_node[(ent_hash, res_ent_hash)] = similarity
+                        synonym_hash_set.add(res_ent_hash)
+                        new_edge_cnt += 1
+                        res_ent.append((entities_store.store[res_ent_hash].str, similarity))  # Debug
+                        synonym_result[ent.str] = res_ent
+                progress.update(task, advance=len(chunk))
 
         for k, v in synonym_result.items():
             print(f'"{k}"的相似实体为：{v}')
@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Awaitable, Callable, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+import asyncio
+import hashlib
 import json
+import time
 
 from json_repair import repair_json
 from sqlmodel import select
@@ -14,6 +17,7 @@ from src.common.logger import get_logger
 from src.common.utils.utils_config import ExpressionConfigUtils
 from src.common.utils.utils_session import SessionUtils
 from src.config.config import global_config
+from src.learners.expression_candidate_cache import expression_candidate_cache
 from src.learners.learner_utils_old import weighted_sample
 from src.maisaka.context_messages import LLMContextMessage
 
@@ -30,8 +34,28 @@ class MaisakaExpressionSelectionResult:
     selected_expression_ids: List[int] = field(default_factory=list)
 
 
+@dataclass
+class _PendingSelection:
+    """一次进行中或已完成的子代理选择。"""
+
+    fingerprint: str
+    started_at: float
+    task: "asyncio.Task[MaisakaExpressionSelectionResult]"
+
+
 class MaisakaExpressionSelector:
-    """负责在 replyer 侧完成表达方式筛选与子代理二次选择。"""
+    """负责在 replyer 侧完成表达方式筛选与子代理二次选择。
+
+    子代理选择需要一次额外的 LLM 调用。为了不让它与回复生成串行叠加，规划器决定回复时
+    会通过 ``prefetch_for_reply`` 提前启动选择；每个会话保留最近一次选择，最近上下文与
+    目标消息未变化且未过期时，``select_for_reply`` 直接复用该结果（或等待进行中的选择）。
+    """
+
+    def __init__(self) -> None:
+        self._selections: Dict[str, _PendingSelection] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.prefetched = 0
 
     def _can_use_expressions(self, session_id: str) -> bool:
         try:
@@ -85,28 +109,10 @@ class MaisakaExpressionSelector:
     def _load_expression_candidates(self, session_id: str) -> List[dict[str, Any]]:
         related_session_ids, has_global_share = self._resolve_expression_group_scope(session_id)
 
-        with get_db_session(auto_commit=False) as session:
-            base_query = select(Expression).where(Expression.rejected.is_(False))  # type: ignore[attr-defined]
-            if has_global_share:
-                scoped_query = base_query
-            else:
-                scoped_query = base_query.where(
-                    (Expression.session_id.in_(related_session_ids)) | (Expression.session_id.is_(None))  # type: ignore[attr-defined]
-                )
-            if global_config.expression.expression_checked_only:
-                scoped_query = scoped_query.where(Expression.checked.is_(True))  # type: ignore[attr-defined]
-            expressions = session.exec(scoped_query).all()
-
-        all_candidates = [
-            {
-                "id": expression.id,
-                "situation": expression.situation,
-                "style": expression.style,
-                "count": expression.count if expression.count is not None else 1,
-            }
-            for expression in expressions
-            if expression.id is not None and expression.situation and expression.style
-        ]
+        all_candidates = expression_candidate_cache.get_candidates(
+            None if has_global_share else related_session_ids,
+            checked_only=global_config.expression.expression_checked_only,
+        )
         if len(all_candidates) < 10:
             return []
 
@@ -259,6 +265,105 @@ class MaisakaExpressionSelector:
                 expression.last_active_time = now
                 session.add(expression)
 
+    @staticmethod
+    def _build_selection_fingerprint(
+        chat_history: List[LLMContextMessage],
+        reply_message: Optional[SessionMessage],
+    ) -> str:
+        """根据最近的非 assistant 上下文与目标消息计算选择指纹。
+
+        规划器自身的思考文本每轮都会变化，但不影响表达方式是否贴合语境，因此不计入指纹。
+        """
+        context_lines = [
+            MaisakaExpressionSelector._normalize_history_line(message)
+            for message in chat_history
+            if message.role != "assistant" and (message.processed_plain_text or "").strip()
+        ][-10:]
+        target_id = reply_message.message_id if reply_message is not None else ""
+        digest_source = "\n".join([target_id, *context_lines])
+        return hashlib.sha1(digest_source.encode("utf-8")).hexdigest()
+
+    def _get_or_start_selection(
+        self,
+        *,
+        session_id: str,
+        chat_history: List[LLMContextMessage],
+        reply_message: Optional[SessionMessage],
+        reply_reason: str,
+        sub_agent_runner: SubAgentRunner,
+    ) -> tuple["asyncio.Task[MaisakaExpressionSelectionResult]", bool]:
+        """返回可复用的选择任务，没有时启动新的选择。
+
+        Returns:
+            tuple[asyncio.Task[MaisakaExpressionSelectionResult], bool]: 选择任务，以及是否复用了已有任务。
+        """
+        fingerprint = self._build_selection_fingerprint(chat_history, reply_message)
+        cache_seconds = global_config.expression.advanced_chosen_cache_seconds
+        pending = self._selections.get(session_id)
+        if (
+            pending is not None
+            and pending.fingerprint == fingerprint
+            and not pending.task.cancelled()
+            and (not pending.task.done() or pending.task.exception() is None)
+            and (not pending.task.done() or time.monotonic() - pending.started_at <= cache_seconds)
+        ):
+            return pending.task, True
+
+        task = asyncio.create_task(
+            self._select_with_sub_agent(
+                session_id=session_id,
+                chat_history=list(chat_history),
+                reply_message=reply_message,
+                reply_reason=reply_reason,
+                sub_agent_runner=sub_agent_runner,
+            )
+        )
+        self._selections[session_id] = _PendingSelection(
+            fingerprint=fingerprint,
+            started_at=time.monotonic(),
+            task=task,
+        )
+        return task, False
+
+    def _can_run_sub_agent_selection(self, session_id: str, sub_agent_runner: Optional[SubAgentRunner]) -> bool:
+        return (
+            bool(session_id)
+            and sub_agent_runner is not None
+            and global_config.expression.advanced_chosen
+            and self._can_use_expressions(session_id)
+        )
+
+    def prefetch_for_reply(
+        self,
+        *,
+        session_id: str,
+        chat_history: List[LLMContextMessage],
+        reply_message: Optional[SessionMessage],
+        reply_reason: str,
+        sub_agent_runner: Optional[SubAgentRunner],
+    ) -> None:
+        """在规划器决定回复时提前启动子代理选择，参数与 ``select_for_reply`` 一致。"""
+        if sub_agent_runner is None or not self._can_run_sub_agent_selection(session_id, sub_agent_runner):
+            return
+        _, reused = self._get_or_start_selection(
+            session_id=session_id,
+            chat_history=chat_history,
+            reply_message=reply_message,
+            reply_reason=reply_reason,
+            sub_agent_runner=sub_agent_runner,
+        )
+        if not reused:
+            self.prefetched += 1
+            logger.debug(f"表达方式选择已提前启动：session_id={session_id}")
+
+    def stats(self) -> Dict[str, int]:
+        """返回选择结果的复用统计。"""
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "prefetched": self.prefetched,
+        }
+
     async def select_for_reply(
         self,
         *,
@@ -275,12 +380,11 @@ class MaisakaExpressionSelector:
             logger.info(f"表达方式选择已跳过：当前会话未启用表达方式，session_id={session_id}")
             return MaisakaExpressionSelectionResult()
 
-        candidates = self._load_expression_candidates(session_id)
-        if not candidates:
-            logger.info(f"表达方式选择已跳过：本地候选不足，session_id={session_id}")
-            return MaisakaExpressionSelectionResult()
-
         if not global_config.expression.advanced_chosen:
+            candidates = self._load_expression_candidates(session_id)
+            if not candidates:
+                logger.info(f"表达方式选择已跳过：本地候选不足，session_id={session_id}")
+                return MaisakaExpressionSelectionResult()
             return self._build_direct_selection_result(
                 session_id=session_id,
                 candidates=candidates,
@@ -290,6 +394,35 @@ class MaisakaExpressionSelector:
             logger.info(f"表达方式选择已跳过：缺少 sub_agent_runner，session_id={session_id}")
             return MaisakaExpressionSelectionResult()
 
+        task, reused = self._get_or_start_selection(
+            session_id=session_id,
+            chat_history=chat_history,
+            reply_message=reply_message,
+            reply_reason=reply_reason,
+            sub_agent_runner=sub_agent_runner,
+        )
+        if reused:
+            self.cache_hits += 1
+            logger.info(f"表达方式选择复用已有结果：session_id={session_id} 已完成={task.done()}")
+        else:
+            self.cache_misses += 1
+        # shield 保证本次回复被取消时，已启动的选择仍可供后续回复复用
+        return await asyncio.shield(task)
+
+    async def _select_with_sub_agent(
+        self,
+        *,
+        session_id: str,
+        chat_history: List[LLMContextMessage],
+        reply_message: Optional[SessionMessage],
+        reply_reason: str,
+        sub_agent_runner: SubAgentRunner,
+    ) -> MaisakaExpressionSelectionResult:
+        candidates = self._load_expression_candidates(session_id)
+        if not candidates:
+            logger.info(f"表达方式选择已跳过：本地候选不足，session_id={session_id}")
+            return MaisakaExpressionSelectionResult()
+
         logger.info(
             f"表达方式选择开始：session_id={session_id} 候选数={len(candidates)} "
             f"候选预览={self._format_candidate_preview(candidates)}"
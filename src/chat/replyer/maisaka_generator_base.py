@@ -406,6 +406,7 @@ class BaseMaisakaReplyGenerator:
             result.error_message = "回复模型尚未初始化"
             return finalize(False)
 
+        expression_started_at = time.perf_counter()
         try:
             reply_context = await self._build_reply_context(
                 chat_history=filtered_history,
@@ -424,6 +425,7 @@ class BaseMaisakaReplyGenerator:
             )
             return finalize(False)
 
+        expression_ms = round((time.perf_counter() - expression_started_at) * 1000, 2)
         merged_expression_habits = expression_habits.strip() or reply_context.expression_habits
         result.selected_expression_ids = (
             list(selected_expression_ids)
@@ -527,9 +529,11 @@ class BaseMaisakaReplyGenerator:
             llm_ms=llm_ms,
             overall_ms=round((time.perf_counter() - overall_started_at) * 1000, 2),
             stage_logs=[
+                f"expression: {expression_ms} ms",
                 f"prompt: {prompt_ms} ms",
                 f"llm: {llm_ms} ms",
             ],
+            extra={"expression_selection_ms": expression_ms},
         )
 
         if show_replyer_reasoning and result.completion.reasoning_text:
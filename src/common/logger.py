@@ -1,11 +1,17 @@
 # 使用基于时间戳的文件处理器，简单的轮转份数限制
 
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Optional
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import queue
 import threading
 import time
 
@@ -18,12 +24,17 @@ from .logger_color_and_mapping import MODULE_ALIASES, RESET_COLOR, CONVERTED_MOD
 # 创建logs目录
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
+# 日志旁路索引文件后缀，不匹配 app_*.log.jsonl，避免被当作日志文件轮转
+LOG_INDEX_SUFFIX = ".idx"
 logger_file = Path(__file__).resolve()
 PROJECT_ROOT = logger_file.parent.parent.parent.resolve()
 # 全局handler实例，避免重复创建
 _file_handler = None
 _console_handler = None
 _ws_handler = None
+# 异步日志管线：队列前端与写入线程
+_queue_handler = None
+_log_writer = None
 # 全局标志，防止重复初始化
 _logging_initialized = False
 _cleanup_task_started = False
@@ -49,6 +60,8 @@ def get_file_handler():
             max_bytes=5 * 1024 * 1024,  # 5MB
             backup_count=30,
             encoding="utf-8",
+            # 异步模式下由写入线程批量 flush，同步模式保持逐条 flush
+            flush_bytes=int(LOG_CONFIG.get("file_flush_bytes", 64 * 1024)) if is_async_logging_enabled() else 0,
         )
         # 设置文件handler的日志级别
         file_level = LOG_CONFIG.get("file_log_level", LOG_CONFIG.get("log_level", "INFO"))
@@ -67,11 +80,43 @@ def get_console_handler():
     return _console_handler
 
 
+def is_async_logging_enabled() -> bool:
+    """是否启用队列化的异步日志管线"""
+    return bool(LOG_CONFIG.get("async_logging", True))
+
+
+def get_log_writer():
+    """获取异步日志写入线程单例，未启用异步日志时返回 None"""
+    global _log_writer
+    if _log_writer is None and is_async_logging_enabled():
+        _log_writer = LogWriterThread(
+            queue.SimpleQueue(),
+            batch_size=int(LOG_CONFIG.get("log_batch_size", 256)),
+            flush_interval=float(LOG_CONFIG.get("file_flush_interval", 0.5)),
+        )
+    return _log_writer
+
+
+def get_queue_handler():
+    """获取日志队列前端 handler 单例，未启用异步日志时返回 None"""
+    global _queue_handler
+    log_writer = get_log_writer()
+    if log_writer is None:
+        return None
+    if _queue_handler is None:
+        _queue_handler = LogQueueHandler(log_writer.queue)
+        _queue_handler.setLevel(logging.DEBUG)
+    return _queue_handler
+
+
 def get_ws_handler():
     """获取 WebSocket handler 单例"""
     global _ws_handler
     if _ws_handler is None:
-        _ws_handler = WebSocketLogHandler()
+        _ws_handler = WebSocketLogHandler(
+            push_interval=float(LOG_CONFIG.get("ws_push_interval", 0.2)),
+            max_pending=int(LOG_CONFIG.get("ws_max_pending", 2000)),
+        )
         # WebSocket handler 推送所有级别的日志
         _ws_handler.setLevel(logging.DEBUG)
     return _ws_handler
@@ -89,6 +134,14 @@ def initialize_ws_handler(loop):
     # 为 WebSocket handler 设置 JSON 格式化器（与文件格式相同）
     handler.setFormatter(file_formatter)
 
+    # 异步模式下挂到写入线程，避免在调用方线程构造推送数据
+    log_writer = get_log_writer()
+    if log_writer is not None and log_writer.is_alive:
+        if handler not in log_writer.handlers:
+            log_writer.add_handler(handler)
+            print("[日志系统] ✅ WebSocket 日志推送已启用")
+        return
+
     # 添加到根日志记录器
     root_logger = logging.getLogger()
     if handler not in root_logger.handlers:
@@ -96,38 +149,113 @@ def initialize_ws_handler(loop):
         print("[日志系统] ✅ WebSocket 日志推送已启用")
 
 
+def get_log_index_path(log_file: Path) -> Path:
+    """获取日志文件对应的旁路索引文件路径"""
+    return log_file.with_name(log_file.name + LOG_INDEX_SUFFIX)
+
+
 class TimestampedFileHandler(logging.Handler):
-    """基于时间戳的文件处理器，简单的轮转份数限制"""
+    """基于时间戳的文件处理器，简单的轮转份数限制
+
+    ``flush_bytes`` 为 0 时每条记录写入后立即 flush（同步模式）；
+    大于 0 时按缓冲字节数批量 flush，由写入线程按时间补充 flush。
+
+    写入的同时按 ``index_bucket_seconds`` 划分时间桶，在旁路索引文件
+    （``<日志文件名>.idx``）中逐行记录每个桶的字节范围、时间范围、级别与模块，
+    供 WebUI 日志查询跳过无关区段。JSON 格式的记录会额外写入 ``created`` 字段
+    （Unix 时间戳），供查询按单条记录精确过滤时间范围。
+    """
 
-    def __init__(self, log_dir, max_bytes=5 * 1024 * 1024, backup_count=30, encoding="utf-8"):
+    def __init__(
+        self,
+        log_dir,
+        max_bytes=5 * 1024 * 1024,
+        backup_count=30,
+        encoding="utf-8",
+        flush_bytes=0,
+        index_bucket_seconds=60,
+    ):
         super().__init__()
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         self.max_bytes = max_bytes
         self.backup_count = backup_count
         self.encoding = encoding
+        self.flush_bytes = flush_bytes
+        self.index_bucket_seconds = index_bucket_seconds
         self._lock = threading.Lock()
 
         # 当前活跃的日志文件
         self.current_file = None
         self.current_stream = None
+        # 当前文件已写入字节数与尚未 flush 的字节数，避免每条记录都 stat 文件
+        self._current_size = 0
+        self._pending_bytes = 0
+        # 当前尚未写入索引的时间桶
+        self._bucket: Optional[dict] = None
         self._init_current_file()
 
     def _init_current_file(self):
         """初始化当前日志文件"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.current_file = self.log_dir / f"app_{timestamp}.log.jsonl"
-        self.current_stream = open(self.current_file, "a", encoding=self.encoding)
+        # 固定使用 \n 换行，保证索引中的字节偏移与文件内容一致
+        self.current_stream = open(self.current_file, "a", encoding=self.encoding, newline="\n")
+        self._current_size = self.current_file.stat().st_size
+        self._pending_bytes = 0
+        self._bucket = None
+
+    def _track_index(self, record, size: int):
+        """将记录计入当前时间桶，跨桶时把上一个桶写入索引（调用方需持有锁）"""
+        bucket = self._bucket
+        if bucket is not None and record.created >= bucket["first"] + self.index_bucket_seconds:
+            self._write_index_bucket()
+            bucket = None
+        if bucket is None:
+            bucket = self._bucket = {
+                "start": self._current_size,
+                "end": self._current_size,
+                "first": record.created,
+                "last": record.created,
+                "count": 0,
+                "levels": set(),
+                "modules": set(),
+            }
+        bucket["end"] += size
+        bucket["last"] = max(bucket["last"], record.created)
+        bucket["count"] += 1
+        bucket["levels"].add(record.levelname)
+        bucket["modules"].add(record.name)
+
+    def _write_index_bucket(self):
+        """将当前时间桶追加到旁路索引文件（调用方需持有锁）"""
+        bucket = self._bucket
+        self._bucket = None
+        if bucket is None or self.current_file is None:
+            return
+        # 先落盘日志内容，确保索引指向的字节已可读
+        self._flush_stream()
+        entry = {
+            **bucket,
+            "first": round(bucket["first"], 3),
+            "last": round(bucket["last"], 3),
+            "levels": sorted(bucket["levels"]),
+            "modules": sorted(bucket["modules"]),
+        }
+        try:
+            with open(get_log_index_path(self.current_file), "a", encoding="utf-8", newline="\n") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"[日志系统] 写入日志索引失败: {e}")
 
     def _should_rollover(self):
         """检查是否需要轮转"""
-        if self.current_file and self.current_file.exists():
-            return self.current_file.stat().st_size >= self.max_bytes
-        return False
+        return self.current_stream is not None and self._current_size >= self.max_bytes
 
     def _do_rollover(self):
         """执行轮转：关闭当前文件，创建新文件"""
         if self.current_stream:
+            self._write_index_bucket()
             self.current_stream.close()
 
         # 清理旧文件
@@ -149,6 +277,7 @@ class TimestampedFileHandler(logging.Handler):
             for old_file in log_files[self.backup_count :]:
                 try:
                     old_file.unlink()
+                    get_log_index_path(old_file).unlink(missing_ok=True)
                     print(f"[日志清理] 删除旧文件: {old_file.name}")
                 except Exception as e:
                     print(f"[日志清理] 删除失败 {old_file}: {e}")
@@ -156,9 +285,22 @@ class TimestampedFileHandler(logging.Handler):
         except Exception as e:
             print(f"[日志清理] 清理过程出错: {e}")
 
+    def _flush_stream(self):
+        """将缓冲区写入磁盘（调用方需持有锁）"""
+        if self.current_stream and self._pending_bytes:
+            self.current_stream.flush()
+        self._pending_bytes = 0
+
     def emit(self, record):
         """发出日志记录"""
         try:
+            msg = self.format(record)
+            if msg.startswith("{") and msg.endswith("}"):
+                body = msg[:-1].rstrip()
+                separator = "" if body == "{" else ", "
+                msg = f'{body}{separator}"created": {record.created:.3f}}}'
+            msg += "\n"
+            size = len(msg.encode(self.encoding, errors="replace"))
             with self._lock:
                 # 检查是否需要轮转
                 if self._should_rollover():
@@ -166,97 +308,294 @@ class TimestampedFileHandler(logging.Handler):
 
                 # 写入日志
                 if self.current_stream:
-                    msg = self.format(record)
-                    self.current_stream.write(msg + "\n")
-                    self.current_stream.flush()
+                    self.current_stream.write(msg)
+                    self._track_index(record, size)
+                    self._current_size += size
+                    self._pending_bytes += size
+                    if self._pending_bytes >= self.flush_bytes:
+                        self._flush_stream()
 
         except Exception:
             self.handleError(record)
 
+    def flush(self):
+        """刷新尚未写入磁盘的日志"""
+        with self._lock:
+            self._flush_stream()
+
     def close(self):
         """关闭处理器"""
         with self._lock:
             if self.current_stream:
+                self._write_index_bucket()
+                self._flush_stream()
                 self.current_stream.close()
                 self.current_stream = None
         super().close()
 
 
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """日志队列前端：调用方线程只负责入队，格式化与 IO 由 ``LogWriterThread`` 完成"""
+
+    def prepare(self, record):
+        """浅拷贝记录并固化位置参数，格式化推迟到写入线程"""
+        record = copy.copy(record)
+        if record.args and not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class LogWriterThread:
+    """日志写入线程，批量消费队列中的记录并分发给下游 handler
+
+    每轮最多取出 ``batch_size`` 条记录依次交给各 handler，
+    距上次 flush 超过 ``flush_interval`` 秒或队列空闲时统一 flush。
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue: "queue.SimpleQueue", handlers=(), batch_size: int = 256, flush_interval: float = 0.5):
+        self.queue = log_queue
+        self.handlers: list[logging.Handler] = list(handlers)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self._handlers_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_handler(self, handler: logging.Handler):
+        """追加下游 handler"""
+        with self._handlers_lock:
+            if handler not in self.handlers:
+                self.handlers = [*self.handlers, handler]
+
+    def remove_handler(self, handler: logging.Handler):
+        """移除下游 handler"""
+        with self._handlers_lock:
+            self.handlers = [h for h in self.handlers if h is not handler]
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """启动写入线程"""
+        if self.is_alive:
+            return
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """写入剩余记录并停止线程"""
+        if not self.is_alive:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join(timeout)  # type: ignore[union-attr]
+        self._thread = None
+
+    def _handle(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno < handler.level:
+                continue
+            try:
+                handler.handle(record)
+            except Exception:
+                handler.handleError(record)
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception as e:
+                print(f"[日志系统] flush 失败 {handler}: {e}")
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = self.flush_interval - (time.monotonic() - last_flush)
+            try:
+                first = self.queue.get(timeout=max(timeout, 0.0)) if timeout > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                self._flush_handlers()
+                last_flush = time.monotonic()
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = False
+            for record in batch:
+                if record is self._STOP:
+                    stopping = True
+                    continue
+                self._handle(record)
+
+            if stopping or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_handlers()
+                last_flush = time.monotonic()
+            if stopping:
+                return
+
+
 class WebSocketLogHandler(logging.Handler):
-    """WebSocket 日志处理器 - 将日志实时推送到前端"""
+    """WebSocket 日志处理器 - 将日志合并为批次后推送到前端
+
+    记录先进入有界缓冲区，每 ``push_interval`` 秒在事件循环上广播一批。
+    上一批仍在发送或缓冲区积压时启用背压策略：超过半数容量后 DEBUG 日志按
+    ``sample_every`` 抽样保留，缓冲区满时丢弃低级别日志，WARNING 及以上挤出最旧条目。
+    """
 
     _log_counter = 0  # 类级别计数器,确保 ID 唯一性
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, push_interval: float = 0.2, max_pending: int = 2000, sample_every: int = 10):
         super().__init__()
         self.loop = loop
         self._initialized = False
+        self.push_interval = push_interval
+        self.max_pending = max(1, max_pending)
+        self.sample_every = max(1, sample_every)
+        self._pending: deque[dict] = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._sending = False
+        self._sample_counter = 0
+        self.dropped_count = 0
 
     def set_loop(self, loop):
         """设置事件循环"""
         self.loop = loop
         self._initialized = True
 
+    @staticmethod
+    def _extract_message(record, formatter) -> str:
+        """从记录中提取消息文本，structlog 记录直接读取 event 字段"""
+        if isinstance(record.msg, dict):
+            event = record.msg.get("event")
+            if isinstance(event, str):
+                return event
+        if formatter is None:
+            return record.getMessage()
+        formatted_msg = formatter.format(record)
+        try:
+            log_dict = json.loads(formatted_msg)
+        except (json.JSONDecodeError, ValueError):
+            return formatted_msg
+        return log_dict.get("event", formatted_msg) if isinstance(log_dict, dict) else formatted_msg
+
+    def _accept(self, levelno: int) -> bool:
+        """根据缓冲区水位决定是否接收记录（调用方需持有锁）"""
+        pending = len(self._pending)
+        if pending >= self.max_pending:
+            if levelno < logging.WARNING:
+                return False
+            self._pending.popleft()
+            self.dropped_count += 1
+            return True
+        if levelno <= logging.DEBUG and pending >= self.max_pending // 2:
+            self._sample_counter += 1
+            return self._sample_counter % self.sample_every == 0
+        return True
+
     def emit(self, record):
-        """发送日志到 WebSocket 客户端"""
+        """将日志放入推送缓冲区"""
         if not self._initialized or self.loop is None:
             return
         if self.loop.is_closed():
             return
 
         try:
-            # 获取格式化后的消息
-            # 对于 structlog,formatted message 包含完整的日志信息
-            formatted_msg = self.format(record) if self.formatter else record.getMessage()
-
-            # 如果是 JSON 格式(文件格式化器),解析它
-            message = formatted_msg
-            try:
-                log_dict = json.loads(formatted_msg)
-                message = log_dict.get("event", formatted_msg)
-            except (json.JSONDecodeError, ValueError):
-                # 不是 JSON,直接使用消息
-                message = formatted_msg
+            with self._pending_lock:
+                if not self._accept(record.levelno):
+                    self.dropped_count += 1
+                    return
 
             # 生成唯一 ID: 时间戳毫秒 + 自增计数器
             WebSocketLogHandler._log_counter += 1
             log_id = f"{int(record.created * 1000)}_{WebSocketLogHandler._log_counter}"
 
-            # 格式化日志数据
             log_data = {
                 "id": log_id,
                 "timestamp": datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"),
                 "level": record.levelname,
                 "module": record.name,
-                "message": message,
+                "message": self._extract_message(record, self.formatter),
             }
 
-            # 异步广播日志(不阻塞日志记录)
-            try:
-                import asyncio
-                from src.webui.logs_ws import broadcast_log
+            with self._pending_lock:
+                self._pending.append(log_data)
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
 
-                coroutine = broadcast_log(log_data)
-                try:
-                    asyncio.run_coroutine_threadsafe(coroutine, self.loop)
-                except Exception:
-                    coroutine.close()
-                    raise
-            except Exception:
-                # WebSocket 推送失败不影响日志记录
-                pass
+            try:
+                self.loop.call_soon_threadsafe(self.loop.call_later, self.push_interval, self._flush_on_loop)
+            except RuntimeError:
+                # 事件循环已关闭
+                with self._pending_lock:
+                    self._flush_scheduled = False
 
         except Exception:
             # 不要让 WebSocket 错误影响日志系统
             self.handleError(record)
 
+    def _take_batch(self) -> tuple[list[dict], int]:
+        with self._pending_lock:
+            entries = list(self._pending)
+            self._pending.clear()
+            dropped = self.dropped_count
+            self.dropped_count = 0
+            return entries, dropped
+
+    def _flush_on_loop(self):
+        """在事件循环线程上取出一批日志并发起广播"""
+        if self._sending:
+            # 上一批尚未发送完成，等待其结束后再推送，期间由缓冲区吸收背压
+            self.loop.call_later(self.push_interval, self._flush_on_loop)
+            return
+
+        entries, dropped = self._take_batch()
+        with self._pending_lock:
+            self._flush_scheduled = False
+        if not entries:
+            return
+
+        try:
+            import asyncio
+            from src.webui.logs_ws import broadcast_log_batch
+
+            self._sending = True
+            task = asyncio.ensure_future(broadcast_log_batch(entries, dropped=dropped), loop=self.loop)
+            task.add_done_callback(self._on_batch_sent)
+        except Exception:
+            # WebSocket 推送失败不影响日志记录
+            self._sending = False
+
+    def _on_batch_sent(self, task):
+        self._sending = False
+        if not task.cancelled():
+            # 取出异常避免 "Task exception was never retrieved"，推送失败不再记录日志
+            task.exception()
+
 
 # 旧的轮转文件处理器已移除，现在使用基于时间戳的处理器
 
 
 def close_handlers():
     """安全关闭所有handler"""
-    global _file_handler, _console_handler, _ws_handler
+    global _file_handler, _console_handler, _ws_handler, _queue_handler, _log_writer
+
+    # 先停止写入线程，确保队列中剩余的日志落盘
+    if _log_writer:
+        _log_writer.stop()
+        _log_writer = None
+
+    if _queue_handler:
+        _queue_handler.close()
+        _queue_handler = None
 
     if _file_handler:
         _file_handler.close()
@@ -319,6 +658,12 @@ def load_log_config():  # sourcery skip: use-contextlib-suppress
             "jieba",
         ],
         "library_log_levels": {"aiohttp": "WARNING"},
+        "async_logging": True,  # 文件与 WebSocket 日志经队列由后台线程写入
+        "log_batch_size": 256,  # 写入线程每轮最多处理的日志条数
+        "file_flush_interval": 0.5,  # 文件日志最长 flush 间隔（秒）
+        "file_flush_bytes": 64 * 1024,  # 文件日志缓冲达到该字节数时立即 flush
+        "ws_push_interval": 0.2,  # WebSocket 日志批量推送间隔（秒）
+        "ws_max_pending": 2000,  # WebSocket 待推送日志上限，超出后丢弃低级别日志
     }
 
     try:
@@ -484,8 +829,25 @@ def normalize_embedded_event_dict(logger, method_name, event_dict):
     return event_dict
 
 
+@lru_cache(maxsize=2048)
+def _pathname_to_module(pathname: str) -> Optional[str]:
+    """将源文件路径转换为模块风格路径，结果按路径缓存，避免每条日志都 resolve 文件系统"""
+    try:
+        # 使用绝对路径确保准确性
+        pathname_path = Path(pathname).resolve()
+        rel_path = pathname_path.relative_to(PROJECT_ROOT)
+    except Exception:
+        return None
+
+    # 转换为模块风格：移除 .py 扩展名，将路径分隔符替换为点
+    module_path = str(rel_path).replace("\\", ".").replace("/", ".")
+    if module_path.endswith(".py"):
+        module_path = module_path[:-3]
+    return module_path
+
+
 def convert_pathname_to_module(logger, method_name, event_dict):
-    # sourcery skip: extract-method, use-string-remove-affix
+    # sourcery skip: use-string-remove-affix
     """将 pathname 转换为模块风格的路径"""
     if "logger_name" in event_dict and event_dict["logger_name"] == "maim_message":
         if "pathname" in event_dict:
@@ -493,27 +855,14 @@ def convert_pathname_to_module(logger, method_name, event_dict):
             event_dict["module"] = "maim_message"
         return event_dict
     if "pathname" in event_dict:
-        pathname = event_dict["pathname"]
-        try:
-            # 使用绝对路径确保准确性
-            pathname_path = Path(pathname).resolve()
-            rel_path = pathname_path.relative_to(PROJECT_ROOT)
-
-            # 转换为模块风格：移除 .py 扩展名，将路径分隔符替换为点
-            module_path = str(rel_path).replace("\\", ".").replace("/", ".")
-            if module_path.endswith(".py"):
-                module_path = module_path[:-3]
-
+        pathname = event_dict.pop("pathname")
+        module_path = _pathname_to_module(pathname)
+        if module_path is not None:
             # 使用转换后的模块路径替换 module 字段
             event_dict["module"] = module_path
-            # 移除原始的 pathname 字段
-            del event_dict["pathname"]
-        except Exception:
-            # 如果转换失败，删除 pathname 但保留原始的 module（如果有的话）
-            del event_dict["pathname"]
-            # 如果没有 module 字段，使用文件名作为备选
-            if "module" not in event_dict:
-                event_dict["module"] = Path(pathname).stem
+        elif "module" not in event_dict:
+            # 如果转换失败且没有 module 字段，使用文件名作为备选
+            event_dict["module"] = Path(pathname).stem
 
     return event_dict
 
@@ -761,14 +1110,22 @@ def _immediate_setup():
     file_handler = get_file_handler()
     console_handler = get_console_handler()
 
-    # 重新添加配置好的handler
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-
     # 设置格式化器
     file_handler.setFormatter(file_formatter)
     console_handler.setFormatter(console_formatter)
 
+    # 重新添加配置好的handler；异步模式下文件 handler 挂在写入线程上，根 logger 只保留队列前端
+    queue_handler = get_queue_handler()
+    if queue_handler is not None:
+        log_writer = get_log_writer()
+        log_writer.add_handler(file_handler)
+        log_writer.start()
+        atexit.register(log_writer.stop)
+        root_logger.addHandler(queue_handler)
+    else:
+        root_logger.addHandler(file_handler)
+    root_logger.addHandler(console_handler)
+
     # 清理重复的handler
     remove_duplicate_handlers()
 
@@ -902,6 +1259,10 @@ def shutdown_logging():
     # 先输出到控制台，避免日志系统关闭后无法输出
     print("[logger] 正在关闭日志系统...")
 
+    # 先停止写入线程，确保队列中剩余的日志落盘
+    if _log_writer:
+        _log_writer.stop()
+
     # 关闭所有handler
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
@@ -0,0 +1,172 @@
+"""入站消息过滤词与过滤正则的预编译匹配器。"""
+
+from collections import deque
+from typing import Callable, Collection, Generic, Iterable, Iterator, Optional, TypeVar
+
+import re
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python 3.10
+    import sre_parse  # type: ignore[no-redef]
+
+MatcherT = TypeVar("MatcherT", "BanWordMatcher", "BanRegexMatcher")
+
+
+class _AhoCorasick:
+    """Aho-Corasick 多模式子串自动机，扫描耗时只与文本长度有关。"""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+
+        for word in words:
+            if not word:
+                continue
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] = (word,)
+
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # 合并后缀状态上的命中词，扫描时无需再沿失配链回溯
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[str]:
+        """按结束位置顺序产出文本中出现的模式（同一模式可能重复产出）。"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class BanWordMatcher:
+    """过滤词匹配器，判断结果与逐个执行 `word in text` 一致。"""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        words = list(words)
+        # 空字符串是任何非空文本的子串
+        self._match_empty = "" in words
+        self._automaton = _AhoCorasick(words)
+
+    def find(self, text: str) -> Optional[str]:
+        """返回文本中出现的任意一个过滤词，未命中时返回 None。"""
+        if not text:
+            return None
+        if self._match_empty:
+            return ""
+        return next(self._automaton.iter_matches(text), None)
+
+
+def _required_literal(compiled: re.Pattern[str]) -> str:
+    """提取匹配成功时文本中必然出现的最长字面量片段，无法确定时返回空字符串。"""
+    if compiled.flags != re.UNICODE:
+        return ""
+    try:
+        parsed = sre_parse.parse(compiled.pattern)
+    except Exception:
+        return ""
+    best = ""
+    current: list[str] = []
+    # 顶层序列中的每一项都必须匹配，因此其中连续的 LITERAL 必然出现在文本中
+    for op, value in [*parsed, (None, None)]:
+        if op == sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if len(current) > len(best):
+            best = "".join(current)
+        current = []
+    return best
+
+
+class BanRegexMatcher:
+    """过滤正则匹配器，判断结果与逐条执行 `re.search` 一致。
+
+    含必然出现字面量的表达式由 Aho-Corasick 预筛，仅在字面量出现时才执行正则；
+    其余不含捕获组、未使用内联全局标志的表达式合并为一个交替表达式；
+    剩下的（可能含反向引用或全局标志）保持逐条匹配。
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._patterns: list[tuple[str, re.Pattern[str]]] = []
+        self._by_literal: dict[str, list[re.Pattern[str]]] = {}
+        mergeable: list[str] = []
+        self._standalone: list[re.Pattern[str]] = []
+        for pattern in patterns:
+            compiled = re.compile(pattern)
+            self._patterns.append((pattern, compiled))
+            if literal := _required_literal(compiled):
+                self._by_literal.setdefault(literal, []).append(compiled)
+            elif compiled.groups == 0 and compiled.flags == re.UNICODE:
+                mergeable.append(pattern)
+            else:
+                self._standalone.append(compiled)
+
+        self._literal_automaton = _AhoCorasick(self._by_literal)
+        self._combined: Optional[re.Pattern[str]] = None
+        if len(mergeable) == 1:
+            self._standalone.append(re.compile(mergeable[0]))
+        elif mergeable:
+            self._combined = re.compile("|".join(f"(?:{pattern})" for pattern in mergeable))
+
+    def _matches_any(self, text: str) -> bool:
+        checked: set[str] = set()
+        for literal in self._literal_automaton.iter_matches(text):
+            if literal in checked:
+                continue
+            checked.add(literal)
+            if any(compiled.search(text) for compiled in self._by_literal[literal]):
+                return True
+        if self._combined is not None and self._combined.search(text):
+            return True
+        return any(compiled.search(text) for compiled in self._standalone)
+
+    def find(self, text: str) -> Optional[str]:
+        """返回第一个匹配文本的过滤正则，未命中时返回 None。"""
+        if not text or not self._matches_any(text):
+            return None
+        # 仅在命中时按配置顺序定位具体表达式，用于日志输出
+        return next(pattern for pattern, compiled in self._patterns if compiled.search(text))
+
+
+class CompiledMatcherCache(Generic[MatcherT]):
+    """按配置集合缓存已编译的匹配器。
+
+    热重载会生成新的配置对象，因此以集合对象本身及其长度作为版本标识，
+    配置替换或原地增删后的下一次检查会自动重建匹配器。
+    """
+
+    def __init__(self, factory: Callable[[Iterable[str]], MatcherT]) -> None:
+        self._factory = factory
+        self._source: Optional[Collection[str]] = None
+        self._source_size = -1
+        self._matcher: Optional[MatcherT] = None
+
+    def get(self, source: Collection[str]) -> MatcherT:
+        if self._matcher is None or source is not self._source or len(source) != self._source_size:
+            self._matcher = self._factory(source)
+            self._source = source
+            self._source_size = len(source)
+        return self._matcher
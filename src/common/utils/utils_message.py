@@ -6,7 +6,6 @@ import base64
 import hashlib
 import msgpack
 import random
-import re
 
 from sqlmodel import select, col
 
@@ -28,12 +27,16 @@ from src.config.config import global_config
 
 from .math_utils import number_to_short_id, TimestampMode, translate_timestamp_to_human_readable
 from .system_utils import is_bot_self
+from .utils_ban_filter import BanRegexMatcher, BanWordMatcher, CompiledMatcherCache
 
 if TYPE_CHECKING:
     from src.chat.message_receive.message import SessionMessage
 
 logger = get_logger("message_utils")
 
+_ban_word_matchers: CompiledMatcherCache[BanWordMatcher] = CompiledMatcherCache(BanWordMatcher)
+_ban_regex_matchers: CompiledMatcherCache[BanRegexMatcher] = CompiledMatcherCache(BanRegexMatcher)
+
 
 class MessageUtils:
     @staticmethod
@@ -115,10 +118,8 @@ class MessageUtils:
         """
         if not text:
             return False, None
-        return next(
-            ((True, word) for word in global_config.message_receive.ban_words if word in text),
-            (False, None),
-        )
+        word = _ban_word_matchers.get(global_config.message_receive.ban_words).find(text)
+        return (True, word) if word is not None else (False, None)
 
     @staticmethod
     def check_ban_regex(text: str) -> Tuple[bool, Optional[str]]:
@@ -135,10 +136,8 @@ class MessageUtils:
         # 检查text是否为None或空字符串
         if not text:
             return False, None
-        return next(
-            ((True, pattern) for pattern in global_config.message_receive.ban_msgs_regex if re.search(pattern, text)),
-            (False, None),
-        )
+        pattern = _ban_regex_matchers.get(global_config.message_receive.ban_msgs_regex).find(text)
+        return (True, pattern) if pattern is not None else (False, None)
 
     @staticmethod
     def store_message_to_db(message: "SessionMessage"):
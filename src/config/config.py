@@ -55,8 +55,8 @@ BOT_CONFIG_PATH: Path = (CONFIG_DIR / "bot_config.toml").resolve().absolute()
 MODEL_CONFIG_PATH: Path = (CONFIG_DIR / "model_config.toml").resolve().absolute()
 LEGACY_ENV_PATH: Path = (PROJECT_ROOT / ".env").resolve().absolute()
 MMC_VERSION: str = "1.0.0"
-CONFIG_VERSION: str = "8.9.8"
-MODEL_CONFIG_VERSION: str = "1.14.1"
+CONFIG_VERSION: str = "8.9.17"
+MODEL_CONFIG_VERSION: str = "1.15.0"
 
 logger = get_logger("config")
 
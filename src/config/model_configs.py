@@ -203,6 +203,39 @@ class APIProvider(ConfigBase):
     )
     """重试间隔 (如果API调用失败, 重试的间隔时间, 单位: 秒)"""
 
+    max_concurrency: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "git-merge",
+            "step": 1,
+        },
+    )
+    """该提供商下所有模型同时进行中的最大请求数，0 表示不限制"""
+
+    rpm_limit: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "gauge",
+            "step": 1,
+        },
+    )
+    """该提供商下所有模型每分钟最多发起的请求数，0 表示不限制"""
+
+    tpm_limit: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "activity",
+            "step": 1,
+        },
+    )
+    """该提供商下所有模型每分钟最多消耗的 token 数（按请求预估并在完成后按实际用量修正），0 表示不限制"""
+
     def model_post_init(self, context: Any = None) -> None:
         """执行 API 提供商配置的后置校验。
 
@@ -316,6 +349,39 @@ class ModelInfo(ConfigBase):
     )
     """是否为多模态模型。开启后表示该模型支持视觉输入。"""
 
+    max_concurrency: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "git-merge",
+            "step": 1,
+        },
+    )
+    """该模型同时进行中的最大请求数，0 表示不限制"""
+
+    rpm_limit: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "gauge",
+            "step": 1,
+        },
+    )
+    """该模型每分钟最多发起的请求数，0 表示不限制"""
+
+    tpm_limit: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "activity",
+            "step": 1,
+        },
+    )
+    """该模型每分钟最多消耗的 token 数（按请求预估并在完成后按实际用量修正），0 表示不限制"""
+
     extra_params: dict[str, Any] = Field(
         default_factory=dict,
         json_schema_extra={
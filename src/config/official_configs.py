@@ -208,6 +208,16 @@ class ChatConfig(ConfigBase):
         },
     )
     """上下文长度"""
+
+    max_context_tokens: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "scissors",
+        },
+    )
+    """上下文 token 预算，按预估 token 数从最早的消息开始裁剪，使上下文历史不超过该值，0 表示只按条数限制"""
     
     planner_interrupt_max_consecutive_count: int = Field(
         default=2,
@@ -219,6 +229,26 @@ class ChatConfig(ConfigBase):
     )
     """Planner 连续被新消息打断的最大次数，0 表示不启用打断"""
 
+    session_hibernate_idle_seconds: int = Field(
+        default=1800,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "moon",
+        },
+    )
+    """会话空闲超过该秒数后休眠其 Maisaka 运行时，收到新消息时自动恢复，0 表示不休眠"""
+
+    session_hibernate_max_sessions: int = Field(
+        default=512,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "archive",
+        },
+    )
+    """最多保留的休眠会话状态数量，超出时丢弃最早休眠的会话状态（下次收到消息时重新开始上下文），0 表示不限制"""
+
     group_chat_prompt: str = Field(
         default=(
             "你正在qq群里聊天，下面是群里正在聊的内容，其中包含聊天记录和聊天中的图片和表情包。\n"
@@ -313,6 +343,39 @@ class MessageReceiveConfig(ConfigBase):
     )
     """过滤正则表达式列表"""
 
+    inbound_queue_size: int = Field(
+        default=2000,
+        ge=1,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "inbox",
+        },
+    )
+    """入站消息队列中等待分发的消息上限，修改后需重启生效"""
+
+    inbound_worker_count: int = Field(
+        default=8,
+        ge=1,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "users",
+        },
+    )
+    """并发分发入站消息的工作协程数量，同一会话内的消息始终按顺序处理，修改后需重启生效"""
+
+    inbound_overflow_policy: Literal["block", "drop_oldest", "shed_low_priority"] = Field(
+        default="block",
+        json_schema_extra={
+            "x-widget": "select",
+            "x-icon": "filter",
+        },
+    )
+    """
+    入站队列已满时的处理策略，修改后需重启生效：
+    block 阻塞适配器直到队列出现空位；drop_oldest 丢弃最早入队的消息；
+    shed_low_priority 优先丢弃通知等低优先级消息，没有可丢弃的消息时退化为阻塞
+    """
+
     def model_post_init(self, context: Optional[dict] = None) -> None:
         for pattern in self.ban_msgs_regex:
             try:
@@ -720,6 +783,16 @@ class ExpressionConfig(ConfigBase):
     )
     """是否启用基于子代理的二次表达方式选择"""
 
+    advanced_chosen_cache_seconds: int = Field(
+        default=120,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "timer",
+        },
+    )
+    """子代理表达方式选择结果的复用时长（秒），最近上下文与目标消息未变化时直接复用，0 表示不复用"""
+
     expression_groups: list[ExpressionGroup] = Field(
         default_factory=list,
         json_schema_extra={
@@ -1290,6 +1363,20 @@ class MaimMessageConfig(ConfigBase):
     )
     """新版API Server允许的API Key列表，为空则允许所有连接"""
 
+    platform_send_timeout_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "number",
+            "x-icon": "clock-3",
+        },
+    )
+    """
+    单个平台驱动单次发送的超时时间，单位秒，设为 0 表示不限时，修改后需重启生效。
+    同一驱动的发送按顺序串行，一次卡住的发送会阻塞该驱动后续的所有消息，超时后记为发送失败；
+    默认 30 秒足以覆盖常规适配器的图片与文件上传，若适配器需要发送大文件可适当调大
+    """
+
 
 class LPMMKnowledgeConfig(ConfigBase):
     """LPMM知识库配置类"""
@@ -2081,6 +2168,45 @@ class PluginRuntimeRenderConfig(ConfigBase):
     )
     """累计渲染指定次数后自动重建本地浏览器，0 表示关闭该策略"""
 
+    page_pool_size: int = Field(
+        default=2,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "number",
+            "x-icon": "copy",
+        },
+    )
+    """预热并在渲染之间复用的空闲页面数量，0 表示每次渲染都新建页面"""
+
+    cache_enabled: bool = Field(
+        default=True,
+        json_schema_extra={
+            "x-widget": "switch",
+            "x-icon": "database",
+        },
+    )
+    """是否启用渲染结果磁盘缓存，相同 HTML 与视口参数直接复用已渲染的 PNG"""
+
+    cache_max_entries: int = Field(
+        default=256,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "number",
+            "x-icon": "hash",
+        },
+    )
+    """渲染结果磁盘缓存最多保留的图片数量"""
+
+    cache_max_size_mb: int = Field(
+        default=64,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "number",
+            "x-icon": "hard-drive",
+        },
+    )
+    """渲染结果磁盘缓存的总大小上限（MB）"""
+
 
 class PluginRuntimeConfig(ConfigBase):
     """插件运行时配置类"""
@@ -2133,6 +2259,48 @@ class PluginRuntimeConfig(ConfigBase):
     )
     """Hook 阻塞步骤的全局超时上限（秒）"""
 
+    sync_handler_max_workers: int = Field(
+        default=8,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "cpu",
+        },
+    )
+    """Runner 中执行同步插件处理器的线程池大小，设为 0 则直接在事件循环上执行"""
+
+    sync_handler_per_plugin_limit: int = Field(
+        default=2,
+        ge=1,
+        json_schema_extra={
+            "x-widget": "input",
+            "x-icon": "layers",
+        },
+    )
+    """单个插件可同时占用的同步处理器线程数"""
+
+    sync_handler_timeout_sec: float = Field(
+        default=30.0,
+        ge=0,
+        json_schema_extra={
+            "x-widget": "number",
+            "x-icon": "timer",
+        },
+    )
+    """单次同步处理器调用的超时时间（秒），设为 0 则只受请求自身超时限制"""
+
+    hot_standby_enabled: bool = Field(
+        default=False,
+        json_schema_extra={
+            "x-widget": "switch",
+            "x-icon": "copy",
+        },
+    )
+    """
+    启用热备 Runner：预先启动一个已导入全部插件的备用进程，当前 Runner 故障时直接接管
+    会额外占用一份插件进程的内存
+    """
+
     ipc_socket_path: str = Field(
         default="",
         json_schema_extra={
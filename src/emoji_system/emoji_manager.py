@@ -11,8 +11,6 @@ import re
 from rich.traceback import install
 from sqlmodel import select
 
-import Levenshtein
-
 from src.common.data_models.image_data_model import MaiEmoji
 from src.common.data_models.llm_service_data_models import LLMGenerationOptions
 from src.common.database.database import get_db_session, get_db_session_manual
@@ -20,6 +18,7 @@ from src.common.database.database_model import Images, ImageType
 from src.common.logger import get_logger
 from src.common.utils.utils_image import ImageUtils
 from src.config.config import config_manager, global_config
+from src.emoji_system.emotion_index import EmotionTagIndex
 from src.plugin_runtime.hook_schema_utils import build_object_schema
 from src.plugin_runtime.host.hook_spec_registry import HookSpec, HookSpecRegistry
 from src.prompt.prompt_manager import prompt_manager
@@ -34,6 +33,7 @@ DATA_DIR = PROJECT_ROOT / "data"
 EmojiRegisterStatus = Literal["registered", "skipped", "failed"]
 EMOJI_DIR = DATA_DIR / "emoji"  # 表情包存储目录
 MAX_EMOJI_FOR_PROMPT = 20  # 最大允许的表情包描述数量于图片替换的 prompt 中
+EMOTION_MATCH_TOP_K = 10  # 情绪匹配时参与随机选择的候选表情包数量
 
 
 def register_emoji_hook_specs(registry: HookSpecRegistry) -> list[HookSpec]:
@@ -232,7 +232,8 @@ class EmojiManager:
         _ensure_directories()
 
         self._emoji_num: int = 0
-        self.emojis: list[MaiEmoji] = []
+        self._emotion_index: EmotionTagIndex = EmotionTagIndex()
+        self.emojis = []
         self._maintenance_wakeup_event: asyncio.Event = asyncio.Event()
         self._pending_description_tasks: dict[str, asyncio.Task[None]] = {}
         self._reload_callback_registered: bool = False
@@ -242,6 +243,30 @@ class EmojiManager:
 
         logger.info("启动表情包管理器")
 
+    @property
+    def emojis(self) -> list[MaiEmoji]:
+        """当前已注册的表情包列表。"""
+        return self._emojis
+
+    @emojis.setter
+    def emojis(self, emojis: list[MaiEmoji]) -> None:
+        self._emojis = emojis
+        self._rebuild_emotion_index()
+
+    def _rebuild_emotion_index(self) -> None:
+        """按当前列表顺序重建情绪标签索引。"""
+        self._emotion_index.rebuild((emoji, _get_emoji_emotions(emoji)) for emoji in self._emojis)
+
+    def _add_runtime_emoji(self, emoji: MaiEmoji) -> None:
+        """将表情包加入内存列表并同步情绪索引。"""
+        self._emojis.append(emoji)
+        self._emotion_index.add(emoji, _get_emoji_emotions(emoji))
+
+    def _remove_runtime_emoji(self, emoji: MaiEmoji) -> None:
+        """将表情包从内存列表移除并同步情绪索引。"""
+        self._emojis.remove(emoji)
+        self._emotion_index.remove(emoji)
+
     def reload_runtime_config(self) -> None:
         """响应配置热重载，唤醒维护循环以尽快应用最新配置。"""
         self._maintenance_wakeup_event.set()
@@ -458,6 +483,7 @@ class EmojiManager:
         """
         logger.debug("[数据库] 开始加载所有表情包记录...")
         try:
+            loaded_emojis: list[MaiEmoji] = []
             with get_db_session() as session:
                 statement = select(Images)
                 results = session.exec(statement).all()
@@ -472,11 +498,12 @@ class EmojiManager:
                         continue
                     try:
                         emoji = MaiEmoji.from_db_instance(record)
-                        self.emojis.append(emoji)
+                        loaded_emojis.append(emoji)
                     except Exception as e:
                         logger.error(
                             f"[数据库] 加载表情包记录时出错: {e}\n记录ID: {record.id}, 路径: {record.full_path}"
                         )
+                self.emojis = loaded_emojis
                 self._emoji_num = len(self.emojis)
                 logger.info(f"[数据库] 成功加载 {self._emoji_num} 个已注册表情包")
         except Exception as e:
@@ -644,6 +671,8 @@ class EmojiManager:
                 if image_record := session.exec(statement).first():
                     image_record.description = emoji.description
                     session.add(image_record)
+                    if emoji in self.emojis:
+                        self._emotion_index.update(emoji, _get_emoji_emotions(emoji))
                     logger.info(f"[更新表情包] 成功更新表情包信息: {emoji.file_hash}")
                 else:
                     logger.error(f"[更新表情包] 未找到表情包记录: {emoji.file_hash}")
@@ -704,7 +733,7 @@ class EmojiManager:
                     image_record.is_banned = True
                     session.add(image_record)
                     if emoji in self.emojis:
-                        self.emojis.remove(emoji)
+                        self._remove_runtime_emoji(emoji)
                     logger.info(f"[封禁表情包] 成功封禁表情包: {emoji.file_name}")
                 else:
                     logger.warning(f"[封禁表情包] 未找到表情包记录: {emoji.file_name}")
@@ -732,8 +761,8 @@ class EmojiManager:
             logger.info("[获取表情包] 未找到匹配的表情包")
             return None
 
-        # 获取前10个相似度最高的表情包
-        top_emojis = heapq.nlargest(10, emoji_similarities, key=lambda x: x[1])
+        # 获取相似度最高的若干个表情包
+        top_emojis = heapq.nlargest(EMOTION_MATCH_TOP_K, emoji_similarities, key=lambda x: x[1])
         selected_emoji, similarity = random.choice(top_emojis)
         self.update_emoji_usage(selected_emoji)
         logger.info(
@@ -799,10 +828,10 @@ class EmojiManager:
                 emoji_to_delete = selected_emojis[emoji_index]
                 logger.info(f"[决策] 删除表情包: {emoji_to_delete.description}")
                 if self.delete_emoji(emoji_to_delete):
-                    self.emojis.remove(emoji_to_delete)
+                    self._remove_runtime_emoji(emoji_to_delete)
                     register_status = self.register_emoji_to_db(new_emoji)
                     if register_status == "registered":
-                        self.emojis.append(new_emoji)
+                        self._add_runtime_emoji(new_emoji)
                         logger.info(f"[register_emoji] Replaced old emoji with new emoji: {new_emoji.description}")
                         return True
                     if register_status == "skipped":
@@ -938,7 +967,7 @@ class EmojiManager:
 
         for emoji, is_description_empty in to_delete_emojis:
             if self.delete_emoji(emoji, is_description_empty):
-                self.emojis.remove(emoji)
+                self._remove_runtime_emoji(emoji)
                 self._emoji_num -= 1
                 removal_count += 1
                 logger.info(f"[完整性检查] 成功删除缺失文件的表情包记录: {emoji.file_name}")
@@ -1048,7 +1077,7 @@ class EmojiManager:
 
         register_status = self.register_emoji_to_db(target_emoji)
         if register_status == "registered":
-            self.emojis.append(target_emoji)
+            self._add_runtime_emoji(target_emoji)
             self._emoji_num = len(self.emojis)
             logger.info(f"[register_emoji] Registered new emoji: {target_emoji.file_name}")
         elif register_status == "failed":
@@ -1057,38 +1086,21 @@ class EmojiManager:
             logger.info(f"[register_emoji] Emoji already registered, skipping: {target_emoji.file_name}")
         return register_status
 
-    def _calculate_emotion_similarity_list(self, text_emotion: str) -> list[tuple[MaiEmoji, float]]:
+    def _calculate_emotion_similarity_list(
+        self, text_emotion: str, top_k: int = EMOTION_MATCH_TOP_K
+    ) -> list[tuple[MaiEmoji, float]]:
         """
-        计算文本情感标签与所有表情包情感标签的相似度列表
+        计算文本情感标签与表情包情感标签的相似度，仅返回相似度最高的若干个候选
 
         Args:
             text_emotion (str): 文本的情感标签
+            top_k (int): 返回的候选数量
         Returns:
-        return (List[Tuple[MaiEmoji, float]]): 返回表情包对象及其相似度的列表
+        return (List[Tuple[MaiEmoji, float]]): 返回表情包对象及其相似度的列表，按表情包列表顺序排列
         """
-        normalized_text_emotion = str(text_emotion or "").strip().lower()
-        if not normalized_text_emotion:
-            return []
-
-        similarity_list: list[tuple[MaiEmoji, float]] = []
-        for emoji in self.emojis:
-            candidate_emotions = _get_emoji_emotions(emoji)
-            if not candidate_emotions:
-                continue
-
-            emotion_similarities = [
-                1 - Levenshtein.distance(normalized_text_emotion, str(emotion).strip().lower()) / max(
-                    len(normalized_text_emotion),
-                    len(str(emotion).strip().lower()),
-                )
-                for emotion in candidate_emotions
-                if emotion
-            ]
-            if not emotion_similarities:
-                continue
-            # 计算该表情包与输入标签的最接近匹配度
-            similarity_list.append((emoji, max(emotion_similarities)))
-        return similarity_list
-
+        if self._emotion_index.size != len(self.emojis):
+            # 列表被外部直接增删时，索引与列表不再一致，整体重建兜底
+            self._rebuild_emotion_index()
+        return self._emotion_index.top_matches(text_emotion, top_k)
 
 emoji_manager = EmojiManager()
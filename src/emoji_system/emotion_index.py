@@ -0,0 +1,198 @@
+"""表情包情绪标签索引。"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import heapq
+import threading
+
+import Levenshtein
+
+from src.common.data_models.image_data_model import MaiEmoji
+
+QUERY_CACHE_SIZE = 256  # 缓存的查询结果数量
+
+
+@dataclass
+class _IndexedEmoji:
+    """索引中的单个表情包条目。"""
+
+    emoji: MaiEmoji
+    seq: int
+    tags: tuple[str, ...]
+
+
+class EmotionTagIndex:
+    """情绪标签倒排索引。
+
+    相似度定义与逐个比较时一致：``1 - Levenshtein 距离 / 两者较长长度``，表情包得分取其所有标签中的最大值。
+    查询时只对与关键词存在公共字符的标签计算编辑距离（没有公共字符的标签相似度恒为 0），
+    并按长度差给出的相似度上界从高到低处理，上界低于当前第 k 名时提前结束。
+    同分时按表情包加入索引的先后顺序决定名次，与按列表顺序全量比较的结果一致。
+    查询在工作线程中执行，增删改在事件循环中执行，因此所有操作都持有同一把锁。
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _IndexedEmoji] = {}
+        self._tag_members: dict[str, dict[int, None]] = {}
+        self._char_tags: dict[str, set[str]] = {}
+        self._next_seq = 0
+        self._query_cache: OrderedDict[tuple[str, int], list[tuple[int, float]]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def size(self) -> int:
+        """索引中的表情包数量（包括没有标签的表情包）。"""
+        return len(self._entries)
+
+    def rebuild(self, emojis: Iterable[tuple[MaiEmoji, Sequence[str]]]) -> None:
+        """按给定顺序重建索引。
+
+        Args:
+            emojis: (表情包, 情绪标签列表) 序列，顺序即同分时的名次顺序
+        """
+        with self._lock:
+            self._entries.clear()
+            self._tag_members.clear()
+            self._char_tags.clear()
+            self._next_seq = 0
+            self._query_cache.clear()
+            for emoji, tags in emojis:
+                self.add(emoji, tags)
+
+    def add(self, emoji: MaiEmoji, tags: Sequence[str]) -> None:
+        """将表情包追加到索引末尾，已存在时等同于 update。"""
+        key = id(emoji)
+        with self._lock:
+            if key in self._entries:
+                self.update(emoji, tags)
+                return
+            entry = _IndexedEmoji(emoji=emoji, seq=self._next_seq, tags=self._normalize_tags(tags))
+            self._next_seq += 1
+            self._entries[key] = entry
+            self._link_tags(key, entry.tags)
+            self._query_cache.clear()
+
+    def remove(self, emoji: MaiEmoji) -> None:
+        """从索引中移除表情包。"""
+        with self._lock:
+            entry = self._entries.pop(id(emoji), None)
+            if entry is None:
+                return
+            self._unlink_tags(id(emoji), entry.tags)
+            self._query_cache.clear()
+
+    def update(self, emoji: MaiEmoji, tags: Sequence[str]) -> None:
+        """更新表情包的标签（例如重新生成描述后），保持其原有名次顺序。"""
+        key = id(emoji)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.add(emoji, tags)
+                return
+            new_tags = self._normalize_tags(tags)
+            if new_tags == entry.tags:
+                return
+            self._unlink_tags(key, entry.tags)
+            entry.tags = new_tags
+            self._link_tags(key, new_tags)
+            self._query_cache.clear()
+
+    def top_matches(self, text: str, k: int) -> list[tuple[MaiEmoji, float]]:
+        """获取与情绪文本最相似的 k 个表情包。
+
+        Args:
+            text: 情绪文本
+            k: 返回数量
+
+        Returns:
+            list[tuple[MaiEmoji, float]]: (表情包, 相似度) 列表，按表情包加入索引的顺序排列
+        """
+        query = str(text or "").strip().lower()
+        if not query or k <= 0:
+            return []
+
+        cache_key = (query, k)
+        with self._lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is None:
+                cached = self._search(query, k)
+                self._query_cache[cache_key] = cached
+                if len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+            else:
+                self._query_cache.move_to_end(cache_key)
+            return [(self._entries[key].emoji, similarity) for key, similarity in cached]
+
+    def _search(self, query: str, k: int) -> list[tuple[int, float]]:
+        query_length = len(query)
+        candidate_tags: set[str] = set()
+        for char in set(query):
+            candidate_tags.update(self._char_tags.get(char, ()))
+
+        def upper_bound(tag: str) -> float:
+            # 编辑距离不小于长度差；与相似度使用相同的浮点表达式，保证同分边界判断准确
+            longest = max(query_length, len(tag))
+            return 1 - abs(query_length - len(tag)) / longest
+
+        best: dict[int, float] = {}
+        current_bound = None
+        for tag in sorted(candidate_tags, key=lambda item: (-upper_bound(item), item)):
+            bound = upper_bound(tag)
+            # 上界只会单调下降，仅在上界变化时重新计算第 k 名得分
+            if bound != current_bound:
+                current_bound = bound
+                if len(best) >= k and bound < heapq.nlargest(k, best.values())[-1]:
+                    break
+            similarity = 1 - Levenshtein.distance(query, tag) / max(query_length, len(tag))
+            for key in self._tag_members[tag]:
+                if similarity > best.get(key, -1.0):
+                    best[key] = similarity
+
+        ranked = heapq.nsmallest(k, best.items(), key=lambda item: (-item[1], self._entries[item[0]].seq))
+        ranked = [item for item in ranked if item[1] > 0]
+        if len(ranked) < k:
+            # 没有公共字符的标签相似度为 0，按加入顺序补足零分候选
+            selected = {key for key, _ in ranked}
+            for key, entry in self._entries.items():
+                if len(ranked) >= k:
+                    break
+                if entry.tags and key not in selected:
+                    ranked.append((key, 0.0))
+        ranked.sort(key=lambda item: self._entries[item[0]].seq)
+        return ranked
+
+    @staticmethod
+    def _normalize_tags(tags: Sequence[str]) -> tuple[str, ...]:
+        normalized: dict[str, None] = {}
+        for tag in tags:
+            token = str(tag).strip().lower()
+            if token:
+                normalized[token] = None
+        return tuple(normalized)
+
+    def _link_tags(self, key: int, tags: tuple[str, ...]) -> None:
+        for tag in tags:
+            members = self._tag_members.get(tag)
+            if members is None:
+                members = self._tag_members[tag] = {}
+                for char in set(tag):
+                    self._char_tags.setdefault(char, set()).add(tag)
+            members[key] = None
+
+    def _unlink_tags(self, key: int, tags: tuple[str, ...]) -> None:
+        for tag in tags:
+            members = self._tag_members.get(tag)
+            if members is None:
+                continue
+            members.pop(key, None)
+            if members:
+                continue
+            del self._tag_members[tag]
+            for char in set(tag):
+                char_tags = self._char_tags.get(char)
+                if char_tags is not None:
+                    char_tags.discard(tag)
+                    if not char_tags:
+                        del self._char_tags[char]
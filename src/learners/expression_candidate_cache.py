@@ -0,0 +1,151 @@
+"""表达方式候选池缓存。
+
+replyer 每次回复都要按会话筛选表达方式候选。这里在内存中按 session_id 维护可用表达方式，
+首次使用时从数据库整体加载一次，之后由表达方式学习器在新增/更新记录时增量同步；
+WebUI 等批量修改入口直接使缓存失效，下次使用时重新加载。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+
+import threading
+
+from sqlmodel import select
+
+from src.common.database.database import get_db_session
+from src.common.database.database_model import Expression
+from src.common.logger import get_logger
+
+logger = get_logger("expression_candidate_cache")
+
+
+@dataclass(frozen=True)
+class ExpressionCandidate:
+    """可供 replyer 选择的表达方式快照。"""
+
+    id: int
+    situation: str
+    style: str
+    count: int
+    checked: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "situation": self.situation, "style": self.style, "count": self.count}
+
+
+class ExpressionCandidateCache:
+    """按会话划分的表达方式候选池。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._pools: dict[Optional[str], dict[int, ExpressionCandidate]] = {}
+        self._session_of: dict[int, Optional[str]] = {}
+        self._version = 0
+        self._scope_cache: dict[tuple[Optional[frozenset[str]], bool], tuple[int, list[ExpressionCandidate]]] = {}
+
+    def invalidate(self) -> None:
+        """丢弃全部缓存，下次读取时从数据库重新加载。"""
+        with self._lock:
+            self._loaded = False
+            self._pools.clear()
+            self._session_of.clear()
+            self._version += 1
+
+    def upsert(self, expression: Expression) -> None:
+        """根据数据库记录新增或更新候选；被拒绝或内容不完整的记录会从候选池移除。
+
+        Args:
+            expression: 已写入数据库（具有 id）的表达方式记录。
+        """
+        if expression.id is None:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            self._discard(expression.id)
+            self._add(expression)
+            self._version += 1
+
+    def remove(self, expression_id: int) -> None:
+        """从候选池中移除表达方式。"""
+        with self._lock:
+            self._discard(expression_id)
+            self._version += 1
+
+    def get_candidates(self, session_ids: Optional[Iterable[str]], checked_only: bool) -> List[dict[str, Any]]:
+        """获取指定会话范围内的候选表达方式。
+
+        Args:
+            session_ids: 相关会话 ID；为 None 时表示全局共享，返回所有会话的候选。
+            checked_only: 是否只返回已检查的表达方式。
+
+        Returns:
+            List[dict[str, Any]]: 候选列表，按表达方式 ID 升序排列，与数据库查询顺序一致。
+        """
+        cache_key = (None if session_ids is None else frozenset(session_ids), checked_only)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            cached = self._scope_cache.get(cache_key)
+            if cached is not None and cached[0] == self._version:
+                candidates = cached[1]
+            else:
+                candidates = self._collect(cache_key[0], checked_only)
+                self._scope_cache[cache_key] = (self._version, candidates)
+        return [candidate.to_dict() for candidate in candidates]
+
+    def _collect(self, session_ids: Optional[frozenset[str]], checked_only: bool) -> list[ExpressionCandidate]:
+        if session_ids is None:
+            pools = list(self._pools.values())
+        else:
+            # session_id 为空的表达方式属于全局表达方式，始终可用
+            scope: set[Optional[str]] = {None, *session_ids}
+            pools = [self._pools[key] for key in scope if key in self._pools]
+        candidates = [
+            candidate for pool in pools for candidate in pool.values() if candidate.checked or not checked_only
+        ]
+        candidates.sort(key=lambda candidate: candidate.id)
+        return candidates
+
+    def _load(self) -> None:
+        self._pools.clear()
+        self._session_of.clear()
+        self._scope_cache.clear()
+        with get_db_session(auto_commit=False) as session:
+            statement = (
+                select(Expression)
+                .where(Expression.rejected.is_(False))  # type: ignore[attr-defined]
+                .order_by(Expression.id)  # type: ignore[arg-type]
+            )
+            for expression in session.exec(statement).all():
+                self._add(expression)
+        self._loaded = True
+        logger.debug(f"已加载表达方式候选池：{len(self._session_of)} 条，{len(self._pools)} 个会话")
+
+    def _add(self, expression: Expression) -> None:
+        if expression.id is None or expression.rejected or not expression.situation or not expression.style:
+            return
+        session_key = expression.session_id
+        self._pools.setdefault(session_key, {})[expression.id] = ExpressionCandidate(
+            id=expression.id,
+            situation=expression.situation,
+            style=expression.style,
+            count=expression.count if expression.count is not None else 1,
+            checked=bool(expression.checked),
+        )
+        self._session_of[expression.id] = session_key
+
+    def _discard(self, expression_id: int) -> None:
+        if expression_id not in self._session_of:
+            return
+        session_key = self._session_of.pop(expression_id)
+        pool = self._pools.get(session_key)
+        if pool is None:
+            return
+        pool.pop(expression_id, None)
+        if not pool:
+            del self._pools[session_key]
+
+
+expression_candidate_cache = ExpressionCandidateCache()
@@ -21,6 +21,7 @@ from src.plugin_runtime.host.hook_spec_registry import HookSpec, HookSpecRegistr
 from src.prompt.prompt_manager import prompt_manager
 from src.services.llm_service import LLMServiceClient
 
+from .expression_candidate_cache import expression_candidate_cache
 from .expression_utils import check_expression_suitability, parse_expression_response
 
 if TYPE_CHECKING:
@@ -633,7 +634,9 @@ class ExpressionLearner:
                 )
                 db.add(new_expr)
                 db.flush()
+                expression_candidate_cache.upsert(new_expr)
         except Exception as e:
+            expression_candidate_cache.invalidate()
             logger.error(f"创建表达方式失败: {e}")
 
     async def _update_existing_expression(self, expr: "MaiExpression", situation: str, use_llm_summary: bool = True):
@@ -660,9 +663,11 @@ class ExpressionLearner:
                     db_expr.last_active_time = expr.last_active_time
                     db_expr.situation = expr.situation  # 更新 situation
                     session.add(db_expr)
+                    expression_candidate_cache.upsert(db_expr)
                 else:
                     logger.warning(f"表达方式 ID {expr.item_id} 在数据库中未找到，无法更新")
         except Exception as e:
+            expression_candidate_cache.invalidate()
             logger.error(f"更新表达方式失败: {e}")
 
         # count 增加后，立即进行一次检查
@@ -715,9 +720,11 @@ class ExpressionLearner:
                     db_expr.checked = expr.checked
                     db_expr.rejected = expr.rejected
                     session.add(db_expr)
+                    expression_candidate_cache.upsert(db_expr)
                 else:
                     logger.warning(f"表达方式 ID {expr.item_id} 在数据库中未找到，无法更新检查结果")
         except Exception as e:
+            expression_candidate_cache.invalidate()
             logger.error(f"更新表达方式检查结果失败: {e}")
 
         status = "通过" if suitable else "不通过"
@@ -0,0 +1,445 @@
+"""LLM 请求全局调度器
+
+进程内所有 ``LLMOrchestrator`` 发往模型的请求在真正调用客户端之前都要经过这里：
+
+- 按 API 提供商与模型分别限制并发数、每分钟请求数（RPM）与每分钟 token 数（TPM），
+  限额为 0 表示不限制；
+- 等待中的请求按优先级排队，回复与规划等交互请求优先于表达学习、记忆整理等后台任务；
+  同一预算上排在前面的请求未放行时，后面更低优先级的请求不会插队；
+- 并发上限大于 1 时，后台请求最多占用上限减一个并发，始终给交互请求留出一个空位；
+- 记录各优先级的排队深度与等待耗时，供统计与排查 429 问题使用。
+
+调度器是进程级单例，除主事件循环外还会被线程池中的同步调用（各自持有临时事件循环）
+使用，因此内部状态由线程锁保护；放行其他事件循环上的等待者时通过
+``call_soon_threadsafe`` 交回其所属循环。
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import asyncio
+import bisect
+import itertools
+import threading
+import time
+
+from src.common.logger import get_logger
+
+logger = get_logger("llm_request_governor")
+
+_WAIT_SAMPLE_SIZE = 512
+_SLOW_WAIT_LOG_THRESHOLD_SEC = 5.0
+
+_INTERACTIVE_REQUEST_PREFIXES: Tuple[str, ...] = ("maisaka_", "replyer", "planner", "mcp_sampling")
+_BACKGROUND_REQUEST_PREFIXES: Tuple[str, ...] = (
+    "expression",
+    "jargon",
+    "memory",
+    "person_fact_writeback",
+    "relation",
+    "emoji",
+    "A_Memorix",
+    "Script.",
+)
+
+
+class LLMRequestPriority(IntEnum):
+    """LLM 请求优先级，数值越小越优先。"""
+
+    INTERACTIVE = 0
+    """回复、规划等直接影响用户感知延迟的请求"""
+
+    NORMAL = 1
+    """图片识别、语音识别、插件调用等普通请求"""
+
+    BACKGROUND = 2
+    """表达学习、黑话挖掘、记忆整理等后台任务"""
+
+
+def resolve_request_priority(request_type: str) -> LLMRequestPriority:
+    """根据请求的业务类型推断优先级。
+
+    Args:
+        request_type: ``LLMOrchestrator`` 的业务类型标识。
+
+    Returns:
+        LLMRequestPriority: 推断出的优先级。
+    """
+    if request_type.startswith(_INTERACTIVE_REQUEST_PREFIXES):
+        return LLMRequestPriority.INTERACTIVE
+    if request_type.startswith(_BACKGROUND_REQUEST_PREFIXES):
+        return LLMRequestPriority.BACKGROUND
+    return LLMRequestPriority.NORMAL
+
+
+@dataclass(slots=True, frozen=True)
+class LLMBudgetLimits:
+    """单个提供商或模型的请求预算，0 表示不限制。"""
+
+    max_concurrency: int = 0
+    rpm_limit: int = 0
+    tpm_limit: int = 0
+
+    @classmethod
+    def from_config(cls, config: Any) -> "LLMBudgetLimits":
+        """从提供商或模型配置对象读取预算。
+
+        Args:
+            config: ``APIProvider`` 或 ``ModelInfo`` 配置对象。
+
+        Returns:
+            LLMBudgetLimits: 预算对象。
+        """
+        return cls(
+            max_concurrency=max(0, int(getattr(config, "max_concurrency", 0) or 0)),
+            rpm_limit=max(0, int(getattr(config, "rpm_limit", 0) or 0)),
+            tpm_limit=max(0, int(getattr(config, "tpm_limit", 0) or 0)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """是否设置了任意一项限制。"""
+        return self.max_concurrency > 0 or self.rpm_limit > 0 or self.tpm_limit > 0
+
+
+class _RateBucket:
+    """以分钟为窗口的令牌桶，容量等于每分钟限额。"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float]) -> None:
+        self._clock = clock
+        self.per_minute = per_minute
+        self.available = float(per_minute)
+        self._updated_at = clock()
+
+    def update_limit(self, per_minute: int) -> None:
+        if per_minute == self.per_minute:
+            return
+        self._refill()
+        self.available = min(self.available + per_minute - self.per_minute, float(per_minute))
+        self.per_minute = per_minute
+
+    def wait_time(self, amount: float) -> float:
+        """返回可以扣除 ``amount`` 之前还需等待的秒数。"""
+        if self.per_minute <= 0:
+            return 0.0
+        self._refill()
+        amount = min(amount, float(self.per_minute))
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) * 60.0 / self.per_minute
+
+    def consume(self, amount: float) -> None:
+        """扣除额度，允许因用量修正而暂时透支。"""
+        if self.per_minute <= 0:
+            return
+        self._refill()
+        self.available -= min(amount, float(self.per_minute))
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        self.available = min(float(self.per_minute), self.available + elapsed * self.per_minute / 60.0)
+
+
+class _Budget:
+    """一个提供商或模型上的预算占用状态。"""
+
+    def __init__(self, limits: LLMBudgetLimits, clock: Callable[[], float]) -> None:
+        self.limits = limits
+        self.in_flight = 0
+        self.requests = _RateBucket(limits.rpm_limit, clock)
+        self.tokens = _RateBucket(limits.tpm_limit, clock)
+
+    def update_limits(self, limits: LLMBudgetLimits) -> None:
+        if limits == self.limits:
+            return
+        self.limits = limits
+        self.requests.update_limit(limits.rpm_limit)
+        self.tokens.update_limit(limits.tpm_limit)
+
+    def admission_delay(self, priority: LLMRequestPriority, estimated_tokens: int) -> Optional[float]:
+        """计算放行一个请求前需要等待的时间。
+
+        Returns:
+            Optional[float]: 0 表示可立即放行；正数表示受速率限制需等待的秒数；
+            ``None`` 表示并发已满，需等待其他请求结束。
+        """
+        concurrency_limit = self.limits.max_concurrency
+        if concurrency_limit > 1 and priority == LLMRequestPriority.BACKGROUND:
+            concurrency_limit -= 1
+        if concurrency_limit > 0 and self.in_flight >= concurrency_limit:
+            return None
+        return max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+
+    def acquire(self, estimated_tokens: int) -> None:
+        self.in_flight += 1
+        self.requests.consume(1)
+        self.tokens.consume(estimated_tokens)
+
+
+@dataclass(order=True, slots=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    budget_keys: Tuple[str, ...] = field(compare=False)
+    estimated_tokens: int = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+
+
+@dataclass(slots=True)
+class _PriorityMetrics:
+    granted: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+    recent_waits: Deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLE_SIZE))
+
+
+class LLMRequestLease:
+    """一次已放行的请求，用于在请求完成后按实际用量修正 token 预算。"""
+
+    def __init__(self, governor: "LLMRequestGovernor", budget_keys: Tuple[str, ...], estimated_tokens: int) -> None:
+        self._governor = governor
+        self._budget_keys = budget_keys
+        self._estimated_tokens = estimated_tokens
+        self.wait_sec = 0.0
+
+    def record_usage(self, total_tokens: int) -> None:
+        """按实际消耗的 token 数修正预算。
+
+        Args:
+            total_tokens: 响应中报告的总 token 数。
+        """
+        delta = int(total_tokens) - self._estimated_tokens
+        if delta == 0:
+            return
+        self._estimated_tokens = int(total_tokens)
+        with self._governor._lock:
+            for key in self._budget_keys:
+                if budget := self._governor._budgets.get(key):
+                    budget.tokens.consume(delta)
+
+
+class LLMRequestGovernor:
+    """按提供商与模型预算调度 LLM 请求的进程级调度器。"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """初始化调度器。
+
+        Args:
+            clock: 单调时钟，测试中可替换。
+        """
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._budgets: Dict[str, _Budget] = {}
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._wakeup_generation = 0
+        self._metrics: Dict[LLMRequestPriority, _PriorityMetrics] = {
+            priority: _PriorityMetrics() for priority in LLMRequestPriority
+        }
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        *,
+        provider_name: str,
+        provider_limits: LLMBudgetLimits,
+        model_name: str,
+        model_limits: LLMBudgetLimits,
+        priority: LLMRequestPriority = LLMRequestPriority.NORMAL,
+        estimated_tokens: int = 0,
+    ) -> AsyncIterator[LLMRequestLease]:
+        """等待预算放行一次请求，退出上下文时归还并发占用。
+
+        Args:
+            provider_name: API 提供商名称。
+            provider_limits: 提供商预算。
+            model_name: 模型名称。
+            model_limits: 模型预算。
+            priority: 请求优先级。
+            estimated_tokens: 预估的 token 消耗，用于 TPM 预算。
+
+        Yields:
+            LLMRequestLease: 已放行的请求，可用于上报实际用量。
+        """
+        budget_keys: List[str] = []
+        with self._lock:
+            for key, limits in ((f"provider:{provider_name}", provider_limits), (f"model:{model_name}", model_limits)):
+                budget = self._budgets.get(key)
+                if budget is None:
+                    if not limits.enabled:
+                        continue
+                    budget = self._budgets[key] = _Budget(limits, self._clock)
+                else:
+                    budget.update_limits(limits)
+                budget_keys.append(key)
+
+        estimated_tokens = max(0, int(estimated_tokens))
+        lease = LLMRequestLease(self, tuple(budget_keys), estimated_tokens)
+        if not budget_keys:
+            with self._lock:
+                self._record_wait(priority, 0.0)
+            yield lease
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            budget_keys=lease._budget_keys,
+            estimated_tokens=estimated_tokens,
+            future=loop.create_future(),
+            loop=loop,
+            enqueued_at=self._clock(),
+        )
+        with self._lock:
+            bisect.insort(self._waiters, waiter)
+            self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release(waiter.budget_keys)
+                else:
+                    self._waiters.remove(waiter)
+                    self._dispatch()
+            raise
+
+        lease.wait_sec = self._clock() - waiter.enqueued_at
+        with self._lock:
+            self._record_wait(priority, lease.wait_sec)
+        if lease.wait_sec >= _SLOW_WAIT_LOG_THRESHOLD_SEC:
+            logger.info(
+                f"LLM 请求排队 {lease.wait_sec:.1f} 秒后放行: provider={provider_name} model={model_name} "
+                f"priority={priority.name.lower()}"
+            )
+        try:
+            yield lease
+        finally:
+            with self._lock:
+                self._release(waiter.budget_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回排队深度、等待耗时与各预算的占用情况。
+
+        Returns:
+            Dict[str, Any]: ``priorities`` 按优先级给出排队数、放行数与等待耗时分位数，
+            ``budgets`` 给出各提供商 / 模型的并发占用与剩余速率额度。
+        """
+        with self._lock:
+            queue_depth = {priority: 0 for priority in LLMRequestPriority}
+            for waiter in self._waiters:
+                queue_depth[LLMRequestPriority(waiter.priority)] += 1
+
+            priorities: Dict[str, Dict[str, Any]] = {}
+            for priority, metrics in self._metrics.items():
+                waits = sorted(metrics.recent_waits)
+                priorities[priority.name.lower()] = {
+                    "queue_depth": queue_depth[priority],
+                    "granted": metrics.granted,
+                    "avg_wait_ms": metrics.total_wait_sec / metrics.granted * 1000 if metrics.granted else 0.0,
+                    "p50_wait_ms": waits[len(waits) // 2] * 1000 if waits else 0.0,
+                    "p99_wait_ms": waits[max(0, int(len(waits) * 0.99) - 1)] * 1000 if waits else 0.0,
+                    "max_wait_ms": metrics.max_wait_sec * 1000,
+                }
+
+            budgets = {
+                key: {
+                    "in_flight": budget.in_flight,
+                    "max_concurrency": budget.limits.max_concurrency,
+                    "rpm_limit": budget.limits.rpm_limit,
+                    "rpm_available": budget.requests.available if budget.limits.rpm_limit else None,
+                    "tpm_limit": budget.limits.tpm_limit,
+                    "tpm_available": budget.tokens.available if budget.limits.tpm_limit else None,
+                }
+                for key, budget in self._budgets.items()
+            }
+        return {"priorities": priorities, "budgets": budgets}
+
+    def _record_wait(self, priority: LLMRequestPriority, wait_sec: float) -> None:
+        metrics = self._metrics[priority]
+        metrics.granted += 1
+        metrics.total_wait_sec += wait_sec
+        metrics.max_wait_sec = max(metrics.max_wait_sec, wait_sec)
+        metrics.recent_waits.append(wait_sec)
+
+    def _release(self, budget_keys: Tuple[str, ...]) -> None:
+        for key in budget_keys:
+            if budget := self._budgets.get(key):
+                budget.in_flight = max(0, budget.in_flight - 1)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """按优先级依次放行预算允许的等待请求，调用方需持有 ``_lock``。"""
+        self._wakeup_generation += 1
+        blocked_keys: set[str] = set()
+        next_wakeup: Optional[Tuple[float, asyncio.AbstractEventLoop]] = None
+        remaining: List[_Waiter] = []
+        for waiter in self._waiters:
+            if blocked_keys.intersection(waiter.budget_keys):
+                remaining.append(waiter)
+                continue
+
+            priority = LLMRequestPriority(waiter.priority)
+            delays = [
+                self._budgets[key].admission_delay(priority, waiter.estimated_tokens) for key in waiter.budget_keys
+            ]
+            if all(delay == 0 for delay in delays):
+                for key in waiter.budget_keys:
+                    self._budgets[key].acquire(waiter.estimated_tokens)
+                waiter.granted = True
+                self._call_in_loop(waiter.loop, self._resolve_waiter, waiter)
+                continue
+
+            # 未放行的请求占住它涉及的预算，避免更低优先级的请求插队
+            remaining.append(waiter)
+            blocked_keys.update(waiter.budget_keys)
+            rate_delays = [delay for delay in delays if delay]
+            if rate_delays and None not in delays:
+                delay = max(rate_delays)
+                if next_wakeup is None or delay < next_wakeup[0]:
+                    next_wakeup = (delay, waiter.loop)
+
+        self._waiters = remaining
+        if next_wakeup is not None:
+            # 定时器挂在仍在等待的请求所属的循环上，该循环在等待期间必然存活；
+            # 过期的定时器依靠代数判断直接忽略
+            delay, loop = next_wakeup
+            self._call_in_loop(loop, self._schedule_wakeup, loop, delay, self._wakeup_generation)
+
+    def _schedule_wakeup(self, loop: asyncio.AbstractEventLoop, delay: float, generation: int) -> None:
+        loop.call_later(delay, self._on_wakeup, generation)
+
+    def _on_wakeup(self, generation: int) -> None:
+        with self._lock:
+            if generation == self._wakeup_generation:
+                self._dispatch()
+
+    def _resolve_waiter(self, waiter: _Waiter) -> None:
+        if not waiter.future.done():
+            waiter.future.set_result(None)
+
+    def _call_in_loop(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., None], *args: Any) -> None:
+        """在 ``loop`` 所在线程执行回调；当前已处于该循环时直接调用。"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            callback(*args)
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            logger.warning("LLM 请求调度回调所属的事件循环已关闭，跳过本次回调")
+
+
+llm_request_governor = LLMRequestGovernor()
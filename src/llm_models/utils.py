@@ -160,6 +160,40 @@ def compress_messages(messages: list[Message], img_target_size: int = 1 * 1024 *
     return [rebuild_message_with_compressed_images(message) for message in messages]
 
 
+ESTIMATED_TOKENS_PER_IMAGE = 1024
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数：CJK 等多字节字符按每字 1 个 token，ASCII 字符按每 4 个 1 个 token
+    :param text: 文本
+    :return: 估算的 token 数
+    """
+    if not text:
+        return 0
+    char_count = len(text)
+    # 多字节字符在 UTF-8 下多出 1~3 个字节，CJK 字符为 3 字节，按多出 2 字节折算
+    multibyte_count = min(char_count, (len(text.encode("utf-8")) - char_count) // 2)
+    return multibyte_count + (char_count - multibyte_count + 3) // 4
+
+
+def estimate_message_tokens(message: Message) -> int:
+    """
+    粗略估算单条消息的 token 数，图片按固定值计入
+    :param message: 消息
+    :return: 估算的 token 数
+    """
+    tokens = 4  # 角色与分隔符开销
+    for message_part in message.parts:
+        if isinstance(message_part, TextMessagePart):
+            tokens += estimate_text_tokens(message_part.text)
+        else:
+            tokens += ESTIMATED_TOKENS_PER_IMAGE
+    for tool_call in message.tool_calls or []:
+        tokens += estimate_text_tokens(tool_call.func_name) + estimate_text_tokens(str(tool_call.args or ""))
+    return tokens
+
+
 class LLMUsageRecorder:
     """
     LLM使用情况记录器
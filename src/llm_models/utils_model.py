@@ -38,6 +38,7 @@ from src.llm_models.model_client.base_client import (
     UsageRecord,
     client_registry,
 )
+from src.llm_models.request_governor import LLMBudgetLimits, llm_request_governor, resolve_request_priority
 from src.llm_models.request_snapshot import format_request_snapshot_log_info
 from src.llm_models.payload_content.message import Message, MessageBuilder
 from src.llm_models.payload_content.resp_format import RespFormat
@@ -47,7 +48,7 @@ from src.llm_models.payload_content.tool_option import (
     ToolOption,
     normalize_tool_options,
 )
-from src.llm_models.utils import compress_messages, llm_usage_recorder
+from src.llm_models.utils import compress_messages, estimate_message_tokens, estimate_text_tokens, llm_usage_recorder
 
 install(extra_lines=3)
 
@@ -59,6 +60,7 @@ DATA_URI_LIMIT_PATTERN = re.compile(
 )
 DATA_URI_RETRY_MARGIN_BYTES = 128 * 1024
 MIN_COMPRESSED_IMAGE_TARGET_SIZE_BYTES = 512 * 1024
+ESTIMATED_TOKENS_PER_AUDIO = 1024
 
 
 class RequestType(Enum):
@@ -89,6 +91,7 @@ class LLMOrchestrator:
         """
         self.task_name = task_name.strip()
         self.request_type = request_type
+        self.priority = resolve_request_priority(request_type)
         self.model_for_task = self._get_task_config_or_raise()
         self.model_usage: Dict[str, Tuple[int, int, int]] = {
             model: (0, 0, 0) for model in self.model_for_task.model_list
@@ -709,6 +712,24 @@ class LLMOrchestrator:
         self.model_usage[model_info.name] = (total_tokens, penalty, usage_penalty + 1)
         return model_info, api_provider, client
 
+    @staticmethod
+    def _estimate_request_tokens(request: ClientRequest) -> int:
+        """粗略估算一次请求的 token 消耗，用于调度器的 TPM 预算。
+
+        Args:
+            request: 统一客户端请求对象。
+
+        Returns:
+            int: 预估的输入与输出 token 总数。
+        """
+        if isinstance(request, EmbeddingRequest):
+            return max(1, estimate_text_tokens(request.embedding_input))
+        if isinstance(request, AudioTranscriptionRequest):
+            return ESTIMATED_TOKENS_PER_AUDIO + (request.max_tokens or 0)
+
+        prompt_tokens = sum(estimate_message_tokens(message) for message in request.message_list)
+        return prompt_tokens + (request.max_tokens or 0)
+
     async def _attempt_request_on_model(
         self,
         api_provider: APIProvider,
@@ -738,11 +759,23 @@ class LLMOrchestrator:
 
         while retry_remain > 0:
             try:
-                if isinstance(active_request, ResponseRequest):
-                    return await client.get_response(active_request)
-                if isinstance(active_request, EmbeddingRequest):
-                    return await client.get_embedding(active_request)
-                return await client.get_audio_transcriptions(active_request)
+                async with llm_request_governor.acquire(
+                    provider_name=api_provider.name,
+                    provider_limits=LLMBudgetLimits.from_config(api_provider),
+                    model_name=model_info.name,
+                    model_limits=LLMBudgetLimits.from_config(model_info),
+                    priority=self.priority,
+                    estimated_tokens=self._estimate_request_tokens(active_request),
+                ) as lease:
+                    if isinstance(active_request, ResponseRequest):
+                        response = await client.get_response(active_request)
+                    elif isinstance(active_request, EmbeddingRequest):
+                        response = await client.get_embedding(active_request)
+                    else:
+                        response = await client.get_audio_transcriptions(active_request)
+                    if response.usage:
+                        lease.record_usage(response.usage.total_tokens)
+                    return response
             except EmptyResponseException as e:
                 # 空回复：通常为临时问题，单独记录并重试
                 original_error_info = self._get_original_error_info(e)
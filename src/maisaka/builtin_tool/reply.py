@@ -1,9 +1,10 @@
 """reply 内置工具。"""
 
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 import traceback
 
+from src.chat.replyer.maisaka_expression_selector import maisaka_expression_selector
 from src.chat.replyer.replyer_manager import replyer_manager
 from src.cli.maisaka_cli_sender import CLI_PLATFORM_NAME, render_cli_message
 from src.common.data_models.reply_generation_data_models import ReplyGenerationResult
@@ -12,20 +13,55 @@ from src.config import config as config_module
 from src.core.tooling import ToolExecutionContext, ToolExecutionResult, ToolInvocation, ToolSpec
 from src.services import send_service
 
+from ..context_messages import LLMContextMessage, ReferenceMessage, ToolResultMessage
 from .context import BuiltinToolRuntimeContext
 
 logger = get_logger("maisaka_builtin_reply")
 
 
-async def _run_expression_selector(tool_ctx: BuiltinToolRuntimeContext, system_prompt: str) -> str:
-    """运行 replyer 侧表达方式选择子代理，并返回文本结果。"""
-    response = await tool_ctx.runtime.run_sub_agent(
-        context_message_limit=10,
-        system_prompt=system_prompt,
-        request_kind="expression_selector",
-        max_tokens=256,
-    )
-    return (response.content or "").strip()
+def build_expression_selector_runner(tool_ctx: BuiltinToolRuntimeContext) -> Callable[[str], Awaitable[str]]:
+    """构建 replyer 侧表达方式选择子代理的执行器。"""
+
+    async def _run_expression_selector(system_prompt: str) -> str:
+        response = await tool_ctx.runtime.run_sub_agent(
+            context_message_limit=10,
+            system_prompt=system_prompt,
+            request_kind="expression_selector",
+            max_tokens=256,
+        )
+        return (response.content or "").strip()
+
+    return _run_expression_selector
+
+
+def _build_replyer_chat_history(tool_ctx: BuiltinToolRuntimeContext) -> list[LLMContextMessage]:
+    """复制回复器使用的聊天历史，与回复器保持相同的消息过滤。"""
+
+    return [
+        message
+        for message in tool_ctx.runtime._chat_history
+        if not isinstance(message, (ReferenceMessage, ToolResultMessage))
+    ]
+
+
+def prefetch_expression_selection(tool_ctx: BuiltinToolRuntimeContext, invocation: ToolInvocation) -> None:
+    """在 reply 工具真正执行前提前启动表达方式选择，使其与同批次的其他工具并行。"""
+
+    target_message_id = str(invocation.arguments.get("msg_id") or "").strip()
+    target_message = tool_ctx.runtime._source_messages_by_id.get(target_message_id)
+    if target_message is None:
+        return
+
+    try:
+        maisaka_expression_selector.prefetch_for_reply(
+            session_id=tool_ctx.runtime.session_id,
+            chat_history=_build_replyer_chat_history(tool_ctx),
+            reply_message=target_message,
+            reply_reason=invocation.reasoning,
+            sub_agent_runner=build_expression_selector_runner(tool_ctx),
+        )
+    except Exception:
+        logger.exception(f"{tool_ctx.runtime.log_prefix} 提前启动表达方式选择失败: 目标消息编号={target_message_id}")
 
 
 def get_tool_spec() -> ToolSpec:
@@ -152,10 +188,7 @@ async def handle_tool(
             stream_id=tool_ctx.runtime.session_id,
             reply_message=target_message,
             chat_history=replyer_chat_history,
-            sub_agent_runner=lambda system_prompt: _run_expression_selector(
-                tool_ctx,
-                system_prompt,
-            ),
+            sub_agent_runner=build_expression_selector_runner(tool_ctx),
             log_reply=False,
         )
     except Exception as exc:
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any, List, Optional, Sequence
 
 import asyncio
+import json
 
 from rich.console import RenderableType
 from src.common.data_models.llm_service_data_models import LLMGenerationOptions
@@ -17,6 +18,7 @@ from src.llm_models.model_client.base_client import BaseClient
 from src.llm_models.payload_content.message import Message, MessageBuilder, RoleType
 from src.llm_models.payload_content.resp_format import RespFormat
 from src.llm_models.payload_content.tool_option import ToolCall, ToolDefinitionInput, ToolOption, normalize_tool_options
+from src.llm_models.utils import estimate_message_tokens, estimate_text_tokens
 from src.plugin_runtime.hook_payloads import (
     deserialize_prompt_messages,
     deserialize_tool_calls,
@@ -57,6 +59,7 @@ class ChatResponse:
     completion_tokens: int
     total_tokens: int
     prompt_section: Optional[RenderableType] = None
+    estimated_prompt_tokens: int = 0
 
 
 logger = get_logger("maisaka_chat_loop")
@@ -555,6 +558,14 @@ class MaisakaChatLoopService:
             ),
         )
 
+        estimated_prompt_tokens = self._estimate_prompt_tokens(built_messages, all_tools)
+        if generation_result.prompt_tokens > 0:
+            logger.debug(
+                f"Maisaka {request_kind} 请求输入 token: 预估={estimated_prompt_tokens} "
+                f"实际={generation_result.prompt_tokens} "
+                f"偏差={estimated_prompt_tokens / generation_result.prompt_tokens - 1:+.1%}"
+            )
+
         final_response = generation_result.response or ""
         final_tool_calls = list(generation_result.tool_calls or [])
         after_response_result = await self._get_runtime_manager().invoke_hook(
@@ -602,8 +613,41 @@ class MaisakaChatLoopService:
             completion_tokens=completion_tokens,
             total_tokens=total_tokens,
             prompt_section=prompt_section,
+            estimated_prompt_tokens=estimated_prompt_tokens,
         )
 
+    @staticmethod
+    def _estimate_prompt_tokens(messages: Sequence[Message], tool_definitions: Sequence[ToolDefinitionInput]) -> int:
+        """估算一次请求的输入 token 数，包括消息与工具定义。"""
+
+        estimated_tokens = sum(estimate_message_tokens(message) for message in messages)
+        if tool_definitions:
+            serialized_tools = json.dumps(serialize_tool_definitions(list(tool_definitions)), ensure_ascii=False)
+            estimated_tokens += estimate_text_tokens(serialized_tools)
+        return estimated_tokens
+
+    @staticmethod
+    def estimate_context_message_tokens(
+        message: LLMContextMessage,
+        *,
+        enable_visual_message: bool,
+    ) -> Optional[int]:
+        """估算一条上下文消息的 token 数，结果缓存在消息对象上。
+
+        命中缓存时不再重新构建 LLM 消息；消息无法转换为 LLM 消息时返回 ``None``。
+        """
+
+        cached_tokens = message.get_cached_token_estimate(enable_visual_message)
+        if cached_tokens is not None:
+            return cached_tokens
+
+        llm_message = build_llm_message_from_context(message, enable_visual_message=enable_visual_message)
+        if llm_message is None:
+            return None
+        estimated_tokens = estimate_message_tokens(llm_message)
+        message.cache_token_estimate(enable_visual_message, estimated_tokens)
+        return estimated_tokens
+
     @staticmethod
     def select_llm_context_messages(
         chat_history: List[LLMContextMessage],
@@ -611,16 +655,27 @@ class MaisakaChatLoopService:
         enable_visual_message: Optional[bool] = None,
         request_kind: str = "planner",
         max_context_size: Optional[int] = None,
+        max_context_tokens: Optional[int] = None,
     ) -> tuple[List[LLMContextMessage], str]:
-        """选择LLM上下文消息"""
+        """选择LLM上下文消息
+
+        从最新消息向前选取，直到达到条数上限；设置了 token 预算时，
+        再放入下一条消息会超出预算则停止，最新的一条消息总会保留。
+        """
 
         filtered_history = MaisakaChatLoopService._filter_history_for_request_kind(
             chat_history,
             request_kind=request_kind,
         )
         effective_context_size = max(1, int(max_context_size or global_config.chat.max_context_size))
+        token_budget = max(
+            0,
+            int(max_context_tokens if max_context_tokens is not None else global_config.chat.max_context_tokens),
+        )
         selected_indices: List[int] = []
         counted_message_count = 0
+        estimated_tokens = 0
+        trimmed_by_token_budget = False
 
         active_enable_visual_message = (
             enable_visual_message
@@ -630,13 +685,18 @@ class MaisakaChatLoopService:
 
         for index in range(len(filtered_history) - 1, -1, -1):
             message = filtered_history[index]
-            if (
-                build_llm_message_from_context(
+            if token_budget > 0:
+                message_tokens = MaisakaChatLoopService.estimate_context_message_tokens(
                     message,
                     enable_visual_message=active_enable_visual_message,
                 )
-                is None
-            ):
+                if message_tokens is None:
+                    continue
+                if selected_indices and estimated_tokens + message_tokens > token_budget:
+                    trimmed_by_token_budget = True
+                    break
+                estimated_tokens += message_tokens
+            elif build_llm_message_from_context(message, enable_visual_message=active_enable_visual_message) is None:
                 continue
 
             selected_indices.append(index)
@@ -658,6 +718,10 @@ class MaisakaChatLoopService:
             f"实际发送 {len(selected_history)} 条消息"
             f"|消息 {normal_message_count} 条|tool {tool_message_count} 条"
         )
+        if token_budget > 0:
+            selection_reason += f"|预估 {estimated_tokens}/{token_budget} tokens"
+            if trimmed_by_token_budget:
+                selection_reason += "|已按 token 预算裁剪"
         return (
             selected_history,
             selection_reason,
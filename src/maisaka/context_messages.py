@@ -329,6 +329,22 @@ class LLMContextMessage(ABC):
         """消费一次生命周期，返回是否继续保留。"""
         return True
 
+    def get_cached_token_estimate(self, enable_visual_message: bool) -> Optional[int]:
+        """返回此前缓存在消息对象上的 token 预估值，未缓存时返回 ``None``。"""
+        return getattr(self, "_token_estimates", {}).get(enable_visual_message)
+
+    def cache_token_estimate(self, enable_visual_message: bool, estimated_tokens: int) -> None:
+        """把 token 预估值缓存在消息对象上，随消息一同释放。
+
+        上下文消息创建后内容不再变化，需要刷新内容时会整体替换为新的消息对象，
+        因此缓存无需失效处理。
+        """
+        token_estimates = getattr(self, "_token_estimates", None)
+        if token_estimates is None:
+            token_estimates = {}
+            self._token_estimates = token_estimates
+        token_estimates[enable_visual_message] = estimated_tokens
+
 
 @dataclass(slots=True)
 class SessionBackedMessage(LLMContextMessage):
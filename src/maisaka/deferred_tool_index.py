@@ -0,0 +1,142 @@
+"""Maisaka deferred tools 搜索索引。"""
+
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from src.core.tooling import ToolSpec
+
+_MAX_GRAM_SIZE = 3
+
+
+@dataclass(slots=True)
+class _IndexedTool:
+    """索引中的单个工具条目。"""
+
+    tool_spec: ToolSpec
+    lower_name: str
+    lower_description: str
+
+
+def _iter_grams(text: str) -> Iterable[str]:
+    """枚举文本中长度为 1 到 ``_MAX_GRAM_SIZE`` 的全部子串。"""
+
+    text_length = len(text)
+    for gram_size in range(1, _MAX_GRAM_SIZE + 1):
+        for start in range(text_length - gram_size + 1):
+            yield text[start : start + gram_size]
+
+
+class DeferredToolSearchIndex:
+    """按字符 n-gram 建立的 deferred tools 倒排索引。
+
+    ``tool_search`` 的打分基于子串匹配，按词切分的索引无法覆盖中文描述和名称片段。
+    这里为工具名与简要描述建立 1~3 字符的 n-gram 倒排表：长度不超过 3 的检索串可以直接
+    命中倒排表，更长的检索串取其全部 3-gram 的倒排交集作为候选，再对候选逐个计算原有分数，
+    因此排序结果与逐个扫描完全一致，而每次查询只需要访问少量候选工具。
+    """
+
+    def __init__(self) -> None:
+        self._tools: dict[str, _IndexedTool] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def sync(self, tool_specs_by_name: Mapping[str, ToolSpec]) -> None:
+        """将索引同步到给定的 deferred tools 池，只重建名称或描述发生变化的条目。"""
+
+        for tool_name in [name for name in self._tools if name not in tool_specs_by_name]:
+            self._remove(tool_name)
+
+        for tool_name, tool_spec in tool_specs_by_name.items():
+            lower_name = tool_name.lower()
+            lower_description = tool_spec.brief_description.lower()
+            indexed_tool = self._tools.get(tool_name)
+            if indexed_tool is not None:
+                if indexed_tool.lower_name == lower_name and indexed_tool.lower_description == lower_description:
+                    indexed_tool.tool_spec = tool_spec
+                    continue
+                self._remove(tool_name)
+            self._add(tool_name, _IndexedTool(tool_spec, lower_name, lower_description))
+
+    def search(self, query: str, *, limit: int) -> list[ToolSpec]:
+        """按名称或简要描述搜索 deferred tools。"""
+
+        normalized_query = " ".join(query.lower().split()).strip()
+        if not normalized_query:
+            return []
+
+        query_terms = [term for term in normalized_query.replace("_", " ").replace("-", " ").split() if term]
+        candidate_names: set[str] = set()
+        for needle in {normalized_query, *query_terms}:
+            candidate_names.update(self._find_containing(needle))
+
+        scored_matches: list[tuple[int, str, ToolSpec]] = []
+        for tool_name in candidate_names:
+            indexed_tool = self._tools[tool_name]
+            score = self._score(indexed_tool, normalized_query, query_terms)
+            if score <= 0:
+                continue
+            scored_matches.append((score, tool_name, indexed_tool.tool_spec))
+
+        scored_matches.sort(key=lambda item: (-item[0], item[1]))
+        return [tool_spec for _, _, tool_spec in scored_matches[: max(1, limit)]]
+
+    @staticmethod
+    def _score(indexed_tool: _IndexedTool, normalized_query: str, query_terms: list[str]) -> int:
+        lower_name = indexed_tool.lower_name
+        lower_description = indexed_tool.lower_description
+        score = 0
+
+        if normalized_query == lower_name:
+            score += 1000
+        if lower_name.startswith(normalized_query):
+            score += 300
+        if normalized_query in lower_name:
+            score += 200
+        if normalized_query in lower_description:
+            score += 100
+
+        for query_term in query_terms:
+            if query_term in lower_name:
+                score += 25
+            if query_term in lower_description:
+                score += 10
+        return score
+
+    def _find_containing(self, needle: str) -> set[str]:
+        """返回名称或描述可能包含 ``needle`` 的工具名集合。"""
+
+        if len(needle) <= _MAX_GRAM_SIZE:
+            return self._postings.get(needle, set())
+
+        grams = {needle[start : start + _MAX_GRAM_SIZE] for start in range(len(needle) - _MAX_GRAM_SIZE + 1)}
+        postings: list[set[str]] = []
+        for gram in grams:
+            gram_postings = self._postings.get(gram)
+            if not gram_postings:
+                return set()
+            postings.append(gram_postings)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _add(self, tool_name: str, indexed_tool: _IndexedTool) -> None:
+        self._tools[tool_name] = indexed_tool
+        for gram in self._collect_grams(indexed_tool):
+            self._postings.setdefault(gram, set()).add(tool_name)
+
+    def _remove(self, tool_name: str) -> None:
+        indexed_tool = self._tools.pop(tool_name, None)
+        if indexed_tool is None:
+            return
+        for gram in self._collect_grams(indexed_tool):
+            gram_postings = self._postings.get(gram)
+            if gram_postings is None:
+                continue
+            gram_postings.discard(tool_name)
+            if not gram_postings:
+                del self._postings[gram]
+
+    @staticmethod
+    def _collect_grams(indexed_tool: _IndexedTool) -> set[str]:
+        return {*_iter_grams(indexed_tool.lower_name), *_iter_grams(indexed_tool.lower_description)}
@@ -26,6 +26,7 @@ from .builtin_tool import get_timing_tools
 from .chat_loop_service import ChatResponse
 from .chat_history_visual_refresher import refresh_chat_history_visual_placeholders
 from .builtin_tool.context import BuiltinToolRuntimeContext
+from .builtin_tool.reply import prefetch_expression_selection
 from .context_messages import (
     AssistantMessage,
     ComplexSessionMessage,
@@ -568,6 +569,9 @@ class MaisakaReasoningEngine:
                                 timing_prompt_tokens=(
                                     timing_response.prompt_tokens if timing_response is not None else None
                                 ),
+                                timing_estimated_prompt_tokens=(
+                                    timing_response.estimated_prompt_tokens if timing_response is not None else None
+                                ),
                                 timing_action=timing_action or "",
                                 timing_response=timing_response.content or "" if timing_response is not None else "",
                                 timing_tool_calls=timing_response.tool_calls if timing_response is not None else None,
@@ -580,6 +584,9 @@ class MaisakaReasoningEngine:
                                     response.selected_history_count if response is not None else None
                                 ),
                                 planner_prompt_tokens=response.prompt_tokens if response is not None else None,
+                                planner_estimated_prompt_tokens=(
+                                    response.estimated_prompt_tokens if response is not None else None
+                                ),
                                 planner_response=response.content or "" if response is not None else "",
                                 planner_tool_calls=response.tool_calls if response is not None else None,
                                 planner_tool_results=tool_result_summaries,
@@ -879,6 +886,24 @@ class MaisakaReasoningEngine:
             reasoning=latest_thought,
         )
 
+    def _prefetch_reply_expressions(self, tool_calls: list[ToolCall], latest_thought: str) -> None:
+        """本批次包含 reply 时提前启动表达方式选择，与排在它前面的工具并行执行。
+
+        Args:
+            tool_calls: 模型返回的工具调用列表。
+            latest_thought: 当前轮的最新思考文本。
+        """
+
+        if not self._runtime.is_action_tool_currently_available("reply"):
+            return
+        for tool_call in tool_calls:
+            if tool_call.func_name == "reply":
+                prefetch_expression_selection(
+                    BuiltinToolRuntimeContext(self, self._runtime),
+                    self._build_tool_invocation(tool_call, latest_thought),
+                )
+                return
+
     def _build_tool_availability_context(self) -> ToolAvailabilityContext:
         """构造当前聊天的工具暴露上下文。"""
 
@@ -1306,6 +1331,7 @@ class MaisakaReasoningEngine:
                 )
             return False, tool_result_summaries, tool_monitor_results
 
+        self._prefetch_reply_expressions(tool_calls, latest_thought)
         execution_context = self._build_tool_execution_context(latest_thought, anchor_message)
         availability_context = self._build_tool_availability_context()
         tool_spec_map = {
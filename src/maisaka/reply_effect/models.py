@@ -3,7 +3,6 @@
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 
@@ -149,7 +148,6 @@ class ReplyEffectRecord:
     finalize_reason: str = ""
     confidence_note: str = ""
     followup_summary: Dict[str, Any] = field(default_factory=dict)
-    file_path: Optional[Path] = field(default=None, repr=False)
 
     def to_json_dict(self) -> Dict[str, Any]:
         """转换为可直接写入 JSON 的字典。"""
@@ -157,7 +155,6 @@ class ReplyEffectRecord:
         payload = asdict(self)
         payload["schema_version"] = SCHEMA_VERSION
         payload["status"] = self.status.value
-        payload.pop("file_path", None)
         return payload
 
 
@@ -1,75 +1,340 @@
-"""回复效果独立 JSON 存储。"""
+"""回复效果 SQLite 存储。"""
 
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional
 
 import json
+import sqlite3
+import threading
 import time
 
-from .models import ReplyEffectRecord
-from .path_utils import BASE_DIR, build_reply_effect_chat_dir, normalize_preview_name
+from src.common.logger import get_logger
+
+from .models import ReplyEffectRecord, ReplyEffectStatus
+from .path_utils import BASE_DIR, build_reply_effect_chat_dir_name, normalize_preview_name
+
+REPLY_EFFECT_DB_NAME = "reply_effect.db"
+
+logger = get_logger("maisaka_reply_effect")
+
+_SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS reply_effect_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        effect_id TEXT NOT NULL UNIQUE,
+        chat_id TEXT NOT NULL,
+        session_id TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at TEXT NOT NULL DEFAULT '',
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_reply_effect_chat_time ON reply_effect_records (chat_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_reply_effect_time ON reply_effect_records (created_at, id)",
+    """
+    CREATE TABLE IF NOT EXISTS reply_effect_chats (
+        chat_id TEXT PRIMARY KEY,
+        record_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+)
 
 
 class ReplyEffectStorage:
-    """负责回复效果记录的独立 JSON 文件存储。"""
+    """负责回复效果记录的 SQLite 存储。
+
+    所有会话的记录保存在同一个数据库文件中，按 ``(chat_id, created_at)`` 建立索引；
+    完整记录以 JSON 文本保存在 ``payload`` 列。每个会话的记录数单独计数，写入时无需扫描
+    即可判断是否超出保留上限。首次打开时会把旧版逐条 JSON 文件导入数据库。
+    """
 
     _MAX_RECORDS_PER_CHAT = 1024
     _TRIM_COUNT = 100
 
     def __init__(self, base_dir: Path | None = None) -> None:
         self._base_dir = base_dir or BASE_DIR
+        self._db_path = self._base_dir / REPLY_EFFECT_DB_NAME
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def db_path(self) -> Path:
+        """数据库文件路径。"""
 
-    def create_record_file(self, record: ReplyEffectRecord) -> Path:
-        """为新记录创建文件路径并写入初始 JSON。"""
-
-        chat_dir_name = normalize_preview_name(record.session.platform_type_id)
-        if chat_dir_name == "unknown":
-            chat_dir = build_reply_effect_chat_dir(record.session.session_id, self._base_dir).resolve()
-        else:
-            chat_dir = (self._base_dir / chat_dir_name).resolve()
-        chat_dir.mkdir(parents=True, exist_ok=True)
-        timestamp_ms = int(time.time() * 1000)
-        safe_effect_id = record.effect_id.replace("-", "")
-        file_path = chat_dir / f"{timestamp_ms}_{safe_effect_id}.json"
-        record.file_path = file_path
-        self.save_record(record)
-        self._trim_overflow(chat_dir)
-        return file_path
+        return self._db_path
+
+    def create_record(self, record: ReplyEffectRecord) -> None:
+        """写入一条新记录，并在会话超出容量时删除最旧的记录。"""
+
+        chat_id = self._resolve_chat_id(record)
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                self._insert_record(
+                    connection,
+                    effect_id=record.effect_id,
+                    chat_id=chat_id,
+                    session_id=record.session.session_id,
+                    status=record.status.value,
+                    created_at=time.time(),
+                    updated_at=record.updated_at,
+                    payload=record.to_json_dict(),
+                )
+                self._trim_overflow(connection, chat_id)
 
     def save_record(self, record: ReplyEffectRecord) -> None:
-        """原子写入记录 JSON。"""
+        """更新已有记录，记录不存在时按新记录写入。"""
 
-        if record.file_path is None:
-            self.create_record_file(record)
-            return
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                cursor = connection.execute(
+                    "UPDATE reply_effect_records SET status = ?, updated_at = ?, payload = ? WHERE effect_id = ?",
+                    (
+                        record.status.value,
+                        record.updated_at,
+                        self._dump_payload(record.to_json_dict()),
+                        record.effect_id,
+                    ),
+                )
+            if cursor.rowcount > 0:
+                return
+        self.create_record(record)
 
-        file_path = record.file_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        temp_path = file_path.with_name(f".{file_path.name}.tmp")
-        temp_path.write_text(
-            json.dumps(record.to_json_dict(), ensure_ascii=False, indent=2, default=str),
-            encoding="utf-8",
-        )
-        temp_path.replace(file_path)
+    def get_record(self, effect_id: str) -> Optional[Dict[str, Any]]:
+        """按 effect_id 读取一条记录。"""
 
-    @staticmethod
-    def read_json(file_path: Path) -> Dict[str, object]:
-        """读取已保存的 JSON 文件。"""
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT chat_id, created_at, payload FROM reply_effect_records WHERE effect_id = ?",
+                    (effect_id,),
+                )
+                .fetchone()
+            )
+        return self._row_to_payload(row) if row is not None else None
+
+    def query_records(
+        self,
+        *,
+        chat_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        status: Optional[ReplyEffectStatus | str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """按会话与创建时间范围查询记录。
+
+        Args:
+            chat_id: 会话目录名，为空时查询全部会话。
+            start_time: 创建时间下限（含），Unix 时间戳。
+            end_time: 创建时间上限（不含），Unix 时间戳。
+            status: 只返回指定状态的记录。
+            limit: 最多返回的条数，为空时不限制。
+            offset: 跳过的条数。
+            newest_first: 是否按创建时间倒序返回。
+
+        Returns:
+            List[Dict[str, Any]]: 记录字典列表，额外附带 ``_chat_id`` 与 ``_created_at`` 字段。
+        """
+
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if chat_id:
+            conditions.append("chat_id = ?")
+            parameters.append(chat_id)
+        if start_time is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(start_time)
+        if end_time is not None:
+            conditions.append("created_at < ?")
+            parameters.append(end_time)
+        if status:
+            conditions.append("status = ?")
+            parameters.append(status.value if isinstance(status, ReplyEffectStatus) else status)
+
+        sql = "SELECT chat_id, created_at, payload FROM reply_effect_records"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        order = "DESC" if newest_first else "ASC"
+        sql += f" ORDER BY created_at {order}, id {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            parameters.extend([-1 if limit is None else max(0, limit), max(0, offset)])
+
+        with self._lock:
+            rows = self._get_connection().execute(sql, parameters).fetchall()
+        return [self._row_to_payload(row) for row in rows]
+
+    def list_chats(self) -> List[Dict[str, Any]]:
+        """列出所有会话及其记录数量统计。"""
+
+        with self._lock:
+            rows = (
+                self._get_connection()
+                .execute(
+                    "SELECT chat_id, status, COUNT(*) FROM reply_effect_records GROUP BY chat_id, status "
+                    "ORDER BY chat_id"
+                )
+                .fetchall()
+            )
+        chats: Dict[str, Dict[str, Any]] = {}
+        for chat_id, status, count in rows:
+            chat = chats.setdefault(
+                chat_id,
+                {"chat_id": chat_id, "record_count": 0, "finalized_count": 0, "pending_count": 0},
+            )
+            chat["record_count"] += count
+            if status == ReplyEffectStatus.FINALIZED.value:
+                chat["finalized_count"] += count
+            elif status == ReplyEffectStatus.PENDING.value:
+                chat["pending_count"] += count
+        return list(chats.values())
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
 
-        return json.loads(file_path.read_text(encoding="utf-8"))
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
 
-    def _trim_overflow(self, chat_dir: Path) -> None:
-        """超过容量时删除最旧的回复效果记录。"""
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for statement in _SCHEMA_STATEMENTS:
+                connection.execute(statement)
+        self._connection = connection
+        self._migrate_legacy_json_files(connection)
+        return connection
 
-        files = [file_path for file_path in chat_dir.glob("*.json") if file_path.is_file()]
-        if len(files) <= self._MAX_RECORDS_PER_CHAT:
+    def _insert_record(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        effect_id: str,
+        chat_id: str,
+        session_id: str,
+        status: str,
+        created_at: float,
+        updated_at: str,
+        payload: Dict[str, Any],
+    ) -> bool:
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO reply_effect_records "
+            "(effect_id, chat_id, session_id, status, created_at, updated_at, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (effect_id, chat_id, session_id, status, created_at, updated_at, self._dump_payload(payload)),
+        )
+        if cursor.rowcount <= 0:
+            return False
+        connection.execute(
+            "INSERT INTO reply_effect_chats (chat_id, record_count) VALUES (?, 1) "
+            "ON CONFLICT(chat_id) DO UPDATE SET record_count = record_count + 1",
+            (chat_id,),
+        )
+        return True
+
+    def _trim_overflow(self, connection: sqlite3.Connection, chat_id: str) -> None:
+        """超过容量时按创建时间删除最旧的一批记录。"""
+
+        row = connection.execute(
+            "SELECT record_count FROM reply_effect_chats WHERE chat_id = ?",
+            (chat_id,),
+        ).fetchone()
+        record_count = int(row[0]) if row is not None else 0
+        if record_count <= self._MAX_RECORDS_PER_CHAT:
             return
 
-        sorted_files = sorted(files, key=lambda file_path: file_path.stat().st_mtime)
-        overflow_count = len(files) - self._MAX_RECORDS_PER_CHAT
-        trim_count = min(len(sorted_files), max(self._TRIM_COUNT, overflow_count))
-        for old_file in sorted_files[:trim_count]:
+        trim_count = max(self._TRIM_COUNT, record_count - self._MAX_RECORDS_PER_CHAT)
+        cursor = connection.execute(
+            "DELETE FROM reply_effect_records WHERE id IN ("
+            "SELECT id FROM reply_effect_records WHERE chat_id = ? ORDER BY created_at, id LIMIT ?)",
+            (chat_id, trim_count),
+        )
+        connection.execute(
+            "UPDATE reply_effect_chats SET record_count = MAX(0, record_count - ?) WHERE chat_id = ?",
+            (cursor.rowcount, chat_id),
+        )
+
+    def _migrate_legacy_json_files(self, connection: sqlite3.Connection) -> None:
+        """把旧版按会话目录保存的 JSON 记录导入数据库，导入成功后删除原文件。"""
+
+        chat_dirs = [path for path in self._base_dir.iterdir() if path.is_dir()]
+        migrated_files: List[Path] = []
+        migrated_chat_ids: set[str] = set()
+        with connection:
+            for chat_dir in chat_dirs:
+                for file_path in sorted(chat_dir.glob("*.json")):
+                    try:
+                        payload = json.loads(file_path.read_text(encoding="utf-8"))
+                    except (OSError, json.JSONDecodeError):
+                        logger.warning(f"跳过无法解析的回复效果记录: {file_path}")
+                        continue
+                    if not isinstance(payload, dict):
+                        continue
+                    session = payload.get("session") if isinstance(payload.get("session"), dict) else {}
+                    self._insert_record(
+                        connection,
+                        effect_id=str(payload.get("effect_id") or file_path.stem),
+                        chat_id=chat_dir.name,
+                        session_id=str(session.get("session_id") or ""),
+                        status=str(payload.get("status") or ReplyEffectStatus.PENDING.value),
+                        created_at=self._resolve_legacy_created_at(file_path),
+                        updated_at=str(payload.get("updated_at") or ""),
+                        payload=payload,
+                    )
+                    migrated_files.append(file_path)
+                    migrated_chat_ids.add(chat_dir.name)
+            for chat_id in migrated_chat_ids:
+                self._trim_overflow(connection, chat_id)
+
+        for file_path in migrated_files:
+            file_path.unlink(missing_ok=True)
+        for chat_dir in chat_dirs:
             try:
-                old_file.unlink()
-            except FileNotFoundError:
+                chat_dir.rmdir()
+            except OSError:
                 continue
+        if migrated_files:
+            logger.info(f"已将 {len(migrated_files)} 条旧版回复效果 JSON 记录迁移到 {self._db_path}")
+
+    @staticmethod
+    def _resolve_legacy_created_at(file_path: Path) -> float:
+        """旧版文件名以毫秒时间戳开头，解析失败时退回文件修改时间。"""
+
+        timestamp_text = file_path.stem.split("_", 1)[0]
+        if timestamp_text.isdigit():
+            return int(timestamp_text) / 1000
+        return file_path.stat().st_mtime
+
+    @staticmethod
+    def _resolve_chat_id(record: ReplyEffectRecord) -> str:
+        chat_id = normalize_preview_name(record.session.platform_type_id)
+        if chat_id == "unknown":
+            return build_reply_effect_chat_dir_name(record.session.session_id)
+        return chat_id
+
+    @staticmethod
+    def _dump_payload(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _row_to_payload(row: Any) -> Dict[str, Any]:
+        chat_id, created_at, raw_payload = row
+        payload = json.loads(raw_payload)
+        payload["_chat_id"] = chat_id
+        payload["_created_at"] = created_at
+        return payload
+
+
+reply_effect_storage = ReplyEffectStorage()
@@ -30,7 +30,7 @@ from .scoring import (
     has_repair_loop,
     score_reply_effect,
 )
-from .storage import ReplyEffectStorage
+from .storage import ReplyEffectStorage, reply_effect_storage
 
 TARGET_USER_FOLLOWUP_LIMIT = 2
 SESSION_FOLLOWUP_LIMIT = 5
@@ -53,7 +53,7 @@ class ReplyEffectTracker:
         self._session_name = session_name
         self._chat_stream = chat_stream
         self._judge_runner = judge_runner
-        self._storage = storage or ReplyEffectStorage()
+        self._storage = storage or reply_effect_storage
         self._pending_records: Dict[str, ReplyEffectRecord] = {}
         self._timeout_tasks: Dict[str, asyncio.Task[None]] = {}
 
@@ -101,7 +101,7 @@ class ReplyEffectTracker:
             ),
             context_snapshot=list(context_snapshot or []),
         )
-        self._storage.create_record_file(record)
+        self._storage.create_record(record)
         self._pending_records[effect_id] = record
         self._timeout_tasks[effect_id] = asyncio.create_task(self._finalize_after_timeout(effect_id))
         return record
@@ -124,6 +124,12 @@ class ReplyEffectTracker:
             if reason:
                 await self.finalize(effect_id, reason)
 
+    @property
+    def has_pending_records(self) -> bool:
+        """当前会话是否还有等待后续反馈的记录。"""
+
+        return bool(self._pending_records)
+
     async def finalize_all(self, reason: str = "runtime_stop") -> None:
         """强制完成当前会话所有 pending 记录。"""
 
@@ -131,7 +137,7 @@ class ReplyEffectTracker:
             await self.finalize(effect_id, reason)
 
     async def finalize(self, effect_id: str, reason: str) -> None:
-        """完成一条 pending 记录并写回 JSON。"""
+        """完成一条 pending 记录并写回存储。"""
 
         record = self._pending_records.pop(effect_id, None)
         if record is None or record.status == ReplyEffectStatus.FINALIZED:
@@ -1,6 +1,7 @@
 ﻿"""Maisaka 非 CLI 运行时。"""
 
 from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from math import ceil
 from typing import Any, Literal, Optional, Sequence
@@ -35,6 +36,7 @@ from src.plugin_runtime.hook_payloads import deserialize_prompt_messages
 
 from .chat_loop_service import ChatResponse, MaisakaChatLoopService
 from .context_messages import LLMContextMessage, ReferenceMessage, ReferenceMessageType
+from .deferred_tool_index import DeferredToolSearchIndex
 from .display.display_utils import build_tool_call_summary_lines, format_token_count
 from .display.prompt_cli_renderer import PromptCLIVisualizer
 from .display.stage_status_board import remove_stage_status, update_stage_status
@@ -49,6 +51,22 @@ logger = get_logger("maisaka_runtime")
 MAX_INTERNAL_ROUNDS = 6
 
 
+@dataclass(slots=True)
+class MaisakaHibernationState:
+    """会话休眠时保留的精简运行时状态。"""
+
+    chat_history: list[LLMContextMessage] = field(default_factory=list)
+    source_messages_by_id: dict[str, SessionMessage] = field(default_factory=dict)
+    unlearned_messages: list[SessionMessage] = field(default_factory=list)
+    discovered_tool_names: set[str] = field(default_factory=set)
+    recent_reply_latencies: list[tuple[float, float]] = field(default_factory=list)
+    talk_frequency_adjust: float = 1.0
+    cycle_counter: int = 0
+    last_message_received_at: float = 0.0
+    last_expression_extraction_time: float = 0.0
+    last_activity_at: float = 0.0
+
+
 class MaisakaHeartFlowChatting:
     """会话级别的 Maisaka 运行时。"""
 
@@ -91,6 +109,7 @@ class MaisakaHeartFlowChatting:
         self._message_debounce_required = False
         self._message_received_at_by_id: dict[str, float] = {}
         self._last_message_received_at = 0.0
+        self._last_activity_at = time.time()
         self._talk_frequency_adjust = 1.0
         self._reply_latency_measurement_started_at: Optional[float] = None
         self._recent_reply_latencies: deque[tuple[float, float]] = deque()
@@ -108,6 +127,7 @@ class MaisakaHeartFlowChatting:
         self._current_action_tool_names: set[str] = set()
         self.discovered_tool_names: set[str] = set()
         self.deferred_tool_specs_by_name: dict[str, ToolSpec] = {}
+        self._deferred_tool_search_index = DeferredToolSearchIndex()
         self._planner_interrupt_max_consecutive_count = max(
             0,
             int(global_config.chat.planner_interrupt_max_consecutive_count),
@@ -201,6 +221,67 @@ class MaisakaHeartFlowChatting:
         self._talk_frequency_adjust = max(0.01, float(frequency))
         self._schedule_message_turn()
 
+    @property
+    def last_activity_at(self) -> float:
+        """最近一次收到消息或完成思考循环的时间戳。"""
+        if self.history_loop:
+            return max(self._last_activity_at, self.history_loop[-1].end_time or 0.0)
+        return self._last_activity_at
+
+    def can_hibernate(self) -> bool:
+        """判断当前运行时是否处于可安全休眠的空闲状态。"""
+        if not self._running or self._agent_state == self._STATE_RUNNING:
+            return False
+        if self._has_pending_messages() or self._message_turn_scheduled or not self._internal_turn_queue.empty():
+            return False
+        if self._deferred_message_turn_task is not None or self._wait_timeout_task is not None:
+            return False
+        if self._is_reply_effect_tracking_enabled() and self._reply_effect_tracker.has_pending_records:
+            return False
+        return True
+
+    def export_hibernation_state(self) -> MaisakaHibernationState:
+        """导出休眠所需的精简状态。
+
+        聊天历史已按上下文长度裁剪，原样保留；原始消息只保留仍被历史引用的部分，
+        以及尚未参与表达学习的消息，循环记录等随会话无限增长的数据全部丢弃。
+        """
+        history_message_ids = {message_id_from_context_message(message) for message in self._chat_history}
+        learning_backlog_limit = max(self._max_context_size, self._expression_learner.min_messages_for_extraction)
+        unlearned_messages = self.message_cache[self._expression_learner._last_processed_index :]
+        return MaisakaHibernationState(
+            chat_history=list(self._chat_history),
+            source_messages_by_id={
+                message_id: message
+                for message_id, message in self._source_messages_by_id.items()
+                if message_id in history_message_ids
+            },
+            unlearned_messages=unlearned_messages[-learning_backlog_limit:],
+            discovered_tool_names=set(self.discovered_tool_names),
+            recent_reply_latencies=list(self._recent_reply_latencies),
+            talk_frequency_adjust=self._talk_frequency_adjust,
+            cycle_counter=self._cycle_counter,
+            last_message_received_at=self._last_message_received_at,
+            last_expression_extraction_time=self._last_expression_extraction_time,
+            last_activity_at=self.last_activity_at,
+        )
+
+    def restore_hibernation_state(self, state: MaisakaHibernationState) -> None:
+        """在启动前恢复休眠时导出的状态。"""
+        self._chat_history = list(state.chat_history)
+        self._source_messages_by_id = dict(state.source_messages_by_id)
+        self.message_cache = list(state.unlearned_messages)
+        self._last_processed_index = len(self.message_cache)
+        self._expression_learner._last_processed_index = 0
+        self.discovered_tool_names = set(state.discovered_tool_names)
+        self._recent_reply_latencies = deque(state.recent_reply_latencies)
+        self._prune_recent_reply_latencies()
+        self._talk_frequency_adjust = state.talk_frequency_adjust
+        self._cycle_counter = state.cycle_counter
+        self._last_message_received_at = state.last_message_received_at
+        self._last_expression_extraction_time = state.last_expression_extraction_time
+        self._last_activity_at = state.last_activity_at
+
     def append_sent_message_to_chat_history(
         self,
         message: SessionMessage,
@@ -209,6 +290,20 @@ class MaisakaHeartFlowChatting:
     ) -> bool:
         """将一条已发送成功的消息同步到 Maisaka 内部历史。"""
 
+        history_message = self.build_sent_history_message(message, source_kind=source_kind)
+        if history_message is None:
+            return False
+        self._chat_history.append(history_message)
+        return True
+
+    @staticmethod
+    def build_sent_history_message(
+        message: SessionMessage,
+        *,
+        source_kind: str = "guided_reply",
+    ) -> Optional[LLMContextMessage]:
+        """将一条已发送成功的消息构造成 Maisaka 历史消息，失败时返回 ``None``。"""
+
         try:
             from .context_messages import SessionBackedMessage
             from .history_utils import build_prefixed_message_sequence, build_session_message_visible_text
@@ -223,20 +318,18 @@ class MaisakaHeartFlowChatting:
                 message_id=message.message_id,
                 include_message_id=not message.is_notify and bool(message.message_id),
             )
-            history_message = SessionBackedMessage.from_session_message(
+            return SessionBackedMessage.from_session_message(
                 message,
                 raw_message=build_prefixed_message_sequence(message.raw_message, planner_prefix),
                 visible_text=build_session_message_visible_text(message),
                 source_kind=source_kind,
             )
-            self._chat_history.append(history_message)
-            return True
         except Exception as exc:
             logger.warning(
-                f"{self.log_prefix} 同步已发送消息到 Maisaka 历史失败: "
+                f"[{message.session_id}] 同步已发送消息到 Maisaka 历史失败: "
                 f"message_id={message.message_id} error={exc}"
             )
-            return False
+            return None
 
     async def register_message(self, message: SessionMessage) -> None:
         """缓存一条新消息并唤醒主循环。"""
@@ -244,6 +337,7 @@ class MaisakaHeartFlowChatting:
             self._ensure_background_tasks_running()
         received_at = time.time()
         self._last_message_received_at = received_at
+        self._last_activity_at = received_at
         self._update_message_trigger_state(message)
         self.message_cache.append(message)
         self._message_received_at_by_id[message.message_id] = received_at
@@ -635,6 +729,7 @@ class MaisakaHeartFlowChatting:
             next_specs_by_name[normalized_name] = tool_spec
 
         self.deferred_tool_specs_by_name = next_specs_by_name
+        self._deferred_tool_search_index.sync(next_specs_by_name)
         self.discovered_tool_names.intersection_update(next_specs_by_name.keys())
 
     def get_discovered_deferred_tool_specs(self) -> list[ToolSpec]:
@@ -684,39 +779,7 @@ class MaisakaHeartFlowChatting:
     ) -> list[ToolSpec]:
         """按名称或简要描述搜索 deferred tools。"""
 
-        normalized_query = " ".join(query.lower().split()).strip()
-        if not normalized_query:
-            return []
-
-        scored_matches: list[tuple[int, str, ToolSpec]] = []
-        query_terms = [term for term in normalized_query.replace("_", " ").replace("-", " ").split() if term]
-        for tool_name, tool_spec in self.deferred_tool_specs_by_name.items():
-            lower_name = tool_name.lower()
-            lower_description = tool_spec.brief_description.lower()
-            score = 0
-
-            if normalized_query == lower_name:
-                score += 1000
-            if lower_name.startswith(normalized_query):
-                score += 300
-            if normalized_query in lower_name:
-                score += 200
-            if normalized_query in lower_description:
-                score += 100
-
-            for query_term in query_terms:
-                if query_term in lower_name:
-                    score += 25
-                if query_term in lower_description:
-                    score += 10
-
-            if score <= 0:
-                continue
-
-            scored_matches.append((score, tool_name, tool_spec))
-
-        scored_matches.sort(key=lambda item: (-item[0], item[1]))
-        return [tool_spec for _, _, tool_spec in scored_matches[: max(1, limit)]]
+        return self._deferred_tool_search_index.search(query, limit=limit)
 
     def discover_deferred_tools(self, tool_names: Sequence[str]) -> list[str]:
         """将指定 deferred tools 标记为已发现，并返回本次新发现的工具名。"""
@@ -984,6 +1047,7 @@ class MaisakaHeartFlowChatting:
         time_records: Optional[dict[str, float]] = None,
         timing_selected_history_count: Optional[int] = None,
         timing_prompt_tokens: Optional[int] = None,
+        timing_estimated_prompt_tokens: Optional[int] = None,
         timing_action: str = "",
         timing_response: str = "",
         timing_tool_calls: Optional[list[Any]] = None,
@@ -992,6 +1056,7 @@ class MaisakaHeartFlowChatting:
         timing_prompt_section: Optional[RenderableType] = None,
         planner_selected_history_count: Optional[int] = None,
         planner_prompt_tokens: Optional[int] = None,
+        planner_estimated_prompt_tokens: Optional[int] = None,
         planner_response: str = "",
         planner_tool_calls: Optional[list[Any]] = None,
         planner_tool_results: Optional[list[str]] = None,
@@ -1017,6 +1082,7 @@ class MaisakaHeartFlowChatting:
             border_style="bright_magenta",
             selected_history_count=timing_selected_history_count,
             prompt_tokens=timing_prompt_tokens,
+            estimated_prompt_tokens=timing_estimated_prompt_tokens,
             response_text=timing_response,
             prompt_section=timing_prompt_section,
             extra_lines=[f"门控动作：{timing_action}"] if timing_action.strip() else None,
@@ -1039,6 +1105,7 @@ class MaisakaHeartFlowChatting:
             border_style="green",
             selected_history_count=planner_selected_history_count,
             prompt_tokens=planner_prompt_tokens,
+            estimated_prompt_tokens=planner_estimated_prompt_tokens,
             response_text=planner_response,
             prompt_section=planner_prompt_section,
             extra_lines=planner_extra_lines,
@@ -1073,6 +1140,7 @@ class MaisakaHeartFlowChatting:
         border_style: str,
         selected_history_count: Optional[int],
         prompt_tokens: Optional[int],
+        estimated_prompt_tokens: Optional[int] = None,
         response_text: str = "",
         prompt_section: Optional[RenderableType] = None,
         extra_lines: Optional[list[str]] = None,
@@ -1093,7 +1161,10 @@ class MaisakaHeartFlowChatting:
         if selected_history_count is not None:
             body_lines.append(f"上下文占用：{selected_history_count}/{self._max_context_size} 条")
         if prompt_tokens is not None:
-            body_lines.append(f"本次请求token消耗：{format_token_count(prompt_tokens)}")
+            token_line = f"本次请求token消耗：{format_token_count(prompt_tokens)}"
+            if estimated_prompt_tokens:
+                token_line += f"（预估输入 {format_token_count(estimated_prompt_tokens)}）"
+            body_lines.append(token_line)
         if extra_lines:
             body_lines.extend([line for line in extra_lines if isinstance(line, str) and line.strip()])
 
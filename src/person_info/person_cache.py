@@ -0,0 +1,92 @@
+"""人物信息进程级缓存。
+
+`Person` 在回复、学习、规划等流程中会针对同一批用户被反复构造，每次构造都要查询数据库。
+这里按 person_id 缓存数据库中的人物档案快照（platform + user_id 通过 `get_person_id` 确定性地映射为
+person_id，因此同一个键同时覆盖两种构造方式），写入数据库后由写入方使对应条目失效。
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import threading
+
+DEFAULT_MAX_PERSON_CACHE_SIZE = 4096  # 缓存的人物档案数量上限
+
+
+@dataclass(frozen=True)
+class PersonProfile:
+    """数据库中人物档案的不可变快照。"""
+
+    is_known: bool
+    user_id: str = ""
+    platform: str = ""
+    nickname: str = ""
+    person_name: Optional[str] = None
+    name_reason: Optional[str] = None
+    know_times: int = 0
+    memory_points: tuple[str, ...] = ()
+    group_cardnames: tuple[tuple[str, str], ...] = ()
+
+    def group_cardname_list(self) -> list[dict[str, str]]:
+        """还原为 `Person.group_cardname_list` 使用的可变结构。"""
+        return [
+            {"group_id": group_id, "group_cardname": group_cardname} for group_id, group_cardname in self.group_cardnames
+        ]
+
+
+class PersonProfileCache:
+    """有界 LRU 人物档案缓存，线程安全。"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_PERSON_CACHE_SIZE) -> None:
+        self._max_size = max(1, int(max_size))
+        self._profiles: OrderedDict[str, PersonProfile] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, person_id: str) -> Optional[PersonProfile]:
+        """读取缓存的人物档案，未命中时返回 None。"""
+        with self._lock:
+            profile = self._profiles.get(person_id)
+            if profile is None:
+                self.misses += 1
+                return None
+            self._profiles.move_to_end(person_id)
+            self.hits += 1
+            return profile
+
+    def put(self, person_id: str, profile: PersonProfile) -> None:
+        """写入人物档案，超过上限时淘汰最久未使用的条目。"""
+        if not person_id:
+            return
+        with self._lock:
+            self._profiles[person_id] = profile
+            self._profiles.move_to_end(person_id)
+            while len(self._profiles) > self._max_size:
+                self._profiles.popitem(last=False)
+
+    def invalidate(self, person_id: str) -> None:
+        """使指定人物的缓存失效。"""
+        with self._lock:
+            self._profiles.pop(person_id, None)
+
+    def clear(self) -> None:
+        """清空缓存（不重置命中统计）。"""
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """获取缓存统计信息。"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._profiles),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+person_profile_cache = PersonProfileCache()
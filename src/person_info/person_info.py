@@ -18,6 +18,7 @@ from src.common.database.database import get_db_session
 from src.common.database.database_model import PersonInfo
 from src.common.logger import get_logger
 from src.config.config import global_config
+from src.person_info.person_cache import PersonProfile, person_profile_cache
 from src.services.memory_service import memory_service
 from src.services.llm_service import LLMServiceClient
 
@@ -106,29 +107,36 @@ def resolve_person_id_for_memory(
     return ""
 
 
+def _query_person_known(person_id: str) -> bool:
+    """直接从数据库查询人物是否已认识。"""
+    with get_db_session() as session:
+        statement = select(PersonInfo).where(col(PersonInfo.person_id) == person_id).limit(1)
+        person = session.exec(statement).first()
+        return person.is_known if person else False
+
+
+def _is_person_id_known(person_id: str) -> bool:
+    """查询人物是否已认识，优先使用缓存，未认识的结果同样写入缓存。"""
+    if profile := person_profile_cache.get(person_id):
+        return profile.is_known
+    known = _query_person_known(person_id)
+    if not known:
+        person_profile_cache.put(person_id, PersonProfile(is_known=False))
+    return known
+
+
 def is_person_known(
     person_id: Optional[str] = None,
     user_id: Optional[str] = None,
     platform: Optional[str] = None,
     person_name: Optional[str] = None,
-) -> bool:  # sourcery skip: extract-duplicate-method
+) -> bool:
     if person_id:
-        with get_db_session() as session:
-            statement = select(PersonInfo).where(col(PersonInfo.person_id) == person_id).limit(1)
-            person = session.exec(statement).first()
-            return person.is_known if person else False
+        return _is_person_id_known(person_id)
     elif user_id and platform:
-        person_id = get_person_id(platform, user_id)
-        with get_db_session() as session:
-            statement = select(PersonInfo).where(col(PersonInfo.person_id) == person_id).limit(1)
-            person = session.exec(statement).first()
-            return person.is_known if person else False
+        return _is_person_id_known(get_person_id(platform, user_id))
     elif person_name:
-        person_id = get_person_id_by_person_name(person_name)
-        with get_db_session() as session:
-            statement = select(PersonInfo).where(col(PersonInfo.person_id) == person_id).limit(1)
-            person = session.exec(statement).first()
-            return person.is_known if person else False
+        return _is_person_id_known(get_person_id_by_person_name(person_name))
     else:
         return False
 
@@ -350,7 +358,11 @@ class Person:
             logger.error("Person 初始化失败，缺少必要参数")
             raise ValueError("Person 初始化失败，缺少必要参数")
 
-        if not is_person_known(person_id=self.person_id):
+        profile = person_profile_cache.get(self.person_id)
+        if profile is None and not _query_person_known(self.person_id):
+            profile = PersonProfile(is_known=False)
+            person_profile_cache.put(self.person_id, profile)
+        if profile is not None and not profile.is_known:
             self.is_known = False
             logger.debug(f"用户 {platform}:{user_id}:{person_name}:{person_id} 尚未认识")
             self.person_name = f"未知用户{self.person_id[:4]}"
@@ -369,8 +381,11 @@ class Person:
         self.memory_points = []
         self.group_cardname_list: list[dict[str, str]] = []  # 群名片列表，存储 {"group_id": str, "group_cardname": str}
 
-        # 从数据库加载数据
-        self.load_from_database()
+        if profile is not None:
+            self._apply_profile(profile)
+        else:
+            # 从数据库加载数据
+            self.load_from_database()
 
     def del_memory(self, category: str, memory_content: str, similarity_threshold: float = 0.95):
         """
@@ -521,6 +536,7 @@ class Person:
                     else:
                         self.group_cardname_list = []
 
+                    person_profile_cache.put(self.person_id, self._build_profile())
                     logger.debug(f"已从数据库加载用户 {self.person_id} 的信息")
                 else:
                     self.sync_to_database()
@@ -530,6 +546,35 @@ class Person:
             logger.error(f"从数据库加载用户 {self.person_id} 信息时出错: {e}")
             # 出错时保持默认值
 
+    def _build_profile(self) -> PersonProfile:
+        """将当前已加载的数据库字段导出为缓存快照。"""
+        return PersonProfile(
+            is_known=self.is_known,
+            user_id=self.user_id,
+            platform=self.platform,
+            nickname=self.nickname,
+            person_name=self.person_name,
+            name_reason=self.name_reason,
+            know_times=self.know_times,
+            memory_points=tuple(self.memory_points),
+            group_cardnames=tuple(
+                (str(item.get("group_id", "")), str(item.get("group_cardname", "")))
+                for item in self.group_cardname_list
+            ),
+        )
+
+    def _apply_profile(self, profile: PersonProfile) -> None:
+        """使用缓存快照填充实例字段，效果与 `load_from_database` 相同。"""
+        self.user_id = profile.user_id
+        self.platform = profile.platform
+        self.is_known = profile.is_known
+        self.nickname = profile.nickname
+        self.person_name = profile.person_name
+        self.name_reason = profile.name_reason
+        self.know_times = profile.know_times
+        self.memory_points = list(profile.memory_points)
+        self.group_cardname_list = profile.group_cardname_list()
+
     def sync_to_database(self):
         """将所有属性同步回数据库"""
         if not self.is_known:
@@ -580,6 +625,7 @@ class Person:
                     )
                     session.add(record)
                     logger.debug(f"已创建用户 {self.person_id} 的信息到数据库")
+            person_profile_cache.invalidate(self.person_id)
 
         except Exception as e:
             logger.error(f"同步用户 {self.person_id} 信息到数据库时出错: {e}")
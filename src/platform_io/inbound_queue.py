@@ -0,0 +1,435 @@
+"""提供 Platform IO 入站消息的有界队列与分发工作池。
+
+驱动上报的入站消息先进入有界队列，再由固定数量的工作协程交给入站分发器，
+从而让适配器的接收循环不再被下游处理阻塞，也不会因突发流量无限堆积任务。
+
+- 同一会话的消息严格按入队顺序逐条分发，不同会话之间并行。
+- 队列满时按 ``InboundOverflowPolicy`` 处理：阻塞等待、丢弃最旧消息或丢弃低优先级消息。
+- 队列深度、排队等待时间与丢弃数量通过 ``stats()`` 暴露，便于按实际负载调整容量。
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import asyncio
+import itertools
+import time
+
+from src.common.logger import get_logger
+
+from .types import InboundMessageEnvelope
+
+logger = get_logger("platform_io.inbound_queue")
+
+InboundQueueDispatcher = Callable[[InboundMessageEnvelope], Awaitable[None]]
+PriorityResolver = Callable[[InboundMessageEnvelope], int]
+
+DEFAULT_INBOUND_QUEUE_SIZE = 2000
+DEFAULT_INBOUND_WORKER_COUNT = 8
+OVERFLOW_WARNING_INTERVAL_SECONDS = 60.0
+DEFAULT_INBOUND_DRAIN_TIMEOUT_SECONDS = 5.0
+
+LOW_PRIORITY = 0
+NORMAL_PRIORITY = 1
+HIGH_PRIORITY = 2
+
+
+class InboundOverflowPolicy(str, Enum):
+    """入站队列已满时的处理策略。"""
+
+    BLOCK = "block"
+    """阻塞调用方直到队列出现空位，对上游形成背压。"""
+
+    DROP_OLDEST = "drop_oldest"
+    """丢弃队列中最早入队且尚未开始分发的消息。"""
+
+    SHED_LOW_PRIORITY = "shed_low_priority"
+    """丢弃低优先级消息；队列中没有可丢弃的低优先级消息时退化为阻塞。"""
+
+
+def default_priority_resolver(envelope: InboundMessageEnvelope) -> int:
+    """根据入站封装推断消息优先级。
+
+    上游可以通过 ``metadata["priority"]`` 显式指定优先级；否则提及或 @ 机器人的消息
+    视为高优先级，通知类消息视为低优先级，其余为普通优先级。
+
+    Args:
+        envelope: 待推断的入站封装。
+
+    Returns:
+        int: 数值越大优先级越高。
+    """
+    explicit_priority = envelope.metadata.get("priority")
+    if isinstance(explicit_priority, int) and not isinstance(explicit_priority, bool):
+        return explicit_priority
+
+    session_message = envelope.session_message
+    if session_message is None:
+        return NORMAL_PRIORITY
+    if getattr(session_message, "is_mentioned", False) or getattr(session_message, "is_at", False):
+        return HIGH_PRIORITY
+    if getattr(session_message, "is_notify", False):
+        return LOW_PRIORITY
+    return NORMAL_PRIORITY
+
+
+def build_ordering_key(envelope: InboundMessageEnvelope) -> str:
+    """构造用于保证会话内顺序的分区键。
+
+    入站阶段 ``SessionMessage.session_id`` 通常尚未计算，因此这里按路由键加群号
+    或用户 ID 划分会话；无法识别会话时退化为整条路由共用一个分区。
+
+    Args:
+        envelope: 待分区的入站封装。
+
+    Returns:
+        str: 同一会话的消息始终得到相同的分区键。
+    """
+    route_scope = envelope.route_key.to_dedupe_scope()
+    group_id: Any = None
+    user_id: Any = None
+
+    session_message = envelope.session_message
+    message_info = getattr(session_message, "message_info", None) if session_message is not None else None
+    if message_info is not None:
+        group_info = getattr(message_info, "group_info", None)
+        user_info = getattr(message_info, "user_info", None)
+        group_id = getattr(group_info, "group_id", None) if group_info is not None else None
+        user_id = getattr(user_info, "user_id", None) if user_info is not None else None
+    elif isinstance(envelope.payload, dict):
+        raw_message_info = envelope.payload.get("message_info")
+        if isinstance(raw_message_info, dict):
+            group_info = raw_message_info.get("group_info")
+            user_info = raw_message_info.get("user_info")
+            group_id = group_info.get("group_id") if isinstance(group_info, dict) else None
+            user_id = user_info.get("user_id") if isinstance(user_info, dict) else None
+
+    if group_id:
+        return f"{route_scope}:group:{group_id}"
+    if user_id:
+        return f"{route_scope}:user:{user_id}"
+    return route_scope
+
+
+@dataclass(slots=True)
+class _QueuedInbound:
+    """队列中等待分发的一条入站消息。"""
+
+    seq: int
+    ordering_key: str
+    priority: int
+    envelope: InboundMessageEnvelope
+    enqueued_at: float = field(default_factory=time.monotonic)
+    dropped: bool = False
+
+
+@dataclass(slots=True)
+class InboundQueueMetrics:
+    """入站队列的累计运行指标。"""
+
+    enqueued: int = 0
+    dispatched: int = 0
+    dispatch_errors: int = 0
+    dropped_oldest: int = 0
+    dropped_low_priority: int = 0
+    blocked_puts: int = 0
+    max_depth: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def dropped(self) -> int:
+        """返回因溢出被丢弃的消息总数。"""
+        return self.dropped_oldest + self.dropped_low_priority
+
+
+class InboundQueue:
+    """有界入站队列，按会话串行、跨会话并行地把消息交给分发器。
+
+    每个会话拥有独立的 FIFO 分区；有待处理消息且未被占用的分区进入就绪队列，
+    工作协程每次从就绪分区取出一条消息处理，完成后若分区仍有消息则重新排队，
+    因此同一会话同一时刻最多只有一条消息在分发，而各会话之间轮转公平。
+    """
+
+    def __init__(
+        self,
+        dispatcher: InboundQueueDispatcher,
+        *,
+        max_size: int = DEFAULT_INBOUND_QUEUE_SIZE,
+        worker_count: int = DEFAULT_INBOUND_WORKER_COUNT,
+        overflow_policy: InboundOverflowPolicy = InboundOverflowPolicy.BLOCK,
+        priority_resolver: PriorityResolver = default_priority_resolver,
+    ) -> None:
+        """初始化入站队列。
+
+        Args:
+            dispatcher: 实际处理单条入站消息的异步回调。
+            max_size: 队列中尚未开始分发的消息上限。
+            worker_count: 并发分发的工作协程数量。
+            overflow_policy: 队列已满时的处理策略。
+            priority_resolver: 推断消息优先级的回调，仅在丢弃低优先级策略下生效。
+
+        Raises:
+            ValueError: 当 ``max_size`` 或 ``worker_count`` 小于 1 时抛出。
+        """
+        if max_size < 1:
+            raise ValueError("InboundQueue.max_size 必须大于 0")
+        if worker_count < 1:
+            raise ValueError("InboundQueue.worker_count 必须大于 0")
+
+        self._dispatcher = dispatcher
+        self._max_size = max_size
+        self._worker_count = worker_count
+        self._overflow_policy = InboundOverflowPolicy(overflow_policy)
+        self._priority_resolver = priority_resolver
+
+        self._seq = itertools.count()
+        self._pending: OrderedDict[int, _QueuedInbound] = OrderedDict()
+        self._low_priority_pending: OrderedDict[int, _QueuedInbound] = OrderedDict()
+        self._partitions: Dict[str, Deque[_QueuedInbound]] = {}
+        self._busy_keys: Set[str] = set()
+        self._ready_keys: Deque[str] = deque()
+        self._in_flight = 0
+        self._state_changed = asyncio.Condition()
+        self._workers: List[asyncio.Task[None]] = []
+        self._metrics = InboundQueueMetrics()
+        self._last_overflow_warning_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        """返回工作协程是否已经启动。"""
+        return bool(self._workers)
+
+    @property
+    def depth(self) -> int:
+        """返回当前尚未开始分发的消息数量。"""
+        return len(self._pending)
+
+    @property
+    def overflow_policy(self) -> InboundOverflowPolicy:
+        """返回当前的溢出处理策略。"""
+        return self._overflow_policy
+
+    def start(self) -> None:
+        """启动分发工作协程；重复调用不会产生额外的工作协程。"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"platform_io_inbound_worker_{index}")
+            for index in range(self._worker_count)
+        ]
+
+    async def stop(self, drain_timeout: float = DEFAULT_INBOUND_DRAIN_TIMEOUT_SECONDS) -> int:
+        """停止工作协程，并在超时前尽量分发完已入队的消息。
+
+        Args:
+            drain_timeout: 等待队列排空的最长秒数。
+
+        Returns:
+            int: 停止时仍未分发而被丢弃的消息数量。
+        """
+        if not self._workers:
+            return 0
+
+        try:
+            await asyncio.wait_for(self.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"入站队列排空超时，剩余 {self.depth} 条消息将被丢弃")
+
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        discarded = len(self._pending)
+        self._pending.clear()
+        self._low_priority_pending.clear()
+        self._partitions.clear()
+        self._busy_keys.clear()
+        self._ready_keys.clear()
+        self._in_flight = 0
+        async with self._state_changed:
+            self._state_changed.notify_all()
+        return discarded
+
+    async def join(self) -> None:
+        """等待全部已入队消息分发完成。"""
+        async with self._state_changed:
+            await self._state_changed.wait_for(lambda: not self._pending and self._in_flight == 0)
+
+    async def put(self, envelope: InboundMessageEnvelope) -> bool:
+        """把一条入站消息放入队列。
+
+        Args:
+            envelope: 已通过 Broker 审核的入站封装。
+
+        Returns:
+            bool: 若消息已入队则返回 ``True``；若因溢出策略被直接丢弃则返回 ``False``。
+        """
+        priority = (
+            self._priority_resolver(envelope)
+            if self._overflow_policy == InboundOverflowPolicy.SHED_LOW_PRIORITY
+            else NORMAL_PRIORITY
+        )
+        async with self._state_changed:
+            if len(self._pending) >= self._max_size and not await self._make_room(priority):
+                self._metrics.dropped_low_priority += 1
+                logger.debug(f"入站队列已满，丢弃低优先级消息: driver={envelope.driver_id}")
+                self._warn_overflow()
+                return False
+
+            item = _QueuedInbound(
+                seq=next(self._seq),
+                ordering_key=build_ordering_key(envelope),
+                priority=priority,
+                envelope=envelope,
+            )
+            self._pending[item.seq] = item
+            if priority <= LOW_PRIORITY:
+                self._low_priority_pending[item.seq] = item
+            partition = self._partitions.setdefault(item.ordering_key, deque())
+            partition.append(item)
+            if item.ordering_key not in self._busy_keys and len(partition) == 1:
+                self._ready_keys.append(item.ordering_key)
+
+            self._metrics.enqueued += 1
+            self._metrics.max_depth = max(self._metrics.max_depth, len(self._pending))
+            self._state_changed.notify_all()
+        return True
+
+    async def _make_room(self, priority: int) -> bool:
+        """在队列已满时按溢出策略腾出一个空位。
+
+        调用方必须持有 ``_state_changed`` 锁。
+
+        Args:
+            priority: 待入队消息的优先级。
+
+        Returns:
+            bool: 若已腾出空位则返回 ``True``；若应丢弃待入队消息则返回 ``False``。
+        """
+        if self._overflow_policy == InboundOverflowPolicy.DROP_OLDEST:
+            self._drop(next(iter(self._pending.values())))
+            self._metrics.dropped_oldest += 1
+            self._warn_overflow()
+            return True
+
+        if self._overflow_policy == InboundOverflowPolicy.SHED_LOW_PRIORITY:
+            if priority <= LOW_PRIORITY:
+                return False
+            if self._low_priority_pending:
+                self._drop(next(iter(self._low_priority_pending.values())))
+                self._metrics.dropped_low_priority += 1
+                self._warn_overflow()
+                return True
+
+        self._metrics.blocked_puts += 1
+        self._warn_overflow()
+        await self._state_changed.wait_for(lambda: len(self._pending) < self._max_size)
+        return True
+
+    def _warn_overflow(self) -> None:
+        """队列溢出时输出告警，同一时间窗口内最多输出一次，避免突发流量刷屏。"""
+        now = time.monotonic()
+        if (
+            self._last_overflow_warning_at is not None
+            and now - self._last_overflow_warning_at < OVERFLOW_WARNING_INTERVAL_SECONDS
+        ):
+            return
+        self._last_overflow_warning_at = now
+        logger.warning(
+            f"入站队列已满（容量 {self._max_size}，策略 {self._overflow_policy.value}）: "
+            f"累计丢弃 {self._metrics.dropped} 条，累计阻塞 {self._metrics.blocked_puts} 次；"
+            "可调整 message_receive.inbound_queue_size / inbound_worker_count"
+        )
+
+    def _drop(self, item: _QueuedInbound) -> None:
+        """把一条尚未分发的消息标记为丢弃，分区中的占位由工作协程懒清理。"""
+        item.dropped = True
+        self._pending.pop(item.seq, None)
+        self._low_priority_pending.pop(item.seq, None)
+        logger.debug(f"入站队列溢出，丢弃消息: driver={item.envelope.driver_id} key={item.ordering_key}")
+
+    def _take_next(self) -> Optional[_QueuedInbound]:
+        """从就绪分区中取出下一条待分发消息，并占用该分区。"""
+        while self._ready_keys:
+            ordering_key = self._ready_keys.popleft()
+            partition = self._partitions.get(ordering_key)
+            while partition and partition[0].dropped:
+                partition.popleft()
+            if not partition:
+                self._partitions.pop(ordering_key, None)
+                continue
+
+            item = partition.popleft()
+            self._pending.pop(item.seq, None)
+            self._low_priority_pending.pop(item.seq, None)
+            self._busy_keys.add(ordering_key)
+            self._in_flight += 1
+            return item
+        return None
+
+    def _release(self, item: _QueuedInbound) -> None:
+        """释放分区占用；分区仍有消息时重新放回就绪队列。"""
+        self._busy_keys.discard(item.ordering_key)
+        self._in_flight -= 1
+        partition = self._partitions.get(item.ordering_key)
+        if partition:
+            self._ready_keys.append(item.ordering_key)
+        else:
+            self._partitions.pop(item.ordering_key, None)
+
+    async def _worker_loop(self) -> None:
+        """持续从就绪分区取消息并交给分发器。"""
+        while True:
+            async with self._state_changed:
+                item = self._take_next()
+                while item is None:
+                    await self._state_changed.wait()
+                    item = self._take_next()
+                # 出队释放了容量，唤醒可能阻塞在 put() 上的调用方
+                self._state_changed.notify_all()
+
+            wait_seconds = time.monotonic() - item.enqueued_at
+            self._metrics.total_wait_seconds += wait_seconds
+            self._metrics.max_wait_seconds = max(self._metrics.max_wait_seconds, wait_seconds)
+            try:
+                await self._dispatcher(item.envelope)
+                self._metrics.dispatched += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._metrics.dispatch_errors += 1
+                logger.exception(f"入站消息分发失败: driver={item.envelope.driver_id} key={item.ordering_key}")
+            finally:
+                async with self._state_changed:
+                    self._release(item)
+                    self._state_changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回队列当前状态与累计指标的快照。
+
+        Returns:
+            Dict[str, Any]: 包含深度、排队等待时间与丢弃数量等指标的字典。
+        """
+        metrics = self._metrics
+        started = metrics.dispatched + metrics.dispatch_errors
+        return {
+            "depth": len(self._pending),
+            "in_flight": self._in_flight,
+            "max_size": self._max_size,
+            "worker_count": self._worker_count,
+            "overflow_policy": self._overflow_policy.value,
+            "enqueued": metrics.enqueued,
+            "dispatched": metrics.dispatched,
+            "dispatch_errors": metrics.dispatch_errors,
+            "dropped": metrics.dropped,
+            "dropped_oldest": metrics.dropped_oldest,
+            "dropped_low_priority": metrics.dropped_low_priority,
+            "blocked_puts": metrics.blocked_puts,
+            "max_depth": metrics.max_depth,
+            "avg_wait_ms": round(metrics.total_wait_seconds / started * 1000, 3) if started else 0.0,
+            "max_wait_ms": round(metrics.max_wait_seconds * 1000, 3),
+        }
@@ -2,10 +2,19 @@
 
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
+import asyncio
+import time
+
 from src.common.logger import get_logger
 from src.platform_io.drivers.base import PlatformIODriver
 
 from .dedupe import MessageDeduplicator
+from .inbound_queue import (
+    DEFAULT_INBOUND_QUEUE_SIZE,
+    DEFAULT_INBOUND_WORKER_COUNT,
+    InboundOverflowPolicy,
+    InboundQueue,
+)
 from .outbound_tracker import OutboundTracker
 from .route_key_factory import RouteKeyFactory
 from .registry import DriverRegistry
@@ -19,6 +28,9 @@ logger = get_logger("platform_io.manager")
 
 InboundDispatcher = Callable[[InboundMessageEnvelope], Awaitable[None]]
 
+# 与 ``maim_message.platform_send_timeout_seconds`` 的默认值保持一致，实际运行时以配置为准
+DEFAULT_DRIVER_SEND_TIMEOUT_SECONDS = 30.0
+
 
 class PlatformIOManager:
     """统一协调平台消息 IO 的路由、去重与状态跟踪。
@@ -26,13 +38,27 @@ class PlatformIOManager:
     与旧实现不同，这个管理器不再负责“多条链路谁该接管平台”的裁决，
     只维护发送表和接收表两张轻量路由表：
 
-    - 发送时：解析所有命中的发送绑定并全部投递。
-    - 接收时：只校验当前驱动是否已登记为可接收链路，然后全部放行给上层。
+    - 发送时：解析所有命中的发送绑定，并发投递给各驱动；同一驱动内按调用顺序串行。
+    - 接收时：只校验当前驱动是否已登记为可接收链路，然后全部放行给上层；
+      运行期间入站消息经有界队列按会话顺序交给分发器，不阻塞驱动的接收循环。
     - 去重时：仅对单条链路做技术性重放抑制，不做跨链路语义去重。
     """
 
-    def __init__(self) -> None:
-        """初始化 Broker 管理器及其内存状态。"""
+    def __init__(
+        self,
+        send_timeout_seconds: Optional[float] = DEFAULT_DRIVER_SEND_TIMEOUT_SECONDS,
+        inbound_queue_size: int = DEFAULT_INBOUND_QUEUE_SIZE,
+        inbound_worker_count: int = DEFAULT_INBOUND_WORKER_COUNT,
+        inbound_overflow_policy: InboundOverflowPolicy = InboundOverflowPolicy.BLOCK,
+    ) -> None:
+        """初始化 Broker 管理器及其内存状态。
+
+        Args:
+            send_timeout_seconds: 单个驱动单次发送的超时时间，为 ``None`` 时不限时。
+            inbound_queue_size: 入站队列中等待分发的消息上限。
+            inbound_worker_count: 并发分发入站消息的工作协程数量。
+            inbound_overflow_policy: 入站队列已满时的处理策略。
+        """
         self._driver_registry = DriverRegistry()
         self._send_route_table = RouteTable()
         self._receive_route_table = RouteTable()
@@ -40,6 +66,14 @@ class PlatformIOManager:
         self._deduplicator = MessageDeduplicator()
         self._outbound_tracker = OutboundTracker()
         self._inbound_dispatcher: Optional[InboundDispatcher] = None
+        self._send_timeout_seconds = send_timeout_seconds
+        self._driver_send_locks: Dict[str, asyncio.Lock] = {}
+        self._inbound_queue = InboundQueue(
+            self._dispatch_queued_inbound,
+            max_size=inbound_queue_size,
+            worker_count=inbound_worker_count,
+            overflow_policy=inbound_overflow_policy,
+        )
         self._started = False
 
     @property
@@ -74,6 +108,7 @@ class PlatformIOManager:
                     logger.exception(f"回滚驱动停止失败: driver_id={driver.driver_id}")
             raise
 
+        self._inbound_queue.start()
         self._started = True
 
     async def ensure_send_pipeline_ready(self) -> None:
@@ -106,6 +141,10 @@ class PlatformIOManager:
                 stop_errors.append(f"{driver.driver_id}: {exc}")
                 logger.exception(f"驱动停止失败: driver_id={driver.driver_id}")
 
+        discarded = await self._inbound_queue.stop()
+        if discarded:
+            logger.warning(f"Broker 停止时丢弃了 {discarded} 条未分发的入站消息")
+
         self._started = False
         self._deduplicator.clear()
         self._outbound_tracker.clear()
@@ -187,6 +226,23 @@ class PlatformIOManager:
         """
         return self._deduplicator
 
+    @property
+    def inbound_queue(self) -> InboundQueue:
+        """返回管理器持有的入站队列。
+
+        Returns:
+            InboundQueue: Broker 运行期间缓冲并分发入站消息的有界队列。
+        """
+        return self._inbound_queue
+
+    def inbound_queue_stats(self) -> Dict[str, Any]:
+        """返回入站队列的深度、等待时间与丢弃数量等指标快照。
+
+        Returns:
+            Dict[str, Any]: 入站队列指标字典。
+        """
+        return self._inbound_queue.stats()
+
     @property
     def outbound_tracker(self) -> OutboundTracker:
         """返回管理器持有的出站跟踪器。
@@ -275,6 +331,7 @@ class PlatformIOManager:
             return None
 
         removed_driver.clear_inbound_handler()
+        self._driver_send_locks.pop(driver_id, None)
         self._send_route_table.remove_bindings_by_driver(driver_id)
         self._receive_route_table.remove_bindings_by_driver(driver_id)
         self._legacy_send_drivers = {
@@ -443,7 +500,8 @@ class PlatformIOManager:
 
         Returns:
             bool: 若消息被接受并继续转发给入站分发器，则返回 ``True``，
-            否则返回 ``False``。
+            否则返回 ``False``。Broker 运行期间消息会先进入入站队列，
+            此时返回值表示消息已入队，队列按溢出策略直接丢弃时返回 ``False``。
         """
 
         if not self._receive_route_table.has_binding_for_driver(envelope.route_key, envelope.driver_id):
@@ -463,9 +521,24 @@ class PlatformIOManager:
                 logger.info(f"忽略重复入站消息: dedupe_key={dedupe_key}")
                 return False
 
+        if self._inbound_queue.is_running:
+            return await self._inbound_queue.put(envelope)
+
         await self._inbound_dispatcher(envelope)
         return True
 
+    async def _dispatch_queued_inbound(self, envelope: InboundMessageEnvelope) -> None:
+        """由入站队列工作协程调用，把排队的消息交给当前的入站分发器。
+
+        Args:
+            envelope: 已出队的入站封装。
+        """
+        dispatcher = self._inbound_dispatcher
+        if dispatcher is None:
+            logger.debug("入站分发器已被清除，丢弃排队中的入站消息")
+            return
+        await dispatcher(envelope)
+
     async def send_message(
         self,
         message: "SessionMessage",
@@ -486,47 +559,100 @@ class PlatformIOManager:
         if not drivers:
             return DeliveryBatch(internal_message_id=message.message_id, route_key=route_key)
 
-        receipts: List[DeliveryReceipt] = []
-        for driver in drivers:
+        receipts = await asyncio.gather(
+            *(self._send_via_driver(driver, message, route_key, metadata) for driver in drivers)
+        )
+        batch = DeliveryBatch(
+            internal_message_id=message.message_id,
+            route_key=route_key,
+            receipts=list(receipts),
+        )
+        if batch.failed_receipts:
+            logger.warning(
+                f"出站投递部分失败: message_id={message.message_id} route={route_key} "
+                f"sent={len(batch.sent_receipts)} failed={len(batch.failed_receipts)}"
+            )
+        return batch
+
+    async def _send_via_driver(
+        self,
+        driver: PlatformIODriver,
+        message: "SessionMessage",
+        route_key: RouteKey,
+        metadata: Optional[Dict[str, Any]],
+    ) -> DeliveryReceipt:
+        """通过单个驱动投递消息，并把异常与超时隔离为失败回执。
+
+        同一驱动的发送由驱动级锁串行化，保证并发广播时单个驱动内的消息顺序
+        与调用顺序一致；超时只计算驱动实际发送的耗时，不包含排队等待。
+
+        Args:
+            driver: 负责本次投递的驱动。
+            message: 要投递的内部会话消息。
+            route_key: 本次出站投递选择的路由键。
+            metadata: 可选的额外 Broker 侧元数据。
+
+        Returns:
+            DeliveryReceipt: 该驱动的投递回执，失败时不会抛出异常。
+        """
+        try:
+            self._outbound_tracker.begin_tracking(
+                internal_message_id=message.message_id,
+                route_key=route_key,
+                driver_id=driver.driver_id,
+                metadata=metadata,
+            )
+        except ValueError as exc:
+            return self._build_failed_receipt(driver, message, route_key, str(exc))
+
+        send_lock = self._driver_send_locks.setdefault(driver.driver_id, asyncio.Lock())
+        async with send_lock:
+            started_at = time.monotonic()
             try:
-                self._outbound_tracker.begin_tracking(
-                    internal_message_id=message.message_id,
-                    route_key=route_key,
-                    driver_id=driver.driver_id,
-                    metadata=metadata,
+                receipt = await asyncio.wait_for(
+                    driver.send_message(message=message, route_key=route_key, metadata=metadata),
+                    timeout=self._send_timeout_seconds,
                 )
-            except ValueError as exc:
-                receipts.append(
-                    DeliveryReceipt(
-                        internal_message_id=message.message_id,
-                        route_key=route_key,
-                        status=DeliveryStatus.FAILED,
-                        driver_id=driver.driver_id,
-                        driver_kind=driver.descriptor.kind,
-                        error=str(exc),
-                    )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"驱动发送超时: driver_id={driver.driver_id} message_id={message.message_id} "
+                    f"timeout={self._send_timeout_seconds}s"
                 )
-                continue
-
-            try:
-                receipt = await driver.send_message(message=message, route_key=route_key, metadata=metadata)
-            except Exception as exc:
-                receipt = DeliveryReceipt(
-                    internal_message_id=message.message_id,
-                    route_key=route_key,
-                    status=DeliveryStatus.FAILED,
-                    driver_id=driver.driver_id,
-                    driver_kind=driver.descriptor.kind,
-                    error=str(exc),
+                receipt = self._build_failed_receipt(
+                    driver, message, route_key, f"发送超时（{self._send_timeout_seconds} 秒）"
                 )
+            except Exception as exc:
+                receipt = self._build_failed_receipt(driver, message, route_key, str(exc))
+            receipt.metadata.setdefault("elapsed_ms", round((time.monotonic() - started_at) * 1000, 3))
 
-            self._outbound_tracker.finish_tracking(receipt)
-            receipts.append(receipt)
+        self._outbound_tracker.finish_tracking(receipt)
+        return receipt
 
-        return DeliveryBatch(
+    @staticmethod
+    def _build_failed_receipt(
+        driver: PlatformIODriver,
+        message: "SessionMessage",
+        route_key: RouteKey,
+        error: str,
+    ) -> DeliveryReceipt:
+        """构造某个驱动的失败回执。
+
+        Args:
+            driver: 投递失败的驱动。
+            message: 要投递的内部会话消息。
+            route_key: 本次出站投递选择的路由键。
+            error: 失败原因。
+
+        Returns:
+            DeliveryReceipt: 状态为 ``FAILED`` 的回执。
+        """
+        return DeliveryReceipt(
             internal_message_id=message.message_id,
             route_key=route_key,
-            receipts=receipts,
+            status=DeliveryStatus.FAILED,
+            driver_id=driver.driver_id,
+            driver_kind=driver.descriptor.kind,
+            error=error,
         )
 
     @staticmethod
@@ -607,5 +733,24 @@ def get_platform_io_manager() -> PlatformIOManager:
 
     global _platform_io_manager
     if _platform_io_manager is None:
-        _platform_io_manager = PlatformIOManager()
+        _platform_io_manager = _build_platform_io_manager()
     return _platform_io_manager
+
+
+def _build_platform_io_manager() -> PlatformIOManager:
+    """按 ``message_receive`` 与 ``maim_message`` 配置构造 Broker 管理器。
+
+    Returns:
+        PlatformIOManager: 使用配置中发送超时、入站队列容量、工作协程数与溢出策略的管理器。
+    """
+
+    from src.config.config import global_config
+
+    receive_config = global_config.message_receive
+    send_timeout_seconds = global_config.maim_message.platform_send_timeout_seconds
+    return PlatformIOManager(
+        send_timeout_seconds=send_timeout_seconds or None,
+        inbound_queue_size=receive_config.inbound_queue_size,
+        inbound_worker_count=receive_config.inbound_worker_count,
+        inbound_overflow_policy=InboundOverflowPolicy(receive_config.inbound_overflow_policy),
+    )
@@ -262,3 +262,21 @@ class DeliveryBatch:
         """返回当前批量投递是否至少命中一条成功回执。"""
 
         return bool(self.sent_receipts)
+
+    @property
+    def all_succeeded(self) -> bool:
+        """返回当前批量投递是否命中驱动且全部成功。"""
+
+        return bool(self.receipts) and all(receipt.status == DeliveryStatus.SENT for receipt in self.receipts)
+
+    def receipt_for(self, driver_id: str) -> Optional[DeliveryReceipt]:
+        """返回指定驱动的投递回执。
+
+        Args:
+            driver_id: 要查询的驱动 ID。
+
+        Returns:
+            Optional[DeliveryReceipt]: 若该驱动参与了本次投递则返回其回执。
+        """
+
+        return next((receipt for receipt in self.receipts if receipt.driver_id == driver_id), None)
@@ -25,3 +25,13 @@ ENV_BLOCKED_PLUGIN_REASONS = "MAIBOT_BLOCKED_PLUGIN_REASONS"
 
 ENV_GLOBAL_CONFIG_SNAPSHOT = "MAIBOT_GLOBAL_CONFIG_SNAPSHOT"
 """Runner 启动时注入的全局配置快照（JSON 对象）"""
+
+ENV_RUNNER_STANDBY = "MAIBOT_RUNNER_STANDBY"
+"""为 "1" 时 Runner 以热备模式启动：预先导入插件，等待 Host 下发接管指令后才连接"""
+
+# 热备 Runner 与 Host 之间通过 stdin/stdout 传递的控制消息
+STANDBY_READY_SIGNAL = "maibot-runner-standby-ready"
+"""热备 Runner 完成插件导入后写入 stdout 的一行信号"""
+
+STANDBY_PROMOTE_COMMAND = "promote"
+"""Host 写入热备 Runner stdin 的接管指令（JSON 行中的 command 字段）"""
@@ -656,8 +656,7 @@ class RuntimeDataCapabilityMixin:
     def _get_frequency_adjust_value(chat_id: str) -> float:
         from src.chat.heart_flow.heartflow_manager import heartflow_manager
 
-        heartflow_chat = heartflow_manager.heartflow_chat_list.get(chat_id)
-        return 1.0 if heartflow_chat is None else heartflow_chat._talk_frequency_adjust
+        return heartflow_manager.get_talk_frequency_adjust(chat_id)
 
     async def _cap_frequency_get_current_talk_value(self, plugin_id: str, capability: str, args: Dict[str, Any]) -> Any:
         from src.common.utils.utils_config import ChatConfigUtils
@@ -31,6 +31,9 @@ from src.plugin_runtime.transport.base import Connection, TransportServer
 
 logger = get_logger("plugin_runtime.host.rpc_server")
 
+# 发送循环单次合并写入的最大消息数
+SEND_BATCH_MAX_FRAMES = 64
+
 # RPC 方法处理器类型
 MethodHandler = Callable[[Envelope], Coroutine[Any, Any, Envelope]]
 
@@ -186,32 +189,59 @@ class RPCServer:
     # ============ 内部方法 ============
     # ========= 发送循环 =========
     async def _send_loop(self) -> None:
-        """后台发送循环：串行消费发送队列，统一执行连接写入。"""
+        """后台发送循环：串行消费发送队列，统一执行连接写入。
+
+        每轮会顺带取出队列中已就绪的后续消息，同一连接的连续消息合并为一次写入。
+        """
         if self._send_queue is None:
             raise RuntimeError("没有消息队列")
 
         while True:
             try:
-                conn, data, send_future = await self._send_queue.get()
+                items = [await self._send_queue.get()]
             except asyncio.CancelledError:
                 break
+            while len(items) < SEND_BATCH_MAX_FRAMES:
+                try:
+                    items.append(self._send_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
 
             try:
-                if conn.is_closed:
-                    raise RPCError(ErrorCode.E_PLUGIN_CRASHED, "Runner 未连接")
-                await conn.send_frame(data)
-                if not send_future.done():
-                    send_future.set_result(None)
+                start = 0
+                while start < len(items):
+                    end = start + 1
+                    while end < len(items) and items[end][0] is items[start][0]:
+                        end += 1
+                    await self._send_batch(items[start:end])
+                    start = end
             except asyncio.CancelledError:
-                if not send_future.done():
-                    send_future.set_exception(RPCError(ErrorCode.E_TIMEOUT, "服务器关闭"))
+                for _conn, _data, send_future in items:
+                    if not send_future.done():
+                        send_future.set_exception(RPCError(ErrorCode.E_TIMEOUT, "服务器关闭"))
                 raise
-            except Exception as e:
-                send_error = RPCError.from_exception(e, {ConnectionError: ErrorCode.E_PLUGIN_CRASHED})
+            finally:
+                for _ in items:
+                    self._send_queue.task_done()
+
+    async def _send_batch(self, items: List[Tuple[Connection, bytes, "asyncio.Future[None]"]]) -> None:
+        """把同一连接的若干条待发送消息一次写出，并回填各自的发送结果。"""
+        conn = items[0][0]
+        try:
+            if conn.is_closed:
+                raise RPCError(ErrorCode.E_PLUGIN_CRASHED, "Runner 未连接")
+            if len(items) == 1:
+                await conn.send_frame(items[0][1])
+            else:
+                await conn.send_frames([data for _conn, data, _future in items])
+            for _conn, _data, send_future in items:
+                if not send_future.done():
+                    send_future.set_result(None)
+        except Exception as e:
+            send_error = RPCError.from_exception(e, {ConnectionError: ErrorCode.E_PLUGIN_CRASHED})
+            for _conn, _data, send_future in items:
                 if not send_future.done():
                     send_future.set_exception(send_error)
-            finally:
-                self._send_queue.task_done()
 
     # ====== 发送循环方法 ======
     async def _handle_connection(self, conn: Connection) -> None:
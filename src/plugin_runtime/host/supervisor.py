@@ -7,6 +7,7 @@ import contextlib
 import json
 import os
 import sys
+import time
 
 from src.common.logger import get_logger
 from src.config.config import config_manager, global_config
@@ -20,7 +21,10 @@ from src.plugin_runtime import (
     ENV_HOST_VERSION,
     ENV_IPC_ADDRESS,
     ENV_PLUGIN_DIRS,
+    ENV_RUNNER_STANDBY,
     ENV_SESSION_TOKEN,
+    STANDBY_PROMOTE_COMMAND,
+    STANDBY_READY_SIGNAL,
 )
 from src.plugin_runtime.protocol.envelope import (
     BootstrapPluginPayload,
@@ -45,7 +49,7 @@ from src.plugin_runtime.protocol.envelope import (
     ValidatePluginConfigPayload,
     ValidatePluginConfigResultPayload,
 )
-from src.plugin_runtime.protocol.codec import MsgPackCodec
+from src.plugin_runtime.protocol.codec import EnvelopeValidationMode, MsgPackCodec
 from src.plugin_runtime.protocol.errors import ErrorCode, RPCError
 from src.plugin_runtime.transport.factory import create_transport_server
 
@@ -65,6 +69,8 @@ if TYPE_CHECKING:
 
 logger = get_logger("plugin_runtime.host.runner_manager")
 
+_STDOUT_DRAIN_CHUNK_SIZE = 64 * 1024
+
 
 @dataclass(slots=True)
 class _MessageGatewayRuntimeState:
@@ -93,6 +99,7 @@ class PluginRunnerSupervisor:
         health_check_interval_sec: Optional[float] = None,
         max_restart_attempts: Optional[int] = None,
         runner_spawn_timeout_sec: Optional[float] = None,
+        hot_standby_enabled: Optional[bool] = None,
     ) -> None:
         """初始化 Supervisor。
 
@@ -104,6 +111,7 @@ class PluginRunnerSupervisor:
             health_check_interval_sec: 健康检查间隔，单位秒。
             max_restart_attempts: 自动重启 Runner 的最大次数。
             runner_spawn_timeout_sec: 等待 Runner 建连并就绪的超时时间，单位秒。
+            hot_standby_enabled: 是否维护一个预先导入插件的热备 Runner；留空时读取配置。
         """
         runtime_config = global_config.plugin_runtime
         self._group_name: str = str(group_name or "third_party").strip() or "third_party"
@@ -111,6 +119,9 @@ class PluginRunnerSupervisor:
         self._health_interval: float = health_check_interval_sec or runtime_config.health_check_interval_sec or 30.0
         self._runner_spawn_timeout: float = runner_spawn_timeout_sec or runtime_config.runner_spawn_timeout_sec or 30.0
         self._max_restart_attempts: int = max_restart_attempts or runtime_config.max_restart_attempts or 3
+        self._hot_standby_enabled: bool = (
+            runtime_config.hot_standby_enabled if hot_standby_enabled is None else hot_standby_enabled
+        )
 
         self._transport = create_transport_server(socket_path=socket_path)
         self._authorization = AuthorizationManager()
@@ -125,7 +136,8 @@ class PluginRunnerSupervisor:
         self._message_gateway = MessageGateway(self._component_registry)
         self._log_bridge = RunnerLogBridge()
 
-        codec = MsgPackCodec()
+        # 信封头在解码时校验，payload 由各 RPC 方法按自身 Schema 校验
+        codec = MsgPackCodec(validation_mode=EnvelopeValidationMode.HEADER)
         self._rpc_server = RPCServer(transport=self._transport, codec=codec)
 
         self._runner_process: Optional[asyncio.subprocess.Process] = None
@@ -137,9 +149,19 @@ class PluginRunnerSupervisor:
         self._runner_ready_payloads: RunnerReadyPayload = RunnerReadyPayload()
         self._health_task: Optional[asyncio.Task[None]] = None
         self._stderr_drain_task: Optional[asyncio.Task[None]] = None
+        # 仅由热备提升而来的 Runner 持有 stdout 管道，需要持续排空，避免插件输出写满管道后阻塞进程
+        self._stdout_drain_task: Optional[asyncio.Task[None]] = None
         self._restart_count: int = 0
         self._running: bool = False
 
+        # 热备 Runner：已导入插件但尚未连接，当前 Runner 故障时被提升为活跃 Runner
+        self._standby_process: Optional[asyncio.subprocess.Process] = None
+        self._standby_stderr_task: Optional[asyncio.Task[None]] = None
+        self._standby_stdout_task: Optional[asyncio.Task[None]] = None
+        self._standby_warm: asyncio.Event = asyncio.Event()
+        self._standby_stale: bool = False
+        self._last_failover_ms: Optional[float] = None
+
         self._register_internal_methods()
 
     @property
@@ -194,11 +216,14 @@ class PluginRunnerSupervisor:
         Args:
             plugin_versions: 外部插件版本映射，键为插件 ID，值为插件版本。
         """
-        self._external_available_plugins = {
+        external_available_plugins = {
             str(plugin_id or "").strip(): str(plugin_version or "").strip()
             for plugin_id, plugin_version in plugin_versions.items()
             if str(plugin_id or "").strip() and str(plugin_version or "").strip()
         }
+        if external_available_plugins != self._external_available_plugins:
+            self._standby_stale = True
+        self._external_available_plugins = external_available_plugins
 
     def get_loaded_plugin_ids(self) -> List[str]:
         """返回当前 Supervisor 已注册的插件 ID 列表。"""
@@ -220,11 +245,14 @@ class PluginRunnerSupervisor:
             blocked_plugin_reasons: 需要拒绝加载的插件及原因映射。
         """
 
-        self._blocked_plugin_reasons = {
+        normalized_reasons = {
             str(plugin_id or "").strip(): str(reason or "").strip()
             for plugin_id, reason in blocked_plugin_reasons.items()
             if str(plugin_id or "").strip() and str(reason or "").strip()
         }
+        if normalized_reasons != self._blocked_plugin_reasons:
+            self._standby_stale = True
+        self._blocked_plugin_reasons = normalized_reasons
 
     @staticmethod
     def _normalize_reload_plugin_ids(plugin_ids: Optional[List[str] | str]) -> List[str]:
@@ -339,6 +367,7 @@ class PluginRunnerSupervisor:
             self._running = False
             raise
 
+        await self._ensure_standby_runner()
         self._health_task = asyncio.create_task(self._health_check_loop(), name="PluginRunnerSupervisor.health")
         logger.info("PluginRunnerSupervisor 已启动")
 
@@ -357,6 +386,7 @@ class PluginRunnerSupervisor:
 
         await self._event_dispatcher.stop()
         await self._hook_dispatcher.stop()
+        await self._discard_standby_runner()
         await self._shutdown_runner(reason="host_stop")
         await self._rpc_server.stop()
         self._clear_runner_state()
@@ -460,6 +490,8 @@ class PluginRunnerSupervisor:
         Returns:
             bool: 是否重载成功。
         """
+        # 插件代码可能已变更，热备 Runner 导入的是旧模块
+        self._standby_stale = True
         try:
             response = await self._rpc_server.send_request(
                 "plugin.reload",
@@ -509,6 +541,7 @@ class PluginRunnerSupervisor:
                 external_available_plugins=external_available_plugins,
             )
 
+        self._standby_stale = True
         try:
             response = await self._rpc_server.send_request(
                 "plugin.reload_batch",
@@ -693,6 +726,11 @@ class PluginRunnerSupervisor:
         except asyncio.TimeoutError as exc:
             raise TimeoutError(f"等待 Runner 连接超时（{timeout_sec}s）") from exc
 
+    async def _wait_for_runner_disconnection(self) -> None:
+        """轮询等待 RPC Server 回收当前 Runner 连接。"""
+        while self._rpc_server.is_connected:
+            await asyncio.sleep(0.01)
+
     async def _wait_for_runner_ready(self, timeout_sec: float = 30.0) -> RunnerReadyPayload:
         """等待 Runner 完成启动初始化。
 
@@ -1307,6 +1345,12 @@ class PluginRunnerSupervisor:
 
         self._runner_ready_payloads = payload
         self._runner_ready_events.set()
+        if payload.activation_ms:
+            slowest = sorted(payload.activation_ms.items(), key=lambda item: item[1], reverse=True)[:5]
+            logger.debug(
+                f"Runner 插件激活耗时（最慢 {len(slowest)} 个）: "
+                + ", ".join(f"{plugin_id}={elapsed:.0f}ms" for plugin_id, elapsed in slowest)
+            )
         return envelope.make_response(payload={"accepted": True})
 
     def _build_runner_environment(self) -> Dict[str, str]:
@@ -1334,26 +1378,172 @@ class PluginRunnerSupervisor:
             return
 
         self._clear_runner_state()
+        self._runner_process = await self._create_runner_process()
 
+        if self._runner_process.stderr is not None:
+            self._stderr_drain_task = asyncio.create_task(
+                self._drain_runner_stderr(self._runner_process.stderr),
+                name="PluginRunnerSupervisor.stderr",
+            )
+
+        logger.info(f"Runner 已拉起，pid={self._runner_process.pid}")
+
+    async def _create_runner_process(self, standby: bool = False) -> asyncio.subprocess.Process:
+        """创建 Runner 子进程。
+
+        Args:
+            standby: 是否以热备模式启动；热备 Runner 通过 stdin/stdout 与 Host 交换控制消息。
+
+        Returns:
+            asyncio.subprocess.Process: 新建的子进程。
+        """
         env = os.environ.copy()
         env.update(self._build_runner_environment())
+        if standby:
+            env[ENV_RUNNER_STANDBY] = "1"
 
-        self._runner_process = await asyncio.create_subprocess_exec(
+        return await asyncio.create_subprocess_exec(
             sys.executable,
             "-m",
             "src.plugin_runtime.runner.runner_main",
             env=env,
-            stdout=asyncio.subprocess.DEVNULL,
+            stdin=asyncio.subprocess.PIPE if standby else None,
+            stdout=asyncio.subprocess.PIPE if standby else asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
 
-        if self._runner_process.stderr is not None:
-            self._stderr_drain_task = asyncio.create_task(
-                self._drain_runner_stderr(self._runner_process.stderr),
-                name="PluginRunnerSupervisor.stderr",
+    async def _ensure_standby_runner(self) -> None:
+        """在启用热备时保证存在一个可用的热备 Runner。
+
+        热备进程已退出或因插件重载、依赖变化而过期时，会被替换为新的热备进程。
+        """
+        if not self._hot_standby_enabled or not self._running:
+            return
+        process = self._standby_process
+        if process is not None and process.returncode is None and not self._standby_stale:
+            return
+
+        await self._discard_standby_runner()
+        self._standby_stale = False
+        self._standby_warm = asyncio.Event()
+        try:
+            process = await self._create_runner_process(standby=True)
+        except Exception as exc:
+            logger.warning(f"拉起热备 Runner 失败: {exc}")
+            return
+
+        self._standby_process = process
+        if process.stderr is not None:
+            self._standby_stderr_task = asyncio.create_task(
+                self._drain_runner_stderr(process.stderr),
+                name="PluginRunnerSupervisor.standby_stderr",
+            )
+        if process.stdout is not None:
+            self._standby_stdout_task = asyncio.create_task(
+                self._drain_standby_stdout(process.stdout, self._standby_warm),
+                name="PluginRunnerSupervisor.standby_stdout",
             )
+        logger.info(f"热备 Runner 已拉起，pid={process.pid}")
 
-        logger.info(f"Runner 已拉起，pid={self._runner_process.pid}")
+    @staticmethod
+    async def _drain_standby_stdout(stream: asyncio.StreamReader, warm_event: asyncio.Event) -> None:
+        """排空热备 Runner 的 stdout，并在收到就绪信号时标记热备已预热。
+
+        热备被提升为活跃 Runner 后继续排空，直到进程退出或任务被取消。
+
+        Args:
+            stream: 热备 Runner 的 stdout 流。
+            warm_event: 预热完成事件。
+        """
+        # 按块读取而不是按行读取：插件输出可能是不含换行的超长内容，readline 会因超出缓冲上限而抛错退出
+        pending = b""
+        with contextlib.suppress(Exception):
+            while chunk := await stream.read(_STDOUT_DRAIN_CHUNK_SIZE):
+                if warm_event.is_set():
+                    continue
+                *lines, pending = (pending + chunk).split(b"\n")
+                if any(line.decode("utf-8", errors="replace").strip() == STANDBY_READY_SIGNAL for line in lines):
+                    warm_event.set()
+                pending = pending[-_STDOUT_DRAIN_CHUNK_SIZE:]
+
+    async def _discard_standby_runner(self) -> None:
+        """关闭当前热备 Runner（若存在）。"""
+        process, self._standby_process = self._standby_process, None
+        stderr_task, self._standby_stderr_task = self._standby_stderr_task, None
+        stdout_task, self._standby_stdout_task = self._standby_stdout_task, None
+
+        if process is not None and process.returncode is None:
+            # 关闭控制通道后热备 Runner 会自行退出，超时再强制结束
+            if process.stdin is not None:
+                with contextlib.suppress(Exception):
+                    process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                process.kill()
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(process.wait(), timeout=5.0)
+
+        for task in (stderr_task, stdout_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    async def _failover_to_standby(self, reason: str) -> bool:
+        """将热备 Runner 提升为活跃 Runner。
+
+        停机窗口只包含旧 Runner 的清理、热备 Runner 的握手与插件注册回放，
+        不再包含插件发现与模块导入。
+
+        Args:
+            reason: 触发故障转移的原因。
+
+        Returns:
+            bool: 是否接管成功；失败时调用方应回退为冷启动。
+        """
+        process = self._standby_process
+        if (
+            process is None
+            or process.returncode is not None
+            or process.stdin is None
+            or self._standby_stale
+        ):
+            await self._discard_standby_runner()
+            return False
+
+        if not self._standby_warm.is_set():
+            logger.warning("热备 Runner 尚未完成插件导入，接管需等待其预热完成")
+        self._standby_process = None
+        stderr_task, self._standby_stderr_task = self._standby_stderr_task, None
+        stdout_task, self._standby_stdout_task = self._standby_stdout_task, None
+        started_at = time.perf_counter()
+
+        # 旧 Runner 已被判定为故障，不再等待其响应关停 RPC
+        await self._shutdown_runner(reason=reason, graceful=False)
+        self._runner_process = process
+        self._stderr_drain_task = stderr_task
+        self._stdout_drain_task = stdout_task
+
+        try:
+            # 等待旧连接被 RPC Server 回收，否则热备 Runner 的握手会因已有活跃连接而被拒绝
+            await asyncio.wait_for(self._wait_for_runner_disconnection(), timeout=self._runner_spawn_timeout)
+            command = {
+                "command": STANDBY_PROMOTE_COMMAND,
+                "global_config_snapshot": self._build_runner_environment()[ENV_GLOBAL_CONFIG_SNAPSHOT],
+            }
+            process.stdin.write(f"{json.dumps(command, ensure_ascii=False)}\n".encode("utf-8"))
+            await process.stdin.drain()
+            await self._wait_for_runner_connection(timeout_sec=self._runner_spawn_timeout)
+            await self._wait_for_runner_ready(timeout_sec=self._runner_spawn_timeout)
+        except Exception as exc:
+            logger.warning(f"热备 Runner 接管失败，回退为冷启动: {exc}")
+            await self._shutdown_runner(reason="standby_promote_failed", graceful=False)
+            return False
+
+        self._last_failover_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(f"热备 Runner 已接管，pid={process.pid}，停机窗口 {self._last_failover_ms:.0f}ms")
+        return True
 
     async def _drain_runner_stderr(self, stream: asyncio.StreamReader) -> None:
         """持续排空 Runner 的 stderr。
@@ -1373,11 +1563,12 @@ class PluginRunnerSupervisor:
         except Exception as exc:
             logger.warning(f"排空 Runner stderr 失败: {exc}")
 
-    async def _shutdown_runner(self, reason: str = "normal") -> None:
-        """优雅关闭 Runner 子进程。
+    async def _shutdown_runner(self, reason: str = "normal", graceful: bool = True) -> None:
+        """关闭 Runner 子进程。
 
         Args:
             reason: 关停原因。
+            graceful: 是否先通过 RPC 通知 Runner 关停并等待其自行退出；为 ``False`` 时直接结束进程。
         """
         process = self._runner_process
         if process is None:
@@ -1385,6 +1576,11 @@ class PluginRunnerSupervisor:
 
         payload = ShutdownPayload(reason=reason)
 
+        if not graceful and process.returncode is None:
+            process.kill()
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(process.wait(), timeout=5.0)
+
         if process.returncode is None and self._rpc_server.is_connected:
             with contextlib.suppress(Exception):
                 await self._rpc_server.send_request(
@@ -1415,11 +1611,13 @@ class PluginRunnerSupervisor:
 
         self._runner_process = None
 
-        if self._stderr_drain_task is not None:
-            self._stderr_drain_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._stderr_drain_task
-            self._stderr_drain_task = None
+        for drain_task in (self._stderr_drain_task, self._stdout_drain_task):
+            if drain_task is not None:
+                drain_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await drain_task
+        self._stderr_drain_task = None
+        self._stdout_drain_task = None
 
         for plugin_id in list(self._message_gateway_states.keys()):
             await self._unregister_all_message_gateway_drivers_for_plugin(plugin_id)
@@ -1460,6 +1658,8 @@ class PluginRunnerSupervisor:
                 restarted = await self._restart_runner(reason="health_check_failed")
                 if not restarted:
                     return
+            else:
+                await self._ensure_standby_runner()
 
     async def _restart_runner(self, reason: str) -> bool:
         """在 Runner 异常时执行整进程级重启。
@@ -1480,6 +1680,11 @@ class PluginRunnerSupervisor:
         self._restart_count += 1
         logger.warning(f"准备重启 Runner，第 {self._restart_count} 次，reason={reason}")
 
+        if await self._failover_to_standby(reason):
+            self._restart_count = 0
+            await self._ensure_standby_runner()
+            return True
+
         await self._shutdown_runner(reason=reason)
 
         try:
@@ -1493,6 +1698,7 @@ class PluginRunnerSupervisor:
 
         self._restart_count = 0
         logger.info("Runner 已成功重启")
+        await self._ensure_standby_runner()
         return True
 
     def _clear_runner_state(self) -> None:
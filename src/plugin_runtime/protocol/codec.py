@@ -1,6 +1,7 @@
 """MsgPack 编解码器"""
 
 from abc import ABC, abstractmethod
+from enum import Enum
 from typing import Any, Dict
 
 import msgpack
@@ -8,6 +9,16 @@ import msgpack
 from .envelope import Envelope
 
 
+class EnvelopeValidationMode(str, Enum):
+    """信封编解码时的校验模式。"""
+
+    FULL = "full"
+    """编码时经 ``model_dump()`` 完整序列化整个信封。"""
+
+    HEADER = "header"
+    """只处理信封头，``payload`` 原样打包，由各 RPC 方法按自身 Schema 校验。"""
+
+
 class Codec(ABC):
     """消息编解码器基类"""
 
@@ -25,7 +36,23 @@ class Codec(ABC):
 
 
 class MsgPackCodec(Codec):
-    """MsgPack 编解码器"""
+    """MsgPack 编解码器
+
+    ``HEADER`` 模式用于高频的 Hook / 事件流量：编码时直接打包信封字段，跳过
+    ``model_dump()`` 对整个 payload 的递归复制；payload 中存在 MsgPack 无法直接
+    打包的对象时自动回退到完整序列化，因此两种模式产出的字节一致。
+
+    解码时两种模式都执行 ``Envelope.model_validate``：``payload`` 声明为
+    ``Dict[str, Any]``，校验只覆盖信封头与 payload 顶层键，不会递归进入载荷，
+    各 RPC 方法再按自身的 payload Schema 校验。
+    """
+
+    def __init__(self, validation_mode: EnvelopeValidationMode = EnvelopeValidationMode.FULL) -> None:
+        self._validation_mode = EnvelopeValidationMode(validation_mode)
+
+    @property
+    def validation_mode(self) -> EnvelopeValidationMode:
+        return self._validation_mode
 
     def encode(self, obj: Dict[str, Any]) -> bytes:
         result = msgpack.packb(obj, use_bin_type=True)
@@ -40,8 +67,25 @@ class MsgPackCodec(Codec):
         return result
 
     def encode_envelope(self, envelope: Envelope) -> bytes:
+        if self._validation_mode == EnvelopeValidationMode.HEADER:
+            try:
+                return self.encode(
+                    {
+                        "protocol_version": envelope.protocol_version,
+                        "request_id": envelope.request_id,
+                        "message_type": envelope.message_type,
+                        "method": envelope.method,
+                        "plugin_id": envelope.plugin_id,
+                        "timestamp_ms": envelope.timestamp_ms,
+                        "timeout_ms": envelope.timeout_ms,
+                        "payload": envelope.payload,
+                        "error": envelope.error,
+                    }
+                )
+            except TypeError:
+                # payload 中含有 Pydantic 模型等 MsgPack 无法直接打包的对象
+                pass
         return self.encode(envelope.model_dump())
 
     def decode_envelope(self, data: bytes) -> Envelope:
-        raw = self.decode(data)
-        return Envelope.model_validate(raw)
+        return Envelope.model_validate(self.decode(data))
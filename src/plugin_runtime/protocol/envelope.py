@@ -294,6 +294,8 @@ class RunnerReadyPayload(BaseModel):
     """初始化失败的插件列表"""
     inactive_plugins: List[str] = Field(default_factory=list, description="当前因禁用或依赖不可用而未激活的插件列表")
     """当前因禁用或依赖不可用而未激活的插件列表"""
+    activation_ms: Dict[str, float] = Field(default_factory=dict, description="各插件激活耗时（毫秒）")
+    """各插件激活耗时（毫秒）"""
 
 
 # ====== 配置更新 ======
@@ -24,6 +24,7 @@ import os
 import signal
 import sys
 import time
+import threading
 import tomllib
 
 import tomlkit
@@ -33,10 +34,14 @@ from src.config.config_utils import compare_versions
 from src.plugin_runtime import (
     ENV_BLOCKED_PLUGIN_REASONS,
     ENV_EXTERNAL_PLUGIN_IDS,
+    ENV_GLOBAL_CONFIG_SNAPSHOT,
     ENV_HOST_VERSION,
     ENV_IPC_ADDRESS,
     ENV_PLUGIN_DIRS,
+    ENV_RUNNER_STANDBY,
     ENV_SESSION_TOKEN,
+    STANDBY_PROMOTE_COMMAND,
+    STANDBY_READY_SIGNAL,
 )
 from src.plugin_runtime.protocol.envelope import (
     BootstrapPluginPayload,
@@ -58,13 +63,23 @@ from src.plugin_runtime.protocol.envelope import (
     ValidatePluginConfigPayload,
     ValidatePluginConfigResultPayload,
 )
+from src.plugin_runtime.protocol.codec import EnvelopeValidationMode, MsgPackCodec
 from src.plugin_runtime.protocol.errors import ErrorCode
 from src.plugin_runtime.runner.log_handler import RunnerIPCLogHandler
 from src.plugin_runtime.runner.plugin_loader import PluginCandidate, PluginLoader, PluginMeta
 from src.plugin_runtime.runner.rpc_client import RPCClient
+from src.plugin_runtime.runner.sync_executor import (
+    DEFAULT_SYNC_HANDLER_MAX_WORKERS,
+    DEFAULT_SYNC_HANDLER_PER_PLUGIN_LIMIT,
+    DEFAULT_SYNC_HANDLER_TIMEOUT_SEC,
+    SyncHandlerExecutor,
+)
 
 logger = get_logger("plugin_runtime.runner.main")
 
+_MAX_CONCURRENT_PLUGIN_ACTIVATIONS = 8
+"""启动时同一波内同时执行激活流程的插件数量上限"""
+
 _PLUGIN_ALLOWED_RAW_HOST_METHODS = frozenset(
     {
         "cap.call",
@@ -316,6 +331,10 @@ class PluginRunner:
         plugin_dirs: List[str],
         external_available_plugins: Optional[Dict[str, str]] = None,
         blocked_plugin_reasons: Optional[Dict[str, str]] = None,
+        sync_handler_max_workers: int = DEFAULT_SYNC_HANDLER_MAX_WORKERS,
+        sync_handler_per_plugin_limit: int = DEFAULT_SYNC_HANDLER_PER_PLUGIN_LIMIT,
+        sync_handler_timeout_sec: float = DEFAULT_SYNC_HANDLER_TIMEOUT_SEC,
+        standby: bool = False,
     ) -> None:
         """初始化 Runner。
 
@@ -325,6 +344,10 @@ class PluginRunner:
             plugin_dirs: 当前 Runner 负责扫描的插件目录列表。
             external_available_plugins: 视为已满足的外部依赖插件版本映射。
             blocked_plugin_reasons: 需要拒绝加载的插件及原因映射。
+            sync_handler_max_workers: 执行同步插件处理器的线程池大小。
+            sync_handler_per_plugin_limit: 单个插件可同时占用的同步处理器线程数。
+            sync_handler_timeout_sec: 单次同步处理器调用的超时时间（秒）。
+            standby: 是否以热备模式启动。
         """
         self._host_address: str = host_address
         self._session_token: str = session_token
@@ -340,12 +363,22 @@ class PluginRunner:
             if str(plugin_id or "").strip() and str(reason or "").strip()
         }
 
-        self._rpc_client: RPCClient = RPCClient(host_address, session_token)
+        self._rpc_client: RPCClient = RPCClient(
+            host_address,
+            session_token,
+            codec=MsgPackCodec(validation_mode=EnvelopeValidationMode.HEADER),
+        )
         self._loader: PluginLoader = PluginLoader(host_version=os.getenv(ENV_HOST_VERSION, ""))
         self._loader.set_blocked_plugin_reasons(self._blocked_plugin_reasons)
         self._start_time: float = time.monotonic()
         self._shutting_down: bool = False
         self._reload_lock: asyncio.Lock = asyncio.Lock()
+        self._standby: bool = standby
+        self._sync_executor: SyncHandlerExecutor = SyncHandlerExecutor(
+            max_workers=sync_handler_max_workers,
+            per_plugin_limit=sync_handler_per_plugin_limit,
+            default_timeout_sec=sync_handler_timeout_sec,
+        )
 
         # IPC 日志 Handler：握手成功后安装，将所有 stdlib logging 转发到 Host
         self._log_handler: Optional[RunnerIPCLogHandler] = None
@@ -353,6 +386,15 @@ class PluginRunner:
 
     async def run(self) -> None:
         """运行 Runner 主循环。"""
+        plugins: Optional[List[PluginMeta]] = None
+        if self._standby:
+            # 热备模式：先完成最耗时的插件发现与导入，再等待 Host 下发接管指令
+            plugins = self._discover_plugins()
+            if not await self._wait_for_standby_promotion():
+                logger.info("热备 Runner 未被接管，直接退出")
+                return
+            self._refresh_sync_executor()
+
         # 1. 连接 Host
         logger.info(f"Runner 启动，连接 Host: {self._host_address}")
         ok = await self._rpc_client.connect_and_handshake()
@@ -367,51 +409,21 @@ class PluginRunner:
         self._register_handlers()
 
         # 3. 加载插件
-        plugins = self._loader.discover_and_load(
-            self._plugin_dirs,
-            extra_available=self._external_available_plugins,
-        )
+        if plugins is None:
+            plugins = self._discover_plugins()
         logger.info(f"已加载 {len(plugins)} 个插件")
 
-        # 4. 注入 PluginContext + 调用 on_load 生命周期钩子
+        # 4. 注入 PluginContext + 调用 on_load 生命周期钩子（按依赖分波并发激活）
         failed_plugins: Set[str] = set(self._loader.failed_plugins.keys())
         inactive_plugins: Set[str] = set()
-        available_plugin_versions: Dict[str, str] = dict(self._external_available_plugins)
-        for meta in plugins:
-            unsatisfied_dependencies = [
-                dependency.id
-                for dependency in meta.manifest.plugin_dependencies
-                if dependency.id not in available_plugin_versions
-                or not self._loader.manifest_validator.is_plugin_dependency_satisfied(
-                    dependency,
-                    available_plugin_versions[dependency.id],
-                )
-            ]
-            if unsatisfied_dependencies:
-                if any(dependency_id in inactive_plugins for dependency_id in unsatisfied_dependencies):
-                    logger.info(
-                        f"插件 {meta.plugin_id} 依赖的插件当前未激活，跳过本次启动: {', '.join(unsatisfied_dependencies)}"
-                    )
-                    inactive_plugins.add(meta.plugin_id)
-                    continue
-                failed_plugins.add(meta.plugin_id)
-                continue
-
-            activation_status = await self._activate_plugin(meta)
-            if activation_status == PluginActivationStatus.LOADED:
-                available_plugin_versions[meta.plugin_id] = meta.version
-                continue
-            if activation_status == PluginActivationStatus.INACTIVE:
-                inactive_plugins.add(meta.plugin_id)
-                continue
-            failed_plugins.add(meta.plugin_id)
+        activation_ms = await self._activate_plugins_in_waves(plugins, failed_plugins, inactive_plugins)
 
         successful_plugins = [
             meta.plugin_id
             for meta in plugins
             if meta.plugin_id not in failed_plugins and meta.plugin_id not in inactive_plugins
         ]
-        await self._notify_ready(successful_plugins, sorted(failed_plugins), sorted(inactive_plugins))
+        await self._notify_ready(successful_plugins, sorted(failed_plugins), sorted(inactive_plugins), activation_ms)
 
         # 5. 等待直到收到关停信号
         with contextlib.suppress(asyncio.CancelledError):
@@ -420,10 +432,75 @@ class PluginRunner:
 
         # 6. 卸载 IPC 日志 Handler 并刷空剩余缓冲，然后断开连接
         logger.info("Runner 开始关停")
+        self._sync_executor.shutdown()
         await self._uninstall_log_handler()
         await self._rpc_client.disconnect()
         logger.info("Runner 已退出")
 
+    def _discover_plugins(self) -> List[PluginMeta]:
+        """发现并导入当前 Runner 负责的全部插件。
+
+        Returns:
+            List[PluginMeta]: 按依赖拓扑排序的插件元数据列表。
+        """
+        return self._loader.discover_and_load(
+            self._plugin_dirs,
+            extra_available=self._external_available_plugins,
+        )
+
+    def _refresh_sync_executor(self) -> None:
+        """按接管指令携带的最新配置快照重建同步处理器执行器。
+
+        热备 Runner 启动时的配置快照可能已经过期；接管前尚未执行过任何同步处理器，直接替换即可。
+        """
+        options = _load_sync_handler_options(os.environ.get(ENV_GLOBAL_CONFIG_SNAPSHOT, ""))
+        self._sync_executor.shutdown()
+        self._sync_executor = SyncHandlerExecutor(
+            max_workers=options.get("sync_handler_max_workers", DEFAULT_SYNC_HANDLER_MAX_WORKERS),
+            per_plugin_limit=options.get("sync_handler_per_plugin_limit", DEFAULT_SYNC_HANDLER_PER_PLUGIN_LIMIT),
+            default_timeout_sec=options.get("sync_handler_timeout_sec", DEFAULT_SYNC_HANDLER_TIMEOUT_SEC),
+        )
+
+    async def _wait_for_standby_promotion(self) -> bool:
+        """热备模式下通知 Host 已就绪，并等待 stdin 上的接管指令。
+
+        接管指令为一行 JSON，可携带最新的全局配置快照，用于覆盖启动时注入的旧快照。
+
+        Returns:
+            bool: 收到接管指令时返回 ``True``；控制通道关闭或 Runner 被要求关停时返回 ``False``。
+        """
+        sys.stdout.write(f"{STANDBY_READY_SIGNAL}\n")
+        sys.stdout.flush()
+
+        loop = asyncio.get_running_loop()
+        while not self._shutting_down:
+            line_future: asyncio.Future[str] = loop.create_future()
+
+            def _read_line(future: "asyncio.Future[str]" = line_future) -> None:
+                line = sys.stdin.readline()
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+
+            # 使用守护线程读取 stdin，避免阻塞的读取拖住进程退出
+            threading.Thread(target=_read_line, name="runner-standby-control", daemon=True).start()
+            while not line_future.done() and not self._shutting_down:
+                await asyncio.wait({line_future}, timeout=1.0)
+            if not line_future.done():
+                return False
+
+            line = line_future.result()
+            if not line:
+                return False
+            try:
+                command = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(command, dict) or command.get("command") != STANDBY_PROMOTE_COMMAND:
+                continue
+            if snapshot := command.get("global_config_snapshot"):
+                os.environ[ENV_GLOBAL_CONFIG_SNAPSHOT] = str(snapshot)
+            return True
+        return False
+
     def _install_log_handler(self) -> None:
         """握手完成后将 RunnerIPCLogHandler 安装到 logging.root。
 
@@ -1150,6 +1227,101 @@ class PluginRunner:
         except Exception as exc:
             logger.error(f"插件 {meta.plugin_id} on_unload 失败: {exc}", exc_info=True)
 
+    async def _activate_plugins_in_waves(
+        self,
+        plugins: List[PluginMeta],
+        failed_plugins: Set[str],
+        inactive_plugins: Set[str],
+    ) -> Dict[str, float]:
+        """按依赖关系分波激活插件。
+
+        同一波内的插件所依赖的插件均已完成激活（或已确定失败/未激活），彼此之间没有依赖，
+        因此并发执行配置加载、Host 注册与 ``on_load``；单个插件失败不影响同波其他插件，
+        只会让依赖它的插件在后续波次中被判定为依赖不满足。
+
+        Args:
+            plugins: 已按依赖拓扑排序的待激活插件列表。
+            failed_plugins: 激活失败的插件集合，会被原地更新。
+            inactive_plugins: 未激活的插件集合，会被原地更新。
+
+        Returns:
+            Dict[str, float]: 实际执行了激活流程的插件及其耗时（毫秒）。
+        """
+        available_plugin_versions: Dict[str, str] = dict(self._external_available_plugins)
+        activation_ms: Dict[str, float] = {}
+        pending: List[PluginMeta] = list(plugins)
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PLUGIN_ACTIVATIONS)
+
+        async def _timed_activate(meta: PluginMeta) -> PluginActivationStatus:
+            async with semaphore:
+                started_at = time.perf_counter()
+                try:
+                    return await self._activate_plugin(meta)
+                except Exception as exc:
+                    logger.error(f"插件 {meta.plugin_id} 激活过程出现未处理异常: {exc}", exc_info=True)
+                    return PluginActivationStatus.FAILED
+                finally:
+                    activation_ms[meta.plugin_id] = round((time.perf_counter() - started_at) * 1000, 3)
+
+        wave_index = 0
+        started_at = time.perf_counter()
+        while pending:
+            pending_ids = {meta.plugin_id for meta in pending}
+            wave = [
+                meta
+                for meta in pending
+                if not any(dependency.id in pending_ids for dependency in meta.manifest.plugin_dependencies)
+            ]
+            if not wave:
+                # 拓扑排序后不应出现环，兜底按原顺序推进，避免死循环
+                wave = pending[:1]
+            wave_ids = {meta.plugin_id for meta in wave}
+            pending = [meta for meta in pending if meta.plugin_id not in wave_ids]
+
+            ready_plugins: List[PluginMeta] = []
+            for meta in wave:
+                unsatisfied_dependencies = [
+                    dependency.id
+                    for dependency in meta.manifest.plugin_dependencies
+                    if dependency.id not in available_plugin_versions
+                    or not self._loader.manifest_validator.is_plugin_dependency_satisfied(
+                        dependency,
+                        available_plugin_versions[dependency.id],
+                    )
+                ]
+                if not unsatisfied_dependencies:
+                    ready_plugins.append(meta)
+                    continue
+                if any(dependency_id in inactive_plugins for dependency_id in unsatisfied_dependencies):
+                    logger.info(
+                        f"插件 {meta.plugin_id} 依赖的插件当前未激活，跳过本次启动: {', '.join(unsatisfied_dependencies)}"
+                    )
+                    inactive_plugins.add(meta.plugin_id)
+                    continue
+                failed_plugins.add(meta.plugin_id)
+
+            wave_index += 1
+            if not ready_plugins:
+                continue
+            logger.debug(f"第 {wave_index} 波并发激活 {len(ready_plugins)} 个插件")
+            statuses = await asyncio.gather(*(_timed_activate(meta) for meta in ready_plugins))
+            for meta, activation_status in zip(ready_plugins, statuses, strict=True):
+                if activation_status == PluginActivationStatus.LOADED:
+                    available_plugin_versions[meta.plugin_id] = meta.version
+                elif activation_status == PluginActivationStatus.INACTIVE:
+                    inactive_plugins.add(meta.plugin_id)
+                else:
+                    failed_plugins.add(meta.plugin_id)
+
+        if activation_ms:
+            slowest = sorted(activation_ms.items(), key=lambda item: item[1], reverse=True)[:5]
+            logger.info(
+                f"插件激活完成: {len(activation_ms)} 个插件，{wave_index} 波，"
+                f"总耗时 {(time.perf_counter() - started_at) * 1000:.0f}ms；"
+                f"最慢: {', '.join(f'{plugin_id}({elapsed:.0f}ms)' for plugin_id, elapsed in slowest)}"
+            )
+        return activation_ms
+
     async def _activate_plugin(self, meta: PluginMeta) -> PluginActivationStatus:
         """完成插件注入、授权、生命周期和组件注册。
 
@@ -1562,6 +1734,7 @@ class PluginRunner:
         loaded_plugins: List[str],
         failed_plugins: List[str],
         inactive_plugins: List[str],
+        activation_ms: Optional[Dict[str, float]] = None,
     ) -> None:
         """通知 Host 当前 Runner 已完成插件初始化。
 
@@ -1569,11 +1742,13 @@ class PluginRunner:
             loaded_plugins: 成功初始化的插件列表。
             failed_plugins: 初始化失败的插件列表。
             inactive_plugins: 因禁用或依赖不可用而未激活的插件列表。
+            activation_ms: 各插件激活耗时（毫秒）。
         """
         payload = RunnerReadyPayload(
             loaded_plugins=loaded_plugins,
             failed_plugins=failed_plugins,
             inactive_plugins=inactive_plugins,
+            activation_ms=activation_ms or {},
         )
         await self._rpc_client.send_request(
             "runner.ready",
@@ -1581,6 +1756,37 @@ class PluginRunner:
             timeout_ms=10000,
         )
 
+    async def _call_component_handler(
+        self,
+        envelope: Envelope,
+        handler_method: Callable[..., Any],
+        args: Dict[str, Any],
+    ) -> Any:
+        """调用插件组件处理函数。
+
+        协程函数直接在事件循环上等待；同步函数交给线程池执行，避免阻塞其他插件的
+        RPC 通信与健康检查，并受单插件并发配额和调用超时约束。
+
+        Args:
+            envelope: RPC 请求信封，用于确定所属插件与请求超时。
+            handler_method: 组件处理函数。
+            args: 调用参数。
+
+        Returns:
+            Any: 处理函数的返回值。
+        """
+        if inspect.iscoroutinefunction(handler_method):
+            return await handler_method(**args)
+        result = await self._sync_executor.run(
+            envelope.plugin_id,
+            handler_method,
+            args,
+            timeout=self._sync_executor.resolve_timeout(envelope.timeout_ms),
+        )
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
     async def _handle_invoke(self, envelope: Envelope) -> Envelope:
         """处理组件调用请求"""
         try:
@@ -1617,11 +1823,7 @@ class PluginRunner:
             )
 
         try:
-            result = (
-                await handler_method(**invoke.args)
-                if inspect.iscoroutinefunction(handler_method)
-                else handler_method(**invoke.args)
-            )
+            result = await self._call_component_handler(envelope, handler_method, invoke.args)
             resp_payload = InvokeResultPayload(success=True, result=result)
             return envelope.make_response(payload=resp_payload.model_dump())
         except Exception as e:
@@ -1659,11 +1861,7 @@ class PluginRunner:
             )
 
         try:
-            raw = (
-                await handler_method(**invoke.args)
-                if inspect.iscoroutinefunction(handler_method)
-                else handler_method(**invoke.args)
-            )
+            raw = await self._call_component_handler(envelope, handler_method, invoke.args)
 
             # 规范化返回值：将 EventHandler 返回展平到 payload 顶层
             if raw is None:
@@ -1717,11 +1915,7 @@ class PluginRunner:
             )
 
         try:
-            raw = (
-                await handler_method(**invoke.args)
-                if inspect.iscoroutinefunction(handler_method)
-                else handler_method(**invoke.args)
-            )
+            raw = await self._call_component_handler(envelope, handler_method, invoke.args)
         except Exception as exc:
             logger.error(f"插件 {plugin_id} hook_handler {component_name} 执行异常: {exc}", exc_info=True)
             return envelope.make_response(
@@ -1941,6 +2135,30 @@ class PluginRunner:
 # ─── 进程入口 ──────────────────────────────────────────────
 
 
+def _load_sync_handler_options(global_config_snapshot_raw: str) -> Dict[str, Any]:
+    """从 Host 注入的全局配置快照中读取同步处理器执行参数。
+
+    Args:
+        global_config_snapshot_raw: 全局配置快照 JSON 字符串。
+
+    Returns:
+        Dict[str, Any]: 可直接传给 ``PluginRunner`` 的关键字参数，缺失的项使用默认值。
+    """
+    try:
+        snapshot = json.loads(global_config_snapshot_raw) if global_config_snapshot_raw else {}
+    except json.JSONDecodeError:
+        logger.warning("解析全局配置快照失败，同步处理器使用默认参数")
+        return {}
+    runtime_config = snapshot.get("plugin_runtime") if isinstance(snapshot, dict) else None
+    if not isinstance(runtime_config, dict):
+        return {}
+    return {
+        key: runtime_config[key]
+        for key in ("sync_handler_max_workers", "sync_handler_per_plugin_limit", "sync_handler_timeout_sec")
+        if isinstance(runtime_config.get(key), (int, float))
+    }
+
+
 async def _async_main() -> None:
     """异步主入口"""
     blocked_plugin_reasons_raw = os.environ.get(ENV_BLOCKED_PLUGIN_REASONS, "")
@@ -1973,6 +2191,7 @@ async def _async_main() -> None:
         blocked_plugin_reasons = {}
 
     runner_kwargs: Dict[str, Any] = {
+        **_load_sync_handler_options(os.environ.get(ENV_GLOBAL_CONFIG_SNAPSHOT, "")),
         "external_available_plugins": {
             str(plugin_id): str(plugin_version) for plugin_id, plugin_version in external_plugin_ids.items()
         }
@@ -1982,6 +2201,9 @@ async def _async_main() -> None:
             str(plugin_id): str(reason) for plugin_id, reason in blocked_plugin_reasons.items()
         }
 
+    if os.environ.get(ENV_RUNNER_STANDBY, "") == "1":
+        runner_kwargs["standby"] = True
+
     runner = PluginRunner(
         host_address,
         session_token,
@@ -0,0 +1,156 @@
+"""同步插件处理器执行器
+
+插件组件的处理函数若不是协程函数，直接在 Runner 事件循环上调用会阻塞所有插件的
+RPC 通信、健康检查与日志转发。本模块将这类调用转交到有界线程池执行：
+
+- 线程池大小限制 Runner 内同时运行的同步处理器总数；
+- 每个插件拥有独立的并发配额，配额在线程真正结束时才归还，
+  超时仍未返回的调用会持续占用该插件自己的配额，而不会挤占其他插件；
+- 每次调用都有超时上限，超时后立即向调用方返回错误。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import asyncio
+import contextvars
+import functools
+import os
+
+DEFAULT_SYNC_HANDLER_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+DEFAULT_SYNC_HANDLER_PER_PLUGIN_LIMIT = 2
+DEFAULT_SYNC_HANDLER_TIMEOUT_SEC = 30.0
+
+
+class SyncHandlerTimeoutError(TimeoutError):
+    """同步处理器在超时时间内未能开始或完成执行。"""
+
+
+class SyncHandlerExecutor:
+    """在有界线程池中执行同步插件处理器。"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SYNC_HANDLER_MAX_WORKERS,
+        per_plugin_limit: int = DEFAULT_SYNC_HANDLER_PER_PLUGIN_LIMIT,
+        default_timeout_sec: float = DEFAULT_SYNC_HANDLER_TIMEOUT_SEC,
+    ) -> None:
+        """初始化执行器。
+
+        Args:
+            max_workers: 线程池大小；为 0 时同步处理器仍直接在事件循环上执行。
+            per_plugin_limit: 单个插件可同时占用的线程数。
+            default_timeout_sec: 单次调用的默认超时时间（秒），小于等于 0 表示不限制。
+        """
+        self._max_workers: int = max(0, int(max_workers))
+        self._per_plugin_limit: int = max(1, int(per_plugin_limit))
+        self._default_timeout_sec: float = max(0.0, float(default_timeout_sec))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._plugin_slots: Dict[str, asyncio.Semaphore] = {}
+        self._running: Dict[str, int] = {}
+        self._timed_out: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用线程池执行。"""
+        return self._max_workers > 0
+
+    def resolve_timeout(self, request_timeout_ms: int) -> Optional[float]:
+        """结合请求自身的超时与默认超时，计算本次调用的超时时间。
+
+        Args:
+            request_timeout_ms: RPC 请求信封上的超时时间（毫秒），小于等于 0 表示未指定。
+
+        Returns:
+            Optional[float]: 超时秒数；两者都未限制时返回 ``None``。
+        """
+        candidates = [self._default_timeout_sec] if self._default_timeout_sec > 0 else []
+        if request_timeout_ms > 0:
+            candidates.append(request_timeout_ms / 1000)
+        return min(candidates) if candidates else None
+
+    async def run(
+        self,
+        plugin_id: str,
+        handler: Callable[..., Any],
+        kwargs: Mapping[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """执行一次同步处理器调用。
+
+        Args:
+            plugin_id: 处理器所属插件 ID。
+            handler: 同步处理函数。
+            kwargs: 调用参数。
+            timeout: 超时时间（秒），包含等待插件配额的时间；``None`` 表示不限制。
+
+        Returns:
+            Any: 处理函数的返回值。
+
+        Raises:
+            SyncHandlerTimeoutError: 等待配额或执行超时。
+        """
+        if not self.enabled:
+            return handler(**kwargs)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        slots = self._plugin_slots.setdefault(plugin_id, asyncio.Semaphore(self._per_plugin_limit))
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        except asyncio.TimeoutError as exc:
+            self._timed_out += 1
+            raise SyncHandlerTimeoutError(f"插件 {plugin_id} 的同步处理器并发已满，等待超时") from exc
+
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="plugin-sync-handler",
+                )
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(self._executor, functools.partial(context.run, handler, **kwargs))
+        except BaseException:
+            slots.release()
+            raise
+
+        self._running[plugin_id] = self._running.get(plugin_id, 0) + 1
+        future.add_done_callback(functools.partial(self._on_handler_done, plugin_id, slots))
+
+        remaining = None if deadline is None else max(0.0, deadline - loop.time())
+        try:
+            # shield 保证超时或取消时线程结束后仍能触发完成回调，归还配额
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError as exc:
+            self._timed_out += 1
+            raise SyncHandlerTimeoutError(f"插件 {plugin_id} 的同步处理器执行超过 {timeout:.1f} 秒") from exc
+
+    def _on_handler_done(self, plugin_id: str, slots: asyncio.Semaphore, future: "asyncio.Future[Any]") -> None:
+        slots.release()
+        running = self._running.get(plugin_id, 0) - 1
+        if running > 0:
+            self._running[plugin_id] = running
+        else:
+            self._running.pop(plugin_id, None)
+        # 调用方已超时放弃时，避免事件循环报告未取回的异常
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回执行器当前状态。
+
+        Returns:
+            Dict[str, Any]: 线程池大小、各插件运行中的调用数与累计超时次数。
+        """
+        return {
+            "max_workers": self._max_workers,
+            "per_plugin_limit": self._per_plugin_limit,
+            "running": dict(self._running),
+            "timed_out": self._timed_out,
+        }
+
+    def shutdown(self) -> None:
+        """关闭线程池，不等待仍在运行的处理器。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
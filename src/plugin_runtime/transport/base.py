@@ -5,17 +5,22 @@
 业务层仅依赖此抽象，禁止直接使用具体传输实现的细节。
 
 分帧协议：4-byte big-endian length prefix + payload
+
+并发发送的小帧会被合并为一次写入与一次 drain，减少高频 Hook / 事件流量下的系统调用次数。
 """
 
 import asyncio
 import contextlib
 import struct
 from abc import ABC, abstractmethod
-from typing import Awaitable, Callable
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, List, Optional, Sequence
 
 # 分帧常量
 FRAME_HEADER_SIZE = 4  # 4 字节长度前缀
 MAX_FRAME_SIZE = 16 * 1024 * 1024  # 16 MB 最大帧大小
+MAX_COALESCED_BYTES = 256 * 1024  # 单次合并写入的字节上限
 
 
 class ConnectionClosed(Exception):
@@ -24,6 +29,15 @@ class ConnectionClosed(Exception):
     pass
 
 
+@dataclass(slots=True)
+class _PendingWrite:
+    """一次 send_frames 调用对应的待写数据"""
+
+    data: bytes
+    written: bool = False
+    cancelled: bool = False
+
+
 class Connection:
     """单个连接的抽象
 
@@ -35,18 +49,72 @@ class Connection:
         self._writer = writer
         self._closed = False
         self._write_lock = asyncio.Lock()  # 保护并发写入的帧完整性
+        self._pending_writes: Deque[_PendingWrite] = deque()  # 等待合并写入的已分帧数据
+        self._write_error: Optional[BaseException] = None
 
     async def send_frame(self, data: bytes) -> None:
-        """发送一帧数据（4-byte length prefix + payload）"""
+        """发送一帧数据（4-byte length prefix + payload）
+
+        帧先进入待写队列；持有写锁的协程会把等待期间积累的帧合并写出，
+        调用方在自己的帧写入并 drain 完成后才返回。
+        """
+        await self.send_frames((data,))
+
+    async def send_frames(self, frames: Sequence[bytes]) -> None:
+        """按顺序发送多帧数据，并与其他并发发送合并写入"""
         if self._closed:
             raise ConnectionClosed("连接已关闭")
-        length = len(data)
-        if length > MAX_FRAME_SIZE:
-            raise ValueError(f"帧大小 {length} 超过最大限制 {MAX_FRAME_SIZE}")
-        header = struct.pack(">I", length)
-        async with self._write_lock:
-            self._writer.write(header + data)
+        chunks: List[bytes] = []
+        for data in frames:
+            length = len(data)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"帧大小 {length} 超过最大限制 {MAX_FRAME_SIZE}")
+            chunks.append(struct.pack(">I", length))
+            chunks.append(data)
+        if not chunks:
+            return
+
+        pending = _PendingWrite(b"".join(chunks))
+        self._pending_writes.append(pending)
+        try:
+            async with self._write_lock:
+                while not pending.written:
+                    if self._write_error is not None:
+                        raise ConnectionClosed("连接写入失败") from self._write_error
+                    await self._flush_pending_writes()
+        except asyncio.CancelledError:
+            # 尚未写出的帧随调用方一起取消，避免在之后的写入中被意外发送
+            pending.cancelled = not pending.written
+            raise
+
+    async def _flush_pending_writes(self) -> None:
+        """合并写出一批待发送帧；调用方必须持有写锁"""
+        batch: List[_PendingWrite] = []
+        batch_bytes = 0
+        while self._pending_writes:
+            pending = self._pending_writes[0]
+            if pending.cancelled:
+                self._pending_writes.popleft()
+                continue
+            if batch and batch_bytes + len(pending.data) > MAX_COALESCED_BYTES:
+                break
+            batch.append(self._pending_writes.popleft())
+            batch_bytes += len(pending.data)
+        if not batch:
+            return
+
+        try:
+            self._writer.write(batch[0].data if len(batch) == 1 else b"".join(pending.data for pending in batch))
+        except Exception as exc:
+            self._write_error = exc
+            raise
+        for pending in batch:
+            pending.written = True
+        try:
             await self._writer.drain()
+        except Exception as exc:
+            self._write_error = exc
+            raise
 
     async def recv_frame(self) -> bytes:
         """接收一帧数据"""
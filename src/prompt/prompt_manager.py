@@ -1,8 +1,11 @@
+from collections import OrderedDict
 from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
 from pathlib import Path
 from string import Formatter
 from typing import Any, Optional
 
+import asyncio
 import inspect
 
 from src.common.logger import get_logger
@@ -21,6 +24,50 @@ CUSTOM_PROMPTS_DIR = DATA_DIR / "custom_prompts"
 PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 CUSTOM_PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 SUFFIX_PROMPT = ".prompt"
+COMPILED_TEMPLATE_CACHE_SIZE = 512
+
+_CONVERTERS: dict[str, Callable[[Any], str]] = {"r": repr, "s": str, "a": ascii}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """预解析的模板：字面量与占位符交替排列的片段序列"""
+
+    segments: tuple[tuple[str, Optional[str], str, Optional[str]], ...]
+    """(字面量, 占位符名称, 格式说明, 转换标记)，字面量中的转义大括号已还原"""
+    field_names: tuple[str, ...]
+    """按首次出现顺序去重后的占位符名称"""
+
+    @classmethod
+    def compile(cls, template: str, formatter: Formatter) -> "CompiledTemplate":
+        escaped = template.replace("{{", _LEFT_BRACE).replace("}}", _RIGHT_BRACE)
+        segments: list[tuple[str, Optional[str], str, Optional[str]]] = []
+        field_names: dict[str, None] = {}
+        for literal_text, field_name, format_spec, conversion in formatter.parse(escaped):
+            literal_text = literal_text.replace(_LEFT_BRACE, "{").replace(_RIGHT_BRACE, "}")
+            if field_name:
+                field_names[field_name] = None
+            segments.append((literal_text, field_name or None, format_spec or "", conversion))
+        return cls(segments=tuple(segments), field_names=tuple(field_names))
+
+    def render(self, values: dict[str, str]) -> str:
+        parts: list[str] = []
+        for literal_text, field_name, format_spec, conversion in self.segments:
+            parts.append(literal_text)
+            if field_name is None:
+                continue
+            value: Any = values[field_name]
+            if conversion:
+                value = _CONVERTERS[conversion](value)
+            parts.append(format(value, format_spec) if format_spec else str(value))
+        return "".join(parts)
+
+
+@dataclass
+class _RenderScope:
+    """一次顶层渲染的作用域，缓存其中纯上下文构造函数的结果"""
+
+    memo: dict[tuple[int, str], "asyncio.Future[str]"] = field(default_factory=dict)
 
 
 class Prompt:
@@ -28,12 +75,21 @@ class Prompt:
         self.prompt_name = prompt_name
         self.template = template
         self.prompt_render_context: dict[str, Callable[[str], str | Coroutine[Any, Any, str]]] = {}
+        self.pure_context_names: set[str] = set()
+        """结果只取决于 Prompt 名称的上下文函数，同一次渲染中只会调用一次"""
         self._is_cloned = False
         self.__post_init__()
 
-    def add_context(self, name: str, func_or_str: Callable[[str], str | Coroutine[Any, Any, str]] | str) -> None:
+    def add_context(
+        self,
+        name: str,
+        func_or_str: Callable[[str], str | Coroutine[Any, Any, str]] | str,
+        pure: bool = False,
+    ) -> None:
         if name in self.prompt_render_context:
             raise KeyError(f"Context function name '{name}' 已存在于 Prompt '{self.prompt_name}' 中")
+        if pure:
+            self.pure_context_names.add(name)
         if isinstance(func_or_str, str):
 
             def tmp_func(_: str) -> str:
@@ -72,6 +128,10 @@ class PromptManager:
         """存储上下文构造函数及其所属模块"""
         self._formatter = Formatter()  # 仅用来解析模板
         """模板解析器"""
+        self._compiled_templates: OrderedDict[tuple[str, str], CompiledTemplate] = OrderedDict()
+        """以 (Prompt 名称, 模板内容) 为键的预解析模板 LRU 缓存"""
+        self._pure_context_functions: set[str] = set()
+        """结果只取决于 Prompt 名称的全局上下文构造函数名称"""
         self._prompt_to_save: set[str] = set()
         """需要保存的 Prompt 名称集合"""
 
@@ -123,13 +183,19 @@ class PromptManager:
         elif prompt.prompt_name in self._prompt_to_save:
             self._prompt_to_save.remove(prompt.prompt_name)
 
-    def add_context_construct_function(self, name: str, func: Callable[[str], str | Coroutine[Any, Any, str]]) -> None:
+    def add_context_construct_function(
+        self,
+        name: str,
+        func: Callable[[str], str | Coroutine[Any, Any, str]],
+        pure: bool = False,
+    ) -> None:
         """
         添加一个上下文构造函数
 
         Args:
             name (str): 上下文名称
             func (Callable[[str], str | Coroutine[Any, Any, str]]): 构造函数，接受 Prompt 名称作为参数，返回字符串或返回字符串的协程
+            pure (bool): 结果是否只取决于 Prompt 名称，为 True 时同一次渲染中相同调用只执行一次
         Raises:
             KeyError: 如果上下文名称已存在则引发该异常
         """
@@ -149,6 +215,8 @@ class PromptManager:
             logger.warning("无法获取调用函数的模块名，使用 'unknown' 作为默认值")
 
         self._context_construct_functions[name] = func, caller_module
+        if pure:
+            self._pure_context_functions.add(name)
 
     def get_prompt(self, prompt_name: str) -> Prompt:
         """
@@ -184,60 +252,126 @@ class PromptManager:
             )
         return await self._render(prompt)
 
+    def compile_template(self, prompt: Prompt) -> CompiledTemplate:
+        """
+        获取 Prompt 模板的预解析结果，按 (Prompt 名称, 模板内容) 缓存
+
+        Args:
+            prompt (Prompt): 要解析的 Prompt 实例
+        Returns:
+            return (CompiledTemplate): 预解析的模板
+        """
+        cache_key = (prompt.prompt_name, prompt.template)
+        compiled = self._compiled_templates.get(cache_key)
+        if compiled is not None:
+            self._compiled_templates.move_to_end(cache_key)
+            return compiled
+        compiled = CompiledTemplate.compile(prompt.template, self._formatter)
+        self._compiled_templates[cache_key] = compiled
+        if len(self._compiled_templates) > COMPILED_TEMPLATE_CACHE_SIZE:
+            self._compiled_templates.popitem(last=False)
+        return compiled
+
     async def _render(
         self,
         prompt: Prompt,
         recursive_level: int = 0,
         additional_construction_function_dict: dict[str, Callable[[str], str | Coroutine[Any, Any, str]]] | None = None,
+        scope: _RenderScope | None = None,
+        additional_pure_names: frozenset[str] = frozenset(),
     ) -> str:
         if additional_construction_function_dict is None:
             additional_construction_function_dict = {}
-        prompt.template = prompt.template.replace("{{", _LEFT_BRACE).replace("}}", _RIGHT_BRACE)
+        if scope is None:
+            scope = _RenderScope()
         if recursive_level > 10:
             raise RecursionError("递归层级过深，可能存在循环引用")
-        field_block = {field_name for _, field_name, _, _ in self._formatter.parse(prompt.template) if field_name}
-        rendered_fields: dict[str, str] = {}
-        for field_name in field_block:
+        compiled = self.compile_template(prompt)
+
+        # 先按优先级确定每个字段的来源，缺失字段在发起任何调用前报错
+        pending: list[Coroutine[Any, Any, str]] = []
+        for field_name in compiled.field_names:
             if field_name in self.prompts:
                 nested_prompt = self.get_prompt(field_name)
                 merged_context = additional_construction_function_dict | prompt.prompt_render_context
-                rendered_fields[field_name] = await self._render(
-                    nested_prompt,
-                    recursive_level + 1,
-                    merged_context,
+                merged_pure_names = additional_pure_names | prompt.pure_context_names
+                pending.append(
+                    self._render(nested_prompt, recursive_level + 1, merged_context, scope, merged_pure_names)
                 )
             elif field_name in prompt.prompt_render_context:
                 # 优先使用内部构造函数
                 func = prompt.prompt_render_context[field_name]
-                rendered_fields[field_name] = await self._get_function_result(
-                    func,
-                    prompt.prompt_name,
-                    field_name,
-                    is_prompt_context=True,
+                pending.append(
+                    self._resolve_context(
+                        scope,
+                        func,
+                        prompt.prompt_name,
+                        field_name,
+                        is_prompt_context=True,
+                        pure=field_name in prompt.pure_context_names,
+                    )
                 )
             elif field_name in self._context_construct_functions:
                 # 随后查找全局构造函数
                 func, module = self._context_construct_functions[field_name]
-                rendered_fields[field_name] = await self._get_function_result(
-                    func,
-                    prompt.prompt_name,
-                    field_name,
-                    is_prompt_context=False,
-                    module=module,
+                pending.append(
+                    self._resolve_context(
+                        scope,
+                        func,
+                        prompt.prompt_name,
+                        field_name,
+                        is_prompt_context=False,
+                        module=module,
+                        pure=field_name in self._pure_context_functions,
+                    )
                 )
             elif field_name in additional_construction_function_dict:
                 # 最后查找额外传入的构造函数
                 func = additional_construction_function_dict[field_name]
-                rendered_fields[field_name] = await self._get_function_result(
-                    func,
-                    prompt.prompt_name,
-                    field_name,
-                    is_prompt_context=True,
+                pending.append(
+                    self._resolve_context(
+                        scope,
+                        func,
+                        prompt.prompt_name,
+                        field_name,
+                        is_prompt_context=True,
+                        pure=field_name in additional_pure_names,
+                    )
                 )
             else:
+                for coroutine in pending:
+                    coroutine.close()
                 raise KeyError(f"Prompt '{prompt.prompt_name}' 中缺少必要的内容块或构建函数: '{field_name}'")
-        rendered_template = prompt.template.format(**rendered_fields)
-        return rendered_template.replace(_LEFT_BRACE, "{").replace(_RIGHT_BRACE, "}")
+
+        # 各内容块互不依赖，并发构建；出错时按字段顺序抛出第一个异常
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        rendered_fields: dict[str, str] = {}
+        for field_name, result in zip(compiled.field_names, results, strict=True):
+            if isinstance(result, BaseException):
+                raise result
+            rendered_fields[field_name] = result
+        return compiled.render(rendered_fields)
+
+    async def _resolve_context(
+        self,
+        scope: _RenderScope,
+        func: Callable[[str], str | Coroutine[Any, Any, str]],
+        prompt_name: str,
+        field_name: str,
+        is_prompt_context: bool,
+        module: Optional[str] = None,
+        pure: bool = False,
+    ) -> str:
+        if not pure:
+            return await self._get_function_result(func, prompt_name, field_name, is_prompt_context, module)
+        memo_key = (id(func), prompt_name)
+        future = scope.memo.get(memo_key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._get_function_result(func, prompt_name, field_name, is_prompt_context, module)
+            )
+            scope.memo[memo_key] = future
+        return await asyncio.shield(future)
 
     def save_prompts(self) -> None:
         """
@@ -0,0 +1,202 @@
+"""HTML 渲染结果的磁盘缓存。
+
+以渲染输入（HTML 与视口等参数）的哈希为键保存 PNG，相同卡片再次渲染时直接读取文件。
+缓存按最近使用时间淘汰，条目数与总字节数都有上限。
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import threading
+
+from src.common.logger import get_logger
+
+logger = get_logger("services.html_render_cache")
+
+_CACHE_FILE_SUFFIX = ".png"
+
+
+def build_render_cache_key(fields: Dict[str, Any]) -> str:
+    """根据会影响渲染输出的字段计算缓存键。
+
+    Args:
+        fields: 参与缓存键计算的渲染参数。
+
+    Returns:
+        str: 十六进制 SHA-256 摘要。
+    """
+
+    canonical = json.dumps(fields, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class HtmlRenderCache:
+    """按内容寻址的 PNG 磁盘缓存。"""
+
+    def __init__(self, cache_dir: Path, max_entries: int, max_bytes: int) -> None:
+        """初始化磁盘缓存。
+
+        Args:
+            cache_dir: 缓存文件目录。
+            max_entries: 最多保留的缓存条目数。
+            max_bytes: 缓存文件总大小上限（字节）。
+        """
+
+        self._cache_dir = cache_dir
+        self._max_entries = max(0, int(max_entries))
+        self._max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self) -> Path:
+        """返回缓存目录。"""
+
+        return self._cache_dir
+
+    def configure(self, max_entries: int, max_bytes: int) -> None:
+        """更新容量上限，超出部分立即淘汰。
+
+        Args:
+            max_entries: 最多保留的缓存条目数。
+            max_bytes: 缓存文件总大小上限（字节）。
+        """
+
+        with self._lock:
+            self._max_entries = max(0, int(max_entries))
+            self._max_bytes = max(0, int(max_bytes))
+            if self._loaded:
+                self._evict_unlocked()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """读取缓存的 PNG。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            Optional[bytes]: 命中时返回 PNG 内容，否则返回 ``None``。
+        """
+
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def put(self, key: str, image_bytes: bytes) -> None:
+        """写入一条缓存。
+
+        Args:
+            key: 缓存键。
+            image_bytes: PNG 内容。
+        """
+
+        await asyncio.to_thread(self._put_sync, key, image_bytes)
+
+    def clear(self) -> None:
+        """删除全部缓存文件。"""
+
+        with self._lock:
+            self._ensure_loaded_unlocked()
+            for key in list(self._entries):
+                self._remove_unlocked(key)
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存的命中统计与容量占用。
+
+        Returns:
+            Dict[str, int]: 命中数、未命中数、条目数与总字节数。
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _path_for(self, key: str) -> Path:
+        return self._cache_dir / f"{key}{_CACHE_FILE_SUFFIX}"
+
+    def _get_sync(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._ensure_loaded_unlocked()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path_for(key)
+            try:
+                image_bytes = path.read_bytes()
+            except OSError:
+                self._forget_unlocked(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # 刷新修改时间，使重启后重建的淘汰顺序与访问顺序一致
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return image_bytes
+
+    def _put_sync(self, key: str, image_bytes: bytes) -> None:
+        size = len(image_bytes)
+        with self._lock:
+            if self._max_entries <= 0 or size > self._max_bytes:
+                return
+            self._ensure_loaded_unlocked()
+            path = self._path_for(key)
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                temp_path.write_bytes(image_bytes)
+                os.replace(temp_path, path)
+            except OSError as exc:
+                logger.warning(f"写入 HTML 渲染缓存失败: {exc}")
+                with contextlib.suppress(OSError):
+                    temp_path.unlink()
+                return
+            self._forget_unlocked(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict_unlocked()
+
+    def _ensure_loaded_unlocked(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self._cache_dir.is_dir():
+            return
+        files = []
+        for path in self._cache_dir.glob(f"*{_CACHE_FILE_SUFFIX}"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.stem, stat.st_size))
+        for _mtime, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict_unlocked()
+
+    def _evict_unlocked(self) -> None:
+        while self._entries and (len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes):
+            self._remove_unlocked(next(iter(self._entries)))
+
+    def _remove_unlocked(self, key: str) -> None:
+        self._forget_unlocked(key)
+        with contextlib.suppress(OSError):
+            self._path_for(key).unlink()
+
+    def _forget_unlocked(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
@@ -5,12 +5,13 @@
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from importlib import metadata
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional, Tuple, cast
+from typing import Any, Deque, Dict, List, Literal, Optional, Tuple, cast
 from urllib.parse import urlparse
 
 import asyncio
@@ -27,6 +28,8 @@ from src.common.logger import PROJECT_ROOT, get_logger
 from src.config.config import config_manager
 from src.config.official_configs import PluginRuntimeRenderConfig
 
+from .html_render_cache import HtmlRenderCache, build_render_cache_key
+
 logger = get_logger("services.html_render_service")
 
 _NETWORK_ALLOW_SCHEMES = frozenset({"about", "blob", "data", "file"})
@@ -49,6 +52,28 @@ _UNIX_BROWSER_NAMES = (
     "msedge",
 )
 _PLAYWRIGHT_MANAGED_BROWSER_PREFIXES = ("chromium-", "chrome-", "chrome-headless-shell-")
+_RENDER_CACHE_KEY_VERSION = 1
+_RENDER_LATENCY_SAMPLE_SIZE = 512
+
+
+class _RenderOwnerCancelled(Exception):
+    """合并渲染中负责实际渲染的请求被取消，等待者应重新发起渲染。"""
+
+
+def _references_local_files(html: str) -> bool:
+    """判断 HTML 是否引用了 ``file:`` 协议的本地资源。
+
+    本地资源可能在 HTML 不变的情况下被修改，仅以 HTML 内容为键的缓存无法感知，
+    因此这类请求不经过渲染缓存。
+
+    Args:
+        html: 待渲染的 HTML 内容。
+
+    Returns:
+        bool: 引用了本地文件时返回 ``True``。
+    """
+
+    return "file:" in html.lower()
 
 
 @dataclass(slots=True)
@@ -95,6 +120,17 @@ class HtmlRenderResult:
         }
 
 
+@dataclass(slots=True)
+class _PooledPage:
+    """渲染页面池中的一个页面及其所属上下文。"""
+
+    browser: Any
+    context: Any
+    page: Any
+    device_scale_factor: float
+    viewport: Tuple[int, int]
+
+
 @dataclass(slots=True)
 class ManagedBrowserRecord:
     """记录 Playwright 托管浏览器的本地状态。"""
@@ -167,6 +203,11 @@ class HTMLRenderService:
         self._render_count: int = 0
         self._render_semaphore: Optional[asyncio.Semaphore] = None
         self._render_semaphore_limit: int = 0
+        self._idle_pages: List[_PooledPage] = []
+        self._warm_task: Optional[asyncio.Task[None]] = None
+        self._render_cache: Optional[HtmlRenderCache] = None
+        self._inflight_renders: Dict[str, asyncio.Future[bytes]] = {}
+        self._render_latencies_ms: Deque[float] = deque(maxlen=_RENDER_LATENCY_SAMPLE_SIZE)
 
     def _get_render_config(self) -> PluginRuntimeRenderConfig:
         """读取当前插件运行时的浏览器渲染配置。
@@ -194,6 +235,10 @@ class HTMLRenderService:
     async def render_html_to_png(self, request: HtmlRenderRequest) -> HtmlRenderResult:
         """将 HTML 内容渲染为 PNG 图片。
 
+        相同渲染输入优先命中磁盘缓存；并发的相同请求只渲染一次，其余请求等待其结果，
+        若负责渲染的请求被取消，等待者之一会接替渲染。允许联网或引用 ``file:`` 本地资源的
+        请求不经过缓存。
+
         Args:
             request: 本次渲染请求。
 
@@ -210,40 +255,322 @@ class HTMLRenderService:
             raise RuntimeError("插件运行时浏览器渲染能力已禁用")
 
         normalized_request = self._normalize_request(request, config)
+        start_time = time.perf_counter()
+        render_cache = (
+            self._get_render_cache(config)
+            if not normalized_request.allow_network and not _references_local_files(normalized_request.html)
+            else None
+        )
+        if render_cache is None:
+            image_bytes = await self._render_with_browser(normalized_request, config)
+            return self._build_render_result(image_bytes, start_time)
+
+        cache_key = self._build_cache_key(normalized_request)
+        while True:
+            cached_bytes = await render_cache.get(cache_key)
+            if cached_bytes is not None:
+                return self._build_render_result(cached_bytes, start_time)
+
+            inflight_render = self._inflight_renders.get(cache_key)
+            if inflight_render is None:
+                break
+            try:
+                image_bytes = await asyncio.shield(inflight_render)
+            except _RenderOwnerCancelled:
+                # 负责渲染的请求被取消，由仍在等待的请求重新发起渲染
+                continue
+            return self._build_render_result(image_bytes, start_time)
+
+        inflight_render = asyncio.get_running_loop().create_future()
+        self._inflight_renders[cache_key] = inflight_render
+        try:
+            image_bytes = await self._render_with_browser(normalized_request, config)
+        except asyncio.CancelledError:
+            self._fail_inflight_render(inflight_render, _RenderOwnerCancelled())
+            raise
+        except Exception as exc:
+            self._fail_inflight_render(inflight_render, exc)
+            raise
+        else:
+            inflight_render.set_result(image_bytes)
+        finally:
+            self._inflight_renders.pop(cache_key, None)
+
+        await render_cache.put(cache_key, image_bytes)
+        return self._build_render_result(image_bytes, start_time)
+
+    @staticmethod
+    def _fail_inflight_render(inflight_render: asyncio.Future[bytes], exc: BaseException) -> None:
+        """将合并渲染的结果标记为失败，通知所有等待中的相同请求。
+
+        Args:
+            inflight_render: 等待者共享的渲染结果。
+            exc: 传递给等待者的异常。
+        """
+
+        inflight_render.set_exception(exc)
+        # 没有其他等待者时避免事件循环报告未取回的异常
+        inflight_render.exception()
+
+    async def _render_with_browser(self, request: HtmlRenderRequest, config: PluginRuntimeRenderConfig) -> bytes:
+        """使用浏览器页面池完成一次实际渲染。
+
+        Args:
+            request: 规范化后的渲染请求。
+            config: 当前浏览器渲染配置。
+
+        Returns:
+            bytes: PNG 二进制内容。
+        """
+
         semaphore = self._get_render_semaphore()
         async with semaphore:
-            start_time = time.perf_counter()
             browser = await self._ensure_browser(config)
-            context: Any = None
+            pooled_page: Optional[_PooledPage] = None
             try:
-                context = await browser.new_context(
-                    device_scale_factor=normalized_request.device_scale_factor,
-                    locale="zh-CN",
-                    viewport={
-                        "width": normalized_request.viewport_width,
-                        "height": normalized_request.viewport_height,
-                    },
-                )
-                page = await context.new_page()
-                await self._configure_page(page, normalized_request)
-                image_bytes = await self._capture_image(page, normalized_request)
-                width, height = self._measure_image_size(image_bytes)
-                self._render_count += 1
-                await self._maybe_restart_browser(config)
-                return HtmlRenderResult(
-                    image_base64=base64.b64encode(image_bytes).decode("utf-8"),
-                    mime_type="image/png",
-                    width=width,
-                    height=height,
-                    render_ms=int((time.perf_counter() - start_time) * 1000),
-                )
+                pooled_page = await self._acquire_page(browser, request)
+                await self._configure_page(pooled_page.page, request)
+                image_bytes = await self._capture_image(pooled_page.page, request)
+            except asyncio.CancelledError:
+                await self._close_pooled_page(pooled_page)
+                raise
             except Exception:
+                await self._close_pooled_page(pooled_page)
                 await self.reset_browser(restart_playwright=False)
                 raise
-            finally:
-                if context is not None:
-                    with contextlib.suppress(Exception):
-                        await context.close()
+
+            await self._release_page(pooled_page, config)
+            self._render_count += 1
+            await self._maybe_restart_browser(config)
+            return image_bytes
+
+    def _build_render_result(self, image_bytes: bytes, start_time: float) -> HtmlRenderResult:
+        """根据 PNG 内容构造渲染结果，并记录本次渲染耗时。
+
+        Args:
+            image_bytes: PNG 二进制内容。
+            start_time: 本次请求开始时的 ``perf_counter`` 时间。
+
+        Returns:
+            HtmlRenderResult: 渲染结果。
+        """
+
+        width, height = self._measure_image_size(image_bytes)
+        render_ms = (time.perf_counter() - start_time) * 1000
+        self._render_latencies_ms.append(render_ms)
+        return HtmlRenderResult(
+            image_base64=base64.b64encode(image_bytes).decode("utf-8"),
+            mime_type="image/png",
+            width=width,
+            height=height,
+            render_ms=int(render_ms),
+        )
+
+    def get_render_stats(self) -> Dict[str, Any]:
+        """返回最近渲染请求的延迟分位数、页面池与缓存状态。
+
+        Returns:
+            Dict[str, Any]: 渲染统计信息。
+        """
+
+        latencies = sorted(self._render_latencies_ms)
+
+        def _percentile(ratio: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * ratio))], 3)
+
+        return {
+            "samples": len(latencies),
+            "p50_ms": _percentile(0.5),
+            "p99_ms": _percentile(0.99),
+            "idle_pages": len(self._idle_pages),
+            "inflight_renders": len(self._inflight_renders),
+            "cache": self._render_cache.stats() if self._render_cache is not None else None,
+        }
+
+    def _get_render_cache(self, config: PluginRuntimeRenderConfig) -> Optional[HtmlRenderCache]:
+        """按当前配置返回渲染结果磁盘缓存。
+
+        Args:
+            config: 当前浏览器渲染配置。
+
+        Returns:
+            Optional[HtmlRenderCache]: 缓存未启用时返回 ``None``。
+        """
+
+        max_entries = int(config.cache_max_entries)
+        max_bytes = int(config.cache_max_size_mb) * 1024 * 1024
+        if not config.cache_enabled or max_entries <= 0 or max_bytes <= 0:
+            return None
+        if self._render_cache is None:
+            cache_dir = (PROJECT_ROOT / "data" / "plugin_runtime" / "html_render_cache").resolve()
+            self._render_cache = HtmlRenderCache(cache_dir, max_entries=max_entries, max_bytes=max_bytes)
+        else:
+            self._render_cache.configure(max_entries=max_entries, max_bytes=max_bytes)
+        return self._render_cache
+
+    @staticmethod
+    def _build_cache_key(request: HtmlRenderRequest) -> str:
+        """计算渲染请求的缓存键，只包含会影响输出图片的字段。
+
+        Args:
+            request: 规范化后的渲染请求。
+
+        Returns:
+            str: 缓存键。
+        """
+
+        return build_render_cache_key(
+            {
+                "version": _RENDER_CACHE_KEY_VERSION,
+                "html": request.html,
+                "selector": request.selector,
+                "viewport_width": request.viewport_width,
+                "viewport_height": request.viewport_height,
+                "device_scale_factor": request.device_scale_factor,
+                "full_page": request.full_page,
+                "omit_background": request.omit_background,
+                "wait_until": request.wait_until,
+                "wait_for_selector": request.wait_for_selector,
+                "wait_for_timeout_ms": request.wait_for_timeout_ms,
+            }
+        )
+
+    async def _acquire_page(self, browser: Any, request: HtmlRenderRequest) -> _PooledPage:
+        """从页面池取出一个可用页面，池中没有合适页面时新建。
+
+        设备像素比只能在创建上下文时指定，因此只复用像素比相同的页面；视口则按需调整。
+
+        Args:
+            browser: 当前浏览器实例。
+            request: 规范化后的渲染请求。
+
+        Returns:
+            _PooledPage: 可用于本次渲染的页面。
+        """
+
+        viewport = (request.viewport_width, request.viewport_height)
+        for index in range(len(self._idle_pages) - 1, -1, -1):
+            pooled_page = self._idle_pages[index]
+            if pooled_page.device_scale_factor != request.device_scale_factor:
+                continue
+            del self._idle_pages[index]
+            if pooled_page.browser is not browser or self._is_page_closed(pooled_page.page):
+                await self._close_pooled_page(pooled_page)
+                continue
+            if pooled_page.viewport != viewport:
+                await pooled_page.page.set_viewport_size({"width": viewport[0], "height": viewport[1]})
+                pooled_page.viewport = viewport
+            return pooled_page
+
+        return await self._open_page(browser, request.device_scale_factor, viewport)
+
+    @staticmethod
+    async def _open_page(browser: Any, device_scale_factor: float, viewport: Tuple[int, int]) -> _PooledPage:
+        """新建浏览器上下文与页面。
+
+        Args:
+            browser: 当前浏览器实例。
+            device_scale_factor: 设备像素比。
+            viewport: 视口宽高。
+
+        Returns:
+            _PooledPage: 新建的页面。
+        """
+
+        context = await browser.new_context(
+            device_scale_factor=device_scale_factor,
+            locale="zh-CN",
+            viewport={"width": viewport[0], "height": viewport[1]},
+        )
+        try:
+            page = await context.new_page()
+        except Exception:
+            with contextlib.suppress(Exception):
+                await context.close()
+            raise
+        return _PooledPage(
+            browser=browser,
+            context=context,
+            page=page,
+            device_scale_factor=device_scale_factor,
+            viewport=viewport,
+        )
+
+    async def _release_page(self, pooled_page: _PooledPage, config: PluginRuntimeRenderConfig) -> None:
+        """重置页面状态后放回页面池，池已满或重置失败时关闭页面。
+
+        Args:
+            pooled_page: 本次渲染使用的页面。
+            config: 当前浏览器渲染配置。
+        """
+
+        if pooled_page.browser is not self._browser or len(self._idle_pages) >= int(config.page_pool_size):
+            await self._close_pooled_page(pooled_page)
+            return
+        try:
+            page = pooled_page.page
+            if hasattr(page, "unroute_all"):
+                await page.unroute_all(behavior="ignoreErrors")
+            else:
+                await page.unroute("**/*")
+            # 导航到空白页会丢弃上一次渲染的 DOM 与脚本状态
+            await page.goto("about:blank")
+        except Exception as exc:
+            logger.debug(f"重置渲染页面失败，将直接关闭: {exc}")
+            await self._close_pooled_page(pooled_page)
+            return
+        self._idle_pages.append(pooled_page)
+
+    @staticmethod
+    async def _close_pooled_page(pooled_page: Optional[_PooledPage]) -> None:
+        """关闭页面所属的浏览器上下文。
+
+        Args:
+            pooled_page: 待关闭的页面，为 ``None`` 时直接返回。
+        """
+
+        if pooled_page is None:
+            return
+        with contextlib.suppress(Exception):
+            await pooled_page.context.close()
+
+    @staticmethod
+    def _is_page_closed(page: Any) -> bool:
+        """判断页面是否已经关闭。
+
+        Args:
+            page: Playwright 页面对象。
+
+        Returns:
+            bool: 页面已关闭或状态无法读取时返回 ``True``。
+        """
+
+        try:
+            return bool(page.is_closed())
+        except Exception:
+            return True
+
+    async def _warm_page_pool(self, browser: Any, config: PluginRuntimeRenderConfig) -> None:
+        """按默认视口预先创建空闲页面，降低浏览器启动后首批渲染的延迟。
+
+        Args:
+            browser: 刚连接或启动的浏览器实例。
+            config: 当前浏览器渲染配置。
+        """
+
+        defaults = HtmlRenderRequest(html="")
+        viewport = (defaults.viewport_width, defaults.viewport_height)
+        try:
+            while browser is self._browser and len(self._idle_pages) < int(config.page_pool_size):
+                pooled_page = await self._open_page(browser, defaults.device_scale_factor, viewport)
+                if browser is not self._browser or len(self._idle_pages) >= int(config.page_pool_size):
+                    await self._close_pooled_page(pooled_page)
+                    return
+                self._idle_pages.append(pooled_page)
+        except Exception as exc:
+            logger.debug(f"预热渲染页面失败: {exc}")
 
     async def reset_browser(self, restart_playwright: bool = False) -> None:
         """关闭当前缓存的浏览器实例。
@@ -262,6 +589,12 @@ class HTMLRenderService:
             restart_playwright: 是否同时关闭 Playwright 运行时。
         """
 
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        idle_pages, self._idle_pages = self._idle_pages, []
+        for pooled_page in idle_pages:
+            await self._close_pooled_page(pooled_page)
         if self._browser is not None:
             with contextlib.suppress(Exception):
                 await self._browser.close()
@@ -302,6 +635,8 @@ class HTMLRenderService:
 
             self._browser = browser
             self._bind_browser_events(browser)
+            if int(config.page_pool_size) > 0:
+                self._warm_task = asyncio.create_task(self._warm_page_pool(browser, config))
             return browser
 
     async def _ensure_playwright(self) -> Any:
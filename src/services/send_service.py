@@ -712,7 +712,7 @@ def _sync_sent_message_to_maisaka_history(
     *,
     source_kind: str,
 ) -> None:
-    """将已发送成功的消息同步到当前会话对应的 Maisaka 历史。"""
+    """将已发送成功的消息同步到当前会话对应的 Maisaka 历史，会话休眠时同步到其休眠状态。"""
 
     session_id = str(message.session_id or "").strip()
     if not session_id:
@@ -721,10 +721,7 @@ def _sync_sent_message_to_maisaka_history(
     try:
         from src.chat.heart_flow.heartflow_manager import heartflow_manager
 
-        runtime = heartflow_manager.heartflow_chat_list.get(session_id)
-        if runtime is None:
-            return
-        runtime.append_sent_message_to_chat_history(message, source_kind=source_kind)
+        heartflow_manager.append_sent_message_to_chat_history(session_id, message, source_kind=source_kind)
     except Exception as exc:
         logger.warning(f"[SendService] 同步消息到 Maisaka 历史失败: session_id={session_id} error={exc}")
 
@@ -1,7 +1,7 @@
 """WebSocket 日志推送模块"""
 
+import asyncio
 import json
-from pathlib import Path
 from typing import Dict, List, Optional, Set
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
@@ -10,6 +10,7 @@ from src.common.logger import get_logger
 from src.webui.core import get_token_manager
 from src.webui.routers.websocket.auth import verify_ws_token
 from src.webui.routers.websocket.manager import websocket_manager
+from src.webui.services.log_store import get_log_store
 
 logger = get_logger("webui.logs_ws")
 router = APIRouter()
@@ -25,56 +26,9 @@ def load_recent_logs(limit: int = 100) -> List[Dict]:
         limit: 返回的最大日志条数
 
     Returns:
-        日志列表
+        日志列表（按时间从旧到新排列）
     """
-    logs = []
-    log_dir = Path("logs")
-
-    if not log_dir.exists():
-        return logs
-
-    # 获取所有日志文件,按修改时间排序
-    log_files = sorted(log_dir.glob("app_*.log.jsonl"), key=lambda f: f.stat().st_mtime, reverse=True)
-
-    # 用于生成唯一 ID 的计数器
-    log_counter = 0
-
-    # 从最新的文件开始读取
-    for log_file in log_files:
-        if len(logs) >= limit:
-            break
-
-        try:
-            with open(log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                # 从文件末尾开始读取
-                for line in reversed(lines):
-                    if len(logs) >= limit:
-                        break
-                    try:
-                        log_entry = json.loads(line.strip())
-                        # 转换为前端期望的格式
-                        # 使用时间戳 + 计数器生成唯一 ID
-                        timestamp_id = (
-                            log_entry.get("timestamp", "0").replace("-", "").replace(" ", "").replace(":", "")
-                        )
-                        formatted_log = {
-                            "id": f"{timestamp_id}_{log_counter}",
-                            "timestamp": log_entry.get("timestamp", ""),
-                            "level": log_entry.get("level", "INFO").upper(),
-                            "module": log_entry.get("logger_name", ""),
-                            "message": log_entry.get("event", ""),
-                        }
-                        logs.append(formatted_log)
-                        log_counter += 1
-                    except (json.JSONDecodeError, KeyError):
-                        continue
-        except Exception as e:
-            logger.error(f"读取日志文件失败 {log_file}: {e}")
-            continue
-
-    # 反转列表，使其按时间顺序排列（旧到新）
-    return list(reversed(logs))
+    return get_log_store().recent(limit=limit)
 
 
 @router.websocket("/ws/logs")
@@ -115,7 +69,7 @@ async def websocket_logs(websocket: WebSocket, token: Optional[str] = Query(None
 
     # 连接建立后，立即发送历史日志
     try:
-        recent_logs = load_recent_logs(limit=100)
+        recent_logs = await asyncio.to_thread(load_recent_logs, 100)
         logger.info(f"发送 {len(recent_logs)} 条历史日志到客户端")
 
         for log_entry in recent_logs:
@@ -155,3 +109,18 @@ async def broadcast_log(log_data: Dict):
         event="entry",
         data={"entry": log_data},
     )
+
+
+async def broadcast_log_batch(entries: List[Dict], dropped: int = 0):
+    """批量广播日志到所有连接的 WebSocket 客户端
+
+    Args:
+        entries: 按时间顺序排列的日志数据列表
+        dropped: 本批次之前因背压被丢弃的日志条数
+    """
+    await websocket_manager.broadcast_to_topic(
+        domain="logs",
+        topic="main",
+        event="batch",
+        data={"entries": entries, "dropped": dropped},
+    )
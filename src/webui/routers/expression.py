@@ -12,6 +12,7 @@ from src.chat.message_receive.chat_manager import chat_manager as _chat_manager
 from src.common.database.database import get_db_session
 from src.common.database.database_model import Expression
 from src.common.logger import get_logger
+from src.learners.expression_candidate_cache import expression_candidate_cache
 from src.webui.dependencies import require_auth
 
 logger = get_logger("webui.expression")
@@ -303,6 +304,7 @@ async def create_expression(
                 session_id=request.chat_id,
             )
             session.add(expression)
+        expression_candidate_cache.invalidate()
 
         logger.info(f"表达方式已创建: ID={expression.id}, situation={request.situation}")
 
@@ -363,6 +365,7 @@ async def update_expression(
                     setattr(db_expression, field, value)
             session.add(db_expression)
             expression = db_expression
+        expression_candidate_cache.invalidate()
 
         logger.info(f"表达方式已更新: ID={expression_id}, 字段: {list(update_data.keys())}")
 
@@ -402,6 +405,7 @@ async def delete_expression(expression_id: int):
         # 执行删除
         with get_db_session() as session:
             session.exec(delete(Expression).where(col(Expression.id) == expression_id))
+        expression_candidate_cache.remove(expression_id)
 
         logger.info(f"表达方式已删除: ID={expression_id}, situation={situation}")
 
@@ -450,6 +454,8 @@ async def batch_delete_expressions(
         with get_db_session() as session:
             result = session.exec(delete(Expression).where(col(Expression.id).in_(found_ids)))
             deleted_count = result.rowcount or 0
+        for expression_id in found_ids:
+            expression_candidate_cache.remove(expression_id)
 
         logger.info(f"批量删除了 {deleted_count} 个表达方式")
 
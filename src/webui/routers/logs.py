@@ -0,0 +1,64 @@
+"""日志查询路由"""
+
+import asyncio
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Optional, Set
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from src.common.logger import get_logger
+from src.webui.dependencies import require_auth
+from src.webui.services.log_store import LogQuery, get_log_store
+
+logger = get_logger("webui.logs")
+
+router = APIRouter(prefix="/logs", tags=["Logs"], dependencies=[Depends(require_auth)])
+
+
+class LogQueryResponse(BaseModel):
+    """日志查询响应"""
+
+    success: bool = True
+    data: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+def _split_values(values: Optional[List[str]]) -> Optional[Set[str]]:
+    """解析可重复或逗号分隔的查询参数"""
+    if not values:
+        return None
+    parsed = {item.strip() for value in values for item in value.split(",") if item.strip()}
+    return parsed or None
+
+
+@router.get("/query", response_model=LogQueryResponse)
+async def query_logs(
+    level: Annotated[Optional[List[str]], Query(description="日志级别，可重复或逗号分隔")] = None,
+    module: Annotated[Optional[List[str]], Query(description="模块（logger 名称），可重复或逗号分隔")] = None,
+    since: Annotated[Optional[datetime], Query(description="起始时间")] = None,
+    until: Annotated[Optional[datetime], Query(description="结束时间")] = None,
+    keyword: Annotated[Optional[str], Query(description="消息关键词")] = None,
+    limit: Annotated[int, Query(ge=1, le=1000, description="每页条数")] = 100,
+    cursor: Annotated[Optional[str], Query(description="上一页返回的游标")] = None,
+):
+    """从新到旧分页查询日志，每页结果按时间从旧到新排列"""
+    levels = _split_values(level)
+    log_query = LogQuery(
+        levels={item.upper() for item in levels} if levels else None,
+        modules=_split_values(module),
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        keyword=keyword or None,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        result = await asyncio.to_thread(get_log_store().query, log_query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"查询日志失败: {e}")
+        raise HTTPException(status_code=500, detail=f"查询日志失败: {str(e)}") from e
+
+    return LogQueryResponse(data=result.entries, next_cursor=result.next_cursor)
@@ -170,8 +170,27 @@ def _unwrap_payload(payload: dict[str, Any] | None) -> dict[str, Any]:
     return dict(raw)
 
 
-async def _graph_get(limit: int) -> dict:
-    return await memory_service.graph_admin(action="get_graph", limit=limit)
+async def _graph_get(
+    limit: int,
+    *,
+    cursor: Optional[str] = None,
+    focus: Optional[str] = None,
+    strategy: str = "degree",
+    depth: Optional[int] = None,
+    max_edges_per_node: int = 0,
+) -> dict:
+    payload = await memory_service.graph_admin(
+        action="get_graph",
+        limit=limit,
+        cursor=cursor,
+        focus=focus,
+        strategy=strategy,
+        depth=depth,
+        max_edges_per_node=max_edges_per_node,
+    )
+    if payload.get("success") is False:
+        raise HTTPException(status_code=400, detail=str(payload.get("error", "获取图谱失败")))
+    return payload
 
 
 async def _graph_search(query: str, limit: int) -> dict:
@@ -685,8 +704,22 @@ async def _stage_upload_files(files: list[UploadFile]) -> tuple[Path, list[dict[
 
 
 @router.get("/graph")
-async def get_memory_graph(limit: int = Query(200, ge=1, le=5000)):
-    return await _graph_get(limit)
+async def get_memory_graph(
+    limit: int = Query(200, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    focus: Optional[str] = Query(None, description="焦点节点，提供时返回其邻域子图"),
+    strategy: str = Query("degree", pattern="^(degree|saliency)$"),
+    depth: Optional[int] = Query(None, ge=1, le=10),
+    max_edges_per_node: int = Query(0, ge=0, le=1000),
+):
+    return await _graph_get(
+        limit,
+        cursor=cursor,
+        focus=focus,
+        strategy=strategy,
+        depth=depth,
+        max_edges_per_node=max_edges_per_node,
+    )
 
 
 @router.get("/graph/search")
@@ -12,6 +12,7 @@ from sqlmodel import col, delete, select
 from src.common.database.database import get_db_session
 from src.common.database.database_model import PersonInfo
 from src.common.logger import get_logger
+from src.person_info.person_cache import person_profile_cache
 from src.webui.dependencies import require_auth
 
 logger = get_logger("webui.person")
@@ -275,6 +276,7 @@ async def update_person(
                     setattr(db_person, field, value)
             session.add(db_person)
             person = db_person
+        person_profile_cache.invalidate(person_id)
 
         logger.info(f"人物信息已更新: {person_id}, 字段: {list(update_data.keys())}")
 
@@ -314,6 +316,7 @@ async def delete_person(person_id: str):
         # 执行删除
         with get_db_session() as session:
             session.exec(delete(PersonInfo).where(col(PersonInfo.person_id) == person_id))
+        person_profile_cache.invalidate(person_id)
 
         logger.info(f"人物信息已删除: {person_id} ({person_name})")
 
@@ -390,6 +393,7 @@ async def batch_delete_persons(
                     else:
                         failed_count += 1
                         failed_ids.append(person_id)
+                person_profile_cache.invalidate(person_id)
             except Exception as e:
                 logger.error(f"删除 {person_id} 失败: {e}")
                 failed_count += 1
@@ -13,6 +13,8 @@ from pydantic import BaseModel
 
 from src.common.logger import get_logger
 from src.config.config import MMC_VERSION
+from src.llm_models.request_governor import llm_request_governor
+from src.platform_io.manager import get_platform_io_manager
 from src.webui.dependencies import require_auth
 
 router = APIRouter(prefix="/system", tags=["system"], dependencies=[Depends(require_auth)])
@@ -89,6 +91,27 @@ async def get_maibot_status():
         raise HTTPException(status_code=500, detail=f"获取状态失败: {str(e)}") from e
 
 
+@router.get("/llm-governor")
+async def get_llm_governor_stats():
+    """
+    获取 LLM 请求调度器状态
+
+    返回各优先级的排队深度、放行数与等待耗时，以及各提供商 / 模型的并发占用与剩余速率额度。
+    """
+    return llm_request_governor.stats()
+
+
+@router.get("/platform-io")
+async def get_platform_io_stats():
+    """
+    获取 Platform IO 入站队列状态
+
+    返回入站队列的当前深度、排队等待耗时、丢弃数量以及队列容量与工作协程配置。
+    """
+    manager = get_platform_io_manager()
+    return {"started": manager.is_started, "inbound_queue": manager.inbound_queue_stats()}
+
+
 # 可选：添加更多系统控制功能
 
 
@@ -114,7 +114,7 @@ async def _handle_logs_subscribe(connection_id: str, request_id: Optional[str],
         domain="logs",
         event="snapshot",
         topic="main",
-        data={"entries": load_recent_logs(limit=replay_limit)},
+        data={"entries": await asyncio.to_thread(load_recent_logs, replay_limit)},
     )
 
 
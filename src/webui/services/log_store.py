@@ -0,0 +1,376 @@
+"""日志查询服务 - 基于旁路索引与倒序分块读取的 JSONL 日志检索"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.common.logger import get_logger
+
+logger = get_logger("webui.log_store")
+
+LOG_FILE_PATTERN = re.compile(r"^app_(\d{8}_\d{6})\.log\.jsonl$")
+READ_BLOCK_SIZE = 64 * 1024
+LEGACY_TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%m-%d %H:%M:%S", "%H:%M:%S")
+
+
+@dataclass
+class LogQuery:
+    """日志查询条件
+
+    ``since``/``until`` 为 Unix 时间戳（含边界），按每条记录的写入时间过滤；
+    索引只用于跳过整段不相交的区段。
+    """
+
+    levels: Optional[Set[str]] = None
+    modules: Optional[Set[str]] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    keyword: Optional[str] = None
+    limit: int = 100
+    cursor: Optional[str] = None
+
+
+@dataclass
+class LogQueryResult:
+    """日志查询结果，``entries`` 按时间从旧到新排列"""
+
+    entries: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    scanned_bytes: int = 0
+
+
+@dataclass
+class _Segment:
+    """日志文件中的一段字节区间及其摘要，``levels``/``modules`` 为 None 表示未知"""
+
+    start: int
+    end: int
+    first: float
+    last: float
+    levels: Optional[Set[str]] = None
+    modules: Optional[Set[str]] = None
+
+
+class LogStore:
+    """日志查询服务
+
+    通过日志文件名确定文件先后顺序，利用 ``TimestampedFileHandler`` 维护的旁路索引
+    跳过与过滤条件无关的区段，再对剩余区段从文件末尾向前分块读取，
+    因此只读取返回结果附近的数据，而不是整份日志。
+    """
+
+    def __init__(self, log_dir: Optional[Path] = None, block_size: int = READ_BLOCK_SIZE) -> None:
+        if log_dir is None:
+            # 延迟导入：部分测试会在收集阶段用精简替身替换 ``src.common.logger``
+            from src.common.logger import LOG_DIR
+
+            log_dir = LOG_DIR
+        self.log_dir = Path(log_dir)
+        self.block_size = block_size
+        self._index_cache: Dict[Path, Tuple[int, List[_Segment]]] = {}
+        self._timestamp_formats: Optional[Tuple[str, ...]] = None
+
+    # ==================== 文件与索引 ====================
+
+    def _list_log_files(self) -> List[Path]:
+        """按创建时间从新到旧列出日志文件"""
+        if not self.log_dir.exists():
+            return []
+        log_files = [path for path in self.log_dir.glob("app_*.log.jsonl") if LOG_FILE_PATTERN.match(path.name)]
+        # 文件名中的时间戳即创建时间，按名称排序即可，无需逐个 stat
+        log_files.sort(key=lambda path: path.name, reverse=True)
+        return log_files
+
+    @staticmethod
+    def _file_created_at(log_file: Path) -> float:
+        match = LOG_FILE_PATTERN.match(log_file.name)
+        if match is None:
+            return 0.0
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+        except ValueError:
+            return 0.0
+
+    def _load_index(self, log_file: Path) -> List[_Segment]:
+        """读取旁路索引，按索引文件大小缓存解析结果"""
+        from src.common.logger import get_log_index_path
+
+        index_path = get_log_index_path(log_file)
+        try:
+            index_size = index_path.stat().st_size
+        except OSError:
+            self._index_cache.pop(log_file, None)
+            return []
+
+        cached = self._index_cache.get(log_file)
+        if cached is not None and cached[0] == index_size:
+            return cached[1]
+
+        segments: List[_Segment] = []
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                        segments.append(
+                            _Segment(
+                                start=int(item["start"]),
+                                end=int(item["end"]),
+                                first=float(item["first"]),
+                                last=float(item["last"]),
+                                levels={str(level).upper() for level in item.get("levels", [])},
+                                modules=set(item.get("modules", [])),
+                            )
+                        )
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+        except OSError as e:
+            logger.warning(f"读取日志索引失败 {index_path}: {e}")
+            return []
+
+        segments.sort(key=lambda segment: segment.start)
+        self._index_cache[log_file] = (index_size, segments)
+        return segments
+
+    def _build_segments(self, log_file: Path, file_size: int, mtime: float) -> List[_Segment]:
+        """构造文件的区段列表，未被索引覆盖的部分作为摘要未知的区段"""
+        segments: List[_Segment] = []
+        position = 0
+        last_time = self._file_created_at(log_file)
+        for segment in self._load_index(log_file):
+            if segment.start >= file_size:
+                break
+            if segment.start > position:
+                segments.append(_Segment(start=position, end=segment.start, first=last_time, last=segment.first))
+            segments.append(segment)
+            position = max(position, min(segment.end, file_size))
+            last_time = segment.last
+        if position < file_size:
+            segments.append(_Segment(start=position, end=file_size, first=last_time, last=mtime))
+        return segments
+
+    # ==================== 过滤 ====================
+
+    @staticmethod
+    def _segment_matches(segment: _Segment, query: LogQuery) -> bool:
+        if query.since is not None and segment.last < query.since:
+            return False
+        if query.until is not None and segment.first > query.until:
+            return False
+        if query.levels and segment.levels is not None and not (segment.levels & query.levels):
+            return False
+        return not (query.modules and segment.modules is not None and not (segment.modules & query.modules))
+
+    @staticmethod
+    def _segment_within_time_range(segment: _Segment, query: LogQuery) -> bool:
+        """区段的时间范围完全落在查询区间内时，无需逐条检查时间"""
+        if query.since is not None and segment.first < query.since:
+            return False
+        return query.until is None or segment.last <= query.until
+
+    def _get_timestamp_formats(self) -> Tuple[str, ...]:
+        if self._timestamp_formats is None:
+            formats: List[str] = []
+            try:
+                from src.common.logger import get_timestamp_format
+
+                formats.append(get_timestamp_format())
+            except ImportError:
+                pass
+            formats.extend(fmt for fmt in LEGACY_TIMESTAMP_FORMATS if fmt not in formats)
+            self._timestamp_formats = tuple(formats)
+        return self._timestamp_formats
+
+    def _entry_time(self, log_entry: Dict, file_created_at: float) -> Optional[float]:
+        """获取单条记录的 Unix 时间戳
+
+        新记录直接携带 ``created`` 字段；旧记录只有格式化后的 ``timestamp``，
+        缺少年份时以所在日志文件的创建时间补全，无法解析时返回 None。
+        """
+        created = log_entry.get("created")
+        if isinstance(created, (int, float)) and not isinstance(created, bool):
+            return float(created)
+
+        timestamp_text = str(log_entry.get("timestamp") or "").strip()
+        if not timestamp_text:
+            return None
+        try:
+            return datetime.fromisoformat(timestamp_text).timestamp()
+        except ValueError:
+            pass
+
+        created_at = datetime.fromtimestamp(file_created_at) if file_created_at > 0 else datetime.now()
+        for fmt in self._get_timestamp_formats():
+            try:
+                parsed = datetime.strptime(timestamp_text, fmt)
+            except ValueError:
+                continue
+            if "%Y" not in fmt:
+                if "%m" not in fmt:
+                    parsed = parsed.replace(year=created_at.year, month=created_at.month, day=created_at.day)
+                else:
+                    parsed = parsed.replace(year=created_at.year)
+                # 跨年（或跨天）写入的记录会早于文件创建时间，顺延到下一年（或下一天）
+                if parsed < created_at - timedelta(minutes=1):
+                    if "%m" not in fmt:
+                        parsed += timedelta(days=1)
+                    else:
+                        parsed = parsed.replace(year=parsed.year + 1)
+            return parsed.timestamp()
+        return None
+
+    @staticmethod
+    def _time_matches(entry_time: Optional[float], query: LogQuery) -> bool:
+        if entry_time is None:
+            return False
+        if query.since is not None and entry_time < query.since:
+            return False
+        return query.until is None or entry_time <= query.until
+
+    @staticmethod
+    def _format_entry(log_entry: Dict, entry_id: str) -> Dict:
+        """转换为前端期望的日志格式"""
+        return {
+            "id": entry_id,
+            "timestamp": log_entry.get("timestamp", ""),
+            "level": str(log_entry.get("level", "INFO")).upper(),
+            "module": log_entry.get("logger_name") or log_entry.get("logger", ""),
+            "message": log_entry.get("event", ""),
+        }
+
+    @staticmethod
+    def _entry_matches(entry: Dict, query: LogQuery) -> bool:
+        if query.levels and entry["level"] not in query.levels:
+            return False
+        if query.modules and entry["module"] not in query.modules:
+            return False
+        return not (query.keyword and query.keyword.lower() not in str(entry["message"]).lower())
+
+    # ==================== 读取 ====================
+
+    def _iter_lines_reversed(self, log_file: Path, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+        """从 ``end`` 向 ``start`` 倒序分块读取，逐行产出 (行起始偏移, 行内容)"""
+        with open(log_file, "rb") as f:
+            position = end
+            remainder = b""
+            while position > start:
+                read_size = min(self.block_size, position - start)
+                position -= read_size
+                f.seek(position)
+                chunk = f.read(read_size) + remainder
+                lines = chunk.split(b"\n")
+                # 第一段可能是不完整的行，留到下一块拼接
+                remainder = lines[0]
+                offset = position + len(remainder) + 1
+                offsets = []
+                for line in lines[1:]:
+                    offsets.append(offset)
+                    offset += len(line) + 1
+                for line_offset, line in zip(reversed(offsets), reversed(lines[1:]), strict=True):
+                    if line:
+                        yield line_offset, line
+            if remainder:
+                yield start, remainder
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
+        if not cursor:
+            return None
+        file_name, _, offset_text = cursor.rpartition(":")
+        if not LOG_FILE_PATTERN.match(file_name):
+            raise ValueError(f"无效的日志游标: {cursor}")
+        try:
+            return file_name, int(offset_text)
+        except ValueError as e:
+            raise ValueError(f"无效的日志游标: {cursor}") from e
+
+    def query(self, query: LogQuery) -> LogQueryResult:
+        """按条件从新到旧查询日志
+
+        Args:
+            query: 查询条件，``cursor`` 为上一页返回的 ``next_cursor``
+
+        Returns:
+            LogQueryResult: 查询结果，存在更早的记录时携带 ``next_cursor``
+        """
+        result = LogQueryResult()
+        limit = max(0, query.limit)
+        if limit == 0:
+            return result
+
+        cursor = self._parse_cursor(query.cursor)
+        # 仅对 ASCII 关键词在原始字节上粗筛：非 ASCII 大小写与 JSON 转义无法在字节层面等价比较
+        keyword_bytes = None
+        if query.keyword and query.keyword.isascii():
+            keyword_bytes = json.dumps(query.keyword.lower())[1:-1].encode("utf-8")
+        collected: List[Dict] = []
+        has_time_range = query.since is not None or query.until is not None
+
+        for log_file in self._list_log_files():
+            if cursor is not None and log_file.name > cursor[0]:
+                continue
+            try:
+                stat = log_file.stat()
+            except OSError:
+                continue
+            file_end = stat.st_size
+            if cursor is not None and log_file.name == cursor[0]:
+                file_end = min(file_end, cursor[1])
+
+            file_created_at = self._file_created_at(log_file)
+
+            try:
+                for segment in reversed(self._build_segments(log_file, stat.st_size, stat.st_mtime)):
+                    if segment.start >= file_end or not self._segment_matches(segment, query):
+                        continue
+                    check_entry_time = has_time_range and not (
+                        segment.levels is not None and self._segment_within_time_range(segment, query)
+                    )
+                    segment_end = min(segment.end, file_end)
+                    result.scanned_bytes += segment_end - segment.start
+                    for line_offset, line in self._iter_lines_reversed(log_file, segment.start, segment_end):
+                        # 关键词先在原始字节上粗筛，避免无谓的 JSON 解析
+                        if keyword_bytes is not None and keyword_bytes not in line.lower():
+                            continue
+                        try:
+                            log_entry = json.loads(line)
+                        except (json.JSONDecodeError, UnicodeDecodeError):
+                            continue
+                        if not isinstance(log_entry, dict):
+                            continue
+                        if check_entry_time and not self._time_matches(
+                            self._entry_time(log_entry, file_created_at), query
+                        ):
+                            continue
+                        entry = self._format_entry(log_entry, f"{log_file.name}:{line_offset}")
+                        if not self._entry_matches(entry, query):
+                            continue
+                        collected.append(entry)
+                        if len(collected) >= limit:
+                            result.entries = list(reversed(collected))
+                            result.next_cursor = f"{log_file.name}:{line_offset}"
+                            return result
+            except OSError as e:
+                logger.error(f"读取日志文件失败 {log_file}: {e}")
+                continue
+
+        result.entries = list(reversed(collected))
+        return result
+
+    def recent(self, limit: int = 100) -> List[Dict]:
+        """获取最近的日志，按时间从旧到新排列"""
+        return self.query(LogQuery(limit=limit)).entries
+
+
+_log_store: Optional[LogStore] = None
+
+
+def get_log_store() -> LogStore:
+    """获取日志查询服务单例"""
+    global _log_store
+    if _log_store is None:
+        _log_store = LogStore()
+    return _log_store